@@ -4,19 +4,23 @@ Handles CSV upload, batch processing, and publishing workflow
 """
 
 from flask import Blueprint, request, jsonify, current_app
-import pandas as pd
+from utils.lazy_imports import LazyModule
 import uuid
-import json
 import os
 from datetime import datetime
 import asyncio
 import threading
 from concurrent.futures import ThreadPoolExecutor
 
+from core.staging_store import get_staging_store
+
+# pandas is only needed once a CSV is uploaded
+pd = LazyModule('pandas')
+
 # Create blueprint
 staging_bp = Blueprint('staging', __name__, url_prefix='/api/<collection>/staging')
 
-# File-based persistent storage
+# Legacy file-based storage, migrated into the SQLite staging store on startup
 STAGING_DATA_FILE = '/home/cassbrothers/mysite/staging_data.json'
 
 def clean_for_json(obj):
@@ -32,64 +36,52 @@ def clean_for_json(obj):
     else:
         return obj
 
-def load_staging_data():
-    """Load staging data from persistent file storage"""
+def get_staging_data():
+    """Get all staging data keyed by staging_id (prefer get_staging_product for single lookups)"""
+    return get_staging_store().get_all_products()
+
+def get_staging_product_data(staging_id):
+    """Get a single staging product, or None if it does not exist"""
+    return get_staging_store().get_product(staging_id)
+
+def update_staging_product(staging_id, updates):
+    """Update a specific staging product with a row-level write (pass only the changed fields)"""
     try:
-        if os.path.exists(STAGING_DATA_FILE):
-            with open(STAGING_DATA_FILE, 'r') as f:
-                return json.load(f)
-        return {}
+        return get_staging_store().update_product(staging_id, clean_for_json(updates))
     except Exception as e:
-        current_app.logger.error(f"Error loading staging data: {e}")
-        return {}
+        current_app.logger.error(f"Error updating staging product {staging_id}: {e}")
+        return False
 
-def save_staging_data(data):
-    """Save staging data to persistent file storage"""
+def modify_staging_product(staging_id, modify):
+    """Apply modify(product) to the stored product inside the store's write transaction"""
+    def apply(product):
+        modify(product)
+        return clean_for_json(product)
     try:
-        # Clean NaN values before saving
-        cleaned_data = clean_for_json(data)
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(STAGING_DATA_FILE), exist_ok=True)
-        with open(STAGING_DATA_FILE, 'w') as f:
-            json.dump(cleaned_data, f, indent=2)
-        return True
+        return get_staging_store().modify_product(staging_id, apply)
     except Exception as e:
-        current_app.logger.error(f"Error saving staging data: {e}")
+        current_app.logger.error(f"Error updating staging product {staging_id}: {e}")
         return False
 
-def get_staging_data():
-    """Get current staging data (loads from file each time)"""
-    return load_staging_data()
-
-def update_staging_product(staging_id, updates):
-    """Update a specific staging product and save to file"""
-    staging_data = load_staging_data()
-    if staging_id in staging_data:
-        # Clean updates before merging
-        cleaned_updates = clean_for_json(updates)
-        staging_data[staging_id].update(cleaned_updates)
-        save_staging_data(staging_data)
-        return True
-    return False
+def record_staging_error(staging_id, message):
+    """Mark a staging product as errored and append the message to its errors"""
+    def apply(product):
+        product['status'] = 'error'
+        product.setdefault('errors', []).append(message)
+    return modify_staging_product(staging_id, apply)
 
 def add_staging_product(staging_id, product_data):
-    """Add a new staging product and save to file"""
-    staging_data = load_staging_data()
-    # Clean product data before adding
-    cleaned_product_data = clean_for_json(product_data)
-    staging_data[staging_id] = cleaned_product_data
-    save_staging_data(staging_data)
-    return True
+    """Add a new staging product"""
+    return add_staging_products({staging_id: product_data}) == 1
+
+def add_staging_products(products):
+    """Add many staging products in a single transaction"""
+    cleaned = {staging_id: clean_for_json(data) for staging_id, data in products.items()}
+    return get_staging_store().add_products(cleaned)
 
 def remove_staging_product(staging_id):
-    """Remove a staging product and save to file"""
-    staging_data = load_staging_data()
-    if staging_id in staging_data:
-        del staging_data[staging_id]
-        save_staging_data(staging_data)
-        return True
-    return False
+    """Remove a staging product"""
+    return get_staging_store().remove_product(staging_id)
 
 # Built-in collection configurations
 COLLECTIONS_CONFIG = {
@@ -220,22 +212,21 @@ class StagingManager:
             }
             
             staging_products.append(staging_entry)
-            add_staging_product(staging_id, staging_entry)
+        
+        # One transaction for the whole upload instead of a write per row
+        add_staging_products({p['staging_id']: p for p in staging_products})
         
         return staging_products
     
     async def extract_product_data(self, staging_id):
         """Extract data from URL for a single staging product"""
         try:
-            staging_data = get_staging_data()
-            product = staging_data.get(staging_id)
+            product = get_staging_product_data(staging_id)
             if not product:
                 return {'success': False, 'error': 'Product not found in staging'}
             
             # Update status
-            product['status'] = 'extracting'
-            product['updated_at'] = datetime.now().isoformat()
-            update_staging_product(staging_id, product)
+            update_staging_product(staging_id, {'status': 'extracting'})
             
             # Simulate extraction delay
             await asyncio.sleep(1)
@@ -244,51 +235,43 @@ class StagingManager:
             if product.get('url'):
                 extracted_data = self.ai_extractor.extract_from_url(product['url'])
                 
-                # Merge with existing data, keeping original values if they exist
-                for key, value in extracted_data.items():
-                    original_value = product.get('original_data', {}).get(key)
-                    if not original_value or original_value == '':
-                        product['extracted_data'][key] = value
-                    else:
-                        product['extracted_data'][key] = original_value
+                # Merge with the stored data, keeping original values if they exist
+                merged = {}
+                def apply_extraction(stored):
+                    for key, value in extracted_data.items():
+                        original_value = stored.get('original_data', {}).get(key)
+                        if not original_value or original_value == '':
+                            stored['extracted_data'][key] = value
+                        else:
+                            stored['extracted_data'][key] = original_value
+                    stored['status'] = 'extracted'
+                    merged.update(stored['extracted_data'])
                 
-                product['status'] = 'extracted'
-                update_staging_product(staging_id, product)
-                return {'success': True, 'data': product['extracted_data']}
+                modify_staging_product(staging_id, apply_extraction)
+                return {'success': True, 'data': merged}
             else:
                 # Use existing data if no URL
-                product['extracted_data'] = {
+                extracted_data = {
                     'title': product.get('title') or 'Product Title Required',
                     'sku': product.get('sku') or f'SKU-{str(uuid.uuid4())[:8].upper()}',
                     'brand_name': product.get('vendor') or 'Brand Required'
                 }
-                product['status'] = 'extracted'
-                update_staging_product(staging_id, product)
-                return {'success': True, 'data': product['extracted_data']}
+                update_staging_product(staging_id, {'extracted_data': extracted_data, 'status': 'extracted'})
+                return {'success': True, 'data': extracted_data}
                 
         except Exception as e:
             current_app.logger.error(f"Error extracting staging product {staging_id}: {str(e)}")
-            staging_data = get_staging_data()
-            if staging_id in staging_data:
-                product = staging_data[staging_id]
-                product['status'] = 'error'
-                if 'errors' not in product:
-                    product['errors'] = []
-                product['errors'].append(f"Extraction error: {str(e)}")
-                update_staging_product(staging_id, product)
+            record_staging_error(staging_id, f"Extraction error: {str(e)}")
             return {'success': False, 'error': str(e)}
     
     async def generate_content(self, staging_id):
         """Generate descriptions and content for staging product"""
         try:
-            staging_data = get_staging_data()
-            product = staging_data.get(staging_id)
+            product = get_staging_product_data(staging_id)
             if not product:
                 return {'success': False, 'error': 'Product not found in staging'}
             
-            product['status'] = 'processing'
-            product['updated_at'] = datetime.now().isoformat()
-            update_staging_product(staging_id, product)
+            update_staging_product(staging_id, {'status': 'processing'})
             
             # Simulate content generation delay
             await asyncio.sleep(2)
@@ -322,29 +305,19 @@ commercial use.</p>
                 'seo_description': f'Shop {title} from {brand}. Premium quality {self.collection_name} with modern design and easy installation. Free shipping available.'
             }
             
-            product['generated_content'] = generated_content
-            product['status'] = 'ready'
-            update_staging_product(staging_id, product)
+            update_staging_product(staging_id, {'generated_content': generated_content, 'status': 'ready'})
             
             return {'success': True, 'content': generated_content}
             
         except Exception as e:
             current_app.logger.error(f"Error generating content for {staging_id}: {str(e)}")
-            staging_data = get_staging_data()
-            if staging_id in staging_data:
-                product = staging_data[staging_id]
-                product['status'] = 'error'
-                if 'errors' not in product:
-                    product['errors'] = []
-                product['errors'].append(f"Content generation error: {str(e)}")
-                update_staging_product(staging_id, product)
+            record_staging_error(staging_id, f"Content generation error: {str(e)}")
             return {'success': False, 'error': str(e)}
     
     async def process_images(self, staging_id):
         """Process and validate images for staging product"""
         try:
-            staging_data = get_staging_data()
-            product = staging_data.get(staging_id)
+            product = get_staging_product_data(staging_id)
             if not product:
                 return {'success': False, 'error': 'Product not found in staging'}
             
@@ -357,12 +330,11 @@ commercial use.</p>
                 'https://example.com/product-image-2.jpg'
             ]
             
-            product['processed_images'] = processed_images
-            if 'extracted_data' not in product:
-                product['extracted_data'] = {}
-            product['extracted_data']['shopify_images'] = ', '.join(processed_images)
+            def apply_images(stored):
+                stored['processed_images'] = processed_images
+                stored.setdefault('extracted_data', {})['shopify_images'] = ', '.join(processed_images)
             
-            update_staging_product(staging_id, product)
+            modify_staging_product(staging_id, apply_images)
             return {'success': True, 'images': processed_images}
             
         except Exception as e:
@@ -376,8 +348,7 @@ commercial use.</p>
         
         try:
             for staging_id in staging_ids:
-                staging_data = get_staging_data()
-                product = staging_data.get(staging_id)
+                product = get_staging_product_data(staging_id)
                 if not product:
                     errors.append(f"Product {staging_id} not found")
                     continue
@@ -563,11 +534,9 @@ def publish_staging_products(collection):
 def get_staging_batch(collection, batch_id):
     """Get all products in a staging batch"""
     try:
-        staging_data = get_staging_data()
-        batch_products = {
-            k: v for k, v in staging_data.items() 
-            if v.get('batch_id') == batch_id and v.get('collection') == collection
-        }
+        batch_products = get_staging_store().list_products(
+            collection=collection, batch_id=batch_id
+        )['products']
         
         return jsonify({
             'success': True,
@@ -582,19 +551,29 @@ def get_staging_batch(collection, batch_id):
 
 @staging_bp.route('/list', methods=['GET'])
 def list_staging_products(collection):
-    """List all staging products for collection"""
+    """List staging products for collection (optionally filtered and paginated)"""
     try:
-        staging_data = get_staging_data()
-        collection_products = {
-            k: v for k, v in staging_data.items() 
-            if v.get('collection') == collection
-        }
+        status = request.args.get('status')
+        page = request.args.get('page', type=int)
+        limit = min(request.args.get('limit', 100, type=int), 500)
         
-        return jsonify({
+        result = get_staging_store().list_products(
+            collection=collection, status=status, page=page, limit=limit
+        )
+        
+        response = {
             'success': True,
-            'products': collection_products,
-            'count': len(collection_products)
-        })
+            'products': result['products'],
+            'count': len(result['products'])
+        }
+        if page is not None:
+            response.update({
+                'total': result['total'],
+                'page': result['page'],
+                'total_pages': result['total_pages']
+            })
+        
+        return jsonify(response)
         
     except Exception as e:
         current_app.logger.error(f"Error in list endpoint: {str(e)}")
@@ -604,8 +583,7 @@ def list_staging_products(collection):
 def get_staging_product(collection, staging_id):
     """Get single staging product"""
     try:
-        staging_data = get_staging_data()
-        product = staging_data.get(staging_id)
+        product = get_staging_product_data(staging_id)
         
         if not product:
             return jsonify({'success': False, 'error': 'Product not found'})
@@ -626,11 +604,10 @@ def get_staging_product(collection, staging_id):
 def delete_staging_product(collection, staging_id):
     """Delete staging product"""
     try:
-        staging_data = get_staging_data()
-        if staging_id not in staging_data:
+        product = get_staging_product_data(staging_id)
+        if not product:
             return jsonify({'success': False, 'error': 'Product not found'})
         
-        product = staging_data[staging_id]
         if product.get('collection') != collection:
             return jsonify({'success': False, 'error': 'Product not in this collection'})
         
@@ -648,5 +625,13 @@ def delete_staging_product(collection, staging_id):
 
 def register_staging_routes(app):
     """Register staging routes with Flask app"""
+    # One-time import of the legacy JSON store (renamed to *.migrated afterwards)
+    if os.path.exists(STAGING_DATA_FILE):
+        try:
+            from migrations.migrate_staging_to_sqlite import run_migration
+            run_migration(STAGING_DATA_FILE)
+        except Exception as e:
+            app.logger.error(f"Staging JSON migration failed: {e}")
+    
     app.register_blueprint(staging_bp)
     app.logger.info("Staging routes registered successfully")
\ No newline at end of file
@@ -13,9 +13,12 @@ from datetime import datetime
 from flask import request, jsonify
 from typing import List, Dict, Any
 
-from core.ai_extractor_optimized import OptimizedAIExtractor
-from core.sheets_manager import get_sheets_manager
 from core.google_apps_script_manager import google_apps_script_manager
+from utils.lazy_imports import lazy_callable
+
+# Heavy extractor and Sheets client load on the first request that needs them
+OptimizedAIExtractor = lazy_callable('core.ai_extractor_optimized', 'OptimizedAIExtractor')
+get_sheets_manager = lazy_callable('core.sheets_manager', 'get_sheets_manager')
 
 logger = logging.getLogger(__name__)
 
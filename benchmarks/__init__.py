@@ -0,0 +1,4 @@
+"""
+Performance Benchmarks
+Run individual benchmarks as modules, e.g. python -m benchmarks.startup
+"""
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+ML Category Predictor Benchmark
+
+Measures category prediction throughput in products/second for:
+  legacy      - what scripts/ml_category_predictor.py did per invocation:
+                unpickle the model, build features with DataFrame.iterrows(),
+                then call predict() and predict_proba()
+  service     - core.category_predictor with the model already loaded and an
+                empty prediction cache (vectorized features, one model call)
+  cached      - the same batch again, served from the SQLite prediction cache
+
+Products are read from shopify_products in --db, or generated when the
+database has none. Needs the saved model (scripts/ml_category_predictor.py
+--save-model) and its scikit-learn/pandas dependencies.
+
+Usage:
+    python -m benchmarks.category_predictor
+    python -m benchmarks.category_predictor --products 20000 --runs 5
+    python -m benchmarks.category_predictor --output benchmarks/results/category_predictor.json
+"""
+
+import os
+import sys
+import json
+import time
+import pickle
+import sqlite3
+import argparse
+import tempfile
+import statistics
+from typing import Dict, List, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import pandas as pd
+
+from core.category_predictor import CategoryPredictor, MODEL_PATH, clean_title
+
+SYNTHETIC_TITLES = [
+    'Chrome Basin Mixer Tap - BM100CH',
+    'Undermount Kitchen Sink 810x455 Stainless Steel',
+    'Wall Hung Vanity 900mm Matte White',
+    'Freestanding Bath 1700mm Gloss White',
+    'Rimless Wall Faced Toilet Suite',
+    'Rail Shower Set with Hand Shower',
+    'Instant Boiling & Chilled Filter Tap',
+    'Heated Towel Rail 8 Bar Brushed Nickel',
+    'Continuous Flow Gas Hot Water System 26L',
+    'Laundry Trough 45L with Cabinet',
+]
+SYNTHETIC_VENDORS = ['Phoenix Tapware', 'Abey', 'ADP', 'Caroma', 'Zip', 'Rinnai', 'Thermogroup']
+
+
+def load_products(db_path: str, count: int) -> pd.DataFrame:
+    """Active shopify_products rows (title, vendor, product_type), topped up with synthetic ones"""
+    rows: List[Dict[str, Any]] = []
+    if os.path.exists(db_path):
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = [
+                {'title': title, 'vendor': vendor, 'product_type': product_type}
+                for title, vendor, product_type in conn.execute(
+                    "SELECT title, vendor, product_type FROM shopify_products WHERE status = 'active' LIMIT ?",
+                    (count,))
+            ]
+        except sqlite3.OperationalError:
+            rows = []
+        finally:
+            conn.close()
+
+    i = 0
+    while len(rows) < count:
+        title = SYNTHETIC_TITLES[i % len(SYNTHETIC_TITLES)]
+        rows.append({
+            'title': f"{title} {i}",
+            'vendor': SYNTHETIC_VENDORS[i % len(SYNTHETIC_VENDORS)],
+            'product_type': '',
+        })
+        i += 1
+    return pd.DataFrame(rows)
+
+
+def legacy_predict(model_path: str, df: pd.DataFrame):
+    """The script's previous prediction path, including its per-invocation model load"""
+    with open(model_path, 'rb') as f:
+        model = pickle.load(f)
+
+    features = []
+    for _, row in df.iterrows():
+        title = clean_title(str(row.get('title', '')))
+        vendor = str(row.get('vendor', '')).lower()
+        product_type = str(row.get('product_type', '')).lower()
+        features.append(f"{title} {vendor} {vendor} {product_type}")
+
+    pipeline = model['pipeline']
+    preds = pipeline.predict(features)
+    probs = pipeline.predict_proba(features)
+    return preds, probs.max(axis=1)
+
+
+def timed(fn, runs: int) -> float:
+    """Median seconds of ``runs`` calls"""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def run(model_path: str, df: pd.DataFrame, runs: int) -> Dict[str, Any]:
+    count = len(df)
+    with tempfile.TemporaryDirectory() as tmp:
+        predictor = CategoryPredictor(model_path=model_path, db_path=os.path.join(tmp, 'predictions.db'))
+        if predictor.get_model()[0] is None:
+            raise SystemExit(f"❌ No usable model at {model_path}")
+
+        legacy_s = timed(lambda: legacy_predict(model_path, df), runs)
+
+        def cold():
+            predictor.clear_cache()
+            return predictor.predict_batch(df)
+        service_s = timed(cold, runs)
+
+        predictor.predict_batch(df)
+        cached_s = timed(lambda: predictor.predict_batch(df), runs)
+
+        # Service predictions must match the legacy path
+        preds, confidences = legacy_predict(model_path, df)
+        served = predictor.predict_batch(df)
+        mismatches = sum(
+            1 for pred, conf, result in zip(preds, confidences, served)
+            if result['primary_category'] != pred or abs(result['confidence'] - float(conf)) > 1e-3
+        )
+
+    def row(seconds: float) -> Dict[str, float]:
+        return {'seconds': round(seconds, 4), 'items_per_second': round(count / seconds, 1) if seconds else None}
+
+    return {
+        'products': count,
+        'runs': runs,
+        'legacy': row(legacy_s),
+        'service': row(service_s),
+        'cached': row(cached_s),
+        'mismatches': mismatches,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure ML category prediction throughput (products/second)')
+    parser.add_argument('--db', default=os.path.join(REPO_ROOT, 'supplier_products.db'),
+                        help='Database to read shopify_products from')
+    parser.add_argument('--model', default=MODEL_PATH, help='Saved category model')
+    parser.add_argument('--products', type=int, default=5000, help='Products per batch')
+    parser.add_argument('--runs', type=int, default=3, help='Timed runs per mode (median reported)')
+    parser.add_argument('--output', help='Write the results as JSON')
+    args = parser.parse_args()
+
+    df = load_products(args.db, args.products)
+    report = run(args.model, df, args.runs)
+
+    print("=" * 70)
+    print("  ML Category Predictor Benchmark")
+    print("=" * 70)
+    print(f"  {report['products']} products, median of {report['runs']} runs\n")
+    print(f"  {'mode':<10} {'seconds':>10} {'products/s':>14}")
+    for mode in ('legacy', 'service', 'cached'):
+        print(f"  {mode:<10} {report[mode]['seconds']:>10.3f} {report[mode]['items_per_second']:>14,.1f}")
+    print(f"\n  Prediction mismatches vs legacy: {report['mismatches']}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
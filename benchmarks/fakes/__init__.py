@@ -0,0 +1,22 @@
+"""
+Local Stand-in Services
+Fake Google Sheets, Shopify, OpenAI and supplier-site backends for benchmarks
+"""
+from benchmarks.fakes.base import FakeHTTPServer, FakeResponse
+from benchmarks.fakes.sheets import FakeGspreadClient, FakeSheetsQuotaError, rows_from_column_mapping
+from benchmarks.fakes.shopify import FakeShopifyServer
+from benchmarks.fakes.openai_api import FakeOpenAIServer
+from benchmarks.fakes.supplier_site import FakeSupplierSite
+from benchmarks.fakes.routing import redirect_requests
+
+__all__ = [
+    'FakeHTTPServer',
+    'FakeResponse',
+    'FakeGspreadClient',
+    'FakeSheetsQuotaError',
+    'rows_from_column_mapping',
+    'FakeShopifyServer',
+    'FakeOpenAIServer',
+    'FakeSupplierSite',
+    'redirect_requests',
+]
@@ -0,0 +1,185 @@
+"""
+Base Fake HTTP Server
+Threaded localhost server with per-request latency, call counting and
+injected 429 responses, shared by the Shopify, OpenAI and supplier fakes
+"""
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional, Tuple
+
+
+class FakeResponse:
+    """Response returned by a fake route handler"""
+
+    def __init__(self, status: int = 200, body: Any = None, headers: Optional[Dict[str, str]] = None,
+                 content_type: str = 'application/json'):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.content_type = content_type
+
+    def encode(self) -> bytes:
+        if self.body is None:
+            return b''
+        if isinstance(self.body, bytes):
+            return self.body
+        if isinstance(self.body, str):
+            return self.body.encode('utf-8')
+        return json.dumps(self.body).encode('utf-8')
+
+
+class FakeHTTPServer:
+    """
+    Localhost HTTP server running in a daemon thread
+
+    Subclasses implement ``handle(method, path, query, body, headers)`` and
+    return a FakeResponse. Every request sleeps ``latency_ms`` (+/- jitter)
+    before handling, and ``error_rate`` of requests get a 429 instead.
+
+    Usage:
+        with FakeOpenAIServer(latency_ms=300, error_rate=0.05) as server:
+            os.environ['OPENAI_BASE_URL'] = server.url + '/v1'
+            ...
+        print(server.stats())
+    """
+
+    name = 'fake'
+
+    def __init__(self, latency_ms: float = 0, jitter_ms: float = 0, error_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        """
+        Args:
+            latency_ms: Simulated server latency per request
+            jitter_ms: Uniform random jitter added to latency
+            error_rate: Fraction of requests answered with 429 Too Many Requests
+            seed: Random seed so injected errors are reproducible between runs
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls: Counter = Counter()
+        self.throttled = 0
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeHTTPServer':
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _dispatch(self):
+                fake._serve(self)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _dispatch
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name=f'{self.name}-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _sleep(self):
+        delay = self.latency_ms
+        if self.jitter_ms:
+            delay += self._random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _should_throttle(self) -> bool:
+        if self.error_rate <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def _serve(self, request: BaseHTTPRequestHandler):
+        path, _, query_string = request.path.partition('?')
+        length = int(request.headers.get('Content-Length') or 0)
+        raw_body = request.rfile.read(length) if length else b''
+
+        with self._lock:
+            self.calls[f"{request.command} {self.route_name(path)}"] += 1
+
+        self._sleep()
+
+        if self._should_throttle():
+            with self._lock:
+                self.throttled += 1
+            response = self.throttle_response()
+        else:
+            try:
+                body = json.loads(raw_body) if raw_body else None
+            except ValueError:
+                body = raw_body
+            query = dict(part.split('=', 1) for part in query_string.split('&') if '=' in part)
+            try:
+                response = self.handle(request.command, path, query, body, request.headers)
+            except Exception as e:
+                response = FakeResponse(500, {'errors': str(e)})
+
+        payload = response.encode()
+        request.send_response(response.status)
+        request.send_header('Content-Type', response.content_type)
+        request.send_header('Content-Length', str(len(payload)))
+        for key, value in response.headers.items():
+            request.send_header(key, value)
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def route_name(self, path: str) -> str:
+        """Normalize a path for call counting (override to collapse IDs)"""
+        return path
+
+    def throttle_response(self) -> FakeResponse:
+        return FakeResponse(429, {'error': {'message': 'Rate limit exceeded', 'type': 'rate_limit'}},
+                            headers={'Retry-After': '1'})
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any, headers) -> FakeResponse:
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts per route plus throttled responses"""
+        with self._lock:
+            return {
+                'requests': sum(self.calls.values()),
+                'throttled': self.throttled,
+                'by_route': dict(self.calls),
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls.clear()
+            self.throttled = 0
+
+
+def split_path(path: str) -> Tuple[str, ...]:
+    """'/admin/api/2024-01/products/5.json' -> ('admin', 'api', '2024-01', 'products', '5')"""
+    if path.endswith('.json'):
+        path = path[:-5]
+    return tuple(part for part in path.split('/') if part)
@@ -0,0 +1,222 @@
+"""
+Fake OpenAI API
+Chat completions (text and vision) with configurable latency, per-output-token
+delay and injected 429s; usable from both requests-based callers and the SDK.
+Also serves the Files and Batches endpoints used by core.openai_batch.
+"""
+import json
+import time
+import uuid
+from email import message_from_bytes
+from email.policy import HTTP
+from typing import Dict, Any, Callable, Optional, Union
+
+from benchmarks.fakes.base import FakeHTTPServer, FakeResponse, split_path
+
+# Returned when no response_factory is given: a plausible product extraction
+DEFAULT_EXTRACTION = {
+    'brand_name': 'Benchmark',
+    'product_material': 'Stainless Steel',
+    'length_mm': '800',
+    'overall_width_mm': '450',
+    'bowl_depth_mm': '200',
+    'installation_type': 'Undermount',
+    'warranty_years': '10',
+    'body_html': '<p>Benchmark product description.</p>',
+    'features': '<ul><li>Benchmark feature</li></ul>',
+    'care_instructions': '<p>Wipe clean with a soft cloth.</p>',
+}
+
+
+class FakeOpenAIServer(FakeHTTPServer):
+    """
+    Serves /v1/chat/completions, /v1/files and /v1/batches
+
+    Requests whose messages contain ``image_url`` parts are counted as vision
+    calls. The reply content comes from ``response_factory(request_body)``,
+    which may return a string or a dict (serialized as JSON).
+
+    Batches stay ``in_progress`` for ``batch_polls_to_complete`` retrievals,
+    then every input line is answered at once and the batch completes.
+    """
+
+    name = 'openai'
+
+    def __init__(self, response_factory: Optional[Callable[[Dict[str, Any]], Union[str, Dict]]] = None,
+                 output_tokens: int = 150, per_token_ms: float = 0.0, batch_polls_to_complete: int = 1,
+                 **kwargs):
+        """
+        Args:
+            response_factory: Builds the assistant message content from the request body
+            output_tokens: Reported completion tokens per reply
+            per_token_ms: Extra latency per output token, to model generation time
+            batch_polls_to_complete: Batch retrievals before a batch completes
+        """
+        super().__init__(**kwargs)
+        self.response_factory = response_factory or (lambda body: DEFAULT_EXTRACTION)
+        self.output_tokens = output_tokens
+        self.per_token_ms = per_token_ms
+        self.vision_calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.batch_polls_to_complete = batch_polls_to_complete
+        self.files: Dict[str, bytes] = {}
+        self.batches: Dict[str, Dict[str, Any]] = {}
+
+    def route_name(self, path: str) -> str:
+        parts = split_path(path)
+        return '/' + '/'.join(':id' if part.startswith(('file-', 'batch_')) else part for part in parts)
+
+    @staticmethod
+    def _is_vision(body: Dict[str, Any]) -> bool:
+        for message in body.get('messages', []):
+            content = message.get('content')
+            if isinstance(content, list) and any(part.get('type') == 'image_url' for part in content):
+                return True
+        return False
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any, headers) -> FakeResponse:
+        parts = split_path(path)
+        if parts == ('v1', 'chat', 'completions') and method == 'POST' and isinstance(body, dict):
+            return FakeResponse(200, self._chat_completion(body), headers={'x-ratelimit-remaining-requests': '5000'})
+
+        with self._lock:
+            if parts == ('v1', 'files') and method == 'POST':
+                return self._upload_file(body, headers)
+            if len(parts) == 4 and parts[:2] == ('v1', 'files') and parts[3] == 'content' and parts[2] in self.files:
+                return FakeResponse(200, self.files[parts[2]], content_type='application/jsonl')
+            if parts == ('v1', 'batches') and method == 'POST' and isinstance(body, dict):
+                return self._create_batch(body)
+            batch = self.batches.get(parts[2]) if len(parts) >= 3 and parts[:2] == ('v1', 'batches') else None
+            if batch and parts[3:] == ('cancel',) and method == 'POST':
+                batch['status'] = 'cancelled'
+                return FakeResponse(200, self._public_batch(batch))
+
+        if batch and len(parts) == 3 and method == 'GET':
+            return FakeResponse(200, self._advance_batch(batch))
+
+        return FakeResponse(404, {'error': {'message': f"Unknown route {method} {path}"}})
+
+    def _chat_completion(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        if self.per_token_ms:
+            time.sleep(self.output_tokens * self.per_token_ms / 1000)
+
+        content = self.response_factory(body)
+        if not isinstance(content, str):
+            content = json.dumps(content)
+
+        prompt_tokens = len(json.dumps(body.get('messages', []))) // 4
+        with self._lock:
+            self.vision_calls += int(self._is_vision(body))
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += self.output_tokens
+
+        return {
+            'id': 'chatcmpl-benchmark',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_tokens,
+                'completion_tokens': self.output_tokens,
+                'total_tokens': prompt_tokens + self.output_tokens,
+            },
+        }
+
+    def _upload_file(self, body: Any, headers) -> FakeResponse:
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        message = message_from_bytes(b'Content-Type: ' + headers.get('Content-Type', '').encode() + b'\r\n\r\n' + raw,
+                                     policy=HTTP)
+        content = None
+        for part in message.iter_parts() if message.is_multipart() else []:
+            if part.get_param('name', header='content-disposition') == 'file':
+                content = part.get_payload(decode=True)
+        if content is None:
+            return FakeResponse(400, {'error': {'message': 'No file part in upload'}})
+
+        file_id = f"file-{uuid.uuid4().hex[:16]}"
+        self.files[file_id] = content
+        return FakeResponse(200, {'id': file_id, 'object': 'file', 'bytes': len(content), 'purpose': 'batch'})
+
+    def _create_batch(self, body: Dict[str, Any]) -> FakeResponse:
+        if body.get('input_file_id') not in self.files:
+            return FakeResponse(400, {'error': {'message': 'Unknown input_file_id'}})
+        batch_id = f"batch_{uuid.uuid4().hex[:16]}"
+        lines = [line for line in self.files[body['input_file_id']].decode('utf-8').splitlines() if line.strip()]
+        self.batches[batch_id] = {
+            'id': batch_id,
+            'object': 'batch',
+            'endpoint': body.get('endpoint'),
+            'input_file_id': body['input_file_id'],
+            'completion_window': body.get('completion_window'),
+            'status': 'validating',
+            'output_file_id': None,
+            'error_file_id': None,
+            'request_counts': {'total': len(lines), 'completed': 0, 'failed': 0},
+            'metadata': body.get('metadata') or {},
+            '_polls': 0,
+        }
+        return FakeResponse(200, self._public_batch(self.batches[batch_id]))
+
+    def _advance_batch(self, batch: Dict[str, Any]) -> Dict[str, Any]:
+        """Count a retrieval; once enough polls have passed, answer every input line and complete"""
+        with self._lock:
+            if batch['status'] not in ('validating', 'in_progress'):
+                return self._public_batch(batch)
+            batch['_polls'] += 1
+            if batch['_polls'] < self.batch_polls_to_complete:
+                batch['status'] = 'in_progress'
+                return self._public_batch(batch)
+            batch['status'] = 'finalizing'
+            input_lines = self.files[batch['input_file_id']].decode('utf-8').splitlines()
+
+        output_lines = []
+        for line in input_lines:
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            output_lines.append(json.dumps({
+                'id': f"batch_req_{uuid.uuid4().hex[:12]}",
+                'custom_id': request['custom_id'],
+                'response': {'status_code': 200, 'body': self._chat_completion(request.get('body') or {})},
+                'error': None,
+            }))
+
+        with self._lock:
+            output_file_id = f"file-{uuid.uuid4().hex[:16]}"
+            self.files[output_file_id] = ('\n'.join(output_lines) + '\n').encode('utf-8')
+            batch.update({
+                'status': 'completed',
+                'output_file_id': output_file_id,
+                'request_counts': {'total': len(output_lines), 'completed': len(output_lines), 'failed': 0},
+            })
+            return self._public_batch(batch)
+
+    @staticmethod
+    def _public_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in batch.items() if not key.startswith('_')}
+
+    def throttle_response(self) -> FakeResponse:
+        return FakeResponse(429, {'error': {'message': 'Rate limit reached for requests', 'type': 'requests',
+                                            'code': 'rate_limit_exceeded'}},
+                            headers={'Retry-After': '1', 'x-ratelimit-remaining-requests': '0'})
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats['vision_calls'] = self.vision_calls
+            stats['prompt_tokens'] = self.prompt_tokens
+            stats['completion_tokens'] = self.completion_tokens
+        return stats
+
+    def reset_stats(self):
+        super().reset_stats()
+        with self._lock:
+            self.vision_calls = 0
+            self.prompt_tokens = 0
+            self.completion_tokens = 0
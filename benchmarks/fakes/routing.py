@@ -0,0 +1,43 @@
+"""
+Request Routing to Fake Servers
+Rewrites outgoing ``requests`` traffic for production hosts (api.openai.com,
+*.myshopify.com) to local fake servers, since those URLs are hard-coded in
+the extractors and Shopify manager
+"""
+import contextlib
+import fnmatch
+from typing import Dict
+from urllib.parse import urlsplit, urlunsplit
+
+
+@contextlib.contextmanager
+def redirect_requests(host_map: Dict[str, str]):
+    """
+    Route matching hosts to fake server base URLs for the duration of the block
+
+    Args:
+        host_map: Host pattern (fnmatch, e.g. '*.myshopify.com') -> fake base URL
+
+    Usage:
+        with redirect_requests({'api.openai.com': openai_fake.url}):
+            requests.post('https://api.openai.com/v1/chat/completions', ...)  # hits the fake
+    """
+    from requests.adapters import HTTPAdapter
+
+    targets = {pattern: urlsplit(url) for pattern, url in host_map.items()}
+    original_send = HTTPAdapter.send
+
+    def send(adapter, request, **kwargs):
+        parts = urlsplit(request.url)
+        for pattern, target in targets.items():
+            if fnmatch.fnmatch(parts.hostname or '', pattern):
+                request.url = urlunsplit((target.scheme, target.netloc, parts.path, parts.query, parts.fragment))
+                request.headers['Host'] = target.netloc
+                break
+        return original_send(adapter, request, **kwargs)
+
+    HTTPAdapter.send = send
+    try:
+        yield
+    finally:
+        HTTPAdapter.send = original_send
@@ -0,0 +1,276 @@
+"""
+Fake Google Sheets (gspread) Client
+In-process stand-in for gspread.Client / Spreadsheet / Worksheet covering the
+calls the PIM makes, with per-call latency, call counting and an optional
+per-minute quota that raises like the real 429 RESOURCE_EXHAUSTED
+"""
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict, List, Any, Optional, Callable
+
+_A1_PATTERN = re.compile(r'^([A-Za-z]+)(\d+)$')
+
+
+class FakeSheetsQuotaError(Exception):
+    """Raised when the simulated read/write quota is exhausted (HTTP 429)"""
+
+    code = 429
+
+
+class FakeCell:
+    def __init__(self, row: int, col: int, value: str):
+        self.row = row
+        self.col = col
+        self.value = value
+
+
+def a1_to_rowcol(label: str) -> tuple:
+    """'B3' -> (3, 2)"""
+    match = _A1_PATTERN.match(label.split('!')[-1].strip())
+    if not match:
+        raise ValueError(f"Unsupported A1 notation: {label}")
+    letters, row = match.groups()
+    col = 0
+    for char in letters.upper():
+        col = col * 26 + (ord(char) - ord('A') + 1)
+    return int(row), col
+
+
+class _CallTracker:
+    """Shared latency, call counting and quota for one fake client"""
+
+    def __init__(self, latency_ms: float, quota_per_minute: Optional[int]):
+        self.latency_ms = latency_ms
+        self.quota_per_minute = quota_per_minute
+        self.calls: Counter = Counter()
+        self.quota_errors = 0
+        self._window: deque = deque()
+        self._lock = threading.Lock()
+
+    def record(self, name: str):
+        with self._lock:
+            self.calls[name] += 1
+            if self.quota_per_minute:
+                now = time.monotonic()
+                while self._window and now - self._window[0] > 60:
+                    self._window.popleft()
+                if len(self._window) >= self.quota_per_minute:
+                    self.quota_errors += 1
+                    raise FakeSheetsQuotaError(
+                        f"APIError: [429]: Quota exceeded for quota metric 'Read requests' ({name})")
+                self._window.append(now)
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+
+class FakeWorksheet:
+    """Grid of string cells; row 1 is the header row"""
+
+    def __init__(self, title: str, rows: List[List[str]], tracker: _CallTracker, sheet_id: int = 0):
+        self.title = title
+        self.id = sheet_id
+        self._rows = [list(row) for row in rows]
+        self._tracker = tracker
+        self._lock = threading.Lock()
+
+    @property
+    def row_count(self) -> int:
+        return len(self._rows)
+
+    def _set(self, row: int, col: int, value: Any):
+        while len(self._rows) < row:
+            self._rows.append([])
+        target = self._rows[row - 1]
+        while len(target) < col:
+            target.append('')
+        target[col - 1] = '' if value is None else str(value)
+
+    def _write_block(self, range_name: str, values: List[List[Any]]):
+        start_row, start_col = a1_to_rowcol(range_name.split(':')[0])
+        for r, row_values in enumerate(values):
+            for c, value in enumerate(row_values):
+                self._set(start_row + r, start_col + c, value)
+
+    def get_all_values(self) -> List[List[str]]:
+        self._tracker.record('get_all_values')
+        with self._lock:
+            width = max((len(row) for row in self._rows), default=0)
+            return [row + [''] * (width - len(row)) for row in self._rows]
+
+    def get_all_records(self) -> List[Dict[str, str]]:
+        self._tracker.record('get_all_records')
+        with self._lock:
+            if not self._rows:
+                return []
+            headers = self._rows[0]
+            return [{h: (row[i] if i < len(row) else '') for i, h in enumerate(headers)} for row in self._rows[1:]]
+
+    def row_values(self, row: int) -> List[str]:
+        self._tracker.record('row_values')
+        with self._lock:
+            return list(self._rows[row - 1]) if row <= len(self._rows) else []
+
+    def col_values(self, col: int) -> List[str]:
+        self._tracker.record('col_values')
+        with self._lock:
+            values = [row[col - 1] if col <= len(row) else '' for row in self._rows]
+        # Like the Sheets API, trailing empty cells are dropped
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def cell(self, row: int, col: int) -> FakeCell:
+        self._tracker.record('cell')
+        with self._lock:
+            values = self._rows[row - 1] if row <= len(self._rows) else []
+            return FakeCell(row, col, values[col - 1] if col <= len(values) else '')
+
+    def update_cell(self, row: int, col: int, value: Any):
+        self._tracker.record('update_cell')
+        with self._lock:
+            self._set(row, col, value)
+
+    def update(self, range_name: str, values: List[List[Any]] = None, **kwargs):
+        self._tracker.record('update')
+        with self._lock:
+            self._write_block(range_name, values or [])
+
+    def batch_update(self, data: List[Dict[str, Any]], **kwargs):
+        self._tracker.record('batch_update')
+        with self._lock:
+            for entry in data:
+                self._write_block(entry['range'], entry['values'])
+
+    def append_row(self, values: List[Any], **kwargs):
+        self._tracker.record('append_row')
+        with self._lock:
+            self._rows.append(['' if v is None else str(v) for v in values])
+
+    def append_rows(self, values: List[List[Any]], **kwargs):
+        self._tracker.record('append_rows')
+        with self._lock:
+            for row in values:
+                self._rows.append(['' if v is None else str(v) for v in row])
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None):
+        self._tracker.record('delete_rows')
+        with self._lock:
+            del self._rows[start_index - 1:(end_index or start_index)]
+
+    def clear(self):
+        self._tracker.record('clear')
+        with self._lock:
+            self._rows = []
+
+    def _delete_dimension(self, start_index: int, end_index: int):
+        """0-based, end-exclusive row delete used by Spreadsheet.batch_update"""
+        with self._lock:
+            del self._rows[start_index:end_index]
+
+
+class FakeSpreadsheet:
+    def __init__(self, key: str, tracker: _CallTracker, row_factory: Callable[[str], List[List[str]]]):
+        self.id = key
+        self._tracker = tracker
+        self._row_factory = row_factory
+        self._worksheets: Dict[str, FakeWorksheet] = {}
+        self._lock = threading.Lock()
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._tracker.record('worksheet')
+        with self._lock:
+            if title not in self._worksheets:
+                self._worksheets[title] = FakeWorksheet(title, self._row_factory(title), self._tracker,
+                                                        sheet_id=len(self._worksheets))
+            return self._worksheets[title]
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._tracker.record('worksheets')
+        return list(self._worksheets.values())
+
+    def get_worksheet(self, index: int) -> Optional[FakeWorksheet]:
+        worksheets = self.worksheets()
+        return worksheets[index] if index < len(worksheets) else None
+
+    def batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Supports deleteDimension (ROWS) requests; other request types are counted only"""
+        self._tracker.record('spreadsheet.batch_update')
+        sheets = {sheet.id: sheet for sheet in self._worksheets.values()}
+        # Apply row deletes bottom-up so earlier indexes stay valid
+        deletes = [r['deleteDimension']['range'] for r in body.get('requests', []) if 'deleteDimension' in r]
+        for rng in sorted(deletes, key=lambda r: r['startIndex'], reverse=True):
+            sheet = sheets.get(rng.get('sheetId', 0))
+            if sheet is not None:
+                sheet._delete_dimension(rng['startIndex'], rng['endIndex'])
+        return {'spreadsheetId': self.id, 'replies': [{} for _ in body.get('requests', [])]}
+
+
+class FakeGspreadClient:
+    """
+    Drop-in for the authorized gspread client held in SheetsManager.gc
+
+    Usage:
+        client = FakeGspreadClient(row_factory=lambda title: rows, latency_ms=120)
+        manager.gc = client
+        ...
+        client.stats()  # {'requests': 14, 'by_call': {'get_all_values': 3, ...}}
+    """
+
+    def __init__(self, row_factory: Optional[Callable[[str], List[List[str]]]] = None,
+                 latency_ms: float = 0, quota_per_minute: Optional[int] = None):
+        """
+        Args:
+            row_factory: Returns the initial rows (header first) for a new worksheet title
+            latency_ms: Simulated round-trip per API call
+            quota_per_minute: Raise FakeSheetsQuotaError past this many calls per minute
+        """
+        self._tracker = _CallTracker(latency_ms, quota_per_minute)
+        self._row_factory = row_factory or (lambda title: [])
+        self._spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self._lock = threading.Lock()
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self._tracker.record('open_by_key')
+        with self._lock:
+            if key not in self._spreadsheets:
+                self._spreadsheets[key] = FakeSpreadsheet(key, self._tracker, self._row_factory)
+            return self._spreadsheets[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'requests': sum(self._tracker.calls.values()),
+            'quota_errors': self._tracker.quota_errors,
+            'by_call': dict(self._tracker.calls),
+        }
+
+    def reset_stats(self):
+        self._tracker.calls.clear()
+        self._tracker.quota_errors = 0
+
+
+def rows_from_column_mapping(column_mapping: Dict[str, int], count: int,
+                             make_product: Callable[[int], Dict[str, Any]]) -> List[List[str]]:
+    """
+    Build worksheet rows (header + ``count`` products) laid out by a collection's column_mapping
+
+    Args:
+        column_mapping: field -> 1-based column index
+        count: Number of product rows
+        make_product: Returns the field values for product i
+    """
+    width = max(column_mapping.values())
+    header = [''] * width
+    for field, col in column_mapping.items():
+        header[col - 1] = field
+
+    rows = [header]
+    for i in range(count):
+        row = [''] * width
+        for field, value in make_product(i).items():
+            col = column_mapping.get(field)
+            if col:
+                row[col - 1] = '' if value is None else str(value)
+        rows.append(row)
+    return rows
@@ -0,0 +1,174 @@
+"""
+Fake Shopify Admin API
+REST products/images endpoints with a leaky-bucket call limit
+(X-Shopify-Shop-Api-Call-Limit, 429 + Retry-After when the bucket is full)
+and a GraphQL endpoint reporting cost-based throttle status
+"""
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from benchmarks.fakes.base import FakeHTTPServer, FakeResponse, split_path
+
+
+class LeakyBucket:
+    """Shopify-style leaky bucket: ``size`` slots draining at ``leak_rate`` per second"""
+
+    def __init__(self, size: float, leak_rate: float):
+        self.size = size
+        self.leak_rate = leak_rate
+        self.level = 0.0
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, amount: float = 1.0) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.level = max(0.0, self.level - (now - self._updated) * self.leak_rate)
+            self._updated = now
+            if self.level + amount > self.size:
+                return False
+            self.level += amount
+            return True
+
+    @property
+    def available(self) -> float:
+        with self._lock:
+            return self.size - self.level
+
+
+class FakeShopifyServer(FakeHTTPServer):
+    """
+    In-memory Shopify store served over localhost
+
+    Products are seeded with ids 1000.. and a single image each. REST calls
+    drain a 40-request bucket at 2/s (Shopify standard plan); GraphQL queries
+    spend ``graphql_cost`` points from a 1000-point bucket restoring 50/s.
+    """
+
+    name = 'shopify'
+
+    def __init__(self, product_count: int = 100, bucket_size: int = 40, leak_rate: float = 2.0,
+                 graphql_cost: int = 10, **kwargs):
+        super().__init__(**kwargs)
+        self.rest_bucket = LeakyBucket(bucket_size, leak_rate)
+        self.graphql_bucket = LeakyBucket(1000, 50)
+        self.graphql_cost = graphql_cost
+        self.products: Dict[int, Dict[str, Any]] = {}
+        self._next_image_id = 1
+        for i in range(product_count):
+            product_id = 1000 + i
+            self.products[product_id] = {
+                'id': product_id,
+                'title': f"Benchmark Product {i}",
+                'status': 'active',
+                'variants': [{'id': 50000 + i, 'sku': f"BENCH-{i:05d}", 'price': '199.00'}],
+                'images': [self._new_image(product_id, f"https://cdn.example.com/{product_id}/original.jpg")],
+            }
+
+    def _new_image(self, product_id: int, src: str, alt: str = '') -> Dict[str, Any]:
+        image = {'id': self._next_image_id, 'product_id': product_id, 'src': src, 'alt': alt}
+        self._next_image_id += 1
+        return image
+
+    def route_name(self, path: str) -> str:
+        parts = split_path(path)
+        return '/'.join(':id' if part.isdigit() else part for part in parts[3:]) or path
+
+    def _rest_headers(self) -> Dict[str, str]:
+        used = int(self.rest_bucket.size - self.rest_bucket.available)
+        return {'X-Shopify-Shop-Api-Call-Limit': f"{used}/{int(self.rest_bucket.size)}"}
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any, headers) -> FakeResponse:
+        parts = split_path(path)
+        if len(parts) < 4 or parts[:2] != ('admin', 'api'):
+            return FakeResponse(404, {'errors': 'Not Found'})
+        resource = parts[3:]
+
+        if resource == ('graphql',):
+            return self._graphql(body or {})
+
+        if not self.rest_bucket.take():
+            with self._lock:
+                self.throttled += 1
+            return FakeResponse(429, {'errors': 'Exceeded 2 calls per second for api client. Reduce request rates to resume uninterrupted service.'},
+                                headers={'Retry-After': '1.0', **self._rest_headers()})
+
+        with self._lock:
+            response = self._rest(method, resource, query, body or {})
+        response.headers.update(self._rest_headers())
+        return response
+
+    def _rest(self, method: str, resource: tuple, query: Dict[str, str], body: Dict[str, Any]) -> FakeResponse:
+        if resource == ('shop',):
+            return FakeResponse(200, {'shop': {'name': 'Benchmark Shop'}})
+
+        if resource == ('products',) and method == 'GET':
+            limit = min(int(query.get('limit', 50)), 250)
+            since_id = int(query.get('since_id', 0))
+            page = [p for pid, p in sorted(self.products.items()) if pid > since_id][:limit]
+            return FakeResponse(200, {'products': page})
+
+        if len(resource) >= 2 and resource[0] == 'products' and resource[1].isdigit():
+            product = self.products.get(int(resource[1]))
+            if product is None:
+                return FakeResponse(404, {'errors': 'Not Found'})
+
+            if len(resource) == 2:
+                if method == 'GET':
+                    return FakeResponse(200, {'product': product})
+                if method == 'PUT':
+                    product.update({k: v for k, v in body.get('product', {}).items() if k != 'id'})
+                    return FakeResponse(200, {'product': product})
+                if method == 'DELETE':
+                    del self.products[product['id']]
+                    return FakeResponse(200, {})
+
+            if resource[2:] == ('images',):
+                if method == 'GET':
+                    return FakeResponse(200, {'images': product['images']})
+                if method == 'POST':
+                    image_data = body.get('image', {})
+                    image = self._new_image(product['id'], image_data.get('src', ''), image_data.get('alt', ''))
+                    product['images'].append(image)
+                    return FakeResponse(201, {'image': image})
+
+        return FakeResponse(404, {'errors': 'Not Found'})
+
+    def _graphql(self, body: Dict[str, Any]) -> FakeResponse:
+        cost = self.graphql_cost
+        throttled = not self.graphql_bucket.take(cost)
+        extensions = {'cost': {
+            'requestedQueryCost': cost,
+            'actualQueryCost': None if throttled else cost,
+            'throttleStatus': {
+                'maximumAvailable': self.graphql_bucket.size,
+                'currentlyAvailable': int(self.graphql_bucket.available),
+                'restoreRate': self.graphql_bucket.leak_rate,
+            },
+        }}
+        if throttled:
+            with self._lock:
+                self.throttled += 1
+            return FakeResponse(200, {'errors': [{'message': 'Throttled', 'extensions': {'code': 'THROTTLED'}}],
+                                      'extensions': extensions})
+
+        first = int((body.get('variables') or {}).get('first', 50))
+        with self._lock:
+            nodes: List[Dict[str, Any]] = [
+                {'id': f"gid://shopify/Product/{p['id']}", 'title': p['title'], 'status': p['status'].upper()}
+                for _, p in sorted(self.products.items())[:first]
+            ]
+        return FakeResponse(200, {'data': {'products': {'nodes': nodes, 'pageInfo': {'hasNextPage': False}}},
+                                  'extensions': extensions})
+
+    def seed_rows(self, count: Optional[int] = None) -> Dict[int, Dict[str, Any]]:
+        """Sheet-style product rows pointing at seeded Shopify products, for bulk_sync_images"""
+        rows = {}
+        for row_num, product_id in enumerate(sorted(self.products)[:count], start=2):
+            rows[row_num] = {
+                'shopify_id': str(product_id),
+                'title': self.products[product_id]['title'],
+                'image_url': f"https://cdn.example.com/{product_id}/new.jpg",
+            }
+        return rows
@@ -0,0 +1,105 @@
+"""
+Fake Supplier Website
+Serves product pages (/products/<sku>), text-only spec sheet PDFs
+(/specs/<sku>.pdf) and accepts Apps Script style webhook POSTs (/webhook)
+"""
+from typing import Dict, Any, List
+
+from benchmarks.fakes.base import FakeHTTPServer, FakeResponse
+
+PRODUCT_PAGE = """<!DOCTYPE html>
+<html><head><title>{sku} Benchmark Sink</title></head>
+<body>
+  <h1 class="product-title">{sku} Benchmark Undermount Sink</h1>
+  <div class="price">$499.00</div>
+  <div class="description"><p>Premium 1.2mm stainless steel sink with sound dampening.</p></div>
+  <table class="specifications">
+    <tr><th>Length</th><td>800mm</td></tr>
+    <tr><th>Width</th><td>450mm</td></tr>
+    <tr><th>Bowl Depth</th><td>200mm</td></tr>
+    <tr><th>Material</th><td>Stainless Steel</td></tr>
+    <tr><th>Warranty</th><td>10 Years</td></tr>
+  </table>
+  <a class="spec-sheet" href="/specs/{sku}.pdf">Download Specification Sheet</a>
+  <img src="/images/{sku}.jpg" alt="{sku}">
+{padding}
+</body></html>
+"""
+
+
+def _minimal_pdf(text: str) -> bytes:
+    """Single-page PDF containing ``text`` (enough for text-layer PDF extraction)"""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode('latin-1')
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R "
+        b"/Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    pdf = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_at = len(pdf)
+    pdf += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        pdf += f"{offset:010d} 00000 n \n".encode()
+    pdf += f"trailer << /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_at}\n%%EOF\n".encode()
+    return pdf
+
+
+class FakeSupplierSite(FakeHTTPServer):
+    """Supplier product pages and spec sheets for scraping/extraction benchmarks"""
+
+    name = 'supplier'
+
+    def __init__(self, page_padding_kb: int = 40, **kwargs):
+        """
+        Args:
+            page_padding_kb: Filler markup appended to each page, to model real page weight
+        """
+        super().__init__(**kwargs)
+        self.padding = '<div class="footer-nav">' + ('<a href="/c">Category</a>' * (page_padding_kb * 40)) + '</div>'
+        self.webhooks = 0
+        self.webhook_payloads: List[Dict[str, Any]] = []
+
+    def route_name(self, path: str) -> str:
+        return '/' + path.strip('/').split('/')[0]
+
+    def product_url(self, sku: str) -> str:
+        return f"{self.url}/products/{sku}"
+
+    def spec_sheet_url(self, sku: str) -> str:
+        return f"{self.url}/specs/{sku}.pdf"
+
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any, headers) -> FakeResponse:
+        parts = [part for part in path.split('/') if part]
+        if len(parts) == 2 and parts[0] == 'products':
+            return FakeResponse(200, PRODUCT_PAGE.format(sku=parts[1], padding=self.padding),
+                                content_type='text/html; charset=utf-8')
+        if len(parts) == 2 and parts[0] == 'specs':
+            sku = parts[1].rsplit('.', 1)[0]
+            text = f"{sku} Length 800mm Width 450mm Bowl Depth 200mm Material Stainless Steel"
+            return FakeResponse(200, _minimal_pdf(text), content_type='application/pdf')
+        if parts == ['webhook'] and method == 'POST':
+            with self._lock:
+                self.webhooks += 1
+                self.webhook_payloads.append(body if isinstance(body, dict) else {})
+            return FakeResponse(200, {'success': True})
+        return FakeResponse(404, 'Not Found', content_type='text/plain')
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats['webhooks'] = self.webhooks
+            stats['webhook_rows'] = sum(len(p.get('row_numbers') or [p.get('row_number')]) for p in self.webhook_payloads)
+        return stats
+
+    def reset_stats(self):
+        super().reset_stats()
+        with self._lock:
+            self.webhooks = 0
+            self.webhook_payloads = []
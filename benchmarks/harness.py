@@ -0,0 +1,209 @@
+"""
+Benchmark Harness
+Starts the fake services, points the app's managers at them and isolates all
+caches/databases in a temp directory so a benchmark never touches production data
+"""
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import ExitStack
+from typing import Dict, List, Any, Optional
+
+from benchmarks.fakes import (
+    FakeGspreadClient, FakeShopifyServer, FakeOpenAIServer, FakeSupplierSite,
+    redirect_requests, rows_from_column_mapping,
+)
+
+
+class RecordingSocketIO:
+    """Stand-in for flask_socketio.SocketIO that records emits"""
+
+    def __init__(self, done_event: Optional[str] = None):
+        self.events: List[tuple] = []
+        self.done = threading.Event()
+        self.done_event = done_event
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, data: Any = None, **kwargs):
+        with self._lock:
+            self.events.append((event, data))
+        if event == self.done_event:
+            self.done.set()
+
+    def last(self, event: str) -> Any:
+        with self._lock:
+            for name, data in reversed(self.events):
+                if name == event:
+                    return data
+        return None
+
+
+class Timer:
+    """Collects per-operation latencies"""
+
+    def __init__(self):
+        self.samples: List[float] = []
+
+    def time(self, fn, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            self.samples.append(time.perf_counter() - start)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {}
+        ordered = sorted(self.samples)
+        return {
+            'count': len(ordered),
+            'p50_ms': round(statistics.median(ordered) * 1000, 1),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            'max_ms': round(ordered[-1] * 1000, 1),
+            'total_s': round(sum(ordered), 3),
+        }
+
+
+class BenchmarkEnvironment:
+    """
+    Fake Sheets/Shopify/OpenAI/supplier backends wired into the app for one run
+
+    Usage:
+        with BenchmarkEnvironment(products=200, openai_latency_ms=400) as env:
+            sheets = env.sheets_manager()
+            ...
+            env.service_stats()
+    """
+
+    def __init__(self, products: int = 100, collection: str = 'sinks',
+                 sheets_latency_ms: float = 150, shopify_latency_ms: float = 80,
+                 openai_latency_ms: float = 800, openai_error_rate: float = 0.0,
+                 supplier_latency_ms: float = 120, seed: int = 42):
+        self.products = products
+        self.collection = collection
+        self.sheets = FakeGspreadClient(row_factory=self._rows_for_worksheet, latency_ms=sheets_latency_ms)
+        self.shopify = FakeShopifyServer(product_count=products, latency_ms=shopify_latency_ms, seed=seed)
+        self.openai = FakeOpenAIServer(latency_ms=openai_latency_ms, error_rate=openai_error_rate, seed=seed)
+        self.supplier = FakeSupplierSite(latency_ms=supplier_latency_ms, seed=seed)
+        self.temp_dir: Optional[str] = None
+        self._stack: Optional[ExitStack] = None
+        self._restore: List[tuple] = []
+        self._saved_env: Dict[str, Optional[str]] = {}
+
+    def _rows_for_worksheet(self, title: str) -> List[List[str]]:
+        from config.collections import get_collection_config
+
+        config = get_collection_config(self.collection)
+
+        def make_product(i: int) -> Dict[str, Any]:
+            sku = f"BENCH-{i:05d}"
+            return {
+                'variant_sku': sku,
+                'title': f"Benchmark Product {i}",
+                'url': self.supplier.product_url(sku),
+                'shopify_spec_sheet': self.supplier.spec_sheet_url(sku),
+                'vendor': 'Benchmark',
+            }
+
+        return rows_from_column_mapping(config.column_mapping, self.products, make_product)
+
+    def _patch(self, target, name: str, value):
+        self._restore.append((target, name, getattr(target, name)))
+        setattr(target, name, value)
+
+    def _set_env(self, **values):
+        for key, value in values.items():
+            self._saved_env.setdefault(key, os.environ.get(key))
+            os.environ[key] = value
+
+    def __enter__(self) -> 'BenchmarkEnvironment':
+        self.temp_dir = tempfile.mkdtemp(prefix='pim-bench-')
+        self._stack = ExitStack()
+        for server in (self.shopify, self.openai, self.supplier):
+            self._stack.enter_context(server)
+
+        self._set_env(
+            OPENAI_API_KEY='sk-benchmark',
+            OPENAI_BASE_URL=f"{self.openai.url}/v1",
+            SHOPIFY_SHOP_URL='benchmark-shop.myshopify.com',
+            SHOPIFY_ACCESS_TOKEN='shpat_benchmark',
+        )
+        # Hard-coded production hosts are rewritten to the fakes
+        self._stack.enter_context(redirect_requests({
+            'api.openai.com': self.openai.url,
+            '*.myshopify.com': self.shopify.url,
+        }))
+
+        import core.db_cache as db_cache_module
+        from core.db_cache import DatabaseCache
+        from core.sheets_manager import SheetsManager, get_sheets_manager
+
+        self._patch(db_cache_module, '_db_cache', DatabaseCache(os.path.join(self.temp_dir, 'pim_cache.db')))
+
+        # Any SheetsManager created during the run (e.g. per-thread writers) gets the fake client
+        fake_client = self.sheets
+
+        def setup_credentials(manager):
+            manager.gc = fake_client
+            return True
+
+        self._patch(SheetsManager, 'setup_credentials', setup_credentials)
+        manager = get_sheets_manager()
+        self._patch(manager, 'gc', fake_client)
+        self._patch(manager, '_spreadsheet_cache', {})
+
+        # Apps Script cleaning triggers go to the supplier site's webhook stub
+        from core.google_apps_script_manager import google_apps_script_manager
+        webhook_url = f"{self.supplier.url}/webhook"
+        self._patch(google_apps_script_manager, 'script_configs', {
+            name: {**config, 'webhook_url': webhook_url}
+            for name, config in google_apps_script_manager.script_configs.items()
+        })
+        self._invalidate_memory_cache()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._invalidate_memory_cache()
+        for target, name, value in reversed(self._restore):
+            setattr(target, name, value)
+        self._restore = []
+        for key, value in self._saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._saved_env = {}
+        self._stack.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _invalidate_memory_cache(self):
+        from core.cache_manager import cache_manager
+        cache_manager.invalidate('products', self.collection)
+
+    def patch(self, target, name: str, value):
+        """Temporarily replace ``target.name`` until the environment exits"""
+        self._patch(target, name, value)
+
+    def path(self, name: str) -> str:
+        """File path inside the run's temp directory"""
+        return os.path.join(self.temp_dir, name)
+
+    def sheets_manager(self):
+        from core.sheets_manager import get_sheets_manager
+        return get_sheets_manager()
+
+    def reset_stats(self):
+        self.sheets.reset_stats()
+        for server in (self.shopify, self.openai, self.supplier):
+            server.reset_stats()
+
+    def service_stats(self) -> Dict[str, Any]:
+        return {
+            'sheets': self.sheets.stats(),
+            'shopify': self.shopify.stats(),
+            'openai': self.openai.stats(),
+            'supplier': self.supplier.stats(),
+        }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+HTML Compaction Benchmark
+
+Compares the prompt content AI extraction used to send (scripts/styles
+stripped, sliced to HTML_MAX_LENGTH characters) with core.html_compactor
+output on a corpus of saved product pages. Reports tokens per page and spec
+recall: the share of spec table/definition list values that survive into
+the prompt.
+
+Pages are read from --corpus (every *.html file; save supplier pages there
+with "Save page as... HTML only"). Without a corpus, synthetic pages are
+generated that put a 50KB+ mega menu ahead of the spec table, which is the
+failure mode character truncation has on real supplier sites.
+
+Usage:
+    python -m benchmarks.html_compaction
+    python -m benchmarks.html_compaction --corpus ~/saved_pages --max-tokens 6000
+    python -m benchmarks.html_compaction --output benchmarks/results/compaction.json
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+from typing import Dict, List, Any, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from bs4 import BeautifulSoup
+
+from core.html_compactor import compact_html, count_tokens
+
+LEGACY_MAX_LENGTH = 50000
+DEFAULT_MAX_TOKENS = 8000
+DEFAULT_MODEL = 'gpt-4o'
+
+SYNTHETIC_PAGE = """<!DOCTYPE html>
+<html><head><title>{sku} Undermount Sink | Supplier</title>
+<style>{css}</style>
+<script type="application/ld+json">{{"@context":"https://schema.org","@type":"Product","name":"{sku} Undermount Sink","brand":{{"@type":"Brand","name":"Benchmark"}},"sku":"{sku}"}}</script>
+<script>{js}</script>
+</head>
+<body>
+<div class="announcement-bar">Free delivery on orders over $500</div>
+<header class="site-header"><nav class="mega-menu">{menu}</nav></header>
+<div class="breadcrumbs"><a href="/">Home</a> / <a href="/kitchen">Kitchen</a> / <a href="/kitchen/sinks">Sinks</a></div>
+<main>
+  <h1>{sku} Undermount Sink</h1>
+  <div class="price">$499.00</div>
+  <div class="description"><p>Premium 1.2mm stainless steel sink with sound dampening pads and a satin finish.</p></div>
+  {reviews}
+  <table class="specifications">
+    <tr><th>Overall Width</th><td>810mm</td></tr>
+    <tr><th>Overall Depth</th><td>455mm</td></tr>
+    <tr><th>Bowl Depth</th><td>205mm</td></tr>
+    <tr><th>Material</th><td>Stainless Steel</td></tr>
+    <tr><th>Grade</th><td>304</td></tr>
+    <tr><th>Installation</th><td>Undermount</td></tr>
+    <tr><th>Warranty</th><td>25 Years</td></tr>
+  </table>
+  <dl class="features"><dt>Overflow</dt><dd>Yes</dd><dt>Min Cabinet Size</dt><dd>900mm</dd></dl>
+  <a href="/specs/{sku}.pdf">Specification Sheet</a>
+  <img src="/images/{sku}-front.jpg" alt="{sku} front">
+</main>
+<footer class="site-footer">{footer}</footer>
+</body></html>
+"""
+
+
+def synthetic_corpus(count: int = 5) -> List[Tuple[str, str]]:
+    """Nav-heavy product pages with the spec table after the mega menu"""
+    pages = []
+    for i in range(count):
+        sku = f"SYN-{i:03d}"
+        menu = ''.join(
+            f'<div class="menu-column"><h4>Category {c}</h4><ul>'
+            + ''.join(f'<li><a href="/c/{c}/{j}">Subcategory {c}-{j} products</a></li>' for j in range(40))
+            + '</ul></div>'
+            for c in range(12 + i * 4)
+        )
+        reviews = ''.join(
+            '<div class="review"><p>Great sink, easy to install and the finish looks fantastic in our kitchen.</p></div>'
+            for _ in range(10)
+        )
+        footer = ''.join(f'<a href="/info/{j}">Information page {j}</a>' for j in range(60))
+        pages.append((f"synthetic/{sku}.html", SYNTHETIC_PAGE.format(
+            sku=sku, css='.x{color:red}' * 500, js='var a=1;' * 2000, menu=menu, reviews=reviews, footer=footer
+        )))
+    return pages
+
+
+def load_corpus(corpus_dir: str) -> List[Tuple[str, str]]:
+    pages = []
+    for path in sorted(glob.glob(os.path.join(corpus_dir, '*.html'))):
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            pages.append((os.path.basename(path), f.read()))
+    return pages
+
+
+def legacy_content(html: str, max_length: int = LEGACY_MAX_LENGTH) -> str:
+    """Prompt content as extract_product_data built it before compaction"""
+    if len(html) <= max_length:
+        return html
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return str(soup)[:max_length] + "...[truncated]"
+
+
+def spec_values(html: str) -> List[str]:
+    """Values from 2-column spec tables and definition lists, the data extraction most needs"""
+    soup = BeautifulSoup(html, 'html.parser')
+    values = []
+    for row in soup.find_all('tr'):
+        cells = row.find_all(['th', 'td'])
+        if len(cells) == 2 and cells[1].get_text(strip=True):
+            values.append(cells[1].get_text(' ', strip=True))
+    values.extend(dd.get_text(' ', strip=True) for dd in soup.find_all('dd') if dd.get_text(strip=True))
+    return values
+
+
+def recall(values: List[str], content: str) -> float:
+    if not values:
+        return 1.0
+    return sum(1 for v in values if v in content) / len(values)
+
+
+def run(pages: List[Tuple[str, str]], max_tokens: int, model: str) -> Dict[str, Any]:
+    results = []
+    for name, html in pages:
+        values = spec_values(html)
+        legacy = legacy_content(html)
+        compacted = compact_html(html, max_tokens=max_tokens, model=model)
+        results.append({
+            'page': name,
+            'html_chars': len(html),
+            'legacy_tokens': count_tokens(legacy, model),
+            'compact_tokens': compacted.tokens,
+            'legacy_spec_recall': round(recall(values, legacy), 3),
+            'compact_spec_recall': round(recall(values, compacted.text), 3),
+            'spec_values': len(values),
+        })
+
+    legacy_total = sum(r['legacy_tokens'] for r in results)
+    compact_total = sum(r['compact_tokens'] for r in results)
+    return {
+        'model': model,
+        'max_tokens': max_tokens,
+        'pages': results,
+        'summary': {
+            'pages': len(results),
+            'legacy_tokens': legacy_total,
+            'compact_tokens': compact_total,
+            'token_reduction_pct': round((1 - compact_total / legacy_total) * 100, 1) if legacy_total else 0.0,
+            'legacy_spec_recall': round(sum(r['legacy_spec_recall'] for r in results) / max(1, len(results)), 3),
+            'compact_spec_recall': round(sum(r['compact_spec_recall'] for r in results) / max(1, len(results)), 3),
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure prompt tokens and spec recall of HTML compaction')
+    parser.add_argument('--corpus', help='Directory of saved product pages (*.html); default: synthetic pages')
+    parser.add_argument('--max-tokens', type=int, default=DEFAULT_MAX_TOKENS, help='Compaction token budget')
+    parser.add_argument('--model', default=DEFAULT_MODEL, help='Model whose tokenizer is used (default: gpt-4o)')
+    parser.add_argument('--output', help='Write the full results as JSON')
+    args = parser.parse_args()
+
+    pages = load_corpus(args.corpus) if args.corpus else synthetic_corpus()
+    if not pages:
+        print(f"❌ No *.html pages found in {args.corpus}")
+        sys.exit(1)
+
+    report = run(pages, args.max_tokens, args.model)
+
+    print("=" * 70)
+    print("  HTML Compaction Benchmark")
+    print("=" * 70)
+    print(f"  {'page':<32} {'legacy tok':>10} {'compact tok':>11} {'recall':>13}")
+    for r in report['pages']:
+        print(f"  {r['page'][:32]:<32} {r['legacy_tokens']:>10} {r['compact_tokens']:>11} "
+              f"{r['legacy_spec_recall']:>5.0%} -> {r['compact_spec_recall']:<4.0%}")
+    summary = report['summary']
+    print(f"\n  Total: {summary['legacy_tokens']} -> {summary['compact_tokens']} tokens "
+          f"({summary['token_reduction_pct']}% fewer), spec recall "
+          f"{summary['legacy_spec_recall']:.0%} -> {summary['compact_spec_recall']:.0%}")
+
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
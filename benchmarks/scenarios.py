@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Benchmarks
+
+Runs the real pipelines against local fake Google Sheets, Shopify, OpenAI and
+supplier-site backends and writes the results as JSON, so throughput can be
+compared across commits without touching production services.
+
+Scenarios:
+    paginated       api_get_products_paginated (cold sheet load, then warm pages)
+    shopify_images  ShopifyManager.bulk_sync_images
+    bulk_extraction run_bulk_extraction_background (via the bulk-extract-pdfs route)
+    wip             process_wip_products_background (fast mode)
+
+Usage:
+    python -m benchmarks.scenarios
+    python -m benchmarks.scenarios --scenario shopify_images --products 50
+    python -m benchmarks.scenarios --compare benchmarks/results/20261018-120000-b6f965f.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import logging
+import subprocess
+from datetime import datetime
+from typing import Dict, Any, Callable
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks.harness import BenchmarkEnvironment, RecordingSocketIO, Timer
+
+RESULTS_DIR = os.path.join(REPO_ROOT, 'benchmarks', 'results')
+
+# Metrics where a higher value is better; everything else is treated as lower-is-better
+HIGHER_IS_BETTER = {'items_per_second'}
+
+
+def bench_paginated(env: BenchmarkEnvironment, pages: int = 5, limit: int = 50) -> Dict[str, Any]:
+    """GET /api/<collection>/products/paginated: one forced refresh, then cached pages"""
+    import flask_app
+    from pathlib import Path
+
+    env.patch(flask_app, 'CACHE_DIR', Path(env.path('file_cache')))
+    flask_app.CACHE_DIR.mkdir(exist_ok=True)
+    client = flask_app.app.test_client()
+    base = f"/api/{env.collection}/products/paginated"
+
+    cold = Timer()
+    response = cold.time(client.get, f"{base}?page=1&limit={limit}&force_refresh=true")
+    if response.status_code != 200:
+        raise RuntimeError(f"paginated request failed: {response.status_code} {response.get_data(as_text=True)[:200]}")
+
+    warm = Timer()
+    for page in range(1, pages + 1):
+        warm.time(client.get, f"{base}?page={page}&limit={limit}")
+
+    return {
+        'items': pages * limit,
+        'cold': cold.summary(),
+        'warm': warm.summary(),
+        'wall_seconds': round(cold.summary()['total_s'] + warm.summary()['total_s'], 3),
+    }
+
+
+def bench_shopify_images(env: BenchmarkEnvironment) -> Dict[str, Any]:
+    """ShopifyManager.bulk_sync_images over every seeded product"""
+    from core.shopify_manager import ShopifyManager
+
+    manager = ShopifyManager()
+    rows = env.shopify.seed_rows()
+
+    start = time.perf_counter()
+    results = manager.bulk_sync_images(rows)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'items': len(rows),
+        'wall_seconds': round(elapsed, 3),
+        'successful': results['successful'],
+        'failed': results['failed'],
+        'skipped': results['skipped'],
+    }
+
+
+def bench_bulk_extraction(env: BenchmarkEnvironment, timeout: float = 1800) -> Dict[str, Any]:
+    """POST /api/<collection>/bulk-extract-pdfs and wait for pdf_extraction_complete"""
+    from flask import Flask
+    from routes.bulk_pdf_extraction import setup_bulk_pdf_routes
+
+    app = Flask('benchmark_bulk_extraction')
+    socketio = RecordingSocketIO(done_event='pdf_extraction_complete')
+    setup_bulk_pdf_routes(app, env.sheets_manager(), socketio)
+
+    start = time.perf_counter()
+    response = app.test_client().post(f"/api/{env.collection}/bulk-extract-pdfs",
+                                      json={'overwrite': True, 'delay_seconds': 0})
+    if response.status_code != 200:
+        raise RuntimeError(f"bulk extraction did not start: {response.get_data(as_text=True)[:200]}")
+    if not socketio.done.wait(timeout):
+        raise RuntimeError(f"bulk extraction did not finish within {timeout}s")
+    elapsed = time.perf_counter() - start
+
+    results = socketio.last('pdf_extraction_complete') or {}
+    return {
+        'items': results.get('total', 0),
+        'wall_seconds': round(elapsed, 3),
+        'succeeded': results.get('succeeded', 0),
+        'failed': results.get('failed', 0),
+    }
+
+
+def bench_wip(env: BenchmarkEnvironment, count: int = 3) -> Dict[str, Any]:
+    """process_wip_products_background in fast mode for ``count`` new supplier products"""
+    from core.supplier_db import SupplierDatabase
+    from core.data_processor import get_data_processor
+    from core.google_apps_script_manager import google_apps_script_manager
+    from core.wip_background_processor import process_wip_products_background
+
+    supplier_db = SupplierDatabase(env.path('supplier_products.db'))
+    wip_ids = []
+    for i in range(count):
+        sku = f"WIP-{i:05d}"
+        product_id = supplier_db.add_manual_product(sku, env.supplier.product_url(sku), f"WIP Product {i}")
+        wip_ids.append(supplier_db.add_to_wip(product_id, env.collection))
+
+    progress = []
+    start = time.perf_counter()
+    process_wip_products_background(
+        job_id='benchmark',
+        wip_ids=wip_ids,
+        collection_name=env.collection,
+        progress_callback=lambda job_id, update: progress.append(update),
+        supplier_db=supplier_db,
+        sheets_manager=env.sheets_manager(),
+        data_processor=get_data_processor(),
+        google_apps_script_manager=google_apps_script_manager,
+        fast_mode=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    return {
+        'items': count,
+        'wall_seconds': round(elapsed, 3),
+        'succeeded': sum(1 for p in progress if p.get('success')),
+        'failed': sum(1 for p in progress if not p.get('success')),
+    }
+
+
+SCENARIOS: Dict[str, Callable[..., Dict[str, Any]]] = {
+    'paginated': bench_paginated,
+    'shopify_images': bench_shopify_images,
+    'bulk_extraction': bench_bulk_extraction,
+    'wip': bench_wip,
+}
+
+
+def run_scenario(name: str, args) -> Dict[str, Any]:
+    """Run one scenario in a fresh environment and attach service call counts"""
+    with BenchmarkEnvironment(
+        products=args.products,
+        collection=args.collection,
+        sheets_latency_ms=args.sheets_latency_ms,
+        shopify_latency_ms=args.shopify_latency_ms,
+        openai_latency_ms=args.openai_latency_ms,
+        openai_error_rate=args.openai_error_rate,
+    ) as env:
+        env.reset_stats()
+        kwargs = {'count': args.wip_count} if name == 'wip' else {}
+        try:
+            result = SCENARIOS[name](env, **kwargs)
+            result['status'] = 'ok'
+        except Exception as e:
+            logging.getLogger(__name__).exception(f"Scenario {name} failed")
+            result = {'status': 'error', 'error': str(e)}
+
+        if result.get('items') and result.get('wall_seconds'):
+            result['items_per_second'] = round(result['items'] / result['wall_seconds'], 3)
+        result['services'] = env.service_stats()
+        return result
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True).stdout.strip() or 'unknown'
+    except OSError:
+        return 'unknown'
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]):
+    """Print per-scenario deltas against a previous results file"""
+    print(f"\nComparison vs {baseline.get('commit', '?')} ({baseline.get('timestamp', '?')}):")
+    for name, result in current['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if not previous or result.get('status') != 'ok' or previous.get('status') != 'ok':
+            print(f"  {name:<16} (no comparable baseline)")
+            continue
+        for metric in ('wall_seconds', 'items_per_second'):
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            better = change > 0 if metric in HIGHER_IS_BETTER else change < 0
+            marker = '✅' if better else ('⚠️ ' if abs(change) >= 10 else '  ')
+            print(f"  {marker} {name:<16} {metric:<17} {old:>10} -> {new:<10} ({change:+.1f}%)")
+        for service in ('sheets', 'shopify', 'openai'):
+            old = previous.get('services', {}).get(service, {}).get('requests')
+            new = result.get('services', {}).get(service, {}).get('requests')
+            if old is not None and new is not None and old != new:
+                print(f"     {name:<16} {service + ' requests':<17} {old:>10} -> {new}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run end-to-end pipeline benchmarks against fake services')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Scenario to run (repeatable; default: all)')
+    parser.add_argument('--collection', default='sinks', help='Collection to benchmark (default: sinks)')
+    parser.add_argument('--products', type=int, default=100, help='Seeded products per fake backend (default: 100)')
+    parser.add_argument('--wip-count', type=int, default=3,
+                        help='WIP products to process (default: 3; the processor sleeps 20s between products)')
+    parser.add_argument('--sheets-latency-ms', type=float, default=150)
+    parser.add_argument('--shopify-latency-ms', type=float, default=80)
+    parser.add_argument('--openai-latency-ms', type=float, default=800)
+    parser.add_argument('--openai-error-rate', type=float, default=0.0,
+                        help='Fraction of OpenAI calls answered with 429 (default: 0)')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/<timestamp>-<commit>.json)')
+    parser.add_argument('--compare', help='Previous results file to compare against')
+    parser.add_argument('--verbose', action='store_true', help='Show application logs')
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING)
+
+    print("=" * 70)
+    print("  End-to-End Pipeline Benchmarks")
+    print("=" * 70)
+
+    report = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'config': {k: v for k, v in vars(args).items() if k not in ('output', 'compare', 'verbose', 'scenario')},
+        'scenarios': {},
+    }
+
+    for name in args.scenario or list(SCENARIOS):
+        print(f"\n▶ {name} ...")
+        result = run_scenario(name, args)
+        report['scenarios'][name] = result
+        if result['status'] == 'ok':
+            services = result['services']
+            print(f"  {result.get('items', 0)} items in {result['wall_seconds']}s "
+                  f"({result.get('items_per_second', 0)} items/s) | "
+                  f"sheets {services['sheets']['requests']}, shopify {services['shopify']['requests']} "
+                  f"({services['shopify']['throttled']} throttled), openai {services['openai']['requests']} requests")
+        else:
+            print(f"  ❌ {result['error']}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(report, json.load(f))
+
+    if any(r['status'] != 'ok' for r in report['scenarios'].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
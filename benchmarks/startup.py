@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Startup Import-Time Benchmark
+
+Imports the app in a fresh interpreter with ``python -X importtime`` and fails
+if total import time exceeds the budget, regresses past a saved baseline, or
+if any heavy SDK is imported during startup (they should load on first use).
+
+Usage:
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 1500
+    python -m benchmarks.startup --save-baseline benchmarks/startup_baseline.json
+    python -m benchmarks.startup --baseline benchmarks/startup_baseline.json --max-regression 0.2
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from typing import Dict, List, Any
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SDKs that must not be imported while the app module loads
+HEAVY_MODULES = ['gspread', 'googleapiclient', 'openai', 'pandas', 'cv2', 'numpy', 'firebase_admin']
+
+DEFAULT_BUDGET_MS = 2500
+
+
+def measure_import(module: str = 'flask_app', runs: int = 3) -> Dict[str, Any]:
+    """
+    Import ``module`` in fresh interpreters and parse -X importtime output
+
+    Returns the best (lowest) run: total_ms, top-level entries, heavy modules seen.
+    """
+    best = None
+
+    for _ in range(max(1, runs)):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+        top_level: List[Dict[str, Any]] = []
+        loaded = set()
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            # "import time:  <self us> | <cumulative us> | <indented module name>"
+            try:
+                self_field, cumulative_field, raw_name = line.split(':', 1)[1].split('|', 2)
+                self_us = int(self_field)
+                cumulative_us = int(cumulative_field)
+            except ValueError:
+                continue
+
+            package = raw_name.strip()
+            loaded.add(package.split('.')[0])
+            # Top-level imports have exactly one space after the separator
+            if not raw_name.startswith('  '):
+                top_level.append({'module': package, 'self_us': self_us, 'cumulative_us': cumulative_us})
+
+        total_ms = sum(entry['cumulative_us'] for entry in top_level) / 1000
+        result = {
+            'module': module,
+            'total_ms': round(total_ms, 1),
+            'top_level': sorted(top_level, key=lambda e: e['cumulative_us'], reverse=True),
+            'heavy_loaded': sorted(m for m in HEAVY_MODULES if m in loaded),
+        }
+        if best is None or result['total_ms'] < best['total_ms']:
+            best = result
+
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check app startup import time against a budget')
+    parser.add_argument('--module', default='flask_app',
+                        help='Module to import (default: flask_app)')
+    parser.add_argument('--runs', type=int, default=3,
+                        help='Fresh-interpreter runs; the fastest is reported (default: 3)')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help=f'Fail if total import time exceeds this (default: {DEFAULT_BUDGET_MS})')
+    parser.add_argument('--baseline', help='JSON file from --save-baseline to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.25,
+                        help='Allowed slowdown vs baseline as a fraction (default: 0.25)')
+    parser.add_argument('--save-baseline', help='Write this run to a JSON baseline file')
+    parser.add_argument('--allow-heavy', action='store_true',
+                        help='Do not fail when heavy SDKs are imported at startup')
+    parser.add_argument('--top', type=int, default=15,
+                        help='Number of slowest top-level imports to show (default: 15)')
+
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("  Startup Import-Time Benchmark")
+    print("=" * 70)
+
+    result = measure_import(args.module, args.runs)
+
+    print(f"\nimport {result['module']}: {result['total_ms']:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    print(f"\nSlowest top-level imports:")
+    for entry in result['top_level'][:args.top]:
+        print(f"  {entry['cumulative_us'] / 1000:>8.1f} ms  {entry['module']}")
+
+    failures = []
+
+    if result['total_ms'] > args.budget_ms:
+        failures.append(f"total {result['total_ms']:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+
+    if result['heavy_loaded']:
+        print(f"\nHeavy SDKs imported at startup: {', '.join(result['heavy_loaded'])}")
+        if not args.allow_heavy:
+            failures.append(f"heavy SDKs imported at startup: {', '.join(result['heavy_loaded'])}")
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        limit = baseline['total_ms'] * (1 + args.max_regression)
+        change = (result['total_ms'] - baseline['total_ms']) / baseline['total_ms'] * 100
+        print(f"\nBaseline: {baseline['total_ms']:.1f} ms ({change:+.1f}%)")
+        if result['total_ms'] > limit:
+            failures.append(f"regressed {change:+.1f}% vs baseline (limit +{args.max_regression * 100:.0f}%)")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'module': result['module'], 'total_ms': result['total_ms'],
+                       'heavy_loaded': result['heavy_loaded']}, f, indent=2)
+        print(f"\nSaved baseline to {args.save_baseline}")
+
+    if failures:
+        print("\nFAIL:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+
+    print("\nPASS")
+
+
+if __name__ == "__main__":
+    main()
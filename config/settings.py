@@ -7,6 +7,8 @@ import os
 import json
 from pathlib import Path
 
+from config.ai_performance_settings import AI_PERFORMANCE_CONFIG
+
 class Settings:
     """Main application settings with Shopify integration and ChatGPT support"""
 
@@ -55,6 +57,22 @@ class Settings:
         # Reduced default delay from 2.0s to 0.5s for faster processing with parallel workers
         self.AI_DELAY_BETWEEN_REQUESTS = float(os.environ.get('AI_DELAY_BETWEEN_REQUESTS', '0.5'))
         self.SHEETS_DELAY_BETWEEN_REQUESTS = float(os.environ.get('SHEETS_DELAY_BETWEEN_REQUESTS', '0.5'))
+        self.AI_CONTENT_WORKERS = int(os.environ.get('AI_CONTENT_WORKERS', '5'))
+        self.CONTENT_WRITE_BATCH_SIZE = int(os.environ.get('CONTENT_WRITE_BATCH_SIZE', '20'))
+
+        # Competitor title research: concurrent retailer searches, cached per brand + model
+        self.COMPETITOR_SEARCH_WORKERS = int(os.environ.get('COMPETITOR_SEARCH_WORKERS', '7'))
+        self.COMPETITOR_TITLE_CACHE_TTL_DAYS = float(os.environ.get('COMPETITOR_TITLE_CACHE_TTL_DAYS', '30'))
+
+        # Batch FAQ generation: products per structured-output request and concurrent requests
+        self.FAQ_BATCH_SIZE = int(os.environ.get('FAQ_BATCH_SIZE', '5'))
+        self.FAQ_BATCH_WORKERS = int(os.environ.get('FAQ_BATCH_WORKERS', '4'))
+        self.FAQ_BATCH_MODEL = os.environ.get('FAQ_BATCH_MODEL', AI_PERFORMANCE_CONFIG['CHATGPT_MODEL_FAST'])
+        # Output token cap of FAQ_BATCH_MODEL (gpt-4o-mini: 16,384); batch requests never ask for more
+        self.FAQ_BATCH_MAX_TOKENS = int(os.environ.get('FAQ_BATCH_MAX_TOKENS', '16384'))
+
+        # Concurrent og:image fetches for the background supplier image job
+        self.SUPPLIER_IMAGE_WORKERS = int(os.environ.get('SUPPLIER_IMAGE_WORKERS', '8'))
 
         # ChatGPT-specific environment variables
         self.CHATGPT_MODEL = os.environ.get('CHATGPT_MODEL', 'gpt-4')
@@ -186,6 +204,13 @@ class Settings:
             'OPENAI_DESCRIPTION_MAX_TOKENS': int(os.environ.get('OPENAI_DESCRIPTION_MAX_TOKENS', '200')),
             'OPENAI_DESCRIPTION_TEMPERATURE': float(os.environ.get('OPENAI_DESCRIPTION_TEMPERATURE', '0.7')),
             'HTML_MAX_LENGTH': int(os.environ.get('HTML_MAX_LENGTH', '50000')),
+            'HTML_MAX_TOKENS': int(os.environ.get('HTML_MAX_TOKENS', '8000')),  # Compacted page content budget per extraction prompt
+            # Structured-first extraction: JSON-LD/spec tables/Shopify JSON before the LLM
+            'STRUCTURED_EXTRACTION_ENABLED': os.environ.get('STRUCTURED_EXTRACTION_ENABLED', 'true').lower() == 'true',
+            # Model cascade: fast model first, escalate low-confidence fields to OPENAI_MODEL/CHATGPT_MODEL
+            'MODEL_ROUTING_ENABLED': os.environ.get('MODEL_ROUTING_ENABLED', 'true').lower() == 'true',
+            'ROUTER_FAST_MODEL': os.environ.get('ROUTER_FAST_MODEL', AI_PERFORMANCE_CONFIG['CHATGPT_MODEL_FAST']),
+            'ROUTER_ESCALATION_THRESHOLD': float(os.environ.get('ROUTER_ESCALATION_THRESHOLD', '0.5')),
             'USER_AGENT': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
         }
 
@@ -236,7 +261,9 @@ class Settings:
             'TAPS_WEBHOOK_URL': os.getenv('GOOGLE_SCRIPTS_TAPS_WEBHOOK_URL'),
             'LIGHTING_WEBHOOK_URL': os.getenv('GOOGLE_SCRIPTS_LIGHTING_WEBHOOK_URL'),
             'ENABLED': os.getenv('GOOGLE_SCRIPTS_ENABLED', 'false').lower() == 'true',
-            'AUTO_TRIGGER': os.getenv('GOOGLE_SCRIPTS_AUTO_TRIGGER', 'true').lower() == 'true'
+            'AUTO_TRIGGER': os.getenv('GOOGLE_SCRIPTS_AUTO_TRIGGER', 'true').lower() == 'true',
+            # Triggers for the same collection within this window go out as one webhook call
+            'DEBOUNCE_SECONDS': float(os.getenv('GOOGLE_SCRIPTS_DEBOUNCE_SECONDS', '0.5'))
         }
 
     def setup_feature_flags(self):
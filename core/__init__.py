@@ -1,9 +1,31 @@
-from .sheets_manager import get_sheets_manager
-from .ai_extractor import get_ai_extractor
-from .data_processor import get_data_processor
+"""
+Core Package
+Exports are resolved lazily (PEP 562) so importing a light module such as
+core.supplier_db does not pull in gspread, googleapiclient or openai
+"""
+import importlib
+
+_LAZY_EXPORTS = {
+    'get_sheets_manager': '.sheets_manager',
+    'get_ai_extractor': '.ai_extractor',
+    'get_data_processor': '.data_processor',
+}
 
 __all__ = [
     'get_sheets_manager',
-    'get_ai_extractor', 
+    'get_ai_extractor',
     'get_data_processor'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals().keys()) + list(_LAZY_EXPORTS.keys()))
@@ -11,6 +11,8 @@ import time
 import asyncio
 import aiohttp
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Any, Optional
 import requests
 from bs4 import BeautifulSoup
@@ -20,6 +22,10 @@ from urllib.parse import urljoin, urlparse
 from config.settings import get_settings
 from config.collections import get_collection_config, CollectionConfig
 from core.google_apps_script_manager import google_apps_script_manager
+from core.extraction_planner import get_extraction_planner
+from core.html_compactor import compact_html, fit_to_token_budget
+from core.model_router import get_model_router
+from core.competitor_title_cache import get_competitor_title_cache, normalize_research_key
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +42,7 @@ class AIExtractor:
 
         # Rate limiting for ChatGPT
         self.last_chatgpt_request = 0
+        self._chatgpt_rate_lock = threading.Lock()
         self.chatgpt_min_interval = getattr(self.settings, 'CHATGPT_MIN_REQUEST_INTERVAL', 0.1)
 
         # Collection-specific prompts (your existing ones)
@@ -1279,103 +1286,143 @@ Format the output as clear, structured text with all measurements and specificat
             return None
 
         prompt = prompt_builder(url)
-        
-        # Truncate HTML content if too long
-        max_length = self.settings.API_CONFIG['HTML_MAX_LENGTH']
-        if len(html_content) > max_length:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            # Remove script and style tags
-            for script in soup(["script", "style"]):
-                script.decompose()
-            html_content = str(soup)[:max_length] + "...[truncated]"
 
         # Detect if content is from PDF or HTML
         # PDF content will contain page markers like "=== Page X ==="
         is_pdf = "=== Page" in html_content
-        content_label = "PDF Content:" if is_pdf else "HTML Content:"
+        content_label = "PDF Content:" if is_pdf else "Page Content:"
+
+        # Run the cheap structured extractors first, on the full page before compaction;
+        # the LLM is only asked for what they could not fill
+        planner = get_extraction_planner()
+        plan = None
+        if not is_pdf and self.settings.API_CONFIG['STRUCTURED_EXTRACTION_ENABLED']:
+            plan = planner.plan(collection_name, html_content, url)
+
+        # Compact pages to their main content (spec tables as "label: value" lines) and
+        # fit the prompt content to the token budget; PDF text only needs the budget
+        model = self.settings.API_CONFIG['OPENAI_MODEL']
+        max_tokens = self.settings.API_CONFIG['HTML_MAX_TOKENS']
+        if is_pdf:
+            page_content = fit_to_token_budget(html_content, max_tokens, model)
+        else:
+            compacted = compact_html(html_content, max_tokens=max_tokens, model=model)
+            page_content = compacted.text
+            logger.info(f"🗜️ Compacted {compacted.original_chars} chars of HTML to {compacted.tokens} tokens"
+                        f"{' (truncated to budget)' if compacted.truncated else ''}")
+
+        if plan and plan.skip_llm:
+            planner.record_llm_skipped(plan, prompt + page_content)
+            filtered_data = dict(plan.structured_data)
+            self._attach_ai_images(collection_name, filtered_data, html_content, url)
+            logger.info(f"✅ Structured extraction successful for {collection_name}: {len(filtered_data)} fields extracted")
+            return filtered_data
+
+        if plan and plan.structured_data:
+            logger.info(f"🎯 Asking AI only for {len(plan.missing_fields)} missing fields: {plan.missing_fields}")
+            prompt = plan.narrow_prompt(prompt)
+        planner.record_llm_call(plan)
+
+        request_body = {
+            'model': self.settings.API_CONFIG['OPENAI_MODEL'],
+            'messages': [
+                {'role': 'user', 'content': prompt + "\n\n" + content_label + "\n" + page_content}
+            ],
+            'max_tokens': self.settings.API_CONFIG['OPENAI_MAX_TOKENS'],
+            'temperature': self.settings.API_CONFIG['OPENAI_TEMPERATURE']
+        }
 
         try:
-            response = requests.post(
-                'https://api.openai.com/v1/chat/completions',
-                headers={
-                    'Content-Type': 'application/json',
-                    'Authorization': f'Bearer {self.api_key}',
-                },
-                json={
-                    'model': self.settings.API_CONFIG['OPENAI_MODEL'],
-                    'messages': [
-                        {'role': 'user', 'content': prompt + "\n\n" + content_label + "\n" + html_content}
-                    ],
-                    'max_tokens': self.settings.API_CONFIG['OPENAI_MAX_TOKENS'],
-                    'temperature': self.settings.API_CONFIG['OPENAI_TEMPERATURE']
-                },
-                timeout=self.settings.AI_REQUEST_TIMEOUT
-            )
-            
-            response.raise_for_status()
-            result = response.json()
-            
-            if 'choices' in result and result['choices']:
-                text = result['choices'][0]['message']['content'].strip()
-                
-                try:
-                    extracted_data = json.loads(text)
-                    # Filter to only include allowed AI extraction fields
-                    filtered_data = self._filter_extracted_fields(collection_name, extracted_data)
-                    
-                    # Add AI-powered image extraction with comma-separated format
-                    config = get_collection_config(collection_name)
-                    if hasattr(config, 'extract_images') and config.extract_images:
-                        logger.info(f"🖼️ Starting AI image extraction for {url}")
-                        
-                        # Build product context for AI
-                        product_context = self._build_product_context_for_images(filtered_data)
-                        
-                        # Extract images using AI
-                        image_urls = self.extract_product_images_with_ai(html_content, url, product_context)
-
-                        if image_urls:
-                            # Join all images into comma-separated string (not JSON array)
-                            # Format: "url1, url2, url3" (clean, readable format)
-                            combined_images = ', '.join(image_urls)
-
-                            # Map to single shopify_images field (Column AT)
-                            if 'shopify_images' in config.ai_extraction_fields:
-                                filtered_data['shopify_images'] = combined_images
-                                logger.info(f"✅ AI extracted {len(image_urls)} product images → Column AT (comma-separated)")
-                            else:
-                                logger.warning("shopify_images not in ai_extraction_fields")
-                        else:
-                            logger.warning(f"⚠️ No product images identified by AI for {url}")
+            if self.settings.API_CONFIG['MODEL_ROUTING_ENABLED']:
+                # Fast model first; low-confidence and missing fields are re-asked of OPENAI_MODEL
+                requested_fields = plan.missing_fields if plan else planner.scored_fields(get_collection_config(collection_name))
+                extracted_data = get_model_router().route_extraction(
+                    collection_name, request_body, lambda text: self._parse_extraction_json(collection_name, text),
+                    requested_fields=requested_fields
+                )
+            else:
+                response = requests.post(
+                    'https://api.openai.com/v1/chat/completions',
+                    headers={
+                        'Content-Type': 'application/json',
+                        'Authorization': f'Bearer {self.api_key}',
+                    },
+                    json=request_body,
+                    timeout=self.settings.AI_REQUEST_TIMEOUT
+                )
 
-                    logger.info(f"✅ AI extraction successful for {collection_name}: {len(filtered_data)} fields extracted")
-                    return filtered_data
-                    
-                except json.JSONDecodeError:
-                    # Try to extract JSON from the response
-                    json_match = re.search(r'\{.*\}', text, re.DOTALL)
-                    if json_match:
-                        try:
-                            extracted_data = json.loads(json_match.group())
-                            filtered_data = self._filter_extracted_fields(collection_name, extracted_data)
-
-                            logger.info(f"✅ AI extraction successful (recovered JSON) for {collection_name}: {len(filtered_data)} fields")
-                            logger.info(f"🔍 EXTRACTED DATA: {json.dumps(filtered_data, indent=2)}")
-                            return filtered_data
-                        except json.JSONDecodeError:
-                            pass
-                    
-                    logger.error(f"❌ Could not parse JSON from AI response for {collection_name}")
-                    logger.error(f"AI response text (first 1000 chars): {text[:1000]}")
+                response.raise_for_status()
+                result = response.json()
+
+                if not result.get('choices'):
+                    logger.error(f"❌ No valid response from OpenAI API for {collection_name}")
                     return None
-            else:
-                logger.error(f"❌ No valid response from OpenAI API for {collection_name}")
+                text = result['choices'][0]['message']['content'].strip()
+                extracted_data = self._parse_extraction_json(collection_name, text)
+
+            if extracted_data is None:
                 return None
-                
+
+            # Filter to only include allowed AI extraction fields
+            filtered_data = self._filter_extracted_fields(collection_name, extracted_data)
+            if plan:
+                filtered_data = plan.merge(filtered_data)
+
+            # Add AI-powered image extraction with comma-separated format
+            self._attach_ai_images(collection_name, filtered_data, html_content, url)
+
+            logger.info(f"✅ AI extraction successful for {collection_name}: {len(filtered_data)} fields extracted")
+            return filtered_data
+
         except Exception as e:
             logger.error(f"❌ AI extraction error for {collection_name}: {e}")
             return None
     
+    def _parse_extraction_json(self, collection_name: str, text: str) -> Optional[Dict[str, Any]]:
+        """Parse an extraction response as JSON, recovering an embedded object if needed"""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            json_match = re.search(r'\{.*\}', text, re.DOTALL)
+            try:
+                data = json.loads(json_match.group()) if json_match else None
+            except json.JSONDecodeError:
+                data = None
+
+        if not isinstance(data, dict):
+            logger.error(f"❌ Could not parse JSON from AI response for {collection_name}")
+            logger.error(f"AI response text (first 1000 chars): {text[:1000]}")
+            return None
+        return data
+    
+    def _attach_ai_images(self, collection_name: str, filtered_data: Dict[str, Any], html_content: str, url: str):
+        """Add AI-identified product images to extracted data (comma-separated) if the collection extracts images"""
+        config = get_collection_config(collection_name)
+        if not (hasattr(config, 'extract_images') and config.extract_images):
+            return
+
+        logger.info(f"🖼️ Starting AI image extraction for {url}")
+        
+        # Build product context for AI
+        product_context = self._build_product_context_for_images(filtered_data)
+        
+        # Extract images using AI
+        image_urls = self.extract_product_images_with_ai(html_content, url, product_context)
+
+        if image_urls:
+            # Join all images into comma-separated string (not JSON array)
+            # Format: "url1, url2, url3" (clean, readable format)
+            combined_images = ', '.join(image_urls)
+
+            # Map to single shopify_images field (Column AT)
+            if 'shopify_images' in config.ai_extraction_fields:
+                filtered_data['shopify_images'] = combined_images
+                logger.info(f"✅ AI extracted {len(image_urls)} product images → Column AT (comma-separated)")
+            else:
+                logger.warning("shopify_images not in ai_extraction_fields")
+        else:
+            logger.warning(f"⚠️ No product images identified by AI for {url}")
+    
     def _build_product_context_for_images(self, extracted_data: Dict[str, Any]) -> str:
         """Build product context string for AI image analysis"""
         context_parts = []
@@ -2231,32 +2278,11 @@ RESPONSE FORMAT (valid JSON only):
             logger.error("❌ No OpenAI API key configured")
             return None
         
-        # Get collection-specific description prompt
-        prompt_builder = self.description_prompts.get(collection_name)
-        if not prompt_builder:
-            logger.error(f"❌ No description prompt defined for collection: {collection_name}")
-            return None
-        
         try:
-            # Build description prompt based on product data
-            prompt = prompt_builder(product_data)
-            
-            # Optionally add URL content for richer context
-            additional_context = ""
-            if use_url_content and url:
-                logger.debug(f"🌐 Fetching URL content for richer description context: {url}")
-                html_content = self.fetch_html(url)
-                if html_content:
-                    # Extract key product info from HTML
-                    soup = BeautifulSoup(html_content, 'html.parser')
-                    # Remove scripts and styles
-                    for script in soup(["script", "style"]):
-                        script.decompose()
-                    
-                    # Get relevant text content (first 2000 chars)
-                    text_content = soup.get_text()[:600]
-                    additional_context = f"\n\nAdditional context from product page:\n{text_content}"
-            
+            request_body = self._description_request_body(collection_name, product_data, url, use_url_content)
+            if not request_body:
+                return None
+
             # Make API call
             response = requests.post(
                 'https://api.openai.com/v1/chat/completions',
@@ -2264,17 +2290,7 @@ RESPONSE FORMAT (valid JSON only):
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}',
                 },
-                json={
-                    'model': self.settings.API_CONFIG['OPENAI_DESCRIPTION_MODEL'],
-                    'messages': [
-                        {
-                            'role': 'user',
-                            'content': prompt + additional_context
-                        }
-                    ],
-                    'max_tokens': self.settings.API_CONFIG.get('OPENAI_DESCRIPTION_MAX_TOKENS', 800),  # Increased for JSON output
-                    'temperature': self.settings.API_CONFIG['OPENAI_DESCRIPTION_TEMPERATURE']
-                },
+                json=request_body,
                 timeout=self.settings.AI_REQUEST_TIMEOUT
             )
 
@@ -2283,36 +2299,7 @@ RESPONSE FORMAT (valid JSON only):
 
             if 'choices' in result and result['choices']:
                 raw_content = result['choices'][0]['message']['content'].strip()
-
-                # Try to parse as JSON for new structured format
-                try:
-                    # Remove markdown code fences if present
-                    if raw_content.startswith('```'):
-                        raw_content = raw_content.split('```')[1]
-                        if raw_content.startswith('json'):
-                            raw_content = raw_content[4:]
-
-                    description_data = json.loads(raw_content)
-
-                    # Validate expected structure
-                    if isinstance(description_data, dict) and 'short_summary' in description_data:
-                        logger.info(f"✅ Generated structured description for {collection_name}")
-                        logger.info(f"   Summary: {description_data['short_summary'][:80]}...")
-                        logger.info(f"   Features: {len(description_data.get('features', []))} items")
-                        logger.info(f"   Specs HTML: {len(description_data.get('specs_html', ''))} chars")
-                        return description_data
-                    else:
-                        # Fallback: treat as plain text description
-                        logger.warning("⚠️ AI returned JSON but not in expected format, using short_summary as plain text")
-                        description = description_data.get('short_summary', raw_content)
-                        return self._clean_description(description)
-
-                except json.JSONDecodeError:
-                    # Fallback: treat as plain text description (backward compatibility)
-                    logger.warning("⚠️ AI did not return JSON, treating as plain text description")
-                    description = self._clean_description(raw_content)
-                    logger.info(f"✅ Generated plain text description for {collection_name}: {description[:100]}...")
-                    return description
+                return self._parse_description_content(raw_content, collection_name)
             else:
                 logger.error(f"❌ No description generated from API response for {collection_name}")
                 return None
@@ -2320,6 +2307,78 @@ RESPONSE FORMAT (valid JSON only):
         except Exception as e:
             logger.error(f"❌ Description generation error for {collection_name}: {e}")
             return None
+
+    def _description_request_body(self, collection_name: str, product_data: Dict[str, Any],
+                                  url: Optional[str] = None, use_url_content: bool = False) -> Optional[Dict[str, Any]]:
+        """Chat completions payload for a description (shared with batch mode)"""
+        # Get collection-specific description prompt
+        prompt_builder = self.description_prompts.get(collection_name)
+        if not prompt_builder:
+            logger.error(f"❌ No description prompt defined for collection: {collection_name}")
+            return None
+
+        # Build description prompt based on product data
+        prompt = prompt_builder(product_data)
+        
+        # Optionally add URL content for richer context
+        additional_context = ""
+        if use_url_content and url:
+            logger.debug(f"🌐 Fetching URL content for richer description context: {url}")
+            html_content = self.fetch_html(url)
+            if html_content:
+                # Extract key product info from HTML
+                soup = BeautifulSoup(html_content, 'html.parser')
+                # Remove scripts and styles
+                for script in soup(["script", "style"]):
+                    script.decompose()
+                
+                # Get relevant text content (first 2000 chars)
+                text_content = soup.get_text()[:600]
+                additional_context = f"\n\nAdditional context from product page:\n{text_content}"
+
+        return {
+            'model': self.settings.API_CONFIG['OPENAI_DESCRIPTION_MODEL'],
+            'messages': [
+                {
+                    'role': 'user',
+                    'content': prompt + additional_context
+                }
+            ],
+            'max_tokens': self.settings.API_CONFIG.get('OPENAI_DESCRIPTION_MAX_TOKENS', 800),  # Increased for JSON output
+            'temperature': self.settings.API_CONFIG['OPENAI_DESCRIPTION_TEMPERATURE']
+        }
+
+    def _parse_description_content(self, raw_content: str, collection_name: str):
+        """Parse a description reply: structured JSON dict, or cleaned plain text"""
+        # Try to parse as JSON for new structured format
+        try:
+            # Remove markdown code fences if present
+            if raw_content.startswith('```'):
+                raw_content = raw_content.split('```')[1]
+                if raw_content.startswith('json'):
+                    raw_content = raw_content[4:]
+
+            description_data = json.loads(raw_content)
+
+            # Validate expected structure
+            if isinstance(description_data, dict) and 'short_summary' in description_data:
+                logger.info(f"✅ Generated structured description for {collection_name}")
+                logger.info(f"   Summary: {description_data['short_summary'][:80]}...")
+                logger.info(f"   Features: {len(description_data.get('features', []))} items")
+                logger.info(f"   Specs HTML: {len(description_data.get('specs_html', ''))} chars")
+                return description_data
+            else:
+                # Fallback: treat as plain text description
+                logger.warning("⚠️ AI returned JSON but not in expected format, using short_summary as plain text")
+                description = description_data.get('short_summary', raw_content)
+                return self._clean_description(description)
+
+        except json.JSONDecodeError:
+            # Fallback: treat as plain text description (backward compatibility)
+            logger.warning("⚠️ AI did not return JSON, treating as plain text description")
+            description = self._clean_description(raw_content)
+            logger.info(f"✅ Generated plain text description for {collection_name}: {description[:100]}...")
+            return description
     
     def generate_product_content(self, collection_name: str, product_data: Dict[str, Any], 
                                url: Optional[str] = None, use_url_content: bool = False,
@@ -2374,6 +2433,55 @@ RESPONSE FORMAT (valid JSON only):
             logger.error(f"Error in generate_product_content: {e}")
             return {}
     
+    def build_content_batch_requests(self, collection_name: str, product_data: Dict[str, Any],
+                                     url: Optional[str] = None, use_url_content: bool = False,
+                                     fields_to_generate: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Build the payloads generate_product_content would send, for submission via the Batch API
+        
+        Returns:
+            Dict of part name ('chatgpt' for features/care instructions, 'description') -> request body
+        """
+        if not fields_to_generate:
+            fields_to_generate = ['description', 'features', 'care_instructions']
+        
+        bodies = {}
+        chatgpt_fields = [f for f in fields_to_generate if f in ['features', 'care_instructions']]
+        if chatgpt_fields:
+            context = self._prepare_product_context(product_data, url, use_url_content)
+            prompt = self._build_chatgpt_prompt(collection_name, context, chatgpt_fields)
+            bodies['chatgpt'] = self._chatgpt_request_body(prompt)
+        
+        if 'description' in fields_to_generate:
+            description_body = self._description_request_body(collection_name, product_data, url, use_url_content)
+            if description_body:
+                bodies['description'] = description_body
+        
+        return bodies
+    
+    def parse_content_batch_results(self, collection_name: str, contents: Dict[str, Optional[str]],
+                                    fields_to_generate: List[str], max_feature_words: int = 10) -> Dict[str, Any]:
+        """
+        Turn Batch API replies (part name -> message content) into generated content,
+        with the same parsing and feature validation as the synchronous path
+        """
+        results = {}
+        
+        chatgpt_fields = [f for f in fields_to_generate if f in ['features', 'care_instructions']]
+        if chatgpt_fields and contents.get('chatgpt'):
+            parsed_results = self._parse_chatgpt_response(contents['chatgpt'], chatgpt_fields)
+            if parsed_results.get('features'):
+                count_validated_features = self._validate_feature_count(parsed_results['features'], target_count=5)
+                parsed_results['features'] = self._validate_feature_length(count_validated_features, max_feature_words)
+            results.update(parsed_results)
+        
+        if 'description' in fields_to_generate and contents.get('description'):
+            description = self._parse_description_content(contents['description'], collection_name)
+            if description:
+                results['description'] = description
+        
+        return results
+    
     def _generate_with_chatgpt(self, collection_name: str, product_data: Dict[str, Any],
                              url: Optional[str], use_url_content: bool, 
                              fields_to_generate: List[str], max_feature_words: int = 10) -> Dict[str, str]:
@@ -2389,8 +2497,14 @@ RESPONSE FORMAT (valid JSON only):
             # Build ChatGPT prompt
             prompt = self._build_chatgpt_prompt(collection_name, context, fields_to_generate)
             
-            # Make ChatGPT request
-            response = self._make_chatgpt_request(prompt)
+            # Make ChatGPT request (fast model first when routing is enabled)
+            if self.settings.API_CONFIG['MODEL_ROUTING_ENABLED']:
+                response = get_model_router().route_generation(
+                    self._chatgpt_request_body(prompt),
+                    accept=lambda text: len(self._parse_chatgpt_response(text, fields_to_generate)) == len(fields_to_generate)
+                )
+            else:
+                response = self._make_chatgpt_request(prompt)
             
             if not response:
                 logger.error("No response from ChatGPT")
@@ -2421,32 +2535,35 @@ RESPONSE FORMAT (valid JSON only):
             logger.error(f"Error generating with ChatGPT: {e}")
             return {}
     
+    def _chatgpt_request_body(self, prompt: str) -> Dict[str, Any]:
+        """Chat completions payload for features/care instructions (shared with batch mode)"""
+        chatgpt_model = getattr(self.settings, 'CHATGPT_MODEL', 'gpt-4o-mini')
+        return {
+            'model': chatgpt_model,
+            'messages': [
+                {
+                    "role": "system", 
+                    "content": "You are an expert product content writer specializing in creating compelling product features and detailed care instructions for sinks, taps, and lighting fixtures. Always respond in the exact JSON format requested. For features, keep each feature to 5 words or less while maintaining clarity and impact."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            'max_tokens': getattr(self.settings, 'CHATGPT_MAX_TOKENS', 1000),
+            'temperature': getattr(self.settings, 'CHATGPT_TEMPERATURE', 0.7)
+        }
+
     def _make_chatgpt_request(self, prompt: str) -> Optional[str]:
         """Make a request to ChatGPT API using your existing request structure"""
         try:
-            chatgpt_model = getattr(self.settings, 'CHATGPT_MODEL', 'gpt-4o-mini')
-            
             response = requests.post(
                 'https://api.openai.com/v1/chat/completions',
                 headers={
                     'Content-Type': 'application/json',
                     'Authorization': f'Bearer {self.api_key}',
                 },
-                json={
-                    'model': chatgpt_model,
-                    'messages': [
-                        {
-                            "role": "system", 
-                            "content": "You are an expert product content writer specializing in creating compelling product features and detailed care instructions for sinks, taps, and lighting fixtures. Always respond in the exact JSON format requested. For features, keep each feature to 5 words or less while maintaining clarity and impact."
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    'max_tokens': getattr(self.settings, 'CHATGPT_MAX_TOKENS', 1000),
-                    'temperature': getattr(self.settings, 'CHATGPT_TEMPERATURE', 0.7)
-                },
+                json=self._chatgpt_request_body(prompt),
                 timeout=self.settings.AI_REQUEST_TIMEOUT
             )
             
@@ -2712,15 +2829,20 @@ FOCUS: {collection_name.title()}
         return results
     
     def _apply_chatgpt_rate_limit(self):
-        """Apply rate limiting between ChatGPT requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_chatgpt_request
-        
-        if time_since_last < self.chatgpt_min_interval:
-            sleep_time = self.chatgpt_min_interval - time_since_last
+        """Apply rate limiting between ChatGPT requests
+
+        Safe to call from several worker threads: each caller reserves the next
+        free slot under the lock and sleeps outside it, so concurrent content
+        generation still respects chatgpt_min_interval across all threads.
+        """
+        with self._chatgpt_rate_lock:
+            current_time = time.time()
+            slot = max(current_time, self.last_chatgpt_request + self.chatgpt_min_interval)
+            self.last_chatgpt_request = slot
+
+        sleep_time = slot - current_time
+        if sleep_time > 0:
             time.sleep(sleep_time)
-        
-        self.last_chatgpt_request = time.time()
     
     def _clean_description(self, description: str) -> str:
         """Clean and format the generated description"""
@@ -4857,7 +4979,8 @@ Please provide 3 title variants in this format:
 
         return " ".join(parts) if parts else "Product Title"
 
-    def analyze_competitor_titles(self, product_data: Dict[str, Any], collection_name: str = 'sinks') -> Dict[str, Any]:
+    def analyze_competitor_titles(self, product_data: Dict[str, Any], collection_name: str = 'sinks',
+                                  offline: bool = False) -> Dict[str, Any]:
         """
         Search Google for competitor product titles and analyze naming patterns
         """
@@ -4870,7 +4993,7 @@ Please provide 3 title variants in this format:
             search_query = self._build_competitor_search_query(product_data, collection_name)
 
             # Use direct site search and Google fallback
-            competitor_data = self._search_competitor_titles(search_query, product_data)
+            competitor_data = self._search_competitor_titles(search_query, product_data, offline=offline)
 
             # No fallback - only show real ChatGPT research results
             if not competitor_data:
@@ -4989,7 +5112,8 @@ Please provide 3 title variants in this format:
         search_query = f'{" ".join(query_parts)} {retail_sites}'
         return search_query
 
-    def _search_competitor_titles(self, search_query: str, product_data: Dict[str, Any] = None) -> List[Dict]:
+    def _search_competitor_titles(self, search_query: str, product_data: Dict[str, Any] = None,
+                                  offline: bool = False) -> List[Dict]:
         """Search competitor websites for real product titles using web scraping"""
         try:
             # Get product details
@@ -5002,7 +5126,7 @@ Please provide 3 title variants in this format:
             logger.info(f"🔍 Real web search for competitor titles - SKU: {sku}, Brand: {brand_name}")
 
             # Try real web scraping first
-            scraped_results = self._scrape_competitor_sites(sku, brand_name, search_query, product_data)
+            scraped_results = self._scrape_competitor_sites(sku, brand_name, search_query, product_data, offline=offline)
             if scraped_results:
                 logger.info(f"✅ Found {len(scraped_results)} real competitor titles")
                 return scraped_results
@@ -5104,12 +5228,34 @@ Please provide 3 title variants in this format:
 
         return mock_results
 
-    def _scrape_competitor_sites(self, sku: str, brand_name: str, search_query: str, product_data: Dict = None) -> List[Dict]:
-        """Use Google Custom Search API + ChatGPT to find real competitor titles"""
+    def _scrape_competitor_sites(self, sku: str, brand_name: str, search_query: str, product_data: Dict = None,
+                                 offline: bool = False) -> List[Dict]:
+        """Use Google Custom Search API + ChatGPT to find real competitor titles
+
+        Results are cached per normalized brand + model, so a product is only
+        researched again once its cache entry is older than
+        COMPETITOR_TITLE_CACHE_TTL_DAYS. With offline=True only the cache is
+        read, whatever its age.
+        """
         try:
-            logger.info(f"🔍 Google search for competitor titles - SKU: {sku}, Brand: {brand_name}")
+            cache = get_competitor_title_cache()
+            query_key = normalize_research_key(brand_name, sku)
+            # Without a model the key would cover the whole brand
+            cacheable = not query_key.endswith('|')
+            max_age = None if offline else self.settings.COMPETITOR_TITLE_CACHE_TTL_DAYS
+            cached = cache.get(query_key, max_age_days=max_age) if cacheable else None
+            if cached is not None:
+                logger.info(f"💾 Using {len(cached)} cached competitor titles for {brand_name} {sku}")
+                return cached
+            if offline:
+                logger.info(f"📴 No cached competitor titles for {brand_name} {sku} (offline)")
+                return []
 
-            competitors = []
+            if not os.getenv('GOOGLE_API_KEY') or not os.getenv('GOOGLE_CSE_ID'):
+                logger.warning("⚠️ Google API credentials not configured, skipping search")
+                return []
+
+            logger.info(f"🔍 Google search for competitor titles - SKU: {sku}, Brand: {brand_name}")
 
             # Try each retailer using Google search
             retailers = [
@@ -5122,15 +5268,32 @@ Please provide 3 title variants in this format:
                 {'name': 'Signature Appliances', 'domain': 'signatureappliances.com.au'}
             ]
 
-            for retailer in retailers:
-                try:
-                    result = self._google_search_retailer(sku, brand_name, retailer)
+            # Retailers are independent, so search them all at once
+            results = {}
+            failed = 0
+            workers = max(1, min(len(retailers), self.settings.COMPETITOR_SEARCH_WORKERS))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(self._google_search_retailer, sku, brand_name, retailer): retailer
+                    for retailer in retailers
+                }
+                for future in as_completed(futures):
+                    retailer = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        failed += 1
+                        logger.warning(f"⚠️ {retailer['name']} Google search failed: {str(e)}")
+                        continue
                     if result:
-                        competitors.append(result)
+                        results[retailer['name']] = result
                         logger.info(f"✅ Found title at {retailer['name']}: {result['title']}")
-                except Exception as e:
-                    logger.warning(f"⚠️ {retailer['name']} Google search failed: {str(e)}")
-                    continue
+
+            competitors = [results[r['name']] for r in retailers if r['name'] in results]
+
+            # Don't cache a result with missing retailers; it would hide them until the TTL expires
+            if cacheable and not failed:
+                cache.put(query_key, brand_name, sku, competitors, len(retailers))
 
             if competitors:
                 logger.info(f"✅ Found {len(competitors)} real competitor titles via Google")
@@ -5553,14 +5716,16 @@ IMPORTANT: Only provide actual titles if you have specific knowledge about these
             logger.error(f"Error analyzing title patterns: {str(e)}")
             return {'error': str(e)}
 
-    def generate_seo_product_title_with_competitor_analysis(self, product_data: Dict[str, Any], collection_name: str = 'sinks') -> Dict[str, Any]:
+    def generate_seo_product_title_with_competitor_analysis(self, product_data: Dict[str, Any], collection_name: str = 'sinks',
+                                                            offline: bool = False) -> Dict[str, Any]:
         """
         Generate SEO-optimized product title with competitor intelligence
+        (offline=True uses only cached competitor titles, never searching)
         """
         try:
             # First, analyze competitor titles with error handling
             try:
-                competitor_analysis = self.analyze_competitor_titles(product_data, collection_name)
+                competitor_analysis = self.analyze_competitor_titles(product_data, collection_name, offline=offline)
             except Exception as comp_error:
                 logger.error(f"Error in competitor analysis: {str(comp_error)}")
                 competitor_analysis = {
@@ -5803,7 +5968,12 @@ IMPORTANT: Don't just copy competitor formats - use them to understand market te
         return [title.strip() for title in fallback_titles if title.strip()]
 
     def _google_search_retailer(self, sku: str, brand_name: str, retailer: Dict) -> Dict:
-        """Use Google Custom Search API to find products on specific retailer sites"""
+        """Use Google Custom Search API to find products on specific retailer sites
+
+        Returns None when the retailer has no match. Raises if the search
+        couldn't run, or if any query failed without a match, so callers can
+        tell "not found" apart from quota and network errors.
+        """
         try:
             # Get Google API credentials from environment
             google_api_key = os.getenv('GOOGLE_API_KEY')
@@ -5827,6 +5997,7 @@ IMPORTANT: Don't just copy competitor formats - use them to understand market te
                 f"site:{retailer['domain']} \"{brand_name}\" \"{sku}\""    # Both quoted (fallback)
             ]
 
+            last_error = None
             for query in search_queries:
                 logger.info(f"🔍 Google searching: {query}")
 
@@ -5861,10 +6032,15 @@ IMPORTANT: Don't just copy competitor formats - use them to understand market te
 
                 except Exception as search_error:
                     logger.warning(f"Google search failed for query '{query}': {str(search_error)}")
+                    last_error = search_error
                     continue
 
+            if last_error is not None:
+                raise last_error
+
         except Exception as e:
             logger.warning(f"Google search failed for {retailer['name']}: {str(e)}")
+            raise
 
         return None
 
@@ -0,0 +1,303 @@
+"""
+ML Category Predictor Service
+Serves the model trained by scripts/ml_category_predictor.py from inside the
+app: the pickled pipeline is loaded once per process on first use and
+reloaded when models/category_predictor.pkl changes on disk. Features are
+built in one pass over a batch (no DataFrame.iterrows), the model runs once
+per batch, and predictions are cached in SQLite by a hash of the model input
+so repeat lookups skip the model entirely.
+"""
+import os
+import re
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_PATH = os.path.join(PROJECT_DIR, 'models', 'category_predictor.pkl')
+
+# Must match SUPER_CATEGORY_MAP in enrich_shopify_products.py
+SUPER_CATEGORY_MAP = {
+    "Basin Tapware": "Tapware",
+    "Kitchen Tapware": "Tapware",
+    "Bath Tapware": "Tapware",
+    "Shower Tapware": "Tapware",
+    "Basins": "Basins",
+    "Toilets": "Toilets",
+    "Bidets": "Toilets",
+    "Urinals": "Toilets",
+    "Smart Toilets": "Smart Toilets",
+    "Baths": "Baths",
+    "Kitchen Sinks": "Sinks",
+    "Laundry Sinks": "Sinks",
+    "Vanities": "Furniture",
+    "Mirrors & Cabinets": "Furniture",
+    "Showers": "Showers",
+    "Shower Screens": "Showers",
+    "Bathroom Accessories": "Accessories",
+    "Kitchen Accessories": "Accessories",
+    "Boiling Water Taps": "Boiling, Chilled & Sparkling",
+    "Chilled Water Taps": "Boiling, Chilled & Sparkling",
+    "Sparkling Water Taps": "Boiling, Chilled & Sparkling",
+    "Filtered Water Systems": "Boiling, Chilled & Sparkling",
+    "Kitchen Appliances": "Appliances",
+    "Laundry Appliances": "Appliances",
+    "Hot Water Systems": "Hot Water Systems",
+    "Air Conditioning": "Heating & Cooling",
+    "Heaters": "Heating & Cooling",
+    "Ventilation": "Heating & Cooling",
+    "Outdoor Products": "Hardware & Outdoor",
+    "Drainage": "Hardware & Outdoor",
+    "Assisted Living": "Assisted Living",
+    "Aged Care": "Assisted Living",
+}
+
+# SKU suffix (usually after " - ") and dimensions like 900x500
+_SKU_SUFFIX = re.compile(r'\s*-\s*[A-Z0-9][A-Z0-9\-\./ ]*$')
+_DIMENSIONS = re.compile(r'\d+x\d+')
+
+
+def clean_title(title: str) -> str:
+    """Clean product title for feature extraction"""
+    if not title:
+        return ''
+    title = _SKU_SUFFIX.sub('', title)
+    title = _DIMENSIONS.sub('', title)
+    return title.lower().strip()
+
+
+def build_features(products) -> List[str]:
+    """
+    Model input text per product: cleaned title + vendor (twice, for emphasis) + product_type
+
+    Values are stringified the way the training script's iterrows() loop did,
+    so features match the ones the model was trained on.
+
+    Args:
+        products: DataFrame or list of dicts with title, vendor and product_type
+
+    Returns:
+        Feature strings in input order
+    """
+    if hasattr(products, 'columns'):
+        # DataFrame: column-wise string ops instead of iterrows()
+        import pandas as pd
+
+        def column(name):
+            if name in products.columns:
+                return products[name].map(str)
+            return pd.Series('', index=products.index)
+
+        titles = (column('title').str.replace(_SKU_SUFFIX, '', regex=True)
+                  .str.replace(_DIMENSIONS, '', regex=True).str.lower().str.strip())
+        vendors = column('vendor').str.lower()
+        product_types = column('product_type').str.lower()
+        return (titles + ' ' + vendors + ' ' + vendors + ' ' + product_types).tolist()
+
+    features = []
+    for product in products:
+        title = clean_title(str(product.get('title', '')))
+        vendor = str(product.get('vendor', '')).lower()
+        product_type = str(product.get('product_type', '')).lower()
+        features.append(f"{title} {vendor} {vendor} {product_type}")
+    return features
+
+
+def feature_hash(text: str) -> str:
+    """Cache key for a model input"""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+class CategoryPredictor:
+    """Process-wide category prediction over the saved model, with an SQLite prediction cache"""
+
+    def __init__(self, model_path: str = None, db_path: str = None):
+        """Initialize category predictor (the model itself loads on first prediction)
+
+        Args:
+            model_path: Pickled model from ml_category_predictor.py --save-model
+            db_path: Path to prediction cache database (defaults to project root)
+        """
+        if db_path is None:
+            db_path = os.path.join(PROJECT_DIR, 'category_predictions.db')
+
+        self.model_path = model_path or MODEL_PATH
+        self.db_path = db_path
+        self._model = None
+        self._model_version = None
+        self._failed_version = None
+        self._lock = threading.Lock()
+        self._init_database()
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS category_predictions (
+                    input_hash TEXT PRIMARY KEY,
+                    model_version TEXT NOT NULL,
+                    primary_category TEXT,
+                    super_category TEXT,
+                    confidence REAL,
+                    predicted_at TEXT NOT NULL
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _current_version(self) -> Optional[str]:
+        try:
+            stat = os.stat(self.model_path)
+        except OSError:
+            return None
+        return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+    def get_model(self):
+        """
+        The loaded model, (re)loading it when the file's mtime or size changed
+
+        Returns:
+            (model dict with 'pipeline', version) or (None, None) if no usable model
+        """
+        version = self._current_version()
+        if version is None:
+            if self._failed_version != 'missing':
+                logger.warning(f"⚠️ No category model at {self.model_path}; "
+                               f"run scripts/ml_category_predictor.py --save-model")
+                self._failed_version = 'missing'
+            return None, None
+        if version == self._model_version:
+            return self._model, self._model_version
+        if version == self._failed_version:
+            return None, None
+
+        with self._lock:
+            if version != self._model_version:
+                try:
+                    with open(self.model_path, 'rb') as f:
+                        model = pickle.load(f)
+                    self._model, self._model_version = model, version
+                    self._failed_version = None
+                    logger.info(f"✅ Loaded category model {self.model_path} "
+                                f"({len(model.get('classes', []))} categories)")
+                except Exception as e:
+                    logger.error(f"❌ Could not load category model {self.model_path}: {e}")
+                    self._failed_version = version
+                    return None, None
+            return self._model, self._model_version
+
+    def _cached(self, conn: sqlite3.Connection, hashes: List[str], version: str) -> Dict[str, Dict[str, Any]]:
+        found = {}
+        unique = list(dict.fromkeys(hashes))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = conn.execute(f'''
+                SELECT input_hash, primary_category, super_category, confidence
+                FROM category_predictions
+                WHERE model_version = ? AND input_hash IN ({','.join('?' * len(chunk))})
+            ''', [version] + chunk).fetchall()
+            for input_hash, primary, super_cat, confidence in rows:
+                found[input_hash] = {
+                    'primary_category': primary,
+                    'super_category': super_cat,
+                    'confidence': confidence,
+                    'cached': True,
+                }
+        return found
+
+    def predict_batch(self, products) -> List[Optional[Dict[str, Any]]]:
+        """
+        Predict categories for many products with one model call for the uncached ones
+
+        Args:
+            products: DataFrame or list of dicts with title, vendor and product_type
+
+        Returns:
+            Per product (input order): {'primary_category', 'super_category', 'confidence',
+            'cached'}, or None for every product when no model is available
+        """
+        features = build_features(products)
+        if not features:
+            return []
+
+        model, version = self.get_model()
+        if model is None:
+            return [None] * len(features)
+
+        hashes = [feature_hash(text) for text in features]
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            results = self._cached(conn, hashes, version)
+
+            missing = {}
+            for input_hash, text in zip(hashes, features):
+                if input_hash not in results:
+                    missing.setdefault(input_hash, text)
+
+            if missing:
+                pipeline = model['pipeline']
+                probs = pipeline.predict_proba(list(missing.values()))
+                best = probs.argmax(axis=1)
+                classes = pipeline.classes_
+                now = datetime.now().isoformat()
+                rows = []
+                for input_hash, index, row_probs in zip(missing, best, probs):
+                    primary = str(classes[index])
+                    prediction = {
+                        'primary_category': primary,
+                        'super_category': SUPER_CATEGORY_MAP.get(primary, 'Other'),
+                        'confidence': round(float(row_probs[index]), 4),
+                        'cached': False,
+                    }
+                    results[input_hash] = prediction
+                    rows.append((input_hash, version, prediction['primary_category'],
+                                 prediction['super_category'], prediction['confidence'], now))
+
+                conn.executemany('''
+                    INSERT OR REPLACE INTO category_predictions
+                    (input_hash, model_version, primary_category, super_category, confidence, predicted_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+                conn.commit()
+        finally:
+            conn.close()
+
+        return [dict(results[input_hash]) for input_hash in hashes]
+
+    def predict(self, title: str, vendor: str = '', product_type: str = '') -> Optional[Dict[str, Any]]:
+        """Predict categories for one product (see predict_batch)"""
+        return self.predict_batch([{'title': title, 'vendor': vendor, 'product_type': product_type}])[0]
+
+    def clear_cache(self) -> int:
+        """Delete cached predictions; returns the number removed"""
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            removed = conn.execute('DELETE FROM category_predictions').rowcount
+            conn.commit()
+            return removed
+        finally:
+            conn.close()
+
+
+# Singleton instance
+_category_predictor = None
+_category_predictor_lock = threading.Lock()
+
+
+def get_category_predictor() -> CategoryPredictor:
+    """Get singleton category predictor instance"""
+    global _category_predictor
+    if _category_predictor is None:
+        with _category_predictor_lock:
+            if _category_predictor is None:
+                _category_predictor = CategoryPredictor()
+    return _category_predictor
@@ -386,15 +386,87 @@ def _cache_result(cache_key: str, result: Tuple[Optional[str], float]):
     _detection_result_cache[cache_key] = result
 
 
-def detect_collection_batch(products: list) -> list:
+# ML primary_category -> collection (keys of config.collections.COLLECTIONS), for products no
+# pattern matched; categories without a collection (e.g. Vanities) are left unassigned
+ML_CATEGORY_COLLECTIONS = {
+    'Basin Tapware': 'taps',
+    'Kitchen Tapware': 'taps',
+    'Bath Tapware': 'taps',
+    'Basins': 'basins',
+    'Toilets': 'toilets',
+    'Smart Toilets': 'smart_toilets',
+    'Baths': 'baths',
+    'Kitchen Sinks': 'sinks',
+    'Laundry Sinks': 'sinks',
+    'Showers': 'showers',
+    'Boiling Water Taps': 'filter_taps',
+    'Chilled Water Taps': 'filter_taps',
+    'Sparkling Water Taps': 'filter_taps',
+    'Filtered Water Systems': 'filter_taps',
+    'Hot Water Systems': 'hot_water',
+}
+
+# Minimum model confidence for an ML prediction to assign a collection
+ML_FALLBACK_THRESHOLD = 0.7
+
+
+def predict_collections_ml(products: list) -> list:
+    """
+    Collection predictions from the ML category model (core.category_predictor)
+
+    Args:
+        products: List of dicts with 'title' (or 'product_name'), 'vendor' and 'product_type'
+
+    Returns:
+        Per product: dict with 'collection' (None when the category has no configured
+        collection or confidence is below ML_FALLBACK_THRESHOLD), 'confidence', 'primary_category'
+        and 'super_category'; or None when no model is available
+    """
+    if not products:
+        return []
+
+    from config.collections import COLLECTIONS
+    from core.category_predictor import get_category_predictor
+
+    predictions = get_category_predictor().predict_batch([
+        {
+            'title': product.get('title') or product.get('product_name', ''),
+            'vendor': product.get('vendor', ''),
+            'product_type': product.get('product_type', ''),
+        }
+        for product in products
+    ])
+
+    results = []
+    for prediction in predictions:
+        if prediction is None:
+            results.append(None)
+            continue
+        collection = ML_CATEGORY_COLLECTIONS.get(prediction['primary_category'])
+        if prediction['confidence'] < ML_FALLBACK_THRESHOLD or collection not in COLLECTIONS:
+            collection = None
+        results.append({
+            'collection': collection,
+            'confidence': prediction['confidence'],
+            'primary_category': prediction['primary_category'],
+            'super_category': prediction['super_category'],
+        })
+    return results
+
+
+def detect_collection_batch(products: list, use_ml: bool = False) -> list:
     """
     Detect collections for multiple products
 
     Args:
         products: List of dicts with 'product_name' and optionally 'product_url'
+            (and 'vendor'/'product_type', used by the ML fallback)
+        use_ml: Predict collections for products no pattern matched with the ML
+            category model, in one batch
 
     Returns:
         List of dicts with added 'detected_collection' and 'confidence_score'
+        ('detection_source' is 'ml' for ML-assigned collections)
     """
     results = []
 
@@ -409,6 +481,14 @@ def detect_collection_batch(products: list) -> list:
         result['confidence_score'] = confidence
         results.append(result)
 
+    if use_ml:
+        unmatched = [result for result in results if not result['detected_collection']]
+        for result, prediction in zip(unmatched, predict_collections_ml(unmatched)):
+            if prediction and prediction['collection']:
+                result['detected_collection'] = prediction['collection']
+                result['confidence_score'] = prediction['confidence']
+                result['detection_source'] = 'ml'
+
     return results
 
 
@@ -0,0 +1,240 @@
+"""
+SQLite Cache for Competitor Title Research
+Stores the titles found at each retailer for a brand + model so repeat title
+generation reads them locally instead of re-running a Google search and a
+ChatGPT extraction per retailer. Searches that found nothing are recorded too,
+and every entry carries the time it was researched so stale entries are
+refreshed.
+"""
+import sqlite3
+import os
+import re
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_research_key(brand_name: str, sku: str) -> str:
+    """Cache key for a brand + model query: lowercase, punctuation and spacing removed
+
+    "Phoenix Tapware" / "PT-123 X" and "phoenix  tapware" / "pt123x" share a key.
+    A sku without letters or digits gives a "brand|" key, which would be shared
+    by every product of the brand, so callers must not cache it.
+    """
+    def clean(value: str) -> str:
+        return re.sub(r'[^a-z0-9]+', '', str(value or '').lower())
+
+    return f"{clean(brand_name)}|{clean(sku)}"
+
+
+class CompetitorTitleCache:
+    """SQLite-backed cache of competitor titles keyed by normalized brand + model"""
+
+    def __init__(self, db_path: str = None):
+        """Initialize competitor title cache
+
+        Args:
+            db_path: Path to SQLite database file (defaults to project root)
+        """
+        if db_path is None:
+            project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            db_path = os.path.join(project_dir, 'competitor_titles.db')
+
+        self.db_path = db_path
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            # One row per research run, including runs that found nothing
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS competitor_research (
+                    query_key TEXT PRIMARY KEY,
+                    brand_name TEXT,
+                    sku TEXT,
+                    retailers_searched INTEGER NOT NULL DEFAULT 0,
+                    titles_found INTEGER NOT NULL DEFAULT 0,
+                    researched_at TEXT NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS competitor_titles (
+                    query_key TEXT NOT NULL,
+                    retailer TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    price TEXT,
+                    found_by TEXT,
+                    fetched_at TEXT NOT NULL,
+                    PRIMARY KEY (query_key, retailer)
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_competitor_research_brand
+                ON competitor_research(brand_name)
+            ''')
+            conn.commit()
+            logger.info(f"✅ Competitor title cache initialized at {self.db_path}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_to_competitor(row: sqlite3.Row) -> Dict[str, Any]:
+        return {
+            'competitor': row['retailer'],
+            'title': row['title'],
+            'price': row['price'],
+            'found_by': row['found_by'],
+            'fetched_at': row['fetched_at'],
+            'cached': True,
+        }
+
+    def get(self, query_key: str, max_age_days: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """Get cached competitor titles for a query
+
+        Args:
+            query_key: Key from normalize_research_key
+            max_age_days: Ignore research older than this (None = any age)
+
+        Returns:
+            List of competitor dicts ([] when research found nothing), or None if
+            the query has not been researched within max_age_days
+        """
+        conn = self._connect()
+        try:
+            research = conn.execute(
+                'SELECT researched_at FROM competitor_research WHERE query_key = ?', (query_key,)
+            ).fetchone()
+            if research is None:
+                return None
+            if max_age_days is not None:
+                cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+                if research['researched_at'] < cutoff:
+                    return None
+
+            rows = conn.execute(
+                'SELECT * FROM competitor_titles WHERE query_key = ? ORDER BY retailer', (query_key,)
+            ).fetchall()
+            return [self._row_to_competitor(row) for row in rows]
+        finally:
+            conn.close()
+
+    def put(self, query_key: str, brand_name: str, sku: str, competitors: List[Dict[str, Any]],
+            retailers_searched: int) -> None:
+        """Replace the cached research for a query
+
+        Args:
+            query_key: Key from normalize_research_key
+            brand_name: Brand as searched (kept for offline lookups)
+            sku: Model/SKU as searched
+            competitors: Results from _google_search_retailer ({'competitor', 'title', 'price', 'found_by'})
+            retailers_searched: Number of retailers the research covered
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (query_key, c['competitor'], c['title'], c.get('price'), c.get('found_by'), now)
+            for c in competitors if c.get('competitor') and c.get('title')
+        ]
+
+        conn = self._connect()
+        try:
+            conn.execute('DELETE FROM competitor_titles WHERE query_key = ?', (query_key,))
+            conn.executemany('''
+                INSERT OR REPLACE INTO competitor_titles
+                (query_key, retailer, title, price, found_by, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.execute('''
+                INSERT OR REPLACE INTO competitor_research
+                (query_key, brand_name, sku, retailers_searched, titles_found, researched_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (query_key, brand_name, sku, retailers_searched, len(rows), now))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def search(self, brand_name: Optional[str] = None, text: Optional[str] = None,
+               limit: int = 100) -> List[Dict[str, Any]]:
+        """Query cached titles without any network calls (offline title generation/analysis)
+
+        Args:
+            brand_name: Only titles researched for this brand (normalized match)
+            text: Only titles containing this text (case-insensitive)
+            limit: Maximum rows returned
+
+        Returns:
+            Competitor dicts with the query's brand_name and sku, newest first
+        """
+        clauses, params = [], []
+        if brand_name:
+            clauses.append('r.query_key LIKE ?')
+            params.append(normalize_research_key(brand_name, '') + '%')
+        if text:
+            clauses.append('t.title LIKE ?')
+            params.append(f'%{text}%')
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        params.append(limit)
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(f'''
+                SELECT t.*, r.brand_name, r.sku
+                FROM competitor_titles t
+                JOIN competitor_research r ON r.query_key = t.query_key
+                {where}
+                ORDER BY t.fetched_at DESC
+                LIMIT ?
+            ''', params).fetchall()
+            return [
+                {**self._row_to_competitor(row), 'brand_name': row['brand_name'], 'sku': row['sku']}
+                for row in rows
+            ]
+        finally:
+            conn.close()
+
+    def get_stats(self, max_age_days: Optional[float] = None) -> Dict[str, Any]:
+        """Counts of researched queries, cached titles and stale entries"""
+        conn = self._connect()
+        try:
+            queries = conn.execute('SELECT COUNT(*) FROM competitor_research').fetchone()[0]
+            empty = conn.execute('SELECT COUNT(*) FROM competitor_research WHERE titles_found = 0').fetchone()[0]
+            titles = conn.execute('SELECT COUNT(*) FROM competitor_titles').fetchone()[0]
+            stale = 0
+            if max_age_days is not None:
+                cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+                stale = conn.execute(
+                    'SELECT COUNT(*) FROM competitor_research WHERE researched_at < ?', (cutoff,)
+                ).fetchone()[0]
+            return {
+                'queries': queries,
+                'queries_without_titles': empty,
+                'titles': titles,
+                'stale_queries': stale,
+                'max_age_days': max_age_days,
+            }
+        finally:
+            conn.close()
+
+
+# Singleton instance
+_competitor_title_cache = None
+_competitor_title_cache_lock = threading.Lock()
+
+
+def get_competitor_title_cache() -> CompetitorTitleCache:
+    """Get singleton competitor title cache instance"""
+    global _competitor_title_cache
+    if _competitor_title_cache is None:
+        with _competitor_title_cache_lock:
+            if _competitor_title_cache is None:
+                _competitor_title_cache = CompetitorTitleCache()
+    return _competitor_title_cache
@@ -6,6 +6,8 @@ IMPROVED VERSION: Enhanced care instructions support and robust field mapping +
 import logging
 import time
 import re
+import threading
+import contextvars
 from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -15,6 +17,7 @@ from config.collections import get_collection_config
 from config.validation import validate_product_data
 from core.sheets_manager import get_sheets_manager
 from core.ai_extractor import get_ai_extractor
+from core.extraction_planner import get_extraction_planner
 from core.data_cleaner import get_data_cleaner
 
 logger = logging.getLogger(__name__)
@@ -43,6 +46,10 @@ class DataProcessor:
         self.data_cleaner = get_data_cleaner(self.sheets_manager)
         self._rules_loaded = False
 
+        # Shared start spacing for concurrent content generation workers
+        self._content_start_lock = threading.Lock()
+        self._next_content_start = 0.0
+
         # Processing statistics
         self.stats = {
             'total_processed': 0,
@@ -454,10 +461,13 @@ class DataProcessor:
 
         logger.info(f"Processing {total_urls} URLs with {max_workers} parallel workers")
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Workers run in copies of this context so the planner counts their calls toward this run only
+        with get_extraction_planner().collect_stats() as structured_extraction, \
+                ThreadPoolExecutor(max_workers=max_workers) as executor:
             # Submit all tasks with source type info
             future_to_url = {
-                executor.submit(self._process_single_url, collection_name, row_num, url, overwrite_mode, source_type): (row_num, url)
+                executor.submit(contextvars.copy_context().run, self._process_single_url,
+                                collection_name, row_num, url, overwrite_mode, source_type): (row_num, url)
                 for row_num, url, source_type in urls_with_source
             }
 
@@ -493,6 +503,11 @@ class DataProcessor:
         
         logger.info(f"{collection_name} extraction complete: {len(successful)} success, {len(failed)} failed, {len(skipped)} skipped in {processing_time:.1f}s")
         
+        # LLM calls/tokens saved by structured-first extraction during this run
+        logger.info(f"📐 Structured extraction: {structured_extraction['llm_calls_avoided']} LLM calls avoided, "
+                    f"{structured_extraction['narrowed_llm_calls']} narrowed, "
+                    f"~{structured_extraction['tokens_avoided_estimate']} tokens saved")
+        
         return {
             "success": True,
             "collection": collection_name,
@@ -503,7 +518,8 @@ class DataProcessor:
                 "failed": len(failed),
                 "skipped": len(skipped),
                 "processing_time": round(processing_time, 2),
-                "ai_fields_updated": config.ai_extraction_fields
+                "ai_fields_updated": config.ai_extraction_fields,
+                "structured_extraction": structured_extraction
             }
         }
     
@@ -947,7 +963,8 @@ class DataProcessor:
     
     def generate_product_content(self, collection_name: str, selected_rows: Optional[List[int]] = None, 
                                use_url_content: bool = False, progress_callback: Optional[Callable] = None,
-                               fields_to_generate: Optional[List[str]] = None, max_feature_words: int = 5) -> Dict[str, Any]:
+                               fields_to_generate: Optional[List[str]] = None, max_feature_words: int = 5,
+                               batch_mode: bool = False) -> Dict[str, Any]:
         """
         ENHANCED: Generate multiple AI content fields for products in one go (description, features, care instructions)
         
@@ -958,6 +975,8 @@ class DataProcessor:
             progress_callback: Optional callback function for progress updates
             fields_to_generate: List of fields to generate (defaults to ['description', 'care_instructions'])
             max_feature_words: Maximum words per feature (default 5)
+            batch_mode: Submit through the OpenAI Batch API instead of calling it per product;
+                results are written back later by apply_content_generation_batch
         """
         logger.info(f"ENHANCED: Starting multi-field content generation for {collection_name} collection")
         logger.info(f"🔧 Feature word limit: {max_feature_words} words per feature")
@@ -974,61 +993,9 @@ class DataProcessor:
         
         logger.info(f"REQUESTED FIELDS: {fields_to_generate}")
         
-        # ENHANCED: More robust field validation and mapping
-        supported_fields = []
-        field_mapping = {}
-        field_warnings = []
-        
-        for field in fields_to_generate:
-            field_mapped = False
-            
-            # Handle description fields (multiple aliases)
-            if field in ['body_html', 'description', 'desc']:
-                description_field = self._find_collection_field(config, ['ai_description_field', 'description_field'])
-                if description_field:
-                    supported_fields.append('description')  # Normalize to 'description' for AI extractor
-                    field_mapping['description'] = description_field
-                    logger.info(f"✅ DESCRIPTION: {field} -> {description_field}")
-                    field_mapped = True
-                else:
-                    field_warnings.append(f"Description field not configured for collection {collection_name}")
-            
-            # Handle care instructions (multiple aliases)
-            elif field in ['care_instructions', 'care', 'washing_instructions']:
-                care_field = self._find_collection_field(config, ['ai_care_field', 'care_field', 'care_instructions_field'])
-                if care_field:
-                    supported_fields.append('care_instructions')
-                    field_mapping['care_instructions'] = care_field
-                    logger.info(f"✅ CARE INSTRUCTIONS: {field} -> {care_field}")
-                    field_mapped = True
-                else:
-                    # FALLBACK: Try to find any field with "care" in the name
-                    care_fallback = self._find_care_field_fallback(config)
-                    if care_fallback:
-                        supported_fields.append('care_instructions')
-                        field_mapping['care_instructions'] = care_fallback
-                        logger.info(f"✅ CARE INSTRUCTIONS (FALLBACK): {field} -> {care_fallback}")
-                        field_mapped = True
-                    else:
-                        field_warnings.append(f"Care instructions field not configured for collection {collection_name}")
-            
-            # Handle features
-            elif field in ['features', 'product_features']:
-                features_field = self._find_collection_field(config, ['ai_features_field', 'features_field'])
-                if features_field:
-                    supported_fields.append('features')
-                    field_mapping['features'] = features_field
-                    logger.info(f"✅ FEATURES: {field} -> {features_field}")
-                    field_mapped = True
-                else:
-                    field_warnings.append(f"Features field not configured for collection {collection_name}")
-            
-            # Unknown field
-            else:
-                field_warnings.append(f"Unknown field '{field}' requested for {collection_name}")
-            
-            if not field_mapped:
-                logger.warning(f"❌ FIELD MAPPING FAILED: {field}")
+        supported_fields, field_mapping, field_warnings = self._resolve_content_fields(
+            config, collection_name, fields_to_generate
+        )
         
         # Log all warnings
         for warning in field_warnings:
@@ -1044,6 +1011,7 @@ class DataProcessor:
         logger.info(f"✅ FIELD MAPPINGS: {field_mapping}")
         
         # Get products to process
+        all_products = None
         if selected_rows:
             products_to_process = selected_rows
             logger.info(f"Processing selected rows: {selected_rows}")
@@ -1058,23 +1026,72 @@ class DataProcessor:
         
         logger.info(f"Generating content for {len(products_to_process)} products in {collection_name}, use_url: {use_url_content}")
         
-        # Process products
+        if batch_mode:
+            return self.submit_content_generation_batch(
+                collection_name, products_to_process, use_url_content, supported_fields,
+                field_mapping, max_feature_words, progress_callback
+            )
+        
+        # Process products in parallel; AI calls share the extractor's rate limit and
+        # finished rows are written back in periodic batch updates
         results = []
         total_products = len(products_to_process)
         start_time = time.time()
         
-        for i, row_num in enumerate(products_to_process):
-            if progress_callback:
-                progress_callback(i + 1, total_products, f"Generating content for row {row_num}")
-            
-            result = self._generate_product_content_single(
-                collection_name, row_num, use_url_content, supported_fields, field_mapping, max_feature_words
+        max_workers = min(self.settings.AI_CONTENT_WORKERS, total_products)
+        write_batch_size = max(1, self.settings.CONTENT_WRITE_BATCH_SIZE)
+        pending_writes: List[Tuple[ProcessingResult, Dict[str, Any]]] = []
+        
+        logger.info(f"Generating content for {total_products} products with {max_workers} parallel workers "
+                    f"(sheet writes every {write_batch_size} rows)")
+        
+        def flush_writes():
+            if not pending_writes:
+                return
+            outcome = self.sheets_manager.bulk_update_products(
+                collection_name,
+                [{'row_num': result.row_num, 'data': updates} for result, updates in pending_writes]
             )
-            results.append(result)
+            failed_rows = set(outcome.get('failed_rows', []))
+            for result, _ in pending_writes:
+                if result.row_num in failed_rows:
+                    result.success = False
+                    result.error = "Failed to save to sheet"
+            logger.info(f"📝 Saved generated content for {len(pending_writes) - len(failed_rows)}/{len(pending_writes)} rows")
+            pending_writes.clear()
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_row = {
+                executor.submit(
+                    self._generate_content_with_spacing, collection_name, row_num, use_url_content,
+                    supported_fields, field_mapping, max_feature_words,
+                    all_products.get(row_num) if all_products else None
+                ): row_num
+                for row_num in products_to_process
+            }
+            
+            completed = 0
+            for future in as_completed(future_to_row):
+                row_num = future_to_row[future]
+                try:
+                    result, updates_data = future.result()
+                except Exception as e:
+                    logger.error(f"Error generating content for row {row_num}: {e}")
+                    result, updates_data = ProcessingResult(
+                        row_num=row_num, url="", success=False, error=str(e)
+                    ), {}
+                
+                results.append(result)
+                if result.success:
+                    pending_writes.append((result, updates_data))
+                    if len(pending_writes) >= write_batch_size:
+                        flush_writes()
+                
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total_products, f"Generated content for row {row_num}")
             
-            # Add delay between requests to avoid rate limiting
-            if i < total_products - 1:  # Don't delay after the last request
-                time.sleep(self.settings.AI_DELAY_BETWEEN_REQUESTS)
+            flush_writes()
         
         # Calculate summary
         processing_time = time.time() - start_time
@@ -1099,6 +1116,251 @@ class DataProcessor:
             }
         }
     
+    def submit_content_generation_batch(self, collection_name: str, rows: List[int], use_url_content: bool,
+                                        supported_fields: List[str], field_mapping: Dict[str, str],
+                                        max_feature_words: int = 5,
+                                        progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Queue content generation for many products as OpenAI Batch API jobs
+
+        Prompts are built exactly as in the synchronous path; each request's
+        custom_id encodes the sheet row so results map back after a restart.
+
+        Returns:
+            Dict with the local batch job IDs and how many rows were queued
+        """
+        from core.openai_batch import BatchRequest, get_batch_runner
+
+        all_products = self.sheets_manager.get_all_products(collection_name)
+        batch_requests = []
+        skipped = []
+
+        for i, row_num in enumerate(rows, start=1):
+            product_data = all_products.get(row_num)
+            if not product_data:
+                skipped.append({"row": row_num, "error": "Product not found"})
+                continue
+
+            url = product_data.get('url', '') if use_url_content else None
+            try:
+                bodies = self.ai_extractor.build_content_batch_requests(
+                    collection_name=collection_name,
+                    product_data=product_data,
+                    url=url,
+                    use_url_content=use_url_content,
+                    fields_to_generate=supported_fields
+                )
+            except Exception as e:
+                logger.error(f"❌ Could not build batch request for row {row_num}: {e}")
+                bodies = {}
+
+            if not bodies:
+                skipped.append({"row": row_num, "error": "No prompt could be built"})
+                continue
+
+            for part, body in bodies.items():
+                batch_requests.append(BatchRequest(
+                    custom_id=f"{collection_name}:{row_num}:{part}",
+                    body=body,
+                    target={'row_num': row_num, 'part': part}
+                ))
+
+            if progress_callback:
+                progress_callback(i, len(rows), f"Queued row {row_num} for batch generation")
+
+        if not batch_requests:
+            return {"success": False, "message": "No batch requests could be built", "skipped": skipped}
+
+        job_ids = get_batch_runner().submit_requests(
+            f"content:{collection_name}",
+            batch_requests,
+            metadata={
+                'collection_name': collection_name,
+                'supported_fields': supported_fields,
+                'field_mapping': field_mapping,
+                'max_feature_words': max_feature_words,
+            }
+        )
+        logger.info(f"📦 Queued {len(rows) - len(skipped)} products ({len(batch_requests)} requests) "
+                    f"for batch content generation in {len(job_ids)} job(s)")
+
+        return {
+            "success": True,
+            "batch_mode": True,
+            "job_ids": job_ids,
+            "message": f"Submitted {len(batch_requests)} requests in {len(job_ids)} batch job(s)",
+            "summary": {
+                "total": len(rows),
+                "queued": len(rows) - len(skipped),
+                "skipped": len(skipped),
+                "requests": len(batch_requests),
+            },
+            "skipped": skipped,
+        }
+
+    def apply_content_generation_batch(self, job_id: str) -> Dict[str, Any]:
+        """
+        Write a completed content batch back to the sheet in one batch update
+
+        Returns:
+            Same results/summary shape as generate_product_content
+        """
+        from core.openai_batch import get_batch_runner
+
+        runner = get_batch_runner()
+        job = runner.poll(job_id)
+        if job['status'] != 'completed':
+            return {"success": False, "message": f"Batch job {job_id} is {job['status']}", "job": job}
+        if job['applied_at']:
+            return {"success": False, "message": f"Batch job {job_id} was already applied at {job['applied_at']}"}
+
+        metadata = job['metadata'] or {}
+        collection_name = metadata['collection_name']
+        supported_fields = metadata['supported_fields']
+        field_mapping = metadata['field_mapping']
+        max_feature_words = metadata.get('max_feature_words', 5)
+
+        # Group replies by sheet row: row -> {part: content}
+        contents_by_row: Dict[int, Dict[str, Optional[str]]] = {}
+        errors_by_row: Dict[int, List[str]] = {}
+        for result in runner.results(job_id).values():
+            row_num = result['target']['row_num']
+            contents_by_row.setdefault(row_num, {})
+            if result['status'] == 'completed':
+                contents_by_row[row_num][result['target']['part']] = result['content']
+            else:
+                errors_by_row.setdefault(row_num, []).append(f"{result['target']['part']}: {result['error']}")
+
+        results = []
+        updates = []
+        for row_num in sorted(contents_by_row):
+            generated_content = self.ai_extractor.parse_content_batch_results(
+                collection_name, contents_by_row[row_num], supported_fields, max_feature_words
+            )
+            updates_data = {
+                sheet_column: generated_content[field_key]
+                for field_key, sheet_column in field_mapping.items()
+                if generated_content.get(field_key) and str(generated_content[field_key]).strip()
+            }
+            if updates_data:
+                updates.append({'row_num': row_num, 'data': updates_data})
+                results.append(ProcessingResult(
+                    row_num=row_num,
+                    url="",
+                    success=True,
+                    extracted_fields=list(updates_data.keys()),
+                    generated_content=generated_content
+                ))
+            else:
+                error = '; '.join(errors_by_row.get(row_num, [])) or "No valid content generated"
+                results.append(ProcessingResult(row_num=row_num, url="", success=False, error=error))
+
+        if updates:
+            write_result = self.sheets_manager.bulk_update_products(collection_name, updates)
+            failed_rows = set(write_result.get('failed_rows', []))
+            for result in results:
+                if result.row_num in failed_rows:
+                    result.success = False
+                    result.error = "Failed to save to sheet"
+
+        runner.mark_applied(job_id)
+        successful = sum(1 for r in results if r.success)
+        logger.info(f"✅ Applied batch job {job_id}: {successful}/{len(results)} products updated")
+
+        return {
+            "success": True,
+            "message": f"Generated content for {successful}/{len(results)} products",
+            "results": [self._result_to_dict(r) for r in results],
+            "summary": {
+                "total": len(results),
+                "successful": successful,
+                "failed": len(results) - successful,
+                "fields_generated": supported_fields
+            }
+        }
+
+    def apply_completed_content_batches(self, collection_name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Resume polling unfinished content batches (e.g. after a restart) and
+        apply every completed job that has not been written back yet
+        """
+        from core.openai_batch import get_batch_runner
+
+        runner = get_batch_runner()
+        name = f"content:{collection_name}" if collection_name else None
+        runner.resume(name)
+
+        applied = []
+        for job in runner.store.list_jobs(statuses=['completed'], name=name):
+            if job['name'].startswith('content:') and not job['applied_at']:
+                applied.append(self.apply_content_generation_batch(job['job_id']))
+        return applied
+    
+    def _resolve_content_fields(self, config, collection_name: str,
+                                fields_to_generate: List[str]) -> Tuple[List[str], Dict[str, str], List[str]]:
+        """
+        Map requested content fields to the collection's sheet columns
+
+        Returns:
+            (supported_fields, field_mapping, field_warnings)
+        """
+        supported_fields = []
+        field_mapping = {}
+        field_warnings = []
+        
+        for field in fields_to_generate:
+            field_mapped = False
+            
+            # Handle description fields (multiple aliases)
+            if field in ['body_html', 'description', 'desc']:
+                description_field = self._find_collection_field(config, ['ai_description_field', 'description_field'])
+                if description_field:
+                    supported_fields.append('description')  # Normalize to 'description' for AI extractor
+                    field_mapping['description'] = description_field
+                    logger.info(f"✅ DESCRIPTION: {field} -> {description_field}")
+                    field_mapped = True
+                else:
+                    field_warnings.append(f"Description field not configured for collection {collection_name}")
+            
+            # Handle care instructions (multiple aliases)
+            elif field in ['care_instructions', 'care', 'washing_instructions']:
+                care_field = self._find_collection_field(config, ['ai_care_field', 'care_field', 'care_instructions_field'])
+                if care_field:
+                    supported_fields.append('care_instructions')
+                    field_mapping['care_instructions'] = care_field
+                    logger.info(f"✅ CARE INSTRUCTIONS: {field} -> {care_field}")
+                    field_mapped = True
+                else:
+                    # FALLBACK: Try to find any field with "care" in the name
+                    care_fallback = self._find_care_field_fallback(config)
+                    if care_fallback:
+                        supported_fields.append('care_instructions')
+                        field_mapping['care_instructions'] = care_fallback
+                        logger.info(f"✅ CARE INSTRUCTIONS (FALLBACK): {field} -> {care_fallback}")
+                        field_mapped = True
+                    else:
+                        field_warnings.append(f"Care instructions field not configured for collection {collection_name}")
+            
+            # Handle features
+            elif field in ['features', 'product_features']:
+                features_field = self._find_collection_field(config, ['ai_features_field', 'features_field'])
+                if features_field:
+                    supported_fields.append('features')
+                    field_mapping['features'] = features_field
+                    logger.info(f"✅ FEATURES: {field} -> {features_field}")
+                    field_mapped = True
+                else:
+                    field_warnings.append(f"Features field not configured for collection {collection_name}")
+            
+            # Unknown field
+            else:
+                field_warnings.append(f"Unknown field '{field}' requested for {collection_name}")
+            
+            if not field_mapped:
+                logger.warning(f"❌ FIELD MAPPING FAILED: {field}")
+        
+        return supported_fields, field_mapping, field_warnings
+    
     def _find_collection_field(self, config, field_names: List[str]) -> Optional[str]:
         """
         ENHANCED: Try to find a field in the collection config by checking multiple possible attribute names
@@ -1141,9 +1403,78 @@ class DataProcessor:
         """ENHANCED: Generate multiple content fields for a single product with better error handling and feature validation"""
         start_time = time.time()
         
+        result, updates_data = self._build_product_content_updates(
+            collection_name, row_num, use_url_content, fields_to_generate, field_mapping, max_feature_words
+        )
+        if not result.success:
+            return result
+        
+        logger.info(f"📝 Updating sheet with {len(updates_data)} fields: {list(updates_data.keys())}")
+        
+        # ENHANCED: Save all content to sheet at once with better error handling
+        try:
+            success = self.sheets_manager.update_multiple_fields(
+                collection_name=collection_name,
+                row_num=row_num,
+                field_updates=updates_data
+            )
+        except Exception as sheet_error:
+            logger.error(f"Sheet update failed for row {row_num}: {sheet_error}")
+            result.success = False
+            result.error = f"Failed to save to sheet: {str(sheet_error)}"
+            success = False
+        else:
+            if not success:
+                result.success = False
+                result.error = "Sheet update returned False"
+        
+        if success:
+            logger.info(f"✅ Successfully saved {len(updates_data)} fields for row {row_num}")
+        result.processing_time = time.time() - start_time
+        return result
+    
+    def _generate_content_with_spacing(self, collection_name: str, row_num: int, use_url_content: bool,
+                                       fields_to_generate: List[str], field_mapping: Dict[str, str],
+                                       max_feature_words: int,
+                                       product_data: Optional[Dict[str, Any]]) -> Tuple[ProcessingResult, Dict[str, Any]]:
+        """Worker for generate_product_content: start rows AI_DELAY_BETWEEN_REQUESTS apart across all threads"""
+        with self._content_start_lock:
+            now = time.time()
+            start_at = max(now, self._next_content_start)
+            self._next_content_start = start_at + self.settings.AI_DELAY_BETWEEN_REQUESTS
+        if start_at > now:
+            time.sleep(start_at - now)
+        
+        return self._build_product_content_updates(
+            collection_name, row_num, use_url_content, fields_to_generate, field_mapping,
+            max_feature_words, product_data
+        )
+    
+    def _build_product_content_updates(self, collection_name: str, row_num: int, use_url_content: bool,
+                                       fields_to_generate: List[str], field_mapping: Dict[str, str],
+                                       max_feature_words: int = 5,
+                                       product_data: Optional[Dict[str, Any]] = None) -> Tuple[ProcessingResult, Dict[str, Any]]:
+        """
+        Generate content for one product without writing it to the sheet
+        
+        Args:
+            collection_name: Name of the collection
+            row_num: Sheet row of the product
+            use_url_content: Whether to fetch URL content for richer content generation
+            fields_to_generate: Content fields to generate
+            field_mapping: Content field -> sheet column
+            max_feature_words: Maximum words per feature
+            product_data: Row data if the caller already has it (otherwise read from the sheet)
+        
+        Returns:
+            Tuple of (ProcessingResult, sheet column -> value updates); updates are empty on failure
+        """
+        start_time = time.time()
+        
         try:
             # Get product data
-            product_data = self.sheets_manager.get_single_product(collection_name, row_num)
+            if product_data is None:
+                product_data = self.sheets_manager.get_single_product(collection_name, row_num)
             if not product_data:
                 return ProcessingResult(
                     row_num=row_num,
@@ -1151,7 +1482,7 @@ class DataProcessor:
                     success=False,
                     error="Product not found",
                     processing_time=time.time() - start_time
-                )
+                ), {}
             
             # Get URL if needed
             url = product_data.get('url', '') if use_url_content else None
@@ -1174,7 +1505,7 @@ class DataProcessor:
                     success=False,
                     error=f"AI generation failed: {str(ai_error)}",
                     processing_time=time.time() - start_time
-                )
+                ), {}
             
             if not generated_content:
                 return ProcessingResult(
@@ -1183,7 +1514,7 @@ class DataProcessor:
                     success=False,
                     error="AI extractor returned no content",
                     processing_time=time.time() - start_time
-                )
+                ), {}
             
             logger.info(f"✅ AI extractor returned content for fields: {list(generated_content.keys())}")
             
@@ -1225,49 +1556,19 @@ class DataProcessor:
                     success=False,
                     error=error_msg,
                     processing_time=time.time() - start_time
-                )
+                ), {}
             
-            logger.info(f"📝 Updating sheet with {len(updates_data)} fields: {list(updates_data.keys())}")
+            if failed_fields:
+                logger.info(f"⚠️ Row {row_num}: generated {successful_fields} (Failed: {failed_fields})")
             
-            # ENHANCED: Save all content to sheet at once with better error handling
-            try:
-                success = self.sheets_manager.update_multiple_fields(
-                    collection_name=collection_name,
-                    row_num=row_num,
-                    field_updates=updates_data
-                )
-            except Exception as sheet_error:
-                logger.error(f"Sheet update failed for row {row_num}: {sheet_error}")
-                return ProcessingResult(
-                    row_num=row_num,
-                    url=url or "",
-                    success=False,
-                    error=f"Failed to save to sheet: {str(sheet_error)}",
-                    processing_time=time.time() - start_time
-                )
-            
-            if success:
-                success_msg = f"Successfully saved {len(successful_fields)} fields: {successful_fields}"
-                if failed_fields:
-                    success_msg += f" (Failed: {failed_fields})"
-                logger.info(f"✅ {success_msg}")
-                
-                return ProcessingResult(
-                    row_num=row_num,
-                    url=url or "",
-                    success=True,
-                    extracted_fields=list(updates_data.keys()),
-                    processing_time=time.time() - start_time,
-                    generated_content=generated_content
-                )
-            else:
-                return ProcessingResult(
-                    row_num=row_num,
-                    url=url or "",
-                    success=False,
-                    error="Sheet update returned False",
-                    processing_time=time.time() - start_time
-                )
+            return ProcessingResult(
+                row_num=row_num,
+                url=url or "",
+                success=True,
+                extracted_fields=list(updates_data.keys()),
+                processing_time=time.time() - start_time,
+                generated_content=generated_content
+            ), updates_data
                 
         except Exception as e:
             logger.error(f"❌ CRITICAL ERROR generating content for row {row_num} ({collection_name}): {e}")
@@ -1277,7 +1578,7 @@ class DataProcessor:
                 success=False,
                 error=f"Critical error: {str(e)}",
                 processing_time=time.time() - start_time
-            )
+            ), {}
     
     def generate_descriptions(self, collection_name: str, selected_rows: Optional[List[int]] = None, 
                             use_url_content: bool = False, progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
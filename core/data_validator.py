@@ -14,7 +14,7 @@ instead of being auto-pushed.
 
 import re
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -83,14 +83,15 @@ WARRANTY_RANGE = (1, 100)
 # Tag Parser with duplicate detection
 # ============================================================
 
-def parse_tags_with_duplicates(tags_str: str) -> Dict[str, List[str]]:
+def parse_tag_pairs(tags_str: str) -> List[Tuple[str, str, str]]:
     """
-    Parse Shopify tags, preserving ALL values for duplicate keys.
-    Returns dict of lowercase_key -> [list of values].
+    Split a Shopify tags string into "key: value" pairs, in tag order.
+    Returns list of (key, value, raw_tag); tags without a value are skipped.
+    This is the single tag parser: shopify_product_tags rows are built from it.
     """
-    result = {}
+    pairs = []
     if not tags_str:
-        return result
+        return pairs
 
     for tag in tags_str.split(','):
         tag = tag.strip()
@@ -98,12 +99,20 @@ def parse_tags_with_duplicates(tags_str: str) -> Dict[str, List[str]]:
             key, _, value = tag.partition(':')
             key = key.strip()
             value = value.strip()
-            if value and value not in ('', ' '):
-                key_lower = key.lower()
-                if key_lower not in result:
-                    result[key_lower] = []
-                result[key_lower].append(value)
+            if value:
+                pairs.append((key, value, tag))
+
+    return pairs
+
 
+def parse_tags_with_duplicates(tags_str: str) -> Dict[str, List[str]]:
+    """
+    Parse Shopify tags, preserving ALL values for duplicate keys.
+    Returns dict of lowercase_key -> [list of values].
+    """
+    result = {}
+    for key, value, _ in parse_tag_pairs(tags_str):
+        result.setdefault(key.lower(), []).append(value)
     return result
 
 
@@ -393,7 +402,7 @@ def validate_metafield(
 
 def validate_product_metafields(
     new_metafields: Dict[str, str],
-    shopify_tags_str: str,
+    shopify_tags: Union[str, Dict[str, List[str]]],
     supplier_specs: Dict[str, str],
     metafield_schema: Dict[str, Dict],
     brand_source: bool = False,
@@ -403,12 +412,16 @@ def validate_product_metafields(
 
     Args:
         new_metafields: Dict of metafield_key -> proposed value
-        shopify_tags_str: Raw Shopify tags string
+        shopify_tags: Raw Shopify tags string, or tags already parsed into the
+            parse_tags_with_duplicates format (e.g. from shopify_product_tags)
         supplier_specs: Parsed supplier specs dict
         metafield_schema: The METAFIELD_SCHEMA dict from gap_analysis
         brand_source: Whether brand_name came from vendor field
     """
-    tag_groups = parse_tags_with_duplicates(shopify_tags_str)
+    if isinstance(shopify_tags, dict):
+        tag_groups = shopify_tags
+    else:
+        tag_groups = parse_tags_with_duplicates(shopify_tags)
 
     results = {}
 
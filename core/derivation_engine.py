@@ -0,0 +1,330 @@
+"""
+Derivation Engine for shopify_products
+Applies declarative enrichment rules (title/tag/vendor matchers that produce
+column values) to every row in a single pass: rows are read once, tag values
+come from the shopify_product_tags index, every enabled rule is evaluated in
+order against the row as earlier rules left it, and all changes are written
+with temp-table join UPDATEs in one transaction. Reports per-rule hit counts
+and supports dry runs.
+"""
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Any, Optional, Callable, Iterable, Tuple, Union
+
+from core.data_validator import parse_tag_pairs
+from core.supplier_db import read_shopify_product_tags
+
+logger = logging.getLogger(__name__)
+
+# Columns every rule may use without declaring them
+BASE_COLUMNS = ('id', 'sku', 'title', 'vendor', 'tags', 'status')
+
+# Sample changes kept per rule for reports
+MAX_SAMPLES = 5
+
+# Marker returned by value functions to leave the column unchanged
+SKIP = object()
+
+
+class Row(dict):
+    """A shopify_products row with lowercased title/vendor and parsed tags, computed once"""
+
+    def __init__(self, values: Dict[str, Any], tag_values: Optional[Dict[str, str]] = None):
+        super().__init__(values)
+        self.title_lower = (values.get('title') or '').lower()
+        self.vendor_lower = (values.get('vendor') or '').lower()
+        self.tag_values = parse_tags(values.get('tags')) if tag_values is None else tag_values
+
+
+def parse_tags(tags: Optional[str]) -> Dict[str, str]:
+    """Shopify tags as {lowercased prefix: value} for "prefix:value" tags (first occurrence wins)"""
+    parsed = {}
+    for prefix, value, _ in parse_tag_pairs(tags):
+        parsed.setdefault(prefix.lower(), value)
+    return parsed
+
+
+def _as_tuple(value) -> tuple:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return (value,)
+
+
+@dataclass
+class Rule:
+    """One derivation rule
+
+    A rule matches a row when every declared matcher passes, then sets
+    ``column`` (and any constant ``sets``) on it.
+
+    Attributes:
+        name: Unique rule name used in reports
+        column: Column the rule produces
+        value: Constant value, or function(row, source_value) -> value (SKIP leaves it unchanged)
+        when: Column -> required value (or tuple of allowed values)
+        title_any: Title must contain one of these (case-insensitive)
+        title_none: Title must contain none of these
+        vendor_any: Vendor must contain one of these
+        tag: Tag prefix whose value is the rule's source value (rule needs the tag)
+        source: Column whose value is the rule's source value (rule needs it non-empty)
+        value_map: Lowercased source value -> output; unmapped values don't match
+        condition: Extra function(row) -> bool for checks the matchers can't express
+        fill_only: Only set the column when it is empty
+        empty_values: Values that count as empty for fill_only and source
+        sets: Extra columns set along with ``column`` (constants or function(row) -> value)
+        group: Rules sharing a group are alternatives: the first match wins
+        stamp_enriched: Set enriched_at on rows this rule changes
+        reads: Extra columns the value/condition functions use
+    """
+    name: str
+    column: str
+    value: Union[Any, Callable[['Row', Any], Any]] = None
+    when: Dict[str, Any] = field(default_factory=dict)
+    title_any: Tuple[str, ...] = ()
+    title_none: Tuple[str, ...] = ()
+    vendor_any: Tuple[str, ...] = ()
+    tag: Optional[str] = None
+    source: Optional[str] = None
+    value_map: Optional[Dict[str, Any]] = None
+    condition: Optional[Callable[['Row'], bool]] = None
+    fill_only: bool = False
+    empty_values: Tuple[Any, ...] = (None, '')
+    sets: Dict[str, Any] = field(default_factory=dict)
+    group: Optional[str] = None
+    stamp_enriched: bool = False
+    reads: Tuple[str, ...] = ()
+
+    def columns(self) -> set:
+        """Columns this rule reads or writes"""
+        cols = set(self.when) | {self.column} | set(self.sets) | set(self.reads)
+        if self.source:
+            cols.add(self.source)
+        return cols
+
+    def is_empty(self, value) -> bool:
+        return value in self.empty_values or (isinstance(value, str) and not value.strip())
+
+    def source_value(self, row: Row):
+        """The value the rule maps from (tag value, source column or None); SKIP if missing"""
+        if self.tag:
+            return row.tag_values.get(self.tag.lower(), SKIP)
+        if self.source:
+            value = row.get(self.source)
+            return SKIP if self.is_empty(value) else value
+        return None
+
+    def matches(self, row: Row) -> bool:
+        for column, allowed in self.when.items():
+            if row.get(column) not in _as_tuple(allowed):
+                return False
+        if self.title_any and not any(kw in row.title_lower for kw in self.title_any):
+            return False
+        if self.title_none and any(kw in row.title_lower for kw in self.title_none):
+            return False
+        if self.vendor_any and not any(kw in row.vendor_lower for kw in self.vendor_any):
+            return False
+        if self.fill_only and not self.is_empty(row.get(self.column)):
+            return False
+        if self.condition and not self.condition(row):
+            return False
+        return True
+
+    def derive(self, row: Row):
+        """New value for ``column`` (SKIP when the rule doesn't apply to the row)"""
+        if not self.matches(row):
+            return SKIP
+
+        source = self.source_value(row)
+        if source is SKIP:
+            return SKIP
+
+        if self.value_map is not None:
+            return self.value_map.get(str(source).lower().strip(), SKIP)
+        if callable(self.value):
+            return self.value(row, source)
+        return self.value
+
+
+class DerivationEngine:
+    """Runs an ordered rule list over shopify_products in one pass"""
+
+    def __init__(self, db_path: str, rules: Iterable[Rule], table: str = 'shopify_products'):
+        """
+        Args:
+            db_path: SQLite database containing the table
+            rules: Rules in evaluation order
+            table: Table to derive (must have an integer ``id`` primary key)
+        """
+        self.db_path = db_path
+        self.rules = list(rules)
+        self.table = table
+
+        names = [rule.name for rule in self.rules]
+        duplicates = {name for name in names if names.count(name) > 1}
+        if duplicates:
+            raise ValueError(f"Duplicate rule names: {sorted(duplicates)}")
+
+    def _table_columns(self, conn: sqlite3.Connection) -> set:
+        return {row[1] for row in conn.execute(f'PRAGMA table_info({self.table})')}
+
+    def _indexed_tags(self, conn: sqlite3.Connection, where: str, params: Tuple):
+        """Tag values the rules need, from shopify_product_tags; None to parse the tags column instead"""
+        keys = {rule.tag for rule in self.rules if rule.tag}
+        if not keys or self.table != 'shopify_products':
+            return None
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'shopify_product_tags'").fetchone():
+            return None
+        return read_shopify_product_tags(conn, where, params, keys=keys)
+
+    def run(self, dry_run: bool = False, where: str = "status = 'active'",
+            params: Tuple = ()) -> Dict[str, Any]:
+        """
+        Apply every rule to the rows selected by ``where``
+
+        Args:
+            dry_run: Compute and report changes without writing them
+            where: SQL filter for the rows to process
+            params: Parameters for ``where``
+
+        Returns:
+            Report with per-rule matched/changed counts, per-column change counts and samples
+        """
+        started = time.perf_counter()
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            available = self._table_columns(conn)
+            needed = set(BASE_COLUMNS)
+            for rule in self.rules:
+                needed |= rule.columns()
+            needed.add('enriched_at')
+            missing = needed - available - {'enriched_at'}
+            if missing:
+                raise ValueError(f"{self.table} is missing columns used by rules: {sorted(missing)}")
+            columns = sorted(c for c in needed if c in available)
+
+            rows = conn.execute(
+                f"SELECT {', '.join(columns)} FROM {self.table} WHERE {where}", params
+            ).fetchall()
+
+            tags_by_id = self._indexed_tags(conn, where, params)
+
+            stats = {rule.name: {'matched': 0, 'changed': 0, 'samples': []} for rule in self.rules}
+            changes: Dict[str, Dict[int, Any]] = {}
+            stamped = set()
+
+            for raw in rows:
+                if tags_by_id is None:
+                    row = Row(dict(raw))
+                else:
+                    row = Row(dict(raw), {key: values[0] for key, values in tags_by_id.get(raw['id'], {}).items()})
+                original = dict(row)
+                done_groups = set()
+
+                for rule in self.rules:
+                    if rule.group and rule.group in done_groups:
+                        continue
+                    new_value = rule.derive(row)
+                    if new_value is SKIP:
+                        continue
+
+                    if rule.group:
+                        done_groups.add(rule.group)
+                    rule_stats = stats[rule.name]
+                    rule_stats['matched'] += 1
+
+                    updates = {rule.column: new_value}
+                    for col, val in rule.sets.items():
+                        updates[col] = val(row) if callable(val) else val
+                    changed = {col: val for col, val in updates.items() if row.get(col) != val}
+                    if not changed:
+                        continue
+
+                    rule_stats['changed'] += 1
+                    if len(rule_stats['samples']) < MAX_SAMPLES:
+                        rule_stats['samples'].append({
+                            'sku': row.get('sku'),
+                            'title': (row.get('title') or '')[:60],
+                            'changes': {col: [row.get(col), val] for col, val in changed.items()},
+                        })
+                    row.update(changed)
+                    if rule.stamp_enriched:
+                        stamped.add(row['id'])
+
+                for col in row.keys():
+                    if row[col] != original.get(col):
+                        changes.setdefault(col, {})[row['id']] = row[col]
+
+            if not dry_run and (changes or stamped):
+                self._write_changes(conn, changes, stamped)
+
+            rows_changed = set()
+            for values in changes.values():
+                rows_changed.update(values)
+
+            report = {
+                'dry_run': dry_run,
+                'rows_scanned': len(rows),
+                'rows_changed': len(rows_changed),
+                'columns': {col: len(values) for col, values in sorted(changes.items())},
+                'rules': stats,
+                'elapsed_seconds': round(time.perf_counter() - started, 2),
+            }
+            logger.info(f"{'🧪 [DRY RUN] ' if dry_run else '✅ '}Derivation pass: {len(rows_changed)}/{len(rows)} rows "
+                        f"changed across {len(changes)} columns in {report['elapsed_seconds']}s")
+            return report
+        finally:
+            conn.close()
+
+    def _write_changes(self, conn: sqlite3.Connection, changes: Dict[str, Dict[int, Any]], stamped: set):
+        """Write all column changes with temp-table join UPDATEs in one transaction"""
+        try:
+            conn.execute('CREATE TEMP TABLE IF NOT EXISTS _derived_values (id INTEGER PRIMARY KEY, value)')
+            for column, values in changes.items():
+                conn.execute('DELETE FROM _derived_values')
+                conn.executemany('INSERT INTO _derived_values (id, value) VALUES (?, ?)', list(values.items()))
+                conn.execute(f'''
+                    UPDATE {self.table}
+                    SET {column} = (SELECT value FROM _derived_values v WHERE v.id = {self.table}.id)
+                    WHERE id IN (SELECT id FROM _derived_values)
+                ''')
+
+            if stamped and 'enriched_at' in self._table_columns(conn):
+                conn.execute('DELETE FROM _derived_values')
+                conn.executemany('INSERT INTO _derived_values (id) VALUES (?)', [(i,) for i in stamped])
+                conn.execute(f'''
+                    UPDATE {self.table}
+                    SET enriched_at = COALESCE(enriched_at, ?)
+                    WHERE id IN (SELECT id FROM _derived_values)
+                ''', (datetime.now().isoformat(),))
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.execute('DROP TABLE IF EXISTS _derived_values')
+
+
+def format_report(report: Dict[str, Any], show_samples: bool = True) -> str:
+    """Human-readable derivation report"""
+    lines = [
+        f"Rows scanned: {report['rows_scanned']:,}",
+        f"Rows changed: {report['rows_changed']:,}" + (' (dry run, nothing written)' if report['dry_run'] else ''),
+        f"Elapsed: {report['elapsed_seconds']}s",
+        '',
+        'Changes by column:',
+    ]
+    lines.extend(f"  {col}: {count:,}" for col, count in report['columns'].items())
+    lines.extend(['', f"  {'rule':<55} {'matched':>8} {'changed':>8}"])
+    for name, stats in report['rules'].items():
+        if stats['matched']:
+            lines.append(f"  {name[:55]:<55} {stats['matched']:>8,} {stats['changed']:>8,}")
+            if show_samples:
+                for sample in stats['samples']:
+                    diff = ', '.join(f"{col}: {old!r} → {new!r}" for col, (old, new) in sample['changes'].items())
+                    lines.append(f"      {sample['sku']}: {diff}")
+    return '\n'.join(lines)
@@ -0,0 +1,203 @@
+"""
+Extraction Planner
+Runs the cheap structured extractors (JSON-LD, supplier spec tables, Shopify
+product JSON) before AI extraction, scores how much of the collection's
+ai_extraction_fields they cover and decides what is left for the LLM.
+"""
+import json
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional
+from urllib.parse import urlparse
+
+from config.settings import get_settings
+from config.collections import get_collection_config
+from core.page_extractors import get_page_extractor
+
+logger = logging.getLogger(__name__)
+
+# Rough OpenAI tokenizer ratio for English text/HTML, used for savings estimates only
+CHARS_PER_TOKEN = 4
+
+# Markers that identify a Shopify storefront (product JSON available at <url>.json)
+SHOPIFY_MARKERS = ('cdn.shopify.com', 'Shopify.shop', 'shopify-section')
+
+# Stats dict of the run collecting in this context (see ExtractionPlanner.collect_stats)
+_run_stats: contextvars.ContextVar = contextvars.ContextVar('extraction_run_stats', default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count for a prompt or response"""
+    return len(text) // CHARS_PER_TOKEN if text else 0
+
+
+@dataclass
+class ExtractionPlan:
+    """Outcome of the structured extraction pass for one page
+
+    Attributes:
+        structured_data: Fields already filled by structured extractors
+        missing_fields: Fields the LLM still has to extract
+        sources: Field -> extractor that supplied it ('page' or 'shopify_json')
+        coverage: Fraction of scored fields covered by structured data
+        skip_llm: True when structured data covered every field (no LLM call needed)
+    """
+    collection_name: str
+    structured_data: Dict[str, Any] = field(default_factory=dict)
+    missing_fields: List[str] = field(default_factory=list)
+    sources: Dict[str, str] = field(default_factory=dict)
+    coverage: float = 0.0
+    skip_llm: bool = False
+
+    def narrow_prompt(self, prompt: str) -> str:
+        """Restrict an extraction prompt to the fields structured data did not cover"""
+        if not self.structured_data:
+            return prompt
+
+        return (
+            f"{prompt}\n\n"
+            f"The following fields are already known from structured data on the page; do NOT return them:\n"
+            f"{json.dumps(self.structured_data, indent=2, default=str)}\n\n"
+            f"ONLY return a JSON object with these remaining fields (use null when not found):\n"
+            f"{json.dumps(self.missing_fields)}"
+        )
+
+    def merge(self, llm_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine LLM output with structured data; structured values win for covered fields"""
+        merged = {k: v for k, v in (llm_data or {}).items() if k not in self.structured_data}
+        merged.update(self.structured_data)
+        return merged
+
+
+class ExtractionPlanner:
+    """Structured-first extraction planner with LLM savings statistics"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.page_extractor = get_page_extractor()
+        self._stats_lock = threading.Lock()
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {
+            'pages_planned': 0,
+            'llm_calls': 0,
+            'llm_calls_avoided': 0,
+            'narrowed_llm_calls': 0,
+            'fields_from_structured_data': 0,
+            'tokens_avoided_estimate': 0,
+        }
+
+    def scored_fields(self, config) -> List[str]:
+        """Fields the LLM is asked for: ai_extraction_fields, minus images when a dedicated step finds them"""
+        # Images come from the dedicated AI image step when the collection enables it
+        fields = list(config.ai_extraction_fields)
+        if getattr(config, 'extract_images', False):
+            fields = [f for f in fields if f != 'shopify_images']
+        return fields
+
+    def plan(self, collection_name: str, html_content: str, url: str) -> ExtractionPlan:
+        """
+        Run the structured extractors for a page and score their field coverage
+
+        Args:
+            collection_name: Collection whose ai_extraction_fields are scored
+            html_content: Full (untruncated) page HTML
+            url: Page URL, used for the supplier hint and the Shopify JSON endpoint
+
+        Returns:
+            ExtractionPlan describing covered/missing fields and whether to skip the LLM
+        """
+        config = get_collection_config(collection_name)
+        scored_fields = self.scored_fields(config)
+        plan = ExtractionPlan(collection_name=collection_name, missing_fields=list(scored_fields))
+        if not scored_fields:
+            return plan
+
+        def absorb(specs: Dict[str, Any], source: str):
+            for field_name, value in specs.items():
+                if field_name in scored_fields and field_name not in plan.structured_data \
+                        and value not in (None, '', [], {}):
+                    plan.structured_data[field_name] = value
+                    plan.sources[field_name] = source
+
+        try:
+            absorb(self.page_extractor.extract_from_html(html_content, url, urlparse(url).netloc), 'page')
+        except Exception as e:
+            logger.warning(f"⚠️ Structured page extraction failed for {url}: {e}")
+
+        if len(plan.structured_data) < len(scored_fields) and any(m in html_content for m in SHOPIFY_MARKERS):
+            absorb(self.page_extractor.extract_shopify_json(url), 'shopify_json')
+
+        plan.missing_fields = [f for f in scored_fields if f not in plan.structured_data]
+        plan.coverage = len(plan.structured_data) / len(scored_fields)
+        # Any field structured data missed still gets a (narrowed) LLM call
+        plan.skip_llm = not plan.missing_fields
+
+        self._count(pages_planned=1, fields_from_structured_data=len(plan.structured_data))
+
+        logger.info(f"📐 Structured data covered {len(plan.structured_data)}/{len(scored_fields)} fields "
+                    f"({plan.coverage:.0%}) for {collection_name}: {url}")
+        return plan
+
+    def record_llm_skipped(self, plan: ExtractionPlan, request_text: str):
+        """Count an extraction answered entirely from structured data"""
+        avoided = estimate_tokens(request_text) + estimate_tokens(json.dumps(plan.structured_data, default=str))
+        self._count(llm_calls_avoided=1, tokens_avoided_estimate=avoided)
+        logger.info(f"⏭️ Skipped LLM extraction for {plan.collection_name} (~{avoided} tokens avoided)")
+
+    def record_llm_call(self, plan: Optional[ExtractionPlan]):
+        """Count an LLM extraction call; narrowed calls save the output tokens of covered fields"""
+        avoided = 0
+        if plan and plan.structured_data:
+            avoided = estimate_tokens(json.dumps(plan.structured_data, default=str))
+        if avoided:
+            self._count(llm_calls=1, narrowed_llm_calls=1, tokens_avoided_estimate=avoided)
+        else:
+            self._count(llm_calls=1)
+
+    def _count(self, **counts: int):
+        """Add to the cumulative statistics and to the current run's, if one is collecting"""
+        run_stats = _run_stats.get()
+        with self._stats_lock:
+            for key, count in counts.items():
+                self.stats[key] += count
+                if run_stats is not None:
+                    run_stats[key] += count
+
+    @contextmanager
+    def collect_stats(self):
+        """
+        Collect the statistics of one run, separately from concurrent runs
+
+        Yields a stats dict filled in by plan()/record_*() calls made in this
+        context. Worker threads must run in a copy of it
+        (``executor.submit(contextvars.copy_context().run, fn, ...)``).
+        """
+        stats = self._empty_stats()
+        token = _run_stats.set(stats)
+        try:
+            yield stats
+        finally:
+            _run_stats.reset(token)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Snapshot of the cumulative planner statistics"""
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+# Singleton instance
+_extraction_planner = None
+
+
+def get_extraction_planner() -> ExtractionPlanner:
+    """Get or create the singleton ExtractionPlanner instance"""
+    global _extraction_planner
+    if _extraction_planner is None:
+        _extraction_planner = ExtractionPlanner()
+    return _extraction_planner
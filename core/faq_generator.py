@@ -4,8 +4,48 @@ Generates product-specific FAQs based on existing product data
 """
 import os
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from openai import OpenAI
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Callable, Any
+
+from config.settings import get_settings
+
+SYSTEM_PROMPT = "You are a product specialist generating helpful FAQs for plumbing and lighting products. Focus on practical customer questions about installation, compatibility, maintenance, and specifications."
+
+# Structured output for batch requests: each product id mapped to its FAQ list
+BATCH_RESPONSE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "products": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "faqs": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "question": {"type": "string"},
+                                "answer": {"type": "string"}
+                            },
+                            "required": ["question", "answer"],
+                            "additionalProperties": False
+                        }
+                    }
+                },
+                "required": ["id", "faqs"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["products"],
+    "additionalProperties": False
+}
+
+# Output tokens requested per product in a batch request
+FAQ_TOKENS_PER_PRODUCT = 1000
 
 
 class FAQGenerator:
@@ -38,7 +78,7 @@ class FAQGenerator:
                 messages=[
                     {
                         "role": "system",
-                        "content": "You are a product specialist generating helpful FAQs for plumbing and lighting products. Focus on practical customer questions about installation, compatibility, maintenance, and specifications."
+                        "content": SYSTEM_PROMPT
                     },
                     {
                         "role": "user",
@@ -112,10 +152,14 @@ class FAQGenerator:
         # Remove empty values
         return {k: v for k, v in info.items() if v and str(v).strip()}
 
+    @staticmethod
+    def _format_product_details(product_info: Dict) -> str:
+        return "\n".join([f"- {k.replace('_', ' ').title()}: {v}" for k, v in product_info.items()])
+
     def _create_faq_prompt(self, product_info: Dict, collection_type: str) -> str:
         """Create ChatGPT prompt for FAQ generation"""
 
-        product_details = "\n".join([f"- {k.replace('_', ' ').title()}: {v}" for k, v in product_info.items()])
+        product_details = self._format_product_details(product_info)
 
         prompt = f"""
 Based on the following {collection_type} product information, generate 5-7 frequently asked questions and answers that customers would typically ask about this product.
@@ -167,20 +211,13 @@ Keep answers concise but informative, and base all answers strictly on the provi
 
             # Update the spreadsheet with FAQs
             from core.sheets_manager import sheets_manager
-            config = sheets_manager.get_collection_config(collection_name)
-            faq_column = config.column_mapping.get('faqs')
-
-            if not faq_column:
+            from config.collections import get_collection_config
+            if 'faqs' not in get_collection_config(collection_name).column_mapping:
                 print(f"FAQ column not configured for {collection_name}")
                 return False
 
             # Update the cell with generated FAQs
-            success = sheets_manager.update_cell_value(
-                collection_name,
-                row_number,
-                faq_column,
-                faqs
-            )
+            success = sheets_manager.update_product_row(collection_name, row_number, {'faqs': faqs})
 
             if success:
                 print(f"✅ FAQs updated for {collection_name} row {row_number}")
@@ -194,5 +231,203 @@ Keep answers concise but informative, and base all answers strictly on the provi
             return False
 
 
+    def _create_batch_faq_prompt(self, products_info: Dict[str, Dict], collection_type: str) -> str:
+        """Create ChatGPT prompt for FAQ generation for several products at once"""
+
+        product_sections = "\n\n".join(
+            f"Product id: {product_id}\n{self._format_product_details(info)}"
+            for product_id, info in products_info.items()
+        )
+
+        return f"""
+For EACH of the following {len(products_info)} {collection_type} products, generate 5-7 frequently asked questions and answers that customers would typically ask about that product.
+
+{product_sections}
+
+Please focus on practical questions that customers would have about:
+- Installation requirements and compatibility
+- Product specifications and features
+- Maintenance and care
+- Dimensions and sizing (always use millimeters/mm for measurements, never centimeters)
+- Material properties and durability
+- Warranty and support
+
+IMPORTANT: When mentioning any dimensions or measurements, always use millimeters (mm) as the unit, never centimeters (cm).
+
+Return one entry per product, using its exact product id. Keep answers concise but informative, and base each product's answers strictly on that product's details. Do not make assumptions about features or specifications not mentioned in the product details.
+"""
+
+    @staticmethod
+    def _format_faq_list(faqs: List[Dict]) -> str:
+        """Format structured FAQs in the same Q:/A: layout generate_faqs returns"""
+        return "\n\n".join(
+            f"Q: {faq['question'].strip()}\nA: {faq['answer'].strip()}"
+            for faq in faqs if faq.get('question') and faq.get('answer')
+        )
+
+    def generate_faqs_batch(self, products: Dict[int, Dict], collection_type: str = "sinks") -> Dict[int, str]:
+        """
+        Generate FAQs for several products in one structured-output request
+
+        Args:
+            products: Row number -> product data
+            collection_type: Type of product collection (sinks, taps, lighting)
+
+        Returns:
+            Row number -> formatted FAQs; products missing from the response are left out
+        """
+        if not products:
+            return {}
+
+        try:
+            products_info = {
+                str(row_num): self._extract_product_info(product_data, collection_type)
+                for row_num, product_data in products.items()
+            }
+            prompt = self._create_batch_faq_prompt(products_info, collection_type)
+
+            response = self.client.chat.completions.create(
+                model=get_settings().FAQ_BATCH_MODEL,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": SYSTEM_PROMPT
+                    },
+                    {
+                        "role": "user",
+                        "content": prompt
+                    }
+                ],
+                response_format={
+                    "type": "json_schema",
+                    "json_schema": {"name": "product_faqs", "strict": True, "schema": BATCH_RESPONSE_SCHEMA}
+                },
+                max_tokens=min(FAQ_TOKENS_PER_PRODUCT * len(products), get_settings().FAQ_BATCH_MAX_TOKENS),
+                temperature=0.7
+            )
+
+            data = json.loads(response.choices[0].message.content)
+            results = {}
+            for entry in data.get('products', []):
+                row_key = str(entry.get('id', '')).strip()
+                if row_key not in products_info:
+                    continue
+                faqs = self._format_faq_list(entry.get('faqs') or [])
+                if faqs:
+                    results[int(row_key)] = faqs
+            return results
+
+        except Exception as e:
+            print(f"Error generating batch FAQs for rows {sorted(products)}: {e}")
+            return {}
+
+    def _generate_faq_chunk(self, products: Dict[int, Dict], collection_name: str) -> Dict[str, Any]:
+        """One batch request for a chunk of products, retrying the products it missed one at a time"""
+        faqs = self.generate_faqs_batch(products, collection_name)
+        missing = [row_num for row_num in products if row_num not in faqs]
+        if missing:
+            print(f"🔁 Retrying {len(missing)} products individually for {collection_name}: {missing}")
+        for row_num in missing:
+            single = self.generate_faqs(products[row_num], collection_name)
+            if single:
+                faqs[row_num] = single
+        return {'rows': list(products), 'faqs': faqs, 'retried': len(missing)}
+
+    def update_collection_faqs(self, collection_name: str, row_numbers: Optional[List[int]] = None,
+                               overwrite: bool = False,
+                               progress_callback: Optional[Callable[[int, int, str], None]] = None) -> Dict[str, Any]:
+        """
+        Generate and update FAQs for many products of a collection
+
+        Products are sent FAQ_BATCH_SIZE per request with FAQ_BATCH_WORKERS requests
+        in flight, and each chunk's FAQs are written with one batch update.
+
+        Args:
+            collection_name: Name of the collection (sinks, taps, lighting)
+            row_numbers: Rows to generate for (None = whole collection)
+            overwrite: Regenerate FAQs for products that already have them
+            progress_callback: Called with (completed, total, message) after each chunk
+
+        Returns:
+            Dict with updated_rows, failed_rows, retried and request counts
+        """
+        from core.sheets_manager import get_sheets_manager
+        from config.collections import get_collection_config
+
+        settings = get_settings()
+        result = {
+            'success': False,
+            'collection': collection_name,
+            'total': 0,
+            'updated_rows': [],
+            'failed_rows': [],
+            'retried': 0,
+            'batch_requests': 0
+        }
+
+        if 'faqs' not in get_collection_config(collection_name).column_mapping:
+            result['error'] = f"FAQ column not configured for {collection_name}"
+            return result
+
+        sheets_manager = get_sheets_manager()
+        all_products = sheets_manager.get_all_products(collection_name)
+        if row_numbers is not None:
+            products = {row_num: all_products[row_num] for row_num in row_numbers if row_num in all_products}
+        else:
+            products = all_products
+        if not overwrite:
+            products = {row_num: data for row_num, data in products.items() if not str(data.get('faqs') or '').strip()}
+
+        rows = sorted(products)
+        result['total'] = len(rows)
+        if not rows:
+            result['success'] = True
+            return result
+
+        # Keep each request within the model's output cap so responses aren't truncated
+        batch_size = max(1, min(settings.FAQ_BATCH_SIZE, settings.FAQ_BATCH_MAX_TOKENS // FAQ_TOKENS_PER_PRODUCT))
+        chunks = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        result['batch_requests'] = len(chunks)
+        print(f"🚀 Generating FAQs for {len(rows)} {collection_name} products in {len(chunks)} batch requests")
+
+        completed = 0
+        with ThreadPoolExecutor(max_workers=max(1, settings.FAQ_BATCH_WORKERS)) as executor:
+            futures = {
+                executor.submit(self._generate_faq_chunk, {row_num: products[row_num] for row_num in chunk},
+                                collection_name): chunk
+                for chunk in chunks
+            }
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    chunk_result = future.result()
+                except Exception as e:
+                    print(f"❌ FAQ chunk {chunk} failed: {e}")
+                    chunk_result = {'rows': chunk, 'faqs': {}, 'retried': 0}
+
+                faqs = chunk_result['faqs']
+                result['retried'] += chunk_result['retried']
+                result['failed_rows'].extend(row_num for row_num in chunk if row_num not in faqs)
+
+                if faqs:
+                    write = sheets_manager.bulk_update_products(collection_name, [
+                        {'row_num': row_num, 'data': {'faqs': text}} for row_num, text in sorted(faqs.items())
+                    ])
+                    write_failed = set(write['failed_rows'])
+                    result['failed_rows'].extend(sorted(write_failed))
+                    result['updated_rows'].extend(row_num for row_num in sorted(faqs) if row_num not in write_failed)
+
+                completed += len(chunk)
+                if progress_callback:
+                    progress_callback(completed, len(rows), f"FAQs generated for {completed}/{len(rows)} products")
+
+        result['updated_rows'].sort()
+        result['failed_rows'].sort()
+        result['success'] = bool(result['updated_rows']) or not result['failed_rows']
+        print(f"✅ FAQs updated for {len(result['updated_rows'])}/{len(rows)} {collection_name} products "
+              f"({len(result['failed_rows'])} failed, {result['retried']} retried individually)")
+        return result
+
+
 # Global instance
 faq_generator = FAQGenerator()
\ No newline at end of file
@@ -0,0 +1,280 @@
+"""
+Batched Firestore Writer
+Groups document writes into WriteBatch commits (up to 500 ops each) instead of
+one RPC per document, skipping documents whose content has not changed
+"""
+import hashlib
+import json
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Any, Optional, Callable
+
+try:
+    from google.api_core import exceptions as google_exceptions
+    RETRYABLE_ERRORS = (
+        google_exceptions.Aborted,             # transaction contention
+        google_exceptions.DeadlineExceeded,
+        google_exceptions.ServiceUnavailable,
+        google_exceptions.ResourceExhausted,
+        google_exceptions.InternalServerError,
+    )
+except ImportError:
+    RETRYABLE_ERRORS = ()
+
+logger = logging.getLogger(__name__)
+
+# Firestore rejects WriteBatch commits with more than 500 operations
+MAX_BATCH_SIZE = 500
+
+# Fields that change on every write and must not affect the content hash
+VOLATILE_FIELDS = {'row_number', 'updated_at', 'created_at', 'synced_from_sheets', '__hydratedFromApi'}
+
+
+def _normalize_value(value: Any) -> Any:
+    """Strip strings; None and empty or whitespace-only strings both mean no value"""
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def content_hash(data: Dict[str, Any], fields: Optional[List[str]] = None) -> str:
+    """
+    Hash document content for change detection
+
+    Strings are stripped, and None and empty strings hash alike so a blank
+    sheet cell matches a missing Firestore field. Other values keep their JSON
+    type, so 0, False, '0' and a missing value all hash differently.
+
+    Args:
+        data: Document data
+        fields: Only hash these fields (defaults to every non-volatile field in data)
+    """
+    if fields is None:
+        fields = [k for k in data.keys() if k not in VOLATILE_FIELDS]
+
+    normalized = {}
+    for field in sorted(set(fields) - VOLATILE_FIELDS):
+        normalized[field] = _normalize_value(data.get(field))
+
+    payload = json.dumps(normalized, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class FirestoreBatchWriter:
+    """
+    Buffers set/update/delete operations for one Firestore collection and
+    commits them as WriteBatch chunks.
+
+    Works against anything exposing ``db.batch()`` returning an object with
+    ``set``/``update``/``delete``/``commit``, so the Firestore emulator
+    (FIRESTORE_EMULATOR_HOST) or an in-memory fake can stand in for production.
+
+    Usage:
+        writer = FirestoreBatchWriter(db, collection_ref)
+        writer.set(5, {'title': 'Sink'}, existing=current_doc)
+        stats = writer.flush()
+    """
+
+    def __init__(self, db, collection_ref, batch_size: int = MAX_BATCH_SIZE,
+                 max_in_flight: int = 4, max_retries: int = 5,
+                 known_hashes: Optional[Dict[str, str]] = None,
+                 progress_callback: Optional[Callable[[int, int], None]] = None):
+        """
+        Args:
+            db: Firestore client
+            collection_ref: Collection reference documents are written into
+            batch_size: Operations per WriteBatch commit (capped at 500)
+            max_in_flight: Maximum number of batches committing concurrently
+            max_retries: Retries per batch on contention/transient errors
+            known_hashes: doc_id -> content hash from earlier writes; updated in place.
+                The cache is process-local: it only knows about writes made through it,
+                so edits made elsewhere (the console, Apps Script, another worker) are not
+                seen. Pass ``existing`` to set() when the document may have changed outside
+                this process; freshly read content always takes precedence over the cache.
+            progress_callback: Called with (committed_ops, total_ops) after each batch
+        """
+        self.db = db
+        self.collection_ref = collection_ref
+        self.batch_size = max(1, min(batch_size, MAX_BATCH_SIZE))
+        self.max_in_flight = max(1, max_in_flight)
+        self.max_retries = max_retries
+        self.known_hashes = known_hashes if known_hashes is not None else {}
+        self.progress_callback = progress_callback
+
+        self._ops: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self.stats = self._empty_stats()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, Any]:
+        return {
+            'written': 0,
+            'deleted': 0,
+            'skipped_unchanged': 0,
+            'failed': 0,
+            'batches': 0,
+            'retries': 0,
+            'written_ids': [],
+            'deleted_ids': [],
+            'failed_ids': [],
+            'errors': [],
+        }
+
+    def _is_unchanged(self, doc_id: str, data: Dict[str, Any],
+                      existing: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Return the new content hash, or None if the write can be skipped"""
+        new_hash = content_hash(data)
+        fields = [k for k in data.keys() if k not in VOLATILE_FIELDS]
+
+        if existing is not None:
+            # Freshly read content is authoritative over hashes cached from earlier writes
+            if existing and content_hash(existing, fields) == new_hash:
+                self.known_hashes[doc_id] = new_hash
+                return None
+            return new_hash
+
+        if self.known_hashes.get(doc_id) == new_hash:
+            return None
+        return new_hash
+
+    def set(self, doc_id, data: Dict[str, Any], merge: bool = True,
+            existing: Optional[Dict[str, Any]] = None, skip_unchanged: bool = True) -> bool:
+        """
+        Queue a set (merge by default, which also creates missing documents)
+
+        Args:
+            doc_id: Document ID (row number)
+            data: Fields to write
+            merge: Merge into the existing document instead of replacing it
+            existing: Current document content, used to skip unchanged writes
+            skip_unchanged: Compare content hashes before queueing
+
+        Returns:
+            True if the write was queued, False if skipped as unchanged
+        """
+        doc_id = str(doc_id)
+        new_hash = content_hash(data)
+        if skip_unchanged:
+            new_hash = self._is_unchanged(doc_id, data, existing)
+            if new_hash is None:
+                self.stats['skipped_unchanged'] += 1
+                return False
+
+        self._ops.append({'type': 'set', 'doc_id': doc_id, 'data': data,
+                          'merge': merge, 'hash': new_hash})
+        return True
+
+    def update(self, doc_id, data: Dict[str, Any], existing: Optional[Dict[str, Any]] = None,
+               skip_unchanged: bool = True) -> bool:
+        """Queue an update (fails for that batch if the document does not exist)"""
+        doc_id = str(doc_id)
+        new_hash = content_hash(data)
+        if skip_unchanged:
+            new_hash = self._is_unchanged(doc_id, data, existing)
+            if new_hash is None:
+                self.stats['skipped_unchanged'] += 1
+                return False
+
+        self._ops.append({'type': 'update', 'doc_id': doc_id, 'data': data, 'hash': new_hash})
+        return True
+
+    def delete(self, doc_id):
+        """Queue a document delete"""
+        doc_id = str(doc_id)
+        self.known_hashes.pop(doc_id, None)
+        self._ops.append({'type': 'delete', 'doc_id': doc_id})
+
+    @property
+    def pending(self) -> int:
+        """Number of queued operations not yet committed"""
+        return len(self._ops)
+
+    def _commit_chunk(self, chunk: List[Dict[str, Any]]):
+        """Build and commit one WriteBatch, retrying transient failures"""
+        attempt = 0
+        while True:
+            batch = self.db.batch()
+            for op in chunk:
+                doc_ref = self.collection_ref.document(op['doc_id'])
+                if op['type'] == 'set':
+                    batch.set(doc_ref, op['data'], merge=op['merge'])
+                elif op['type'] == 'update':
+                    batch.update(doc_ref, op['data'])
+                else:
+                    batch.delete(doc_ref)
+
+            try:
+                batch.commit()
+                return attempt
+            except RETRYABLE_ERRORS as e:
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                delay = min(30.0, (2 ** attempt) * 0.25) + random.uniform(0, 0.25)
+                logger.warning(f"⚠️ Batch commit contention ({e}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _record(self, chunk: List[Dict[str, Any]], retries: int = 0, error: Exception = None):
+        with self._lock:
+            self.stats['batches'] += 1
+            self.stats['retries'] += retries
+            for op in chunk:
+                if error is not None:
+                    self.stats['failed'] += 1
+                    self.stats['failed_ids'].append(op['doc_id'])
+                elif op['type'] == 'delete':
+                    self.stats['deleted'] += 1
+                    self.stats['deleted_ids'].append(op['doc_id'])
+                else:
+                    self.stats['written'] += 1
+                    self.stats['written_ids'].append(op['doc_id'])
+                    self.known_hashes[op['doc_id']] = op['hash']
+            if error is not None:
+                self.stats['errors'].append(str(error))
+
+    def flush(self) -> Dict[str, Any]:
+        """
+        Commit every queued operation
+
+        Batches are committed concurrently, with at most ``max_in_flight``
+        outstanding at a time. A batch that still fails after retries marks
+        all of its documents as failed; other batches are unaffected.
+
+        Returns:
+            Cumulative stats dict for this writer
+        """
+        ops, self._ops = self._ops, []
+        if not ops:
+            return self.stats
+
+        chunks = [ops[i:i + self.batch_size] for i in range(0, len(ops), self.batch_size)]
+        total_ops = len(ops)
+        committed = 0
+        start_time = time.time()
+
+        with ThreadPoolExecutor(max_workers=min(self.max_in_flight, len(chunks))) as executor:
+            futures = {executor.submit(self._commit_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    retries = future.result()
+                    self._record(chunk, retries=retries)
+                except Exception as e:
+                    logger.error(f"❌ Batch of {len(chunk)} writes failed: {e}")
+                    self._record(chunk, error=e)
+
+                committed += len(chunk)
+                if self.progress_callback:
+                    try:
+                        self.progress_callback(committed, total_ops)
+                    except Exception:
+                        pass
+
+        elapsed = (time.time() - start_time) * 1000
+        logger.info(f"✅ Committed {total_ops} ops in {len(chunks)} batches ({elapsed:.0f}ms), "
+                    f"{self.stats['skipped_unchanged']} unchanged skipped, {self.stats['failed']} failed")
+        return self.stats
@@ -3,6 +3,7 @@ Firestore Manager - Cloud Database for Product Information Management
 Replaces Google Sheets for scalable storage of 30,000+ products
 """
 import json
+import os
 import logging
 import time
 from typing import Dict, List, Any, Optional, Tuple
@@ -19,6 +20,7 @@ except ImportError:
 from config.settings import get_settings
 from config.collections import get_collection_config
 from config.validation import validate_product_data
+from core.firestore_batch_writer import FirestoreBatchWriter
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +38,8 @@ class FirestoreManager:
         self.db = None
         self.settings = get_settings()
         self._initialized = False
+        # collection -> {doc_id: content hash} of documents written by batch writers
+        self._content_hashes: Dict[str, Dict[str, str]] = {}
 
         if FIREBASE_AVAILABLE:
             self.setup_firestore()
@@ -49,7 +53,12 @@ class FirestoreManager:
             # Check if Firebase is already initialized
             if not firebase_admin._apps:
                 # Load credentials from settings (same as Google Sheets)
-                if self.settings.GOOGLE_CREDENTIALS_JSON:
+                if os.environ.get('FIRESTORE_EMULATOR_HOST'):
+                    # Local emulator needs no credentials, only a project id
+                    project_id = os.environ.get('GOOGLE_CLOUD_PROJECT', 'demo-pim')
+                    firebase_admin.initialize_app(options={'projectId': project_id})
+                    logger.info(f"✅ Firebase Admin SDK initialized against emulator ({project_id})")
+                elif self.settings.GOOGLE_CREDENTIALS_JSON:
                     if self.settings.GOOGLE_CREDENTIALS_JSON.startswith('{'):
                         creds_dict = json.loads(self.settings.GOOGLE_CREDENTIALS_JSON)
                     else:
@@ -222,9 +231,13 @@ class FirestoreManager:
 
             # Add update timestamp
             update_data['updated_at'] = firestore.SERVER_TIMESTAMP
+            # Keep the row_number sort key equal to the document ID (get_products_page orders by it)
+            update_data['row_number'] = int(row_num)
 
             # Update in Firestore
             product_ref.update(update_data)
+            # Cached batch-writer hash no longer reflects this document
+            self._content_hashes.get(collection_name, {}).pop(str(row_num), None)
 
             logger.info(f"✅ Updated {len(update_data)} fields in row {row_num} ({collection_name})")
             return True
@@ -233,6 +246,202 @@ class FirestoreManager:
             logger.error(f"Error updating row {row_num} in {collection_name}: {e}")
             return False
 
+    def get_batch_writer(self, collection_name: str, **kwargs) -> FirestoreBatchWriter:
+        """
+        Get a batched writer for a collection's products
+
+        Content hashes are shared across writers for the same collection, so
+        repeated syncs in this process skip documents already written. The
+        cache only sees this process's writes (update_product_row drops its
+        entry); callers that may race external edits should pass existing=.
+        """
+        if not self.db:
+            raise Exception("Firestore not initialized")
+
+        known_hashes = self._content_hashes.setdefault(collection_name, {})
+        return FirestoreBatchWriter(
+            self.db,
+            self.get_collection_ref(collection_name),
+            known_hashes=known_hashes,
+            **kwargs
+        )
+
+    def get_products_batch(self, collection_name: str, row_nums: List[int],
+                           fields: Optional[List[str]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Get several products with batched reads (one RPC per 300 documents)
+
+        Args:
+            collection_name: Collection name
+            row_nums: Row numbers (document IDs) to read
+            fields: Only return these fields (None = whole documents)
+
+        Returns:
+            Dict mapping row numbers to product data (missing rows omitted)
+        """
+        if not self.db or not row_nums:
+            return {}
+
+        collection_ref = self.get_collection_ref(collection_name)
+        products = {}
+        row_nums = list(dict.fromkeys(int(r) for r in row_nums))
+
+        for i in range(0, len(row_nums), 300):
+            refs = [collection_ref.document(str(r)) for r in row_nums[i:i + 300]]
+            for doc in self.db.get_all(refs, field_paths=fields):
+                if not doc.exists:
+                    continue
+                product_data = doc.to_dict()
+                product_data['row_number'] = int(doc.id)
+                products[int(doc.id)] = product_data
+
+        return products
+
+    def get_products_page(self, collection_name: str, limit: int, after_row: Optional[int] = None,
+                          fields: Optional[List[str]] = None) -> Tuple[Dict[int, Dict[str, Any]], Optional[int]]:
+        """
+        Get one page of products ordered by row_number, in a single query
+
+        Relies on every document's row_number being the int form of its
+        document ID (writes guarantee it; see backfill_row_numbers for older
+        documents), so cursors from either pagination path resume correctly.
+
+        Args:
+            collection_name: Collection name
+            limit: Products per page
+            after_row: Start after this row number (None = first page)
+            fields: Only return these fields (None = whole documents)
+
+        Returns:
+            (products keyed by row number, row number to continue after or None on the last page)
+        """
+        if not self.db:
+            return {}, None
+
+        query = self.get_collection_ref(collection_name).order_by('row_number')
+        if fields:
+            query = query.select(list(dict.fromkeys(list(fields) + ['row_number'])))
+        if after_row is not None:
+            query = query.start_after({'row_number': after_row})
+
+        # One extra document tells us whether another page exists
+        docs = list(query.limit(limit + 1).stream())
+        products = {}
+        for doc in docs[:limit]:
+            product_data = doc.to_dict()
+            product_data['row_number'] = int(doc.id)
+            products[int(doc.id)] = product_data
+
+        # Continue after the last returned document's row number
+        next_row = int(docs[limit - 1].id) if len(docs) > limit else None
+        return products, next_row
+
+    def backfill_row_numbers(self, collection_name: str, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        Set row_number to int(document ID) on documents where it is missing or not that int
+
+        Args:
+            collection_name: Collection name
+            dry_run: Only count the documents that need fixing
+
+        Returns:
+            Dict with checked, fixed and failed_ids
+        """
+        if not self.db:
+            raise Exception("Firestore not initialized")
+
+        # Own writer: a row_number-only write must not replace the shared content hashes
+        writer = FirestoreBatchWriter(self.db, self.get_collection_ref(collection_name))
+        stats = {'checked': 0, 'fixed': 0, 'failed_ids': []}
+        for doc in self.get_collection_ref(collection_name).select(['row_number']).stream():
+            stats['checked'] += 1
+            if not doc.id.isdigit():
+                continue
+            row_num = int(doc.id)
+            current = doc.to_dict().get('row_number')
+            if type(current) is int and current == row_num:
+                continue
+            stats['fixed'] += 1
+            if not dry_run:
+                writer.update(row_num, {'row_number': row_num}, skip_unchanged=False)
+
+        if not dry_run:
+            stats['failed_ids'] = writer.flush()['failed_ids']
+            stats['fixed'] -= len(stats['failed_ids'])
+        logger.info(f"✅ Backfilled row_number on {stats['fixed']}/{stats['checked']} documents in {collection_name}")
+        return stats
+
+    def batch_update_products(self, collection_name: str, updates: Dict[int, Dict[str, Any]],
+                              overwrite_mode: bool = True, allowed_fields: Optional[List[str]] = None,
+                              existing: Optional[Dict[int, Dict[str, Any]]] = None,
+                              create_missing: bool = True) -> Dict[str, Any]:
+        """
+        Update many products with batched writes
+
+        Applies the same field filtering as update_product_row, but commits
+        in WriteBatch chunks and skips documents whose content is unchanged.
+
+        Args:
+            collection_name: Collection name
+            updates: Dict mapping row numbers to data to write
+            overwrite_mode: Whether empty values overwrite existing data
+            allowed_fields: List of allowed fields (None = all fields)
+            existing: Current product data by row number, for change detection
+            create_missing: Use merge-set (creates missing docs) instead of update
+
+        Returns:
+            Writer stats dict (written, skipped_unchanged, failed, failed_ids, ...)
+        """
+        writer = self.get_batch_writer(collection_name)
+        existing = existing or {}
+        no_fields = []
+
+        for row_num, data in updates.items():
+            update_data = {}
+            for field, value in data.items():
+                if allowed_fields is not None and field not in allowed_fields:
+                    continue
+                if not overwrite_mode and (value is None or str(value).strip() == ''):
+                    continue
+                update_data[field] = value
+
+            if not update_data:
+                no_fields.append(str(row_num))
+                continue
+
+            # updated_at and row_number are excluded from content hashes, so they never defeat skipping
+            update_data['updated_at'] = firestore.SERVER_TIMESTAMP
+            update_data['row_number'] = int(row_num)
+            current = existing.get(int(row_num))
+            if create_missing:
+                writer.set(row_num, update_data, existing=current)
+            else:
+                writer.update(row_num, update_data, existing=current)
+
+        stats = writer.flush()
+        stats['no_fields'] = no_fields
+        return stats
+
+    def reserve_row_numbers(self, collection_name: str, count: int) -> List[int]:
+        """
+        Reserve a contiguous block of row numbers for new products
+
+        One metadata read/write for the whole block instead of one per product.
+        """
+        if count <= 0:
+            return []
+
+        metadata_ref = self.db.collection('collections').document(collection_name).collection('metadata').document('stats')
+        metadata = metadata_ref.get()
+
+        if metadata.exists:
+            last_row = metadata.to_dict().get('last_row_number', 1)
+        else:
+            last_row = 1  # Row 1 is headers in Google Sheets
+
+        metadata_ref.set({'last_row_number': last_row + count}, merge=True)
+        return list(range(last_row + 1, last_row + count + 1))
+
     def update_single_field(self, collection_name: str, row_num: int, field: str, value: Any) -> bool:
         """Update a single field in a product"""
         return self.update_product_row(collection_name, row_num, {field: value}, overwrite_mode=True)
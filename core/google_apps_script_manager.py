@@ -1,23 +1,72 @@
 """
 Google Apps Script Integration Manager
 Triggers Google Apps Script functions after AI extraction completion
+
+Triggers are coalesced: rows reported for the same collection while a trigger
+is already in flight are buffered for a short debounce window and dispatched
+together (concurrent per-row webhook requests, or a single checkbox batch
+write); a lone trigger is dispatched immediately. All I/O runs on a dedicated
+event loop thread with one shared aiohttp session, so callers awaiting a
+trigger never block their own event loop.
 """
+import asyncio
 import logging
-import requests
-import json
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Dict, Any, List, Optional, Set
+
+import aiohttp
+
 from config.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on rows in one webhook call; larger bursts flush early
+MAX_ROWS_PER_TRIGGER = 200
+
+WEBHOOK_TIMEOUT_SECONDS = 30
+
+# Concurrent per-row webhook requests for one coalesced batch
+WEBHOOK_CONCURRENCY = 10
+
+
+@dataclass
+class _PendingTrigger:
+    """Rows buffered for one collection until the debounce window closes"""
+    rows: Set[int] = field(default_factory=set)
+    operation_types: Set[str] = field(default_factory=set)
+    waiters: List[Future] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
 class GoogleAppsScriptManager:
     """
     Manages integration with Google Apps Script for post-AI processing
     """
 
-    def __init__(self):
+    def __init__(self, debounce_seconds: Optional[float] = None,
+                 script_configs: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            debounce_seconds: Coalescing window per collection
+                (defaults to GOOGLE_SCRIPTS['DEBOUNCE_SECONDS'])
+            script_configs: Per-collection script/webhook config, e.g. to point at a local stub
+        """
         self.settings = get_settings()
-        self.script_configs = self._load_script_configs()
+        self.script_configs = script_configs or self._load_script_configs()
+        if debounce_seconds is None:
+            debounce_seconds = self.settings.GOOGLE_SCRIPTS.get('DEBOUNCE_SECONDS', 0.5)
+        self.debounce_seconds = debounce_seconds
+
+        # Background loop owning the aiohttp session and the pending buffers
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._pending: Dict[str, _PendingTrigger] = {}
+        # Collections with a flush in progress; only then is there anything to coalesce with
+        self._in_flight: Set[str] = set()
 
     def _load_script_configs(self) -> Dict[str, Any]:
         """Load Google Apps Script configurations"""
@@ -46,44 +95,148 @@ class GoogleAppsScriptManager:
         """
         Trigger Google Apps Script cleaning after AI operations
 
+        The row joins the collection's pending batch; the result is that of the
+        coalesced call, with 'row_numbers' listing every row it covered.
+
         Args:
             collection_name: The collection being processed
             row_number: The row number that was processed
             operation_type: Type of AI operation completed (description, features, images, etc.)
         """
         try:
-            logger.info(f"🔄 Triggering Google Apps Script cleaning for {collection_name} row {row_number} after {operation_type}")
+            logger.info(f"🔄 Queueing Google Apps Script cleaning for {collection_name} row {row_number} after {operation_type}")
 
-            config = self.script_configs.get(collection_name)
-            if not config:
+            if not self.script_configs.get(collection_name):
                 logger.warning(f"⚠️ No Google Apps Script config found for collection: {collection_name}")
                 return {'success': False, 'error': 'No script configuration found'}
 
-            # Method 1: Try webhook approach first (fastest)
-            if config.get('webhook_url'):
-                result = await self._trigger_via_webhook(config, row_number, operation_type)
-                if result['success']:
-                    return result
-
-            # Method 2: Try Google Apps Script API
-            if config.get('script_id'):
-                result = await self._trigger_via_apps_script_api(config, row_number, operation_type)
-                if result['success']:
-                    return result
-
-            # Method 3: Fallback to checkbox setting (requires manual trigger)
-            result = await self._set_checkbox_for_cleaning(collection_name, row_number)
-            return result
+            waiter: Future = Future()
+            self._ensure_loop().call_soon_threadsafe(
+                self._enqueue, collection_name, row_number, operation_type, waiter
+            )
+            return await asyncio.wrap_future(waiter)
 
         except Exception as e:
             logger.error(f"❌ Error triggering Google Apps Script: {e}")
             return {'success': False, 'error': str(e)}
 
-    async def _trigger_via_webhook(self, config: Dict[str, Any], row_number: int, operation_type: str) -> Dict[str, Any]:
-        """Trigger Google Apps Script via webhook (fastest method)"""
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background trigger loop on first use"""
+        with self._loop_lock:
+            if self._loop is None or not self._loop_thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name='apps-script-triggers', daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+
+    def _enqueue(self, collection_name: str, row_number: int, operation_type: str, waiter: Future):
+        """Add a row to the collection's pending batch (runs on the trigger loop)"""
+        pending = self._pending.get(collection_name)
+        if pending is None:
+            pending = self._pending[collection_name] = _PendingTrigger()
+            # Nothing in flight: flush on the next loop pass (rows queued meanwhile still join)
+            # instead of making a lone caller wait out the debounce window
+            delay = self.debounce_seconds if collection_name in self._in_flight else 0
+            pending.timer = self._loop.call_later(
+                delay, lambda: self._loop.create_task(self._flush(collection_name))
+            )
+
+        pending.rows.add(row_number)
+        pending.operation_types.add(operation_type)
+        pending.waiters.append(waiter)
+
+        if len(pending.rows) >= MAX_ROWS_PER_TRIGGER:
+            pending.timer.cancel()
+            self._loop.create_task(self._flush(collection_name))
+
+    async def _flush(self, collection_name: str):
+        """Send one trigger for every row buffered for a collection"""
+        pending = self._pending.pop(collection_name, None)
+        if pending is None:
+            return
+
+        row_numbers = sorted(pending.rows)
+        operation_type = ','.join(sorted(pending.operation_types))
+        self._in_flight.add(collection_name)
         try:
-            webhook_url = config['webhook_url']
+            result = await self._dispatch(collection_name, row_numbers, operation_type)
+        except Exception as e:
+            logger.error(f"❌ Error triggering Google Apps Script: {e}")
+            result = {'success': False, 'error': str(e)}
+        finally:
+            self._in_flight.discard(collection_name)
+
+        result['row_numbers'] = row_numbers
+        for waiter in pending.waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+
+    async def _dispatch(self, collection_name: str, row_numbers: List[int], operation_type: str) -> Dict[str, Any]:
+        """Try each trigger method in turn for a batch of rows"""
+        config = self.script_configs[collection_name]
+        logger.info(f"🔄 Triggering Google Apps Script cleaning for {collection_name} "
+                    f"rows {row_numbers} after {operation_type}")
+
+        # Method 1: Try webhook approach first (fastest)
+        if config.get('webhook_url'):
+            result = await self._trigger_via_webhook(config, row_numbers, operation_type)
+            if result['success']:
+                return result
+            # Rows the webhook already cleaned aren't triggered again
+            row_numbers = result.get('failed_rows', row_numbers)
+
+        # Method 2: Try Google Apps Script API
+        if config.get('script_id'):
+            result = await self._trigger_via_apps_script_api(config, row_numbers, operation_type)
+            if result['success']:
+                return result
+
+        # Method 3: Fallback to checkbox setting (requires manual trigger)
+        return await self._set_checkbox_for_cleaning(collection_name, row_numbers)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session, created on the trigger loop"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT_SECONDS),
+                headers={'Content-Type': 'application/json'}
+            )
+        return self._session
+
+    async def _trigger_via_webhook(self, config: Dict[str, Any], row_numbers: List[int], operation_type: str) -> Dict[str, Any]:
+        """Trigger Google Apps Script via webhook (fastest method)
+
+        Deployed doPost handlers only read row_number, so a coalesced batch is
+        sent as one request per row, concurrently over the shared session.
+        """
+        webhook_url = config['webhook_url']
+        logger.info(f"📡 Sending webhook to: {webhook_url} ({len(row_numbers)} rows)")
+
+        semaphore = asyncio.Semaphore(WEBHOOK_CONCURRENCY)
+
+        async def send(row_number: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._post_webhook_row(webhook_url, row_number, operation_type)
+
+        results = await asyncio.gather(*(send(row_number) for row_number in row_numbers))
+        failed_rows = [row for row, result in zip(row_numbers, results) if not result['success']]
+        if failed_rows:
+            errors = sorted({result['error'] for result in results if not result['success']})
+            return {
+                'success': False,
+                'method': 'webhook',
+                'error': f"Webhook failed for rows {failed_rows}: {'; '.join(errors)}",
+                'failed_rows': failed_rows
+            }
+
+        logger.info(f"✅ Webhook successful for {len(row_numbers)} rows")
+        return {'success': True, 'method': 'webhook', 'result': [result['result'] for result in results]}
 
+    async def _post_webhook_row(self, webhook_url: str, row_number: int, operation_type: str) -> Dict[str, Any]:
+        """POST one row to the webhook; success requires HTTP 200 and no success:false in the body"""
+        try:
             payload = {
                 'row_number': row_number,
                 'operation_type': operation_type,
@@ -91,28 +244,29 @@ class GoogleAppsScriptManager:
                 'source': 'PIM_AI_System'
             }
 
-            logger.info(f"📡 Sending webhook to: {webhook_url}")
+            session = await self._get_session()
+            async with session.post(webhook_url, json=payload) as response:
+                if response.status != 200:
+                    text = await response.text()
+                    logger.warning(f"⚠️ Webhook failed with status {response.status} for row {row_number}: {text}")
+                    return {'success': False, 'error': f'Webhook failed: {response.status}'}
 
-            response = requests.post(
-                webhook_url,
-                json=payload,
-                timeout=30,
-                headers={'Content-Type': 'application/json'}
-            )
+                try:
+                    result = await response.json(content_type=None)
+                except ValueError:
+                    result = None
+                if isinstance(result, dict) and result.get('success') is False:
+                    error = result.get('error') or 'script reported failure'
+                    logger.warning(f"⚠️ Webhook script failed for row {row_number}: {error}")
+                    return {'success': False, 'error': f'Webhook script error: {error}'}
 
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"✅ Webhook successful: {result}")
-                return {'success': True, 'method': 'webhook', 'result': result}
-            else:
-                logger.warning(f"⚠️ Webhook failed with status {response.status_code}: {response.text}")
-                return {'success': False, 'error': f'Webhook failed: {response.status_code}'}
+                return {'success': True, 'result': result}
 
         except Exception as e:
-            logger.error(f"❌ Webhook error: {e}")
+            logger.error(f"❌ Webhook error for row {row_number}: {e}")
             return {'success': False, 'error': str(e)}
 
-    async def _trigger_via_apps_script_api(self, config: Dict[str, Any], row_number: int, operation_type: str) -> Dict[str, Any]:
+    async def _trigger_via_apps_script_api(self, config: Dict[str, Any], row_numbers: List[int], operation_type: str) -> Dict[str, Any]:
         """Trigger Google Apps Script via Google Apps Script API"""
         try:
             script_id = config['script_id']
@@ -135,39 +289,61 @@ class GoogleAppsScriptManager:
             logger.error(f"❌ Apps Script API error: {e}")
             return {'success': False, 'error': str(e)}
 
-    async def _set_checkbox_for_cleaning(self, collection_name: str, row_number: int) -> Dict[str, Any]:
+    async def _set_checkbox_for_cleaning(self, collection_name: str, row_numbers: List[int]) -> Dict[str, Any]:
         """
-        Set checkbox in Google Sheets to trigger cleaning
-        This is a fallback method that requires the Google Sheets integration
+        Set checkboxes in Google Sheets to trigger cleaning
+        This is a fallback method that requires the Google Sheets integration;
+        all rows are written in one batch update, off the event loop
         """
         try:
             from core.sheets_manager import get_sheets_manager
 
-            logger.info(f"☑️ Setting checkbox for row {row_number} in {collection_name}")
+            logger.info(f"☑️ Setting checkbox for rows {row_numbers} in {collection_name}")
 
             sheets_manager = get_sheets_manager()
+            updates = [
+                {'row_num': row_num, 'data': {'checkbox_trigger': True}}  # This would need to map to the correct column
+                for row_num in row_numbers
+            ]
 
-            # Set checkbox in column BE (57) to trigger cleaning
-            result = sheets_manager.update_product_row(
-                collection_name=collection_name,
-                row_num=row_number,
-                data={'checkbox_trigger': True}  # This would need to map to the correct column
+            result = await asyncio.get_running_loop().run_in_executor(
+                None, sheets_manager.bulk_update_products, collection_name, updates
             )
 
-            if result:
-                logger.info(f"✅ Checkbox set for row {row_number} - Google Apps Script should trigger automatically")
+            if result['success_count'] and not result['failed_rows']:
+                logger.info(f"✅ Checkbox set for {len(row_numbers)} rows - Google Apps Script should trigger automatically")
                 return {
                     'success': True,
                     'method': 'checkbox',
-                    'message': f'Checkbox set for row {row_number} to trigger cleaning'
+                    'message': f'Checkbox set for rows {row_numbers} to trigger cleaning'
                 }
             else:
-                return {'success': False, 'error': 'Failed to set checkbox'}
+                return {'success': False, 'error': 'Failed to set checkbox', 'failed_rows': result['failed_rows']}
 
         except Exception as e:
             logger.error(f"❌ Checkbox setting error: {e}")
             return {'success': False, 'error': str(e)}
 
+    def close(self, timeout: float = WEBHOOK_TIMEOUT_SECONDS):
+        """Flush pending triggers, close the session and stop the trigger loop"""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def shutdown():
+            for collection_name, pending in list(self._pending.items()):
+                pending.timer.cancel()
+                await self._flush(collection_name)
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+
     def create_webhook_setup_instructions(self, collection_name: str) -> str:
         """
         Generate instructions for setting up webhook integration
@@ -187,10 +363,11 @@ function doPost(e) {{
     // Verify request is from PIM system
     if (data.source !== 'PIM_AI_System') {{
       return ContentService
-        .createTextOutput(JSON.stringify({{'error': 'Unauthorized'}}))
+        .createTextOutput(JSON.stringify({{'success': false, 'error': 'Unauthorized'}}))
         .setMimeType(ContentService.MimeType.JSON);
     }}
 
+    // One POST per row: the payload is row_number, operation_type, trigger_cleaning and source
     const rowNumber = data.row_number;
     const operationType = data.operation_type;
 
@@ -215,7 +392,7 @@ function doPost(e) {{
   }} catch (error) {{
     console.error('Webhook error:', error);
     return ContentService
-      .createTextOutput(JSON.stringify({{'error': error.toString()}}))
+      .createTextOutput(JSON.stringify({{'success': false, 'error': error.toString()}}))
       .setMimeType(ContentService.MimeType.JSON);
   }}
 }}
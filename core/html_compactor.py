@@ -0,0 +1,254 @@
+"""
+HTML Compactor
+Reduces product page HTML to the content an extraction prompt needs: strips
+boilerplate (scripts, navigation, footers, link farms) using link-density
+scoring, flattens spec tables and definition lists to "label: value" lines,
+drops repeated text blocks and fits the result to a token budget measured
+with the model's tokenizer.
+"""
+import json
+import logging
+import re
+from dataclasses import dataclass
+from typing import List, Optional
+
+from bs4 import BeautifulSoup, Tag
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Tags that never carry product content
+STRIP_TAGS = ['script', 'style', 'noscript', 'svg', 'iframe', 'template', 'link', 'meta',
+              'button', 'input', 'select', 'textarea', 'form']
+
+# Landmark tags and class/id names that usually hold site chrome
+BOILERPLATE_TAGS = {'nav', 'header', 'footer', 'aside'}
+BOILERPLATE_PATTERN = re.compile(
+    r'(^|[-_\s])(nav|navbar|menu|megamenu|footer|header|breadcrumbs?|cookie|newsletter|social|share|'
+    r'cart|minicart|modal|popup|banner|sidebar|related|recently|announcement|drawer)([-_\s]|$)',
+    re.I
+)
+
+# Blocks scored for link density
+DENSITY_TAGS = ['div', 'section', 'ul', 'ol', 'aside', 'nav', 'header', 'footer']
+
+# A block whose text is mostly link text is navigation
+MAX_LINK_DENSITY = 0.5
+
+# Blocks containing any of these are kept regardless of score
+PROTECTED_TAGS = ['h1', 'table', 'dl']
+
+# Elements that start a new line in the compacted text
+BLOCK_TAGS = ['p', 'div', 'section', 'article', 'main', 'li', 'tr', 'br', 'h1', 'h2', 'h3', 'h4',
+              'h5', 'h6', 'ul', 'ol', 'dt', 'dd', 'blockquote', 'pre']
+
+# Lines shorter than this are never deduplicated (labels, "Yes", sizes...)
+MIN_DEDUPE_LENGTH = 20
+
+# Fallback ratio when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+_encodings = {}
+
+
+@dataclass
+class CompactionResult:
+    """Compacted page text and its token accounting"""
+    text: str
+    tokens: int
+    original_chars: int
+    truncated: bool = False
+
+
+def _get_encoding(model: Optional[str]):
+    """tiktoken encoding for ``model`` (None when tiktoken or its encoding files are unavailable)"""
+    if tiktoken is None:
+        return None
+
+    key = model or ''
+    if key not in _encodings:
+        try:
+            _encodings[key] = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding('o200k_base')
+        except KeyError:
+            # Model newer than the installed tiktoken: gpt-4o family encoding
+            _encodings[key] = tiktoken.get_encoding('o200k_base')
+        except Exception as e:
+            logger.warning(f"⚠️ tiktoken encoding unavailable ({e}); estimating tokens from characters")
+            _encodings[key] = None
+    return _encodings[key]
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """Token count for ``text`` with the model's tokenizer (character estimate without tiktoken)"""
+    if not text:
+        return 0
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return len(text) // CHARS_PER_TOKEN
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def fit_to_token_budget(text: str, max_tokens: int, model: Optional[str] = None) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens, on a line boundary where possible"""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        limit = max_tokens * CHARS_PER_TOKEN
+        if len(text) <= limit:
+            return text
+        cut = text[:limit]
+    else:
+        tokens = encoding.encode(text, disallowed_special=())
+        if len(tokens) <= max_tokens:
+            return text
+        cut = encoding.decode(tokens[:max_tokens])
+
+    newline = cut.rfind('\n')
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut + "\n...[truncated]"
+
+
+def _link_density(element: Tag) -> float:
+    text_length = len(element.get_text(strip=True))
+    if not text_length:
+        return 1.0 if element.find('a') else 0.0
+    link_length = sum(len(a.get_text(strip=True)) for a in element.find_all('a'))
+    return link_length / text_length
+
+
+def _is_boilerplate(element: Tag) -> bool:
+    if element.find(PROTECTED_TAGS):
+        return False
+
+    names = ' '.join(element.get('class') or []) + ' ' + (element.get('id') or '')
+    looks_like_chrome = element.name in BOILERPLATE_TAGS or bool(BOILERPLATE_PATTERN.search(names))
+    density = _link_density(element)
+
+    if looks_like_chrome:
+        # Landmarks/chrome classes go unless they hold substantial non-link text
+        return density > 0.2 or len(element.get_text(strip=True)) < 200
+    return density > MAX_LINK_DENSITY and len(element.find_all('a')) >= 3
+
+
+def _row_line(cells: List[str]) -> Optional[str]:
+    cells = [c for c in cells if c]
+    if not cells:
+        return None
+    if len(cells) == 2:
+        return f"{cells[0]}: {cells[1]}"
+    return ' | '.join(cells)
+
+
+def _flatten_tables(soup: BeautifulSoup):
+    """Replace tables and definition lists with compact "label: value" lines"""
+    for table in soup.find_all('table'):
+        lines = []
+        for row in table.find_all('tr'):
+            line = _row_line([cell.get_text(' ', strip=True) for cell in row.find_all(['th', 'td'])])
+            if line:
+                lines.append(line)
+        replacement = soup.new_tag('div')
+        replacement.string = '\n'.join(lines)
+        table.replace_with(replacement)
+
+    for dl in soup.find_all('dl'):
+        lines = [
+            f"{dt.get_text(' ', strip=True)}: {dd.get_text(' ', strip=True)}"
+            for dt, dd in zip(dl.find_all('dt'), dl.find_all('dd'))
+        ]
+        replacement = soup.new_tag('div')
+        replacement.string = '\n'.join(lines)
+        dl.replace_with(replacement)
+
+
+def _structured_data_lines(soup: BeautifulSoup) -> List[str]:
+    """JSON-LD blocks as single minified lines (dropped with the other scripts otherwise)"""
+    lines = []
+    for script in soup.find_all('script', type='application/ld+json'):
+        try:
+            data = json.loads(script.string or '')
+        except (json.JSONDecodeError, TypeError):
+            continue
+        lines.append("Structured data: " + json.dumps(data, separators=(',', ':'), ensure_ascii=False))
+    return lines
+
+
+def _media_lines(soup: BeautifulSoup) -> List[str]:
+    """Spec sheet links and product images, which carry no text of their own"""
+    lines = []
+    for a in soup.find_all('a', href=True):
+        if a['href'].lower().split('?')[0].endswith('.pdf'):
+            lines.append(f"Document: {a.get_text(' ', strip=True) or 'PDF'} ({a['href']})")
+    for img in soup.find_all('img', src=True):
+        src = img['src']
+        if src.startswith('data:') or re.search(r'icon|logo|sprite|\.svg', src, re.I):
+            continue
+        alt = img.get('alt', '').strip()
+        lines.append(f"Image: {src}" + (f" ({alt})" if alt else ''))
+    return lines
+
+
+def compact_html(html: str, max_tokens: Optional[int] = None, model: Optional[str] = None) -> CompactionResult:
+    """
+    Compact product page HTML for an LLM prompt
+
+    Args:
+        html: Raw page HTML
+        max_tokens: Token budget for the result (None = no limit)
+        model: OpenAI model name, selects the tokenizer
+
+    Returns:
+        CompactionResult with the compacted text and its token count
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    header_lines = []
+    if soup.title:
+        if soup.title.string:
+            header_lines.append(f"Page title: {soup.title.string.strip()}")
+        soup.title.decompose()
+    header_lines.extend(_structured_data_lines(soup))
+
+    for element in soup(STRIP_TAGS):
+        element.decompose()
+
+    # Innermost blocks first, so a content wrapper is not judged by the menus inside it
+    for element in reversed(soup.find_all(DENSITY_TAGS)):
+        if not element.decomposed and _is_boilerplate(element):
+            element.decompose()
+
+    _flatten_tables(soup)
+    media_lines = _media_lines(soup)
+    for element in soup.find_all(BLOCK_TAGS):
+        element.insert_before('\n')
+        element.insert_after('\n')
+
+    seen = set()
+    lines = []
+    for line in header_lines + soup.get_text().split('\n') + media_lines:
+        line = re.sub(r'\s+', ' ', line).strip()
+        if not line:
+            continue
+        if len(line) >= MIN_DEDUPE_LENGTH:
+            key = line.lower()
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+
+    text = '\n'.join(lines)
+    truncated = False
+    if max_tokens:
+        fitted = fit_to_token_budget(text, max_tokens, model)
+        truncated = fitted != text
+        text = fitted
+
+    return CompactionResult(
+        text=text,
+        tokens=count_tokens(text, model),
+        original_chars=len(html),
+        truncated=truncated
+    )
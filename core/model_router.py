@@ -0,0 +1,273 @@
+"""
+Model Cascade Router
+Sends extraction and generation requests to a cheap, fast model first and
+escalates to the stronger model only when the fast output is not good
+enough: extraction fields scoring below threshold with ConfidenceScorer or
+left empty, or generation output missing requested fields. Tracks per-route latency, token
+cost and escalation rate.
+"""
+import json
+import logging
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List, Optional, Callable
+
+import requests
+
+from config.settings import get_settings
+from core.confidence_scorer import ConfidenceScorer
+
+logger = logging.getLogger(__name__)
+
+OPENAI_CHAT_URL = 'https://api.openai.com/v1/chat/completions'
+
+# USD per 1M tokens (input, output); unknown models are tracked with zero cost
+MODEL_PRICING = {
+    'gpt-4o-mini': (0.15, 0.60),
+    'gpt-4o': (2.50, 10.00),
+    'gpt-4-turbo': (10.00, 30.00),
+    'gpt-4': (30.00, 60.00),
+    'gpt-3.5-turbo': (0.50, 1.50),
+}
+
+# Latency samples kept per route/model for percentiles
+LATENCY_WINDOW = 1000
+
+# Wait before the single retry of a rate-limited request (as AIExtractor._make_chatgpt_request)
+RATE_LIMIT_RETRY_SECONDS = 5
+
+
+def estimate_cost(model: str, usage: Dict[str, Any]) -> float:
+    """USD cost of one call from its ``usage`` block"""
+    prices = MODEL_PRICING.get(model)
+    if prices is None:
+        # Dated snapshots (gpt-4o-2024-08-06) price like their base model
+        prices = next((p for name, p in sorted(MODEL_PRICING.items(), key=lambda x: -len(x[0]))
+                       if model.startswith(name)), (0.0, 0.0))
+    return (usage.get('prompt_tokens', 0) * prices[0] + usage.get('completion_tokens', 0) * prices[1]) / 1_000_000
+
+
+class _RouteMetrics:
+    """Counters and latency samples for one route or model"""
+
+    def __init__(self):
+        self.calls = 0
+        self.escalations = 0
+        self.escalated_fields = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.latencies: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def to_dict(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            'calls': self.calls,
+            'escalations': self.escalations,
+            'escalation_rate': round(self.escalations / self.calls, 3) if self.calls else 0.0,
+            'escalated_fields': self.escalated_fields,
+            'errors': self.errors,
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': self.completion_tokens,
+            'cost_usd': round(self.cost_usd, 4),
+            'latency_ms': {
+                'p50': round(statistics.median(ordered) * 1000, 1) if ordered else None,
+                'p95': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1) if ordered else None,
+            },
+        }
+
+
+class ModelRouter:
+    """Fast-model-first routing for chat completion requests"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.api_key = self.settings.OPENAI_API_KEY
+        self.fast_model = self.settings.API_CONFIG['ROUTER_FAST_MODEL']
+        self.scorer = ConfidenceScorer(threshold=self.settings.API_CONFIG['ROUTER_ESCALATION_THRESHOLD'])
+        self.session = requests.Session()
+        self._lock = threading.Lock()
+        self._routes: Dict[str, _RouteMetrics] = {}
+        self._models: Dict[str, _RouteMetrics] = {}
+
+    def _chat(self, route: str, body: Dict[str, Any]) -> Optional[str]:
+        """POST one chat completion and record its latency, tokens and cost under its model and route"""
+        model = body.get('model', '')
+        start = time.perf_counter()
+        for attempt in range(2):
+            try:
+                response = self.session.post(
+                    OPENAI_CHAT_URL,
+                    headers={
+                        'Content-Type': 'application/json',
+                        'Authorization': f'Bearer {self.api_key}',
+                    },
+                    json=body,
+                    timeout=self.settings.AI_REQUEST_TIMEOUT
+                )
+                response.raise_for_status()
+                result = response.json()
+                break
+            except Exception as e:
+                rate_limited = (getattr(getattr(e, 'response', None), 'status_code', None) == 429
+                                or 'rate_limit' in str(e).lower())
+                if rate_limited and attempt == 0:
+                    logger.warning(f"{model} rate limit hit, waiting...")
+                    time.sleep(RATE_LIMIT_RETRY_SECONDS)
+                    continue
+                logger.error(f"❌ {route} request to {model} failed: {e}")
+                with self._lock:
+                    self._models.setdefault(model, _RouteMetrics()).errors += 1
+                return None
+
+        usage = result.get('usage') or {}
+        cost = estimate_cost(model, usage)
+        with self._lock:
+            metrics = self._models.setdefault(model, _RouteMetrics())
+            metrics.calls += 1
+            metrics.latencies.append(time.perf_counter() - start)
+            for target in (metrics, self._routes.setdefault(route, _RouteMetrics())):
+                target.prompt_tokens += usage.get('prompt_tokens', 0)
+                target.completion_tokens += usage.get('completion_tokens', 0)
+                target.cost_usd += cost
+
+        choices = result.get('choices') or []
+        if not choices:
+            return None
+        return (choices[0].get('message') or {}).get('content', '').strip()
+
+    def _record_route(self, route: str, started: float, escalated_fields: int = 0, escalated: bool = False,
+                      failed: bool = False):
+        with self._lock:
+            metrics = self._routes.setdefault(route, _RouteMetrics())
+            metrics.calls += 1
+            metrics.latencies.append(time.perf_counter() - started)
+            if escalated:
+                metrics.escalations += 1
+                metrics.escalated_fields += escalated_fields
+            if failed:
+                metrics.errors += 1
+
+    @staticmethod
+    def _with_instruction(body: Dict[str, Any], instruction: str) -> Dict[str, Any]:
+        """Copy of ``body`` with ``instruction`` appended to the last user message"""
+        messages = [dict(m) for m in body.get('messages', [])]
+        for message in reversed(messages):
+            if message.get('role') == 'user' and isinstance(message.get('content'), str):
+                message['content'] = f"{message['content']}\n\n{instruction}"
+                break
+        return {**body, 'messages': messages}
+
+    def route_extraction(self, collection_name: str, body: Dict[str, Any],
+                         parse: Callable[[str], Optional[Dict[str, Any]]],
+                         requested_fields: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Extract with the fast model, re-asking the strong model only for weak fields
+
+        Weak fields are those ConfidenceScorer flags for review plus any requested
+        field the fast model left out or returned empty (the scorer skips those).
+
+        Args:
+            collection_name: Collection, for ConfidenceScorer's schema filtering
+            body: Chat completions payload; its ``model`` is the strong model
+            parse: Turns a response into a field dict (None if unparseable)
+            requested_fields: Fields the prompt asks for
+
+        Returns:
+            Extracted field dict, or None if both models failed
+        """
+        started = time.perf_counter()
+        strong_model = body.get('model')
+
+        if strong_model == self.fast_model:
+            text = self._chat('extraction', body)
+            data = parse(text) if text else None
+            self._record_route('extraction', started, failed=data is None)
+            return data
+
+        text = self._chat('extraction', {**body, 'model': self.fast_model})
+        data = parse(text) if text else None
+
+        if data is None:
+            logger.info(f"⬆️ Fast model output unusable for {collection_name}; escalating to {strong_model}")
+            text = self._chat('extraction', body)
+            data = parse(text) if text else None
+            self._record_route('extraction', started, escalated=True, failed=data is None)
+            return data
+
+        scores = self.scorer.score_extracted_data(data, collection_name)
+        weak_fields = set(scores['review_fields'])
+        for field in requested_fields or []:
+            value = data.get(field)
+            if value is None or value in ([], {}) or (isinstance(value, str) and not value.strip()):
+                weak_fields.add(field)
+        weak_fields = sorted(weak_fields)
+        if not weak_fields:
+            self._record_route('extraction', started)
+            return data
+
+        logger.info(f"⬆️ Escalating {len(weak_fields)} low-confidence fields to {strong_model}: {weak_fields}")
+        retry = self._with_instruction(body, (
+            "A first pass was unsure about some fields. ONLY return a JSON object with these fields "
+            f"(use null when not stated in the content): {json.dumps(weak_fields)}"
+        ))
+        text = self._chat('extraction', retry)
+        strong_data = parse(text) if text else None
+        if strong_data:
+            # The strong model's answer replaces the weak values, including nulls for guesses
+            data.update({field: strong_data[field] for field in weak_fields if field in strong_data})
+        self._record_route('extraction', started, escalated_fields=len(weak_fields), escalated=True)
+        return data
+
+    def route_generation(self, body: Dict[str, Any], accept: Callable[[str], bool]) -> Optional[str]:
+        """
+        Generate with the fast model, regenerating with the strong model if ``accept`` rejects it
+
+        Args:
+            body: Chat completions payload; its ``model`` is the strong model
+            accept: True if a response contains everything that was asked for
+
+        Returns:
+            Response text, or None if both models failed
+        """
+        started = time.perf_counter()
+        strong_model = body.get('model')
+
+        if strong_model != self.fast_model:
+            text = self._chat('generation', {**body, 'model': self.fast_model})
+            if text and accept(text):
+                self._record_route('generation', started)
+                return text
+            logger.info(f"⬆️ Fast model generation incomplete; regenerating with {strong_model}")
+
+        text = self._chat('generation', body)
+        self._record_route('generation', started, escalated=strong_model != self.fast_model, failed=not text)
+        return text
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-route and per-model latency, cost and escalation metrics"""
+        with self._lock:
+            routes = {name: m.to_dict() for name, m in self._routes.items()}
+            models = {name: m.to_dict() for name, m in self._models.items()}
+        return {
+            'fast_model': self.fast_model,
+            'escalation_threshold': self.scorer.threshold,
+            'routes': routes,
+            'models': models,
+            'total_cost_usd': round(sum(m['cost_usd'] for m in models.values()), 4),
+        }
+
+
+# Singleton instance
+_model_router = None
+
+
+def get_model_router() -> ModelRouter:
+    """Get or create the singleton ModelRouter instance"""
+    global _model_router
+    if _model_router is None:
+        _model_router = ModelRouter()
+    return _model_router
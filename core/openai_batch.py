@@ -0,0 +1,523 @@
+"""
+OpenAI Batch API Runner
+Serializes chat-completion requests to JSONL, submits them through the Batch
+API (half price, separate rate limits) and maps results back by custom_id.
+Submission and polling state is checkpointed in SQLite so a restart resumes
+polling instead of resubmitting.
+"""
+import sqlite3
+import json
+import os
+import time
+import uuid
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Batch API limits: 50,000 requests and 200 MB per input file
+MAX_REQUESTS_PER_BATCH = 50000
+MAX_BATCH_FILE_BYTES = 190 * 1024 * 1024
+
+# Remote statuses after which a batch will not change again
+TERMINAL_STATUSES = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+@dataclass
+class BatchRequest:
+    """One request in a batch
+
+    Attributes:
+        custom_id: Unique within the job; used to map the result back
+        body: Request body for the endpoint (e.g. a chat completions payload)
+        target: Where the result belongs (row number, queue id, field, ...)
+    """
+    custom_id: str
+    body: Dict[str, Any]
+    target: Dict[str, Any] = field(default_factory=dict)
+
+
+def chat_completion_content(response_body: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Extract the assistant message text from a chat completions response body"""
+    if not response_body:
+        return None
+    choices = response_body.get('choices') or []
+    if not choices:
+        return None
+    content = (choices[0].get('message') or {}).get('content')
+    return content.strip() if content else None
+
+
+class HTTPBatchTransport:
+    """
+    Batch API transport over HTTP
+
+    ``base_url`` defaults to OPENAI_BASE_URL (or api.openai.com), so the same
+    flow can be pointed at a local fake endpoint.
+    """
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None, timeout: int = 120):
+        if api_key is None:
+            from config.settings import get_settings
+            api_key = get_settings().OPENAI_API_KEY
+        self.base_url = (base_url or os.environ.get('OPENAI_BASE_URL') or 'https://api.openai.com/v1').rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({'Authorization': f'Bearer {api_key}'})
+
+    def upload_file(self, content: bytes, filename: str) -> str:
+        response = self.session.post(
+            f"{self.base_url}/files",
+            data={'purpose': 'batch'},
+            files={'file': (filename, content, 'application/jsonl')},
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()['id']
+
+    def create_batch(self, input_file_id: str, endpoint: str, completion_window: str,
+                     metadata: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        response = self.session.post(
+            f"{self.base_url}/batches",
+            json={
+                'input_file_id': input_file_id,
+                'endpoint': endpoint,
+                'completion_window': completion_window,
+                'metadata': metadata or {},
+            },
+            timeout=self.timeout,
+        )
+        response.raise_for_status()
+        return response.json()
+
+    def retrieve_batch(self, batch_id: str) -> Dict[str, Any]:
+        response = self.session.get(f"{self.base_url}/batches/{batch_id}", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def download_file(self, file_id: str) -> str:
+        response = self.session.get(f"{self.base_url}/files/{file_id}/content", timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def cancel_batch(self, batch_id: str) -> Dict[str, Any]:
+        response = self.session.post(f"{self.base_url}/batches/{batch_id}/cancel", timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+
+class BatchJobStore:
+    """SQLite checkpoint of batch jobs and their per-request results"""
+
+    def __init__(self, db_path: str = None):
+        """Initialize batch job store
+
+        Args:
+            db_path: Path to SQLite database file (defaults to project root)
+        """
+        if db_path is None:
+            project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            db_path = os.path.join(project_dir, 'openai_batches.db')
+
+        self.db_path = db_path
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS openai_batch_jobs (
+                    job_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    endpoint TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    remote_batch_id TEXT,
+                    input_file_id TEXT,
+                    output_file_id TEXT,
+                    error_file_id TEXT,
+                    request_count INTEGER NOT NULL DEFAULT 0,
+                    completed_count INTEGER NOT NULL DEFAULT 0,
+                    failed_count INTEGER NOT NULL DEFAULT 0,
+                    metadata TEXT,
+                    error TEXT,
+                    applied_at TEXT,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS openai_batch_requests (
+                    job_id TEXT NOT NULL,
+                    custom_id TEXT NOT NULL,
+                    body TEXT NOT NULL,
+                    target TEXT,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    content TEXT,
+                    response TEXT,
+                    error TEXT,
+                    PRIMARY KEY (job_id, custom_id)
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_batch_jobs_status ON openai_batch_jobs(status)')
+            conn.commit()
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _job_from_row(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        job['metadata'] = json.loads(job['metadata']) if job.get('metadata') else {}
+        return job
+
+    def create_job(self, job_id: str, name: str, endpoint: str, requests_: List[BatchRequest],
+                   metadata: Optional[Dict[str, Any]] = None):
+        """Record a job and its requests before anything is sent"""
+        now = datetime.now().isoformat()
+        conn = self._connect()
+        try:
+            conn.execute('''
+                INSERT INTO openai_batch_jobs (job_id, name, endpoint, status, request_count, metadata, created_at, updated_at)
+                VALUES (?, ?, ?, 'pending', ?, ?, ?, ?)
+            ''', (job_id, name, endpoint, len(requests_), json.dumps(metadata or {}), now, now))
+            conn.executemany('''
+                INSERT INTO openai_batch_requests (job_id, custom_id, body, target)
+                VALUES (?, ?, ?, ?)
+            ''', [(job_id, r.custom_id, json.dumps(r.body), json.dumps(r.target)) for r in requests_])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def update_job(self, job_id: str, **fields):
+        if not fields:
+            return
+        fields['updated_at'] = datetime.now().isoformat()
+        if 'metadata' in fields:
+            fields['metadata'] = json.dumps(fields['metadata'])
+        assignments = ', '.join(f"{key} = ?" for key in fields)
+        conn = self._connect()
+        try:
+            conn.execute(f'UPDATE openai_batch_jobs SET {assignments} WHERE job_id = ?',
+                         (*fields.values(), job_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM openai_batch_jobs WHERE job_id = ?', (job_id,)).fetchone()
+            return self._job_from_row(row) if row else None
+        finally:
+            conn.close()
+
+    def list_jobs(self, statuses: Optional[List[str]] = None, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        query = 'SELECT * FROM openai_batch_jobs WHERE 1=1'
+        params: List[Any] = []
+        if statuses:
+            query += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        if name:
+            query += ' AND name = ?'
+            params.append(name)
+        query += ' ORDER BY created_at'
+        conn = self._connect()
+        try:
+            return [self._job_from_row(row) for row in conn.execute(query, params).fetchall()]
+        finally:
+            conn.close()
+
+    def get_request_lines(self, job_id: str, endpoint: str) -> List[str]:
+        """JSONL lines for every request in a job"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('SELECT custom_id, body FROM openai_batch_requests WHERE job_id = ? ORDER BY rowid',
+                                (job_id,)).fetchall()
+        finally:
+            conn.close()
+        return [json.dumps({'custom_id': row['custom_id'], 'method': 'POST', 'url': endpoint,
+                            'body': json.loads(row['body'])}) for row in rows]
+
+    def save_results(self, job_id: str, results: List[Dict[str, Any]]):
+        """Store parsed output/error lines in one transaction"""
+        conn = self._connect()
+        try:
+            conn.executemany('''
+                UPDATE openai_batch_requests
+                SET status = ?, content = ?, response = ?, error = ?
+                WHERE job_id = ? AND custom_id = ?
+            ''', [(r['status'], r.get('content'), json.dumps(r.get('response')) if r.get('response') else None,
+                   r.get('error'), job_id, r['custom_id']) for r in results])
+            conn.commit()
+        finally:
+            conn.close()
+
+    def fail_unfinished(self, job_id: str, error: str) -> int:
+        """Mark requests that never got a result (expired/cancelled batches) as failed"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                UPDATE openai_batch_requests SET status = 'failed', error = ?
+                WHERE job_id = ? AND status = 'pending'
+            ''', (error, job_id))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def get_results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """custom_id -> {status, content, response, error, target}"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT custom_id, target, status, content, response, error
+                FROM openai_batch_requests WHERE job_id = ?
+            ''', (job_id,)).fetchall()
+        finally:
+            conn.close()
+        return {
+            row['custom_id']: {
+                'status': row['status'],
+                'content': row['content'],
+                'response': json.loads(row['response']) if row['response'] else None,
+                'error': row['error'],
+                'target': json.loads(row['target']) if row['target'] else {},
+            }
+            for row in rows
+        }
+
+
+class OpenAIBatchRunner:
+    """
+    Submit, poll and collect OpenAI Batch API jobs
+
+    Usage:
+        runner = get_batch_runner()
+        job_ids = runner.submit_requests('content:sinks', batch_requests, metadata={...})
+        for job_id in job_ids:
+            runner.wait(job_id)
+            results = runner.results(job_id)
+    """
+
+    def __init__(self, transport=None, store: Optional[BatchJobStore] = None,
+                 endpoint: str = '/v1/chat/completions', completion_window: str = '24h',
+                 poll_interval: float = 60.0):
+        """
+        Args:
+            transport: Object with upload_file/create_batch/retrieve_batch/download_file/cancel_batch
+                (defaults to HTTPBatchTransport)
+            store: Checkpoint store (defaults to BatchJobStore at the project root)
+            endpoint: Batch endpoint the requests target
+            completion_window: Batch API completion window
+            poll_interval: Seconds between polls in wait()
+        """
+        self.transport = transport or HTTPBatchTransport()
+        self.store = store or BatchJobStore()
+        self.endpoint = endpoint
+        self.completion_window = completion_window
+        self.poll_interval = poll_interval
+
+    def submit_requests(self, name: str, batch_requests: List[BatchRequest],
+                        metadata: Optional[Dict[str, Any]] = None) -> List[str]:
+        """
+        Checkpoint and submit requests, split into as many batches as the API limits need
+
+        Args:
+            name: Job name (e.g. 'content:sinks'), used to find jobs later
+            batch_requests: Requests with unique custom_ids
+            metadata: JSON-serializable data needed to apply results later
+
+        Returns:
+            Local job IDs, one per submitted batch
+        """
+        custom_ids = [r.custom_id for r in batch_requests]
+        if len(custom_ids) != len(set(custom_ids)):
+            raise ValueError("custom_id values must be unique within a submission")
+
+        job_ids = []
+        chunk: List[BatchRequest] = []
+        chunk_bytes = 0
+        for request in batch_requests:
+            line_bytes = len(json.dumps(request.body)) + 200
+            if chunk and (len(chunk) >= MAX_REQUESTS_PER_BATCH or chunk_bytes + line_bytes > MAX_BATCH_FILE_BYTES):
+                job_ids.append(self._create_and_submit(name, chunk, metadata))
+                chunk, chunk_bytes = [], 0
+            chunk.append(request)
+            chunk_bytes += line_bytes
+        if chunk:
+            job_ids.append(self._create_and_submit(name, chunk, metadata))
+        return job_ids
+
+    def _create_and_submit(self, name: str, chunk: List[BatchRequest], metadata: Optional[Dict[str, Any]]) -> str:
+        job_id = f"batch-{uuid.uuid4().hex[:12]}"
+        self.store.create_job(job_id, name, self.endpoint, chunk, metadata)
+        logger.info(f"📦 Checkpointed batch job {job_id} ({len(chunk)} requests)")
+        self.submit(job_id)
+        return job_id
+
+    def submit(self, job_id: str) -> Dict[str, Any]:
+        """Upload the JSONL input and create the remote batch for a pending job"""
+        job = self.store.get_job(job_id)
+        if not job:
+            raise ValueError(f"Unknown batch job: {job_id}")
+        if job['remote_batch_id']:
+            return job
+
+        try:
+            input_file_id = job['input_file_id']
+            if not input_file_id:
+                lines = self.store.get_request_lines(job_id, job['endpoint'])
+                input_file_id = self.transport.upload_file(('\n'.join(lines) + '\n').encode('utf-8'), f"{job_id}.jsonl")
+                self.store.update_job(job_id, input_file_id=input_file_id)
+
+            batch = self.transport.create_batch(input_file_id, job['endpoint'], self.completion_window,
+                                                metadata={'job_id': job_id, 'name': job['name']})
+            self.store.update_job(job_id, remote_batch_id=batch['id'], status=batch.get('status', 'validating'))
+            logger.info(f"🚀 Submitted batch job {job_id} as {batch['id']}")
+        except Exception as e:
+            # Stays 'pending' so resume() retries the submission
+            logger.error(f"❌ Failed to submit batch job {job_id}: {e}")
+            self.store.update_job(job_id, error=str(e))
+            raise
+
+        return self.store.get_job(job_id)
+
+    def poll(self, job_id: str) -> Dict[str, Any]:
+        """Refresh a job from the API; collects results once the batch reaches a terminal state"""
+        job = self.store.get_job(job_id)
+        if not job:
+            raise ValueError(f"Unknown batch job: {job_id}")
+        if job['status'] in TERMINAL_STATUSES or not job['remote_batch_id']:
+            return job
+
+        batch = self.transport.retrieve_batch(job['remote_batch_id'])
+        status = batch.get('status', job['status'])
+        counts = batch.get('request_counts') or {}
+        updates = {
+            'status': status,
+            'completed_count': counts.get('completed', job['completed_count']),
+            'failed_count': counts.get('failed', job['failed_count']),
+        }
+
+        if status in TERMINAL_STATUSES:
+            updates['output_file_id'] = batch.get('output_file_id')
+            updates['error_file_id'] = batch.get('error_file_id')
+            self._collect(job_id, updates['output_file_id'], updates['error_file_id'])
+            if status != 'completed':
+                errors = (batch.get('errors') or {}).get('data') or []
+                updates['error'] = '; '.join(e.get('message', '') for e in errors) or status
+                self.store.fail_unfinished(job_id, f"batch {status}")
+            logger.info(f"✅ Batch job {job_id} {status}: {updates['completed_count']} completed, "
+                        f"{updates['failed_count']} failed")
+
+        self.store.update_job(job_id, **updates)
+        return self.store.get_job(job_id)
+
+    def _collect(self, job_id: str, output_file_id: Optional[str], error_file_id: Optional[str]):
+        """Download output and error files and store each line against its custom_id"""
+        results = []
+        for file_id in (output_file_id, error_file_id):
+            if not file_id:
+                continue
+            for line in self.transport.download_file(file_id).splitlines():
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                response = record.get('response') or {}
+                body = response.get('body')
+                error = record.get('error')
+                if not error and response.get('status_code', 200) >= 400:
+                    error = (body or {}).get('error')
+                if error:
+                    message = error.get('message') if isinstance(error, dict) else str(error)
+                    results.append({'custom_id': record['custom_id'], 'status': 'failed', 'error': message,
+                                    'response': body})
+                else:
+                    results.append({'custom_id': record['custom_id'], 'status': 'completed',
+                                    'content': chat_completion_content(body), 'response': body})
+        if results:
+            self.store.save_results(job_id, results)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None,
+             on_poll: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Poll until the job reaches a terminal state
+
+        Args:
+            job_id: Local job ID
+            timeout: Give up (returning the current state) after this many seconds
+            on_poll: Called with the job after each poll
+        """
+        deadline = time.time() + timeout if timeout else None
+        while True:
+            job = self.poll(job_id)
+            if on_poll:
+                on_poll(job)
+            if job['status'] in TERMINAL_STATUSES:
+                return job
+            if deadline and time.time() >= deadline:
+                logger.info(f"⏳ Batch job {job_id} still {job['status']} after {timeout}s")
+                return job
+            time.sleep(self.poll_interval)
+
+    def resume(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Pick up unfinished jobs after a restart: submit jobs that never reached
+        the API and poll jobs that are still running
+
+        Returns:
+            The refreshed state of every unfinished job
+        """
+        refreshed = []
+        unfinished = [j for j in self.store.list_jobs(name=name) if j['status'] not in TERMINAL_STATUSES]
+        for job in unfinished:
+            try:
+                if not job['remote_batch_id']:
+                    self.submit(job['job_id'])
+                refreshed.append(self.poll(job['job_id']))
+            except Exception as e:
+                logger.error(f"❌ Could not resume batch job {job['job_id']}: {e}")
+                refreshed.append(self.store.get_job(job['job_id']))
+        if unfinished:
+            logger.info(f"🔄 Resumed {len(unfinished)} unfinished batch jobs")
+        return refreshed
+
+    def results(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        """Per-request results for a job, keyed by custom_id"""
+        return self.store.get_results(job_id)
+
+    def cancel(self, job_id: str) -> Dict[str, Any]:
+        job = self.store.get_job(job_id)
+        if job and job['remote_batch_id'] and job['status'] not in TERMINAL_STATUSES:
+            self.transport.cancel_batch(job['remote_batch_id'])
+            self.store.update_job(job_id, status='cancelling')
+        return self.store.get_job(job_id)
+
+    def mark_applied(self, job_id: str):
+        """Record that a job's results have been written back, so they are not applied twice"""
+        self.store.update_job(job_id, applied_at=datetime.now().isoformat())
+
+
+_batch_runner = None
+_batch_runner_lock = threading.Lock()
+
+
+def get_batch_runner() -> OpenAIBatchRunner:
+    """Get singleton batch runner instance"""
+    global _batch_runner
+    if _batch_runner is None:
+        with _batch_runner_lock:
+            if _batch_runner is None:
+                _batch_runner = OpenAIBatchRunner()
+    return _batch_runner
@@ -12,6 +12,7 @@ import re
 from typing import Dict, Any, Optional, List
 from bs4 import BeautifulSoup
 import requests
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
@@ -47,40 +48,101 @@ class PageExtractor:
             # Fetch page
             response = self.session.get(product_url, timeout=30)
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, 'html.parser')
-
-            # Extract page title early
-            title = self._extract_title(soup)
-
-            # Use supplier-specific extraction if hint provided
-            if supplier_hint:
-                specs = self._extract_supplier_specific(soup, product_url, supplier_hint)
-                if specs:
-                    # If only image is found, try generic extraction for specs
-                    if len(specs) == 1 and 'shopify_images' in specs:
-                        generic_specs = self._extract_generic(soup)
-                        if generic_specs:
-                            specs.update(generic_specs)
-                    if title and 'title' not in specs:
-                        specs['title'] = title
-                    logger.info(f"  ✅ Extracted {len(specs)} fields from page")
-                    return specs
-
-            # Generic extraction as fallback
-            specs = self._extract_generic(soup)
+            return self.extract_from_html(response.content, product_url, supplier_hint)
+
+        except Exception as e:
+            logger.error(f"  ❌ Page extraction failed: {e}")
+            return {}
+
+    def extract_from_html(self, html: Any, product_url: str, supplier_hint: str = None) -> Dict[str, Any]:
+        """
+        Extract specifications from already-fetched product page HTML.
+
+        Args:
+            html: Page HTML (str or bytes)
+            product_url: URL the HTML came from
+            supplier_hint: Supplier domain hint (e.g., 'abey.com.au')
+
+        Returns:
+            Dictionary of extracted specifications
+        """
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Extract page title early
+        title = self._extract_title(soup)
 
+        # Use supplier-specific extraction if hint provided
+        if supplier_hint:
+            specs = self._extract_supplier_specific(soup, product_url, supplier_hint)
             if specs:
+                # If only image is found, try generic extraction for specs
+                if len(specs) == 1 and 'shopify_images' in specs:
+                    generic_specs = self._extract_generic(soup)
+                    if generic_specs:
+                        specs.update(generic_specs)
                 if title and 'title' not in specs:
                     specs['title'] = title
                 logger.info(f"  ✅ Extracted {len(specs)} fields from page")
-            else:
-                logger.warning(f"  ⚠️  No specs found on page")
-
-            return specs
-
-        except Exception as e:
-            logger.error(f"  ❌ Page extraction failed: {e}")
-            return {}
+                return specs
+
+        # Generic extraction as fallback
+        specs = self._extract_generic(soup)
+
+        if specs:
+            if title and 'title' not in specs:
+                specs['title'] = title
+            logger.info(f"  ✅ Extracted {len(specs)} fields from page")
+        else:
+            logger.warning(f"  ⚠️  No specs found on page")
+
+        return specs
+
+    def extract_shopify_json(self, product_url: str) -> Dict[str, Any]:
+        """
+        Extract basic product fields from a Shopify storefront's product JSON.
+
+        Shopify supplier sites serve every product page as JSON at
+        ``/products/<handle>.json``, which is cheaper and more reliable than
+        parsing the rendered page.
+
+        Args:
+            product_url: URL of the product page
+
+        Returns:
+            Dictionary of extracted fields (empty if the endpoint is unavailable)
+        """
+        parsed = urlparse(product_url)
+        if '/products/' not in parsed.path:
+            return {}
+
+        json_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path.rstrip('/')}.json"
+        try:
+            response = self.session.get(json_url, timeout=15)
+            response.raise_for_status()
+            product = response.json().get('product') or {}
+        except Exception as e:
+            logger.debug(f"  Shopify product JSON unavailable for {product_url}: {e}")
+            return {}
+
+        specs = {}
+        if product.get('title'):
+            specs['title'] = product['title']
+        if product.get('vendor'):
+            specs['vendor'] = product['vendor']
+            specs['brand_name'] = product['vendor']
+
+        variants = product.get('variants') or []
+        if len(variants) == 1 and variants[0].get('sku'):
+            specs['sku'] = variants[0]['sku']
+
+        # Single-valued options (e.g. one finish) are product attributes
+        for option in product.get('options') or []:
+            values = option.get('values') or []
+            field_name = self._normalize_field_name(option.get('name', ''))
+            if field_name and len(values) == 1 and values[0].lower() != 'default title':
+                specs[field_name] = values[0]
+
+        return self._clean_specs(specs)
 
     def _extract_supplier_specific(self, soup: BeautifulSoup, url: str, supplier: str) -> Dict[str, Any]:
         """Extract using supplier-specific patterns"""
@@ -0,0 +1,305 @@
+"""
+Processing Queue Approver
+Approves processing queue items in batches: all items are loaded in one query
+and cleaned in memory. The database is written first (supplier products, WIP
+entries and an 'approving' queue status, per item so one bad item doesn't fail
+the batch), then each collection's sheet rows are written with one append_rows
+call, and finally the sheet rows are recorded and the queue items removed. An
+item whose sheet row exists is therefore always in WIP, and a retry can't
+append it twice. Large batches run as background jobs with progress polling.
+"""
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+from config.settings import get_settings
+from config.collections import get_collection_config
+from core.data_cleaner import DataCleaner
+from core.sheets_manager import get_sheets_manager
+from core.supplier_db import get_supplier_db
+
+logger = logging.getLogger(__name__)
+
+# Batches larger than this run as background jobs instead of inside the request
+BACKGROUND_THRESHOLD = 25
+
+
+def _shopify_product_url(handle: str, settings) -> str:
+    """Public Shopify product URL for a handle ('' when the shop URL isn't configured)"""
+    if not handle:
+        return ''
+    base = settings.SHOPIFY_CONFIG.get('SHOP_URL', '').strip()
+    if not base:
+        return ''
+    if not base.startswith('http'):
+        base = f"https://{base}"
+    return f"{base.rstrip('/')}/products/{handle.strip()}"
+
+
+class ProcessingQueueApprover:
+    """Moves approved processing queue items to their collection sheets and WIP"""
+
+    def __init__(self, supplier_db=None, sheets_manager=None):
+        self.settings = get_settings()
+        self.supplier_db = supplier_db or get_supplier_db()
+        self.sheets_manager = sheets_manager or get_sheets_manager()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def start(self, queue_ids: List[int]) -> str:
+        """
+        Start a background approval job
+
+        Args:
+            queue_ids: Processing queue item IDs to approve
+
+        Returns:
+            Job ID for get_job()
+        """
+        job_id = str(uuid.uuid4())
+        with self.lock:
+            self.jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'total': len(queue_ids),
+                'processed': 0,
+                'approved_count': 0,
+                'error_count': 0,
+                'created_at': datetime.now().isoformat(),
+                'completed_at': None,
+                'error': None,
+                'result': None,
+            }
+
+        thread = threading.Thread(target=self._run_job, args=(job_id, list(queue_ids)), daemon=True,
+                                  name=f"queue-approve-{job_id[:8]}")
+        thread.start()
+        logger.info(f"📋 Started approval job {job_id} for {len(queue_ids)} queue items")
+        return job_id
+
+    def _run_job(self, job_id: str, queue_ids: List[int]):
+        self._update_job(job_id, status='running')
+
+        def progress(job_stats: Dict[str, int]):
+            self._update_job(job_id, **job_stats)
+
+        try:
+            result = self.run(queue_ids, progress_callback=progress)
+            self._update_job(job_id, status='completed', completed_at=datetime.now().isoformat(),
+                             approved_count=result['approved_count'], error_count=len(result['errors']),
+                             result=result)
+        except Exception as e:
+            logger.error(f"❌ Approval job {job_id} failed: {e}")
+            self._update_job(job_id, status='failed', error=str(e), completed_at=datetime.now().isoformat())
+
+    def _load_rules(self, data_cleaner: DataCleaner):
+        rules_spreadsheet_id = getattr(self.settings, 'RULES_SPREADSHEET_ID', None)
+        if rules_spreadsheet_id:
+            data_cleaner.load_rules(rules_spreadsheet_id)
+
+    def _prepare(self, item: Dict[str, Any], data_cleaner: DataCleaner,
+                 valid_fields: Optional[set]) -> Dict[str, Any]:
+        """Clean and validate one queue item; returns its approval record with sheet data"""
+        collection_name = item['target_collection']
+        sku = item['sku']
+        title = item.get('title', '')
+        vendor = item.get('vendor', '')
+
+        extracted_data = item.get('extracted_data')
+        if isinstance(extracted_data, str):
+            extracted_data = json.loads(extracted_data) if extracted_data else {}
+        elif extracted_data is None:
+            extracted_data = {}
+
+        try:
+            cleaned_data = data_cleaner.clean_extracted_data(
+                collection_name=collection_name,
+                extracted_data=extracted_data,
+                title=title,
+                vendor=vendor
+            )
+        except Exception as clean_error:
+            logger.warning(f"  ⚠️ DataCleaner failed for {sku}, using raw data: {clean_error}")
+            cleaned_data = extracted_data
+
+        if valid_fields is not None:
+            validated_data = {k: v for k, v in cleaned_data.items() if k in valid_fields}
+        else:
+            validated_data = cleaned_data
+
+        product_url = _shopify_product_url(item.get('shopify_handle', ''), self.settings)
+        sheet_data = {
+            'variant_sku': sku,
+            'url': product_url,
+            'title': title,
+            'vendor': vendor,
+            **validated_data
+        }
+        if item.get('shopify_images'):
+            sheet_data['shopify_images'] = item.get('shopify_images')
+        if item.get('shopify_spec_sheet'):
+            sheet_data['shopify_spec_sheet'] = item.get('shopify_spec_sheet')
+
+        return {
+            'queue_id': item['id'],
+            'sku': sku,
+            'product_url': product_url,
+            'product_name': title,
+            'supplier_name': vendor or 'Shopify',
+            'collection_name': collection_name,
+            'extracted_data': validated_data,
+            'sheet_data': sheet_data,
+            'wip_id': None,
+            'sheet_row': None,
+        }
+
+    def run(self, queue_ids: List[int],
+            progress_callback: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, Any]:
+        """
+        Approve queue items now, in the calling thread
+
+        Args:
+            queue_ids: Processing queue item IDs to approve
+            progress_callback: Called with running totals after cleaning and after each collection write
+
+        Returns:
+            Dict with approved (per-item summaries), approved_count and errors
+        """
+        queue_ids = list(dict.fromkeys(int(queue_id) for queue_id in queue_ids))
+        errors = []
+        stats = {'total': len(queue_ids), 'processed': 0, 'approved_count': 0, 'error_count': 0}
+
+        items = self.supplier_db.get_processing_queue_items(queue_ids)
+        for queue_id in queue_ids:
+            if queue_id not in items:
+                errors.append(f'Item {queue_id} not found')
+
+        data_cleaner = DataCleaner(self.sheets_manager)
+        try:
+            self._load_rules(data_cleaner)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load cleaning rules: {e}")
+
+        # Clean everything in memory, grouped by target collection
+        by_collection: Dict[str, List[Dict[str, Any]]] = {}
+        valid_fields_cache: Dict[str, Optional[set]] = {}
+        for queue_id in queue_ids:
+            item = items.get(queue_id)
+            if not item:
+                continue
+            collection_name = item['target_collection']
+            if collection_name not in valid_fields_cache:
+                try:
+                    column_mapping = getattr(get_collection_config(collection_name), 'column_mapping', {})
+                    valid_fields_cache[collection_name] = set(column_mapping.keys())
+                except Exception as config_error:
+                    logger.warning(f"  ⚠️ Schema validation skipped for {collection_name}: {config_error}")
+                    valid_fields_cache[collection_name] = None
+            try:
+                approval = self._prepare(item, data_cleaner, valid_fields_cache[collection_name])
+                by_collection.setdefault(collection_name, []).append(approval)
+            except Exception as item_error:
+                logger.error(f"Error preparing item {queue_id}: {item_error}")
+                errors.append(f'{queue_id}: {str(item_error)}')
+
+        stats['error_count'] = len(errors)
+        if progress_callback:
+            progress_callback(dict(stats))
+
+        # Database first: WIP entries and 'approving' status before any sheet row exists
+        wip_ids, failures = self.supplier_db.begin_processing_queue_approvals(
+            [approval for collection_approvals in by_collection.values() for approval in collection_approvals]
+        )
+        for collection_approvals in by_collection.values():
+            for approval in collection_approvals:
+                if approval['queue_id'] in failures:
+                    logger.error(f"Error approving item {approval['queue_id']}: {failures[approval['queue_id']]}")
+                    errors.append(f"{approval['sku']}: {failures[approval['queue_id']]}")
+                else:
+                    approval['wip_id'] = wip_ids[approval['queue_id']]
+
+        # One sheet append per collection, then its sheet rows are recorded
+        approvals = []
+        for collection_name, collection_approvals in by_collection.items():
+            started = [approval for approval in collection_approvals if approval['wip_id'] is not None]
+            if started:
+                try:
+                    rows = self.sheets_manager.add_products(
+                        collection_name, [approval['sheet_data'] for approval in started]
+                    )
+                    for approval, sheet_row in zip(started, rows):
+                        approval['sheet_row'] = sheet_row
+                except Exception as sheet_error:
+                    logger.error(f"  ⚠️ Sheet write failed for {collection_name}: {sheet_error}")
+                    errors.extend(
+                        f"{approval['sku']}: Added to WIP but sheet write failed - {str(sheet_error)}"
+                        for approval in started
+                    )
+
+                try:
+                    self.supplier_db.complete_processing_queue_approvals(started)
+                    approvals.extend(started)
+                except Exception as db_error:
+                    # Items stay 'approving' with their WIP entry, so a retry won't append them again
+                    logger.error(f"  ⚠️ Could not finish approvals for {collection_name}: {db_error}")
+                    errors.extend(
+                        f"{approval['sku']}: In WIP (sheet row {approval['sheet_row']}) but left 'approving' - {str(db_error)}"
+                        for approval in started
+                    )
+
+            stats['processed'] += len(collection_approvals)
+            stats['error_count'] = len(errors)
+            if progress_callback:
+                progress_callback(dict(stats))
+
+        approved = [
+            {
+                'queue_id': approval['queue_id'],
+                'sku': approval['sku'],
+                'wip_id': approval['wip_id'],
+                'collection': approval['collection_name'],
+                'sheet_row': approval['sheet_row'],
+                'fields_written': len(approval['extracted_data'])
+            }
+            for approval in approvals
+        ]
+        stats['approved_count'] = len(approved)
+        if progress_callback:
+            progress_callback(dict(stats))
+
+        logger.info(f"✅ Approved {len(approved)}/{len(queue_ids)} queue items "
+                    f"across {len(by_collection)} collections ({len(errors)} errors)")
+        return {
+            'approved': approved,
+            'approved_count': len(approved),
+            'errors': errors
+        }
+
+    def _update_job(self, job_id: str, **fields):
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a job's status, counts and (once completed) result"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+
+# Singleton instance
+_queue_approver = None
+_queue_approver_lock = threading.Lock()
+
+
+def get_queue_approver() -> ProcessingQueueApprover:
+    """Get singleton processing queue approver instance"""
+    global _queue_approver
+    if _queue_approver is None:
+        with _queue_approver_lock:
+            if _queue_approver is None:
+                _queue_approver = ProcessingQueueApprover()
+    return _queue_approver
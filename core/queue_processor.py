@@ -7,11 +7,16 @@ to ensure consistency with the collection workflows.
 
 import logging
 import json
-from typing import Dict, Any, Optional, List
+import time
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
+# Keys the extraction call adds to its JSON output for the product type check
+TYPE_MATCH_KEY = 'product_type_matches'
+DETECTED_TYPE_KEY = 'detected_product_type'
+
 
 @dataclass
 class QueueExtractionResult:
@@ -23,6 +28,130 @@ class QueueExtractionResult:
     error: Optional[str] = None
     source_url: Optional[str] = None
     collection: Optional[str] = None
+    timings: Optional[Dict[str, float]] = None        # Seconds per stage (fetch, text, render, ai, clean, normalize, total)
+
+
+class SpecSheetDocument:
+    """
+    A spec sheet fetched at most once per queue item.
+
+    The PDF text and first-page image are derived lazily from the in-memory
+    bytes and memoized, so every stage of the pipeline shares one download.
+    Stage durations are recorded in ``timings``.
+    """
+
+    _UNSET = object()
+
+    def __init__(self, url: str, timeout: int = 30):
+        self.url = url
+        self.timeout = timeout
+        self.is_pdf = url.lower().endswith('.pdf') or 'pdf' in url.lower()
+        self.timings: Dict[str, float] = {}
+        self._content: Optional[bytes] = None
+        self._text = self._UNSET
+        self._image = self._UNSET
+
+    def _record(self, stage: str, start: float):
+        self.timings[stage] = round(self.timings.get(stage, 0.0) + time.perf_counter() - start, 3)
+
+    @property
+    def content(self) -> bytes:
+        """Raw spec sheet bytes (downloaded on first access)"""
+        if self._content is None:
+            import requests as req
+
+            start = time.perf_counter()
+            try:
+                response = req.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+                self._content = response.content
+            finally:
+                self._record('fetch', start)
+        return self._content
+
+    @property
+    def text(self) -> Optional[str]:
+        """Text of the first 2 PDF pages, or None if the PDF has no meaningful text layer"""
+        if self._text is self._UNSET:
+            self._text = None
+            if self.is_pdf:
+                try:
+                    pdf_bytes = self.content
+                    start = time.perf_counter()
+                    try:
+                        # Try PyMuPDF for text extraction
+                        import fitz
+                        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+                        text = ""
+                        for page_num in range(min(2, doc.page_count)):
+                            text += doc[page_num].get_text()
+                        doc.close()
+
+                        # Check if we got meaningful text (at least 200 chars)
+                        if len(text.strip()) > 200:
+                            logger.info(f"  📝 Extracted {len(text)} chars of text from PDF")
+                            self._text = text.strip()
+                    except ImportError:
+                        pass
+                    finally:
+                        self._record('text', start)
+                except Exception as e:
+                    logger.debug(f"  Text extraction failed: {e}")
+        return self._text
+
+    @property
+    def first_page_image(self) -> Optional[str]:
+        """First PDF page as a base64 PNG for the Vision API (None for image URLs)"""
+        if self._image is self._UNSET:
+            if not self.is_pdf:
+                self._image = None  # Use URL directly for images
+                return None
+
+            logger.info(f"  📄 Converting PDF to image: {self.url[:60]}...")
+            try:
+                pdf_bytes = self.content
+                start = time.perf_counter()
+                try:
+                    self._image = self._render_first_page(pdf_bytes)
+                finally:
+                    self._record('render', start)
+            except Exception as e:
+                logger.error(f"  ❌ PDF conversion failed: {e}")
+                raise
+        return self._image
+
+    @staticmethod
+    def _render_first_page(pdf_bytes: bytes) -> Optional[str]:
+        import base64
+        import io
+
+        # Try pdf2image first
+        try:
+            from pdf2image import convert_from_bytes
+            images = convert_from_bytes(pdf_bytes, first_page=1, last_page=1, dpi=150)
+            if images:
+                img_buffer = io.BytesIO()
+                images[0].save(img_buffer, format='PNG')
+                img_buffer.seek(0)
+                return base64.b64encode(img_buffer.read()).decode('utf-8')
+        except ImportError:
+            pass
+
+        # Try PyMuPDF as fallback
+        try:
+            import fitz
+            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+            if doc.page_count > 0:
+                page = doc[0]
+                mat = fitz.Matrix(2, 2)
+                pix = page.get_pixmap(matrix=mat)
+                result = base64.b64encode(pix.tobytes("png")).decode('utf-8')
+                doc.close()
+                return result
+        except ImportError:
+            raise ValueError("PDF conversion libraries not available")
+
+        return None
 
 
 class QueueProcessor:
@@ -65,6 +194,9 @@ class QueueProcessor:
         2. DataCleaner for rule-based standardization
         3. Column mapping validation
 
+        The spec sheet is downloaded once; the product-type check is part of
+        the extraction call's JSON output rather than a separate model call.
+
         Args:
             spec_sheet_url: URL to the spec sheet (PDF or image)
             collection_name: Target collection key (e.g., 'toilets', 'sinks')
@@ -74,166 +206,92 @@ class QueueProcessor:
         Returns:
             QueueExtractionResult with extracted and normalized data
         """
+        started = time.perf_counter()
+        document = SpecSheetDocument(spec_sheet_url)
+        timings = document.timings
+
+        def finish(result: QueueExtractionResult) -> QueueExtractionResult:
+            timings['total'] = round(time.perf_counter() - started, 3)
+            result.timings = timings
+            return result
+
         try:
             logger.info(f"🔄 Queue extraction for {collection_name}: {spec_sheet_url[:60]}...")
 
             config = self._get_collection_config(collection_name)
             if not config:
-                return QueueExtractionResult(
+                return finish(QueueExtractionResult(
                     success=False,
                     error=f"Unknown collection: {collection_name}"
-                )
+                ))
 
             # Step 1: Fetch and extract using AIExtractor
             extraction_fields = getattr(config, 'ai_extraction_fields', [])
             logger.info(f"  📋 Using {len(extraction_fields)} extraction fields from collection config")
 
-            # Try to extract using AIExtractor's methods
-            raw_data = self._extract_with_ai(spec_sheet_url, collection_name, config)
+            raw_data, type_check = self._extract_with_ai(document, collection_name, config)
+
+            if type_check.get('product_type_matches') is False:
+                detected = type_check.get('detected_product_type') or 'a different product'
+                logger.warning(f"  ⚠️  Skipping extraction - spec sheet doesn't match expected collection: {collection_name}")
+                return finish(QueueExtractionResult(
+                    success=False,
+                    error=f"Spec sheet appears to be for {detected}, not {collection_name}",
+                    source_url=spec_sheet_url,
+                    collection=collection_name
+                ))
 
             if not raw_data:
-                return QueueExtractionResult(
+                return finish(QueueExtractionResult(
                     success=False,
                     error="No data could be extracted from the spec sheet",
                     source_url=spec_sheet_url,
                     collection=collection_name
-                )
+                ))
 
             # Step 2: Apply data cleaning rules
+            start = time.perf_counter()
             cleaned_data = self._apply_cleaning_rules(
                 raw_data, collection_name, product_title, vendor
             )
+            timings['clean'] = round(time.perf_counter() - start, 3)
 
             # Step 3: Normalize and validate against column mapping
+            start = time.perf_counter()
             normalized_data = self._normalize_to_schema(cleaned_data, collection_name, config)
+            timings['normalize'] = round(time.perf_counter() - start, 3)
 
             logger.info(f"  ✅ Extracted {len(raw_data)} raw fields, cleaned to {len(cleaned_data)} fields, normalized {len(normalized_data)} fields")
 
-            return QueueExtractionResult(
+            return finish(QueueExtractionResult(
                 success=True,
                 extracted_data=cleaned_data,      # Cleaned, ready for display/edit
                 normalized_data=normalized_data,   # Mapped to sheet columns
                 raw_extraction=raw_data,           # Original for audit
                 source_url=spec_sheet_url,
                 collection=collection_name
-            )
+            ))
 
         except Exception as e:
             logger.error(f"❌ Queue extraction failed: {e}")
             import traceback
             logger.error(traceback.format_exc())
-            return QueueExtractionResult(
+            return finish(QueueExtractionResult(
                 success=False,
                 error=str(e),
                 source_url=spec_sheet_url,
                 collection=collection_name
-            )
+            ))
 
-    def _validate_product_type(self, spec_sheet_url: str, expected_collection: str) -> bool:
-        """
-        Validate that the spec sheet matches the expected product type.
-        Returns True if valid, False if mismatch.
-        """
-        import requests as req
-        from config.settings import get_settings
-
-        settings = get_settings()
-        openai_key = settings.OPENAI_API_KEY
-
-        if not openai_key:
-            return True  # Skip validation if no API key
-
-        try:
-            # Try text extraction first
-            pdf_text = self._extract_text_from_pdf(spec_sheet_url)
-
-            if pdf_text:
-                # Quick text-based validation
-                validation_prompt = f"""Is this spec sheet for a {self._get_collection_context(expected_collection)}?
-
-Spec sheet content:
-{pdf_text[:2000]}
-
-Answer with ONLY 'yes' or 'no'."""
-            else:
-                # Fall back to image validation
-                image_content = self._convert_to_image(spec_sheet_url)
-                if not image_content:
-                    return True  # Can't validate, proceed
-
-                validation_prompt = f"""Is this spec sheet for a {self._get_collection_context(expected_collection)}?
-
-Answer with ONLY 'yes' or 'no'."""
-
-                # Use vision for validation
-                payload = {
-                    "model": "gpt-4o-mini",  # Use cheaper model for validation
-                    "messages": [{
-                        "role": "user",
-                        "content": [
-                            {"type": "text", "text": validation_prompt},
-                            {
-                                "type": "image_url",
-                                "image_url": {"url": f"data:image/png;base64,{image_content}"}
-                            }
-                        ]
-                    }],
-                    "max_tokens": 10
-                }
-
-                response = req.post(
-                    "https://api.openai.com/v1/chat/completions",
-                    headers={
-                        "Content-Type": "application/json",
-                        "Authorization": f"Bearer {openai_key}"
-                    },
-                    json=payload,
-                    timeout=30
-                )
-                response.raise_for_status()
-                result = response.json()
-                answer = result['choices'][0]['message']['content'].strip().lower()
-
-                is_valid = 'yes' in answer
-                if not is_valid:
-                    logger.warning(f"  ⚠️  Product type mismatch: Expected {expected_collection}, spec sheet appears to be different")
-                return is_valid
-
-            # Text-based validation (simpler, no image needed)
-            payload = {
-                "model": "gpt-4o-mini",
-                "messages": [{"role": "user", "content": validation_prompt}],
-                "max_tokens": 10
-            }
-
-            response = req.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {openai_key}"
-                },
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-            result = response.json()
-            answer = result['choices'][0]['message']['content'].strip().lower()
-
-            is_valid = 'yes' in answer
-            if not is_valid:
-                logger.warning(f"  ⚠️  Product type mismatch: Expected {expected_collection}, spec sheet appears to be different")
-            return is_valid
-
-        except Exception as e:
-            logger.debug(f"  Product type validation failed: {e}")
-            return True  # Proceed if validation fails
-
-    def _extract_with_ai(self, spec_sheet_url: str, collection_name: str, config) -> Dict[str, Any]:
+    def _extract_with_ai(self, document: SpecSheetDocument, collection_name: str,
+                         config) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         """
         Perform AI extraction using the Vision API with collection-specific prompts.
+
+        Returns:
+            (extracted fields, product type check with 'product_type_matches'
+            and 'detected_product_type' when the model reported them)
         """
-        import base64
-        import io
         import requests as req
         from config.settings import get_settings
 
@@ -243,11 +301,6 @@ Answer with ONLY 'yes' or 'no'."""
         if not openai_key:
             raise ValueError("OpenAI API key not configured")
 
-        # Validate product type first
-        if not self._validate_product_type(spec_sheet_url, collection_name):
-            logger.warning(f"  ⚠️  Skipping extraction - spec sheet doesn't match expected collection: {collection_name}")
-            return {}
-
         # Get extraction fields from config
         extraction_fields = getattr(config, 'ai_extraction_fields', [])
 
@@ -283,14 +336,14 @@ RULES:
 4. Use lowercase snake_case for field names
 5. Only include fields where values are clearly stated
 
+PRODUCT TYPE CHECK:
+Also include "{TYPE_MATCH_KEY}": true if this spec sheet is for a {collection_context}, false if it is
+clearly a different kind of product, and "{DETECTED_TYPE_KEY}": a few words naming the product shown.
+
 Return as JSON object."""
 
         # Try text extraction first for PDFs (more reliable for structured specs)
-        is_pdf = spec_sheet_url.lower().endswith('.pdf') or 'pdf' in spec_sheet_url.lower()
-        pdf_text = None
-
-        if is_pdf:
-            pdf_text = self._extract_text_from_pdf(spec_sheet_url)
+        pdf_text = document.text
 
         # Build API request based on available content
         if pdf_text:
@@ -306,7 +359,7 @@ Return as JSON object."""
             }
         else:
             # Fall back to vision-based extraction
-            image_content = self._convert_to_image(spec_sheet_url)
+            image_content = document.first_page_image
 
             if image_content:
                 image_data = {
@@ -316,7 +369,7 @@ Return as JSON object."""
             else:
                 image_data = {
                     "type": "image_url",
-                    "image_url": {"url": spec_sheet_url}
+                    "image_url": {"url": document.url}
                 }
 
             payload = {
@@ -332,103 +385,28 @@ Return as JSON object."""
                 "response_format": {"type": "json_object"}  # Force JSON responses
             }
 
-        response = req.post(
-            "https://api.openai.com/v1/chat/completions",
-            headers={
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {openai_key}"
-            },
-            json=payload,
-            timeout=60
-        )
-        response.raise_for_status()
+        start = time.perf_counter()
+        try:
+            response = req.post(
+                "https://api.openai.com/v1/chat/completions",
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {openai_key}"
+                },
+                json=payload,
+                timeout=60
+            )
+            response.raise_for_status()
+        finally:
+            document.timings['ai'] = round(time.perf_counter() - start, 3)
 
         result = response.json()
         content = result['choices'][0]['message']['content']
 
-        # Parse JSON from response
-        return self._parse_json_response(content)
-
-    def _extract_text_from_pdf(self, url: str) -> Optional[str]:
-        """Extract text content from PDF if available"""
-        import requests as req
-
-        try:
-            pdf_response = req.get(url, timeout=30)
-            pdf_response.raise_for_status()
-            pdf_bytes = pdf_response.content
-
-            # Try PyMuPDF for text extraction
-            try:
-                import fitz
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-                text = ""
-                # Extract text from first 2 pages
-                for page_num in range(min(2, doc.page_count)):
-                    text += doc[page_num].get_text()
-                doc.close()
-
-                # Check if we got meaningful text (at least 200 chars)
-                if len(text.strip()) > 200:
-                    logger.info(f"  📝 Extracted {len(text)} chars of text from PDF")
-                    return text.strip()
-            except ImportError:
-                pass
-
-        except Exception as e:
-            logger.debug(f"  Text extraction failed: {e}")
-
-        return None
-
-    def _convert_to_image(self, url: str) -> Optional[str]:
-        """Convert PDF to base64 image for Vision API"""
-        import requests as req
-        import base64
-        import io
-
-        is_pdf = url.lower().endswith('.pdf') or 'pdf' in url.lower()
-
-        if not is_pdf:
-            return None  # Use URL directly for images
-
-        logger.info(f"  📄 Converting PDF to image: {url[:60]}...")
-
-        try:
-            pdf_response = req.get(url, timeout=30)
-            pdf_response.raise_for_status()
-            pdf_bytes = pdf_response.content
-
-            # Try pdf2image first
-            try:
-                from pdf2image import convert_from_bytes
-                images = convert_from_bytes(pdf_bytes, first_page=1, last_page=1, dpi=150)
-                if images:
-                    img_buffer = io.BytesIO()
-                    images[0].save(img_buffer, format='PNG')
-                    img_buffer.seek(0)
-                    return base64.b64encode(img_buffer.read()).decode('utf-8')
-            except ImportError:
-                pass
-
-            # Try PyMuPDF as fallback
-            try:
-                import fitz
-                doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-                if doc.page_count > 0:
-                    page = doc[0]
-                    mat = fitz.Matrix(2, 2)
-                    pix = page.get_pixmap(matrix=mat)
-                    result = base64.b64encode(pix.tobytes("png")).decode('utf-8')
-                    doc.close()
-                    return result
-            except ImportError:
-                raise ValueError("PDF conversion libraries not available")
-
-        except Exception as e:
-            logger.error(f"  ❌ PDF conversion failed: {e}")
-            raise
-
-        return None
+        # Parse JSON from response and split off the product type check
+        data = self._parse_json_response(content)
+        type_check = {key: data.pop(key) for key in (TYPE_MATCH_KEY, DETECTED_TYPE_KEY) if key in data}
+        return data, type_check
 
     def _get_collection_context(self, collection_name: str) -> str:
         """Get context description for collection"""
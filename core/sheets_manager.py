@@ -738,6 +738,54 @@ class SheetsManager:
             logger.error(f"❌ Failed to add product to {collection_name}: {e}")
             raise
 
+    def add_products(self, collection_name: str, products: List[Dict[str, Any]]) -> List[int]:
+        """
+        Add many product rows to the Google Sheet with one append call
+
+        The rows go out in a single append_rows request, so Sheets picks the
+        rows atomically (no race with other writers between reading the sheet
+        length and writing) and the row numbers come from the response.
+
+        Args:
+            collection_name: Name of the collection
+            products: Product data dicts (field names as keys), in row order
+
+        Returns:
+            Row numbers of the new products, in the same order
+        """
+        if not products:
+            return []
+
+        worksheet = self.get_worksheet(collection_name)
+        if not worksheet:
+            raise Exception(f"Could not access worksheet for {collection_name}")
+
+        config = get_collection_config(collection_name)
+
+        try:
+            width = max(config.column_mapping.values())
+
+            rows_data = []
+            for data in products:
+                row_data = [''] * width
+                for field, value in data.items():
+                    if field in config.column_mapping:
+                        row_data[config.column_mapping[field] - 1] = self._format_value_for_sheets(value)
+                rows_data.append(row_data)
+
+            # table_range anchors the append at column A; updatedRange is e.g. "'Sinks'!A120:BZ124"
+            response = worksheet.append_rows(rows_data, value_input_option='RAW', table_range='A1')
+            updated_range = response['updates']['updatedRange'].rsplit('!', 1)[-1]
+            first_row = gspread.utils.a1_to_rowcol(updated_range.split(':')[0])[0]
+            last_row = first_row + len(products) - 1
+
+            logger.info(f"✅ Added {len(products)} products at rows {first_row}-{last_row} ({collection_name})")
+            return list(range(first_row, last_row + 1))
+
+        except Exception as e:
+            logger.error(f"❌ Failed to add {len(products)} products to {collection_name}: {e}")
+            raise
+
     def update_product_row(self, collection_name: str, row_num: int, data: Dict[str, Any],
                           overwrite_mode: bool = True, allowed_fields: Optional[List[str]] = None) -> bool:
         """
@@ -4,10 +4,15 @@ Finds PDF spec sheet URLs on supplier product pages
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 import logging
+import queue
 import re
+import threading
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin, urlparse
 import time
 
@@ -30,13 +35,14 @@ class SpecSheetScraper:
         'care-guide', 'general', 'overview', 'all-products'
     ]
 
-    def __init__(self, timeout: int = 15, user_agent: str = None):
+    def __init__(self, timeout: int = 15, user_agent: str = None, pool_size: int = 20):
         """
         Initialize spec sheet scraper
 
         Args:
             timeout: Request timeout in seconds
             user_agent: Custom user agent string
+            pool_size: Pooled connections per host, shared by batch_scrape workers
         """
         self.timeout = timeout
         self.user_agent = user_agent or (
@@ -45,6 +51,9 @@ class SpecSheetScraper:
         )
         self.session = requests.Session()
         self.session.headers.update({'User-Agent': self.user_agent})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
 
     def find_spec_sheet_url(self, product_url: str, supplier_hint: str = None) -> Optional[str]:
         """
@@ -226,15 +235,40 @@ class SpecSheetScraper:
                         if not any(ex in text or ex in href.lower() for ex in self.EXCLUDE_KEYWORDS):
                             return urljoin(base_url, href)
 
+        # Registered supplier patterns (selectors, keywords, exclusions)
+        try:
+            from .supplier_scrapers import SupplierScraperPatterns
+        except ImportError:
+            # Loaded by file path from scripts/, outside the core package
+            return None
+
+        if SupplierScraperPatterns.get_pattern(supplier) is not SupplierScraperPatterns.PATTERNS['default']:
+            return SupplierScraperPatterns.find_spec_sheet_for_supplier(soup, base_url, supplier)
+
         return None
 
-    def batch_scrape(self, products: List[Dict[str, Any]], rate_limit: float = 1.0) -> Dict[str, Any]:
+    def batch_scrape(self, products: List[Dict[str, Any]], rate_limit: float = 1.0,
+                     max_per_domain: int = 2, max_workers: int = 8, flush_every: int = 50,
+                     resume: bool = False, resume_since: Optional[str] = None) -> Dict[str, Any]:
         """
-        Scrape spec sheets for multiple products
+        Scrape spec sheets for multiple products concurrently
+
+        Products are grouped by supplier domain. Each domain gets at most
+        ``max_per_domain`` requests in flight, started at least ``rate_limit``
+        seconds apart, while different suppliers run in parallel. Results are
+        written to the database in batches of ``flush_every``.
 
         Args:
             products: List of product dicts with 'sku' and 'product_url' keys
-            rate_limit: Seconds to wait between requests
+            rate_limit: Minimum seconds between requests to the same domain
+            max_per_domain: Concurrent requests per domain
+            max_workers: Concurrent requests across all domains
+            flush_every: Results per database write
+            resume: Continue an interrupted run by skipping SKUs that already
+                have last_scraped_at set (off by default, so every product
+                passed in is scraped)
+            resume_since: With resume, only skip SKUs scraped at or after this
+                timestamp (pass the interrupted run's start time)
 
         Returns:
             Dict with statistics and results
@@ -247,47 +281,100 @@ class SpecSheetScraper:
             'found': 0,
             'not_found': 0,
             'errors': 0,
+            'skipped': 0,
             'found_skus': [],
             'not_found_skus': [],
             'error_skus': []
         }
 
-        for i, product in enumerate(products):
-            sku = product.get('sku')
-            product_url = product.get('product_url')
+        valid = [p for p in products if p.get('sku') and p.get('product_url')]
+        results['errors'] += len(products) - len(valid)
 
-            if not sku or not product_url:
-                results['errors'] += 1
-                continue
+        if resume and valid:
+            done = db.get_scraped_skus([p['sku'] for p in valid], since=resume_since)
+            results['skipped'] = len(done)
+            valid = [p for p in valid if p['sku'] not in done]
+            if done:
+                logger.info(f"⏭️ Resuming: skipping {len(done)} already-scraped SKUs")
 
-            logger.info(f"[{i+1}/{len(products)}] Scraping {sku}...")
+        # One work queue and request budget per supplier domain
+        queues: Dict[str, deque] = defaultdict(deque)
+        for product in valid:
+            queues[urlparse(product['product_url']).netloc.lower()].append(product)
+        budgets = {domain: _DomainBudget(rate_limit) for domain in queues}
 
-            try:
-                spec_sheet_url = self.find_spec_sheet_url(product_url)
+        logger.info(f"🔎 Scraping {len(valid)} products across {len(queues)} domains "
+                    f"({max_per_domain} per domain, {rate_limit}s spacing)")
+
+        result_queue: queue.Queue = queue.Queue()
+        pending_writes: List[Tuple[str, str]] = []
+        workers = [domain for domain, items in queues.items() for _ in range(min(max_per_domain, len(items)))]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(workers)))) as executor:
+            for domain in workers:
+                executor.submit(self._drain_domain, domain, queues[domain], budgets[domain], result_queue)
+
+            for i in range(len(valid)):
+                sku, spec_sheet_url, error = result_queue.get()
+                logger.info(f"[{i+1}/{len(valid)}] Scraped {sku}")
+
+                if error:
+                    logger.error(f"Error processing {sku}: {error}")
+                    results['errors'] += 1
+                    results['error_skus'].append(sku)
+                    continue
 
                 if spec_sheet_url:
-                    # Update database
-                    db.update_spec_sheet_url(sku, spec_sheet_url)
                     results['found'] += 1
                     results['found_skus'].append(sku)
                 else:
                     # Still update timestamp to mark as scraped
-                    db.update_spec_sheet_url(sku, '')
                     results['not_found'] += 1
                     results['not_found_skus'].append(sku)
+                pending_writes.append((sku, spec_sheet_url or ''))
 
-            except Exception as e:
-                logger.error(f"Error processing {sku}: {e}")
-                results['errors'] += 1
-                results['error_skus'].append(sku)
+                if len(pending_writes) >= flush_every:
+                    db.update_spec_sheet_urls(pending_writes)
+                    pending_writes = []
 
-            # Rate limiting
-            if i < len(products) - 1:
-                time.sleep(rate_limit)
+        if pending_writes:
+            db.update_spec_sheet_urls(pending_writes)
 
-        logger.info(f"📊 Batch scrape complete: {results['found']} found, {results['not_found']} not found, {results['errors']} errors")
+        logger.info(f"📊 Batch scrape complete: {results['found']} found, {results['not_found']} not found, "
+                    f"{results['errors']} errors, {results['skipped']} skipped")
         return results
 
+    def _drain_domain(self, domain: str, products: deque, budget: '_DomainBudget', result_queue: queue.Queue):
+        """Worker: scrape products for one domain until its queue is empty"""
+        while True:
+            try:
+                product = products.popleft()
+            except IndexError:
+                return
+
+            try:
+                budget.wait()
+                spec_sheet_url = self.find_spec_sheet_url(product['product_url'], supplier_hint=domain)
+                result_queue.put((product['sku'], spec_sheet_url, None))
+            except Exception as e:
+                result_queue.put((product['sku'], None, str(e)))
+
+
+class _DomainBudget:
+    """Spaces request starts on one domain at least ``delay`` seconds apart"""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.delay
+        if start > now:
+            time.sleep(start - now)
 
 # Singleton instance
 _scraper_instance = None
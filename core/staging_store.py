@@ -0,0 +1,327 @@
+"""
+SQLite Staging Store for New Products
+Replaces the staging_data.json file with row-level storage so updates to one
+staged product no longer rewrite every other product
+"""
+import sqlite3
+import json
+import os
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Any, Optional, List, Callable
+
+logger = logging.getLogger(__name__)
+
+# Columns promoted out of the JSON payload so they can be indexed and filtered
+INDEXED_FIELDS = ('batch_id', 'collection', 'status')
+
+
+class StagingStore:
+    """SQLite-backed store for staging products"""
+
+    def __init__(self, db_path: str = None):
+        """Initialize staging store
+
+        Args:
+            db_path: Path to SQLite database file (defaults to project root)
+        """
+        if db_path is None:
+            project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            db_path = os.path.join(project_dir, 'staging_products.db')
+
+        self.db_path = db_path
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None lets us issue BEGIN IMMEDIATE ourselves so the
+        # read-merge-write in update_product holds the write lock throughout
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _init_database(self):
+        """Initialize database schema"""
+        conn = self._connect()
+        try:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS staging_products (
+                    staging_id TEXT PRIMARY KEY,
+                    batch_id TEXT,
+                    collection TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'uploaded',
+                    data TEXT NOT NULL,
+                    created_at TEXT,
+                    updated_at TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_staging_collection_status
+                ON staging_products(collection, status)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_staging_batch
+                ON staging_products(batch_id)
+            ''')
+            conn.execute('''
+                CREATE INDEX IF NOT EXISTS idx_staging_status
+                ON staging_products(status)
+            ''')
+            logger.info(f"✅ Staging store initialized at {self.db_path}")
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _row_values(staging_id: str, product: Dict[str, Any]) -> tuple:
+        now = datetime.now().isoformat()
+        return (
+            staging_id,
+            product.get('batch_id'),
+            product.get('collection') or '',
+            product.get('status') or 'uploaded',
+            json.dumps(product),
+            product.get('created_at') or now,
+            product.get('updated_at') or now,
+        )
+
+    def get_product(self, staging_id: str) -> Optional[Dict[str, Any]]:
+        """Get a single staging product
+
+        Args:
+            staging_id: Staging product ID
+
+        Returns:
+            Product dictionary, or None if not found
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                'SELECT data FROM staging_products WHERE staging_id = ?', (staging_id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row['data']) if row else None
+
+    def add_product(self, staging_id: str, product: Dict[str, Any]) -> bool:
+        """Insert or replace a single staging product"""
+        return self.add_products({staging_id: product}) == 1
+
+    def add_products(self, products: Dict[str, Dict[str, Any]]) -> int:
+        """Insert or replace many staging products in one transaction
+
+        Args:
+            products: Dictionary of products keyed by staging_id
+
+        Returns:
+            Number of products written
+        """
+        if not products:
+            return 0
+
+        rows = [self._row_values(staging_id, product) for staging_id, product in products.items()]
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.executemany('''
+                INSERT INTO staging_products
+                    (staging_id, batch_id, collection, status, data, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(staging_id) DO UPDATE SET
+                    batch_id = excluded.batch_id,
+                    collection = excluded.collection,
+                    status = excluded.status,
+                    data = excluded.data,
+                    updated_at = excluded.updated_at
+            ''', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return len(rows)
+
+    def update_product(self, staging_id: str, updates: Dict[str, Any]) -> bool:
+        """Merge updates into a single staging product
+
+        Args:
+            staging_id: Staging product ID
+            updates: Fields to merge into the stored product
+
+        Returns:
+            True if the product existed and was updated
+        """
+        return self.modify_product(staging_id, lambda product: {**product, **updates})
+
+    def modify_product(self, staging_id: str,
+                       modify: Callable[[Dict[str, Any]], Dict[str, Any]]) -> bool:
+        """Read-modify-write a single staging product
+
+        The read and write happen inside one write transaction, so concurrent
+        updates to the same product are serialized instead of overwriting
+        each other. Use this when the change depends on the stored value
+        (e.g. merging into a nested dict or appending to a list).
+
+        Args:
+            staging_id: Staging product ID
+            modify: Called with the stored product; returns the product to store
+
+        Returns:
+            True if the product existed and was updated
+        """
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                'SELECT data FROM staging_products WHERE staging_id = ?', (staging_id,)
+            ).fetchone()
+            if not row:
+                conn.execute('ROLLBACK')
+                return False
+
+            product = modify(json.loads(row['data']))
+            product['updated_at'] = datetime.now().isoformat()
+
+            conn.execute('''
+                UPDATE staging_products
+                SET batch_id = ?, collection = ?, status = ?, data = ?, updated_at = ?
+                WHERE staging_id = ?
+            ''', (
+                product.get('batch_id'),
+                product.get('collection') or '',
+                product.get('status') or 'uploaded',
+                json.dumps(product),
+                product['updated_at'],
+                staging_id,
+            ))
+            conn.execute('COMMIT')
+            return True
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def remove_product(self, staging_id: str) -> bool:
+        """Delete a staging product
+
+        Returns:
+            True if a product was deleted
+        """
+        conn = self._connect()
+        try:
+            cursor = conn.execute('DELETE FROM staging_products WHERE staging_id = ?', (staging_id,))
+            return cursor.rowcount > 0
+        finally:
+            conn.close()
+
+    def list_products(self, collection: Optional[str] = None, status: Optional[str] = None,
+                      batch_id: Optional[str] = None, page: Optional[int] = None,
+                      limit: int = 100) -> Dict[str, Any]:
+        """List staging products with optional filters and pagination
+
+        Args:
+            collection: Filter by collection name
+            status: Filter by status (comma-separated for several)
+            batch_id: Filter by upload batch
+            page: Page number (1-indexed); None returns every matching product
+            limit: Products per page when paginating
+
+        Returns:
+            Dict with products (keyed by staging_id), total, page, total_pages
+        """
+        where_clauses = []
+        params: List[Any] = []
+
+        if collection:
+            where_clauses.append('collection = ?')
+            params.append(collection)
+        if batch_id:
+            where_clauses.append('batch_id = ?')
+            params.append(batch_id)
+        if status:
+            statuses = [s.strip() for s in status.split(',') if s.strip()]
+            placeholders = ','.join('?' * len(statuses))
+            where_clauses.append(f'status IN ({placeholders})')
+            params.extend(statuses)
+
+        where_sql = ' AND '.join(where_clauses) if where_clauses else '1=1'
+
+        conn = self._connect()
+        try:
+            total = conn.execute(
+                f'SELECT COUNT(*) FROM staging_products WHERE {where_sql}', params
+            ).fetchone()[0]
+
+            query = f'''
+                SELECT staging_id, data FROM staging_products
+                WHERE {where_sql}
+                ORDER BY created_at, staging_id
+            '''
+            query_params = list(params)
+            if page is not None:
+                page = max(1, page)
+                query += ' LIMIT ? OFFSET ?'
+                query_params.extend([limit, (page - 1) * limit])
+
+            rows = conn.execute(query, query_params).fetchall()
+        finally:
+            conn.close()
+
+        return {
+            'products': {row['staging_id']: json.loads(row['data']) for row in rows},
+            'total': total,
+            'page': page or 1,
+            'total_pages': max(1, (total + limit - 1) // limit) if page is not None else 1,
+        }
+
+    def get_all_products(self) -> Dict[str, Dict[str, Any]]:
+        """Get every staging product keyed by staging_id"""
+        return self.list_products()['products']
+
+    def count_by_status(self, collection: str) -> Dict[str, int]:
+        """Count staging products per status for a collection"""
+        conn = self._connect()
+        try:
+            rows = conn.execute('''
+                SELECT status, COUNT(*) FROM staging_products
+                WHERE collection = ?
+                GROUP BY status
+            ''', (collection,)).fetchall()
+        finally:
+            conn.close()
+        return {row[0]: row[1] for row in rows}
+
+    def import_from_json(self, json_path: str) -> int:
+        """Import products from a legacy staging_data.json file
+
+        Existing rows with the same staging_id are overwritten.
+
+        Args:
+            json_path: Path to the JSON file
+
+        Returns:
+            Number of products imported
+        """
+        with open(json_path, 'r') as f:
+            staging_data = json.load(f) or {}
+
+        imported = self.add_products(staging_data)
+        logger.info(f"✅ Imported {imported} staging products from {json_path}")
+        return imported
+
+
+# Singleton instance
+_staging_store = None
+_staging_store_lock = threading.Lock()
+
+
+def get_staging_store() -> StagingStore:
+    """Get singleton staging store instance"""
+    global _staging_store
+    if _staging_store is None:
+        with _staging_store_lock:
+            if _staging_store is None:
+                _staging_store = StagingStore()
+    return _staging_store
@@ -5,14 +5,50 @@ Handles supplier product catalog and work-in-progress tracking
 
 import sqlite3
 import json
+import csv
 import os
 from datetime import datetime
-from typing import Optional, Dict, List, Any, Tuple
+from typing import Optional, Dict, List, Any, Tuple, Iterable, Callable
 import logging
 
+from core.data_validator import parse_tag_pairs
+
 logger = logging.getLogger(__name__)
 
 
+def read_shopify_product_tags(conn: sqlite3.Connection, where: str = '1 = 1', params: Iterable[Any] = (),
+                              keys: Optional[Iterable[str]] = None) -> Dict[int, Dict[str, List[str]]]:
+    """
+    Parsed tags of the shopify_products rows matching `where`, read from the
+    shopify_product_tags index instead of re-splitting the tags strings
+
+    Args:
+        conn: Open connection to the supplier database
+        where: SQL condition on shopify_products columns
+        params: Parameters for `where`
+        keys: Only these tag keys (case-insensitive; None = all keys)
+
+    Returns:
+        Dict of shopify_products.id -> {lowercase_key: [values in tag order]}
+        (parse_tags_with_duplicates format); products without tags are omitted
+    """
+    query = f'''
+        SELECT product_id, key, value FROM shopify_product_tags
+        WHERE product_id IN (SELECT id FROM shopify_products WHERE {where})
+    '''
+    params = list(params)
+    if keys is not None:
+        keys = list(keys)
+        query += f" AND key IN ({','.join('?' * len(keys))})"
+        params.extend(keys)
+    query += ' ORDER BY product_id, position'
+
+    result: Dict[int, Dict[str, List[str]]] = {}
+    for product_id, key, value in conn.execute(query, params):
+        result.setdefault(product_id, {}).setdefault(key.lower(), []).append(value)
+    return result
+
+
 class SupplierDatabase:
     """Manage supplier products and WIP tracking"""
 
@@ -123,6 +159,9 @@ class SupplierDatabase:
                 extracted_images TEXT,
                 extracted_data TEXT,
                 confidence_summary TEXT,
+                overall_confidence REAL,
+                review_field_count INTEGER,
+                min_field_confidence REAL,
                 reviewed_data TEXT,
                 applied_fields TEXT,
                 applied_at TIMESTAMP,
@@ -169,6 +208,21 @@ class SupplierDatabase:
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_shopify_vendor ON shopify_products(vendor)
         ''')
+
+        # Parsed "key: value" Shopify tags, one row per tag (kept in sync by the baseline import)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS shopify_product_tags (
+                product_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                key TEXT NOT NULL COLLATE NOCASE,
+                value TEXT NOT NULL COLLATE NOCASE,
+                raw TEXT NOT NULL,
+                PRIMARY KEY (product_id, position)
+            )
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_shopify_tags_key_value ON shopify_product_tags(key, value)
+        ''')
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_pq_collection ON processing_queue(target_collection)
         ''')
@@ -179,6 +233,104 @@ class SupplierDatabase:
             CREATE INDEX IF NOT EXISTS idx_pq_run_id ON processing_queue(run_id)
         ''')
 
+        # Review queue ordering: add the columns to older databases and backfill them
+        # from confidence_summary (same values as migrations/add_review_priority_fields.py)
+        cursor.execute('PRAGMA table_info(processing_queue)')
+        queue_columns = {row[1] for row in cursor.fetchall()}
+        added = False
+        for column, column_type in (('overall_confidence', 'REAL'), ('review_field_count', 'INTEGER'),
+                                    ('min_field_confidence', 'REAL')):
+            if column not in queue_columns:
+                try:
+                    cursor.execute(f"ALTER TABLE processing_queue ADD COLUMN {column} {column_type}")
+                    added = True
+                except sqlite3.OperationalError:
+                    # Column already exists (added by another process)
+                    pass
+        if added:
+            cursor.execute('''
+                UPDATE processing_queue
+                SET overall_confidence = COALESCE(json_extract(confidence_summary, '$.overall_confidence'), 1.0),
+                    review_field_count = CASE
+                        WHEN json_type(confidence_summary, '$.review_fields') = 'object'
+                        THEN (SELECT COUNT(*) FROM json_each(confidence_summary, '$.review_fields'))
+                        ELSE 0
+                    END,
+                    min_field_confidence = (
+                        SELECT MIN(json_extract(value, '$.confidence'))
+                        FROM json_each(confidence_summary, '$.field_scores')
+                    )
+                WHERE confidence_summary IS NOT NULL
+                  AND confidence_summary != ''
+                  AND json_valid(confidence_summary)
+            ''')
+            logger.info(f"✅ Added review priority columns and backfilled {cursor.rowcount} queue items")
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pq_review_priority
+            ON processing_queue(overall_confidence, min_field_confidence)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pq_review_field_count ON processing_queue(review_field_count)
+        ''')
+
+        # Keyset pagination (newest first) within a status or collection + status
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pq_status_id ON processing_queue(status, id)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pq_collection_status_id ON processing_queue(target_collection, status, id)
+        ''')
+
+        # Queue counts per collection/status, kept current by triggers so stats never scan the queue
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS processing_queue_counts (
+                target_collection TEXT NOT NULL,
+                status TEXT NOT NULL,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (target_collection, status)
+            )
+        ''')
+        cursor.execute('SELECT 1 FROM processing_queue_counts LIMIT 1')
+        if cursor.fetchone() is None:
+            self._rebuild_processing_queue_counts(cursor)
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_pq_counts_insert AFTER INSERT ON processing_queue
+            BEGIN
+                INSERT OR IGNORE INTO processing_queue_counts (target_collection, status, count)
+                VALUES (NEW.target_collection, IFNULL(NEW.status, ''), 0);
+                UPDATE processing_queue_counts SET count = count + 1
+                WHERE target_collection = NEW.target_collection AND status = IFNULL(NEW.status, '');
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_pq_counts_delete AFTER DELETE ON processing_queue
+            BEGIN
+                UPDATE processing_queue_counts SET count = count - 1
+                WHERE target_collection = OLD.target_collection AND status = IFNULL(OLD.status, '');
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS trg_pq_counts_update AFTER UPDATE OF status, target_collection ON processing_queue
+            WHEN OLD.status IS NOT NEW.status OR OLD.target_collection IS NOT NEW.target_collection
+            BEGIN
+                UPDATE processing_queue_counts SET count = count - 1
+                WHERE target_collection = OLD.target_collection AND status = IFNULL(OLD.status, '');
+                INSERT OR IGNORE INTO processing_queue_counts (target_collection, status, count)
+                VALUES (NEW.target_collection, IFNULL(NEW.status, ''), 0);
+                UPDATE processing_queue_counts SET count = count + 1
+                WHERE target_collection = NEW.target_collection AND status = IFNULL(NEW.status, '');
+            END
+        ''')
+
+        # Existing baselines imported before the tag table existed
+        cursor.execute('SELECT 1 FROM shopify_product_tags LIMIT 1')
+        if cursor.fetchone() is None:
+            cursor.execute("SELECT 1 FROM shopify_products WHERE tags IS NOT NULL AND tags != '' LIMIT 1")
+            if cursor.fetchone() is not None:
+                cursor.execute('SELECT id, tags FROM shopify_products')
+                tag_count = self._sync_shopify_product_tags(cursor, cursor.fetchall())
+                logger.info(f"🏷️ Indexed {tag_count:,} Shopify tags into shopify_product_tags")
+
         conn.commit()
         conn.close()
 
@@ -193,101 +345,209 @@ class SupplierDatabase:
         - product_name: (optional) Product name
         - image_url: (optional) Direct image URL
 
+        Rows are upserted with bulk_import; images are not fetched inline but by a
+        background SupplierImageBackfill job started for the SKUs still missing one.
+
         Args:
             csv_data: List of product dictionaries
-            auto_extract_images: If True, automatically extract images from product URLs
+            auto_extract_images: If True, start a background job extracting images from product URLs
 
-        Returns dict with import statistics
+        Returns dict with import statistics (image_job_id when a job was started)
         """
-        from .image_extractor import extract_og_image
-        from .collection_detector import detect_collection
+        result = self.bulk_import(csv_data)
+        skus_missing_images = result.pop('skus_missing_images')
+        result['images_extracted'] = 0
+        result['images_pending'] = len(skus_missing_images)
 
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if auto_extract_images and skus_missing_images:
+            from .supplier_image_backfill import get_supplier_image_backfill
+            result['image_job_id'] = get_supplier_image_backfill().start(skus_missing_images)
+
+        return result
+
+    def bulk_import(self, csv_data: List[Dict[str, str]], skip_existing: bool = False) -> Dict[str, Any]:
+        """
+        Upsert supplier products in a single transaction, without network calls
+
+        Rows are validated and de-duplicated by SKU (last row wins), collections are
+        detected in one batch and every row is written by one executemany
+        INSERT ... ON CONFLICT(sku) DO UPDATE. Empty product_name/image_url values
+        keep what is already stored.
+
+        Args:
+            csv_data: List of product dictionaries (columns as for import_from_csv)
+            skip_existing: If True, leave SKUs already in the database untouched
+
+        Returns dict with import statistics and skus_missing_images
+        """
+        from .collection_detector import detect_collection_batch
 
-        imported = 0
-        updated = 0
         skipped = 0
-        images_extracted = 0
+        duplicates = 0
         errors = []
+        rows_by_sku = {}
 
         for row in csv_data:
             try:
-                sku = row.get('sku', '').strip()
-                supplier_name = row.get('supplier_name', '').strip()
-                product_url = row.get('product_url', '').strip()
-                product_name = row.get('product_name', '').strip()
-                image_url = row.get('image_url', '').strip()
+                sku = (row.get('sku') or '').strip()
+                supplier_name = (row.get('supplier_name') or '').strip()
+                product_url = (row.get('product_url') or '').strip()
 
                 if not sku or not supplier_name or not product_url:
                     skipped += 1
                     continue
 
-                # Auto-extract image if not provided and auto_extract is enabled
-                if auto_extract_images and not image_url and product_url:
-                    try:
-                        logger.info(f"Extracting image for {sku}...")
-                        extracted_image = extract_og_image(product_url, timeout=15)
-                        if extracted_image:
-                            image_url = extracted_image
-                            images_extracted += 1
-                            logger.info(f"✅ Extracted image for {sku}")
-                    except Exception as e:
-                        logger.warning(f"Failed to extract image for {sku}: {e}")
-
-                # Auto-detect collection
-                detected_collection = None
-                confidence_score = 0.0
-                if product_name or product_url:
-                    detected_collection, confidence_score = detect_collection(
-                        product_name or '', product_url
-                    )
-
-                # Check if SKU already exists
-                cursor.execute('SELECT id FROM supplier_products WHERE sku = ?', (sku,))
-                existing = cursor.fetchone()
-
-                if existing:
-                    # Update existing record
-                    cursor.execute('''
-                        UPDATE supplier_products
-                        SET supplier_name = ?, product_url = ?, product_name = ?,
-                            image_url = ?, detected_collection = ?, confidence_score = ?,
-                            updated_at = CURRENT_TIMESTAMP
-                        WHERE sku = ?
-                    ''', (supplier_name, product_url, product_name, image_url,
-                          detected_collection, confidence_score, sku))
-                    updated += 1
-                else:
-                    # Insert new record
-                    cursor.execute('''
-                        INSERT INTO supplier_products
-                        (sku, supplier_name, product_url, product_name, image_url,
-                         detected_collection, confidence_score)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (sku, supplier_name, product_url, product_name, image_url,
-                          detected_collection, confidence_score))
-                    imported += 1
-
+                if sku in rows_by_sku:
+                    duplicates += 1
+                rows_by_sku[sku] = {
+                    'sku': sku,
+                    'supplier_name': supplier_name,
+                    'product_url': product_url,
+                    'product_name': (row.get('product_name') or '').strip(),
+                    'image_url': (row.get('image_url') or '').strip()
+                }
             except Exception as e:
                 errors.append(f"Row {row}: {str(e)}")
                 logger.error(f"Error importing row: {e}")
 
-        conn.commit()
-        conn.close()
-
         result = {
-            'imported': imported,
-            'updated': updated,
+            'imported': 0,
+            'updated': 0,
             'skipped': skipped,
-            'images_extracted': images_extracted,
+            'duplicates': duplicates,
             'errors': errors,
-            'total_processed': imported + updated + skipped
+            'skus_missing_images': []
         }
 
-        logger.info(f"📊 Import complete: {result}")
+        if rows_by_sku:
+            skus = list(rows_by_sku)
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+
+                existing = set()
+                for start in range(0, len(skus), 500):
+                    chunk = skus[start:start + 500]
+                    cursor.execute(
+                        f"SELECT sku FROM supplier_products WHERE sku IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    existing.update(r[0] for r in cursor.fetchall())
+
+                if skip_existing:
+                    result['skipped'] += len(existing)
+                    for sku in existing:
+                        del rows_by_sku[sku]
+                    existing = set()
+
+                products = detect_collection_batch(list(rows_by_sku.values()))
+
+                cursor.executemany('''
+                    INSERT INTO supplier_products
+                    (sku, supplier_name, product_url, product_name, image_url,
+                     detected_collection, confidence_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(sku) DO UPDATE SET
+                        supplier_name = excluded.supplier_name,
+                        product_url = excluded.product_url,
+                        product_name = COALESCE(NULLIF(excluded.product_name, ''), supplier_products.product_name),
+                        image_url = COALESCE(NULLIF(excluded.image_url, ''), supplier_products.image_url),
+                        detected_collection = excluded.detected_collection,
+                        confidence_score = excluded.confidence_score,
+                        updated_at = CURRENT_TIMESTAMP
+                ''', [
+                    (p['sku'], p['supplier_name'], p['product_url'], p['product_name'], p['image_url'],
+                     p['detected_collection'], p['confidence_score'])
+                    for p in products
+                ])
+                conn.commit()
+
+                result['updated'] = sum(1 for sku in rows_by_sku if sku in existing)
+                result['imported'] = len(rows_by_sku) - result['updated']
+            except Exception as e:
+                conn.rollback()
+                errors.append(f"Bulk upsert failed: {str(e)}")
+                logger.error(f"❌ Bulk supplier import failed, nothing written: {e}")
+                rows_by_sku = {}
+            finally:
+                conn.close()
+
+        if rows_by_sku:
+            result['skus_missing_images'] = [
+                p['sku'] for p in self.get_products_missing_images(list(rows_by_sku))
+            ]
+
+        result['total_processed'] = result['imported'] + result['updated'] + result['skipped'] + duplicates
+        logger.info(f"📊 Import complete: {result['imported']} imported, {result['updated']} updated, "
+                    f"{result['skipped']} skipped, {duplicates} duplicates, "
+                    f"{len(result['skus_missing_images'])} awaiting images, {len(errors)} errors")
         return result
 
+    def get_products_missing_images(self, skus: Optional[List[str]] = None,
+                                    limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Get products with no image_url
+
+        Args:
+            skus: Only check these SKUs (None = all products)
+            limit: Maximum products returned when checking all products
+
+        Returns:
+            List of {'sku', 'product_url'} dicts
+        """
+        missing = []
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            condition = "(image_url IS NULL OR image_url = '')"
+            if skus is None:
+                query = f'SELECT sku, product_url FROM supplier_products WHERE {condition} ORDER BY id'
+                if limit:
+                    query += f' LIMIT {int(limit)}'
+                cursor.execute(query)
+                missing.extend(dict(row) for row in cursor.fetchall())
+            else:
+                for start in range(0, len(skus), 500):
+                    chunk = skus[start:start + 500]
+                    cursor.execute(f'''
+                        SELECT sku, product_url FROM supplier_products
+                        WHERE sku IN ({','.join('?' * len(chunk))}) AND {condition}
+                    ''', chunk)
+                    missing.extend(dict(row) for row in cursor.fetchall())
+        finally:
+            conn.close()
+
+        return missing
+
+    def update_image_urls(self, updates: List[Tuple[str, str]]) -> int:
+        """
+        Set image URLs for many products in one transaction
+
+        Args:
+            updates: (sku, image_url) pairs
+
+        Returns:
+            Number of rows updated
+        """
+        if not updates:
+            return 0
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE supplier_products
+                SET image_url = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE sku = ?
+            ''', [(url, sku) for sku, url in updates])
+            updated = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+
+        return updated
+
     def search_by_sku(self, sku_list: List[str]) -> List[Dict[str, Any]]:
         """Search for products by SKU list"""
         if not sku_list:
@@ -695,6 +955,63 @@ class SupplierDatabase:
 
         return [dict(row) for row in rows]
 
+    def update_spec_sheet_urls(self, updates: List[Tuple[str, str]]) -> int:
+        """
+        Update spec sheet URLs for many products in one transaction
+
+        Args:
+            updates: (sku, spec_sheet_url) pairs; '' marks a product as scraped with no spec sheet
+
+        Returns:
+            Number of rows updated
+        """
+        if not updates:
+            return 0
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE supplier_products
+                SET spec_sheet_url = ?, last_scraped_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE sku = ?
+            ''', [(url, sku) for sku, url in updates])
+            updated = cursor.rowcount
+            conn.commit()
+        finally:
+            conn.close()
+
+        return updated
+
+    def get_scraped_skus(self, skus: List[str], since: Optional[str] = None) -> set:
+        """
+        Of the given SKUs, return those already scraped for spec sheets
+
+        Args:
+            skus: SKUs to check
+            since: Only count scrapes at or after this timestamp ('YYYY-MM-DD HH:MM:SS', UTC)
+        """
+        scraped = set()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(skus), 500):
+                chunk = skus[start:start + 500]
+                query = f'''
+                    SELECT sku FROM supplier_products
+                    WHERE sku IN ({','.join('?' * len(chunk))}) AND last_scraped_at IS NOT NULL
+                '''
+                params = list(chunk)
+                if since:
+                    query += ' AND last_scraped_at >= ?'
+                    params.append(since)
+                cursor.execute(query, params)
+                scraped.update(row[0] for row in cursor.fetchall())
+        finally:
+            conn.close()
+
+        return scraped
+
     # ==========================================================================
     # Collection Override Methods
     # ==========================================================================
@@ -861,19 +1178,39 @@ class SupplierDatabase:
             'skipped_skus': skipped_skus
         }
 
+    @staticmethod
+    def _rebuild_processing_queue_counts(cursor: sqlite3.Cursor):
+        cursor.execute('DELETE FROM processing_queue_counts')
+        cursor.execute('''
+            INSERT INTO processing_queue_counts (target_collection, status, count)
+            SELECT target_collection, IFNULL(status, ''), COUNT(*)
+            FROM processing_queue
+            GROUP BY target_collection, IFNULL(status, '')
+        ''')
+
+    def rebuild_processing_queue_counts(self):
+        """Recount processing_queue_counts from the queue (repair after manual edits with triggers off)"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self._rebuild_processing_queue_counts(conn.cursor())
+            conn.commit()
+        finally:
+            conn.close()
+
     def get_processing_queue(self, collection: str = None, status: str = None,
-                             page: int = 1, limit: int = 50) -> Dict[str, Any]:
+                             page: int = 1, limit: int = 50, after_id: int = None) -> Dict[str, Any]:
         """
-        Get items from the processing queue with optional filtering.
+        Get items from the processing queue with optional filtering, newest first.
 
         Args:
             collection: Filter by target collection
             status: Filter by status (pending, processing, ready, approved, error)
-            page: Page number (1-indexed)
+            page: Page number (1-indexed); used for OFFSET paging when after_id is not given
             limit: Items per page
+            after_id: Keyset cursor - return items older than this queue id (next_cursor of the previous page)
 
         Returns:
-            Dict with items, total, page, total_pages
+            Dict with items, total, page, total_pages, next_cursor and has_more
         """
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
@@ -899,30 +1236,42 @@ class SupplierDatabase:
 
         where_sql = ' AND '.join(where_clauses) if where_clauses else '1=1'
 
-        # Get total count
-        cursor.execute(f'SELECT COUNT(*) FROM processing_queue WHERE {where_sql}', params)
+        # Total from the trigger-maintained counters (same filter columns)
+        cursor.execute(f'SELECT COALESCE(SUM(count), 0) FROM processing_queue_counts WHERE {where_sql}', params)
         total = cursor.fetchone()[0]
 
         # Calculate pagination
         total_pages = max(1, (total + limit - 1) // limit)
-        offset = (page - 1) * limit
 
-        # Get items
-        cursor.execute(f'''
-            SELECT * FROM processing_queue
-            WHERE {where_sql}
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        ''', params + [limit, offset])
+        # Get items (one extra to know whether another page follows)
+        if after_id is not None:
+            cursor.execute(f'''
+                SELECT * FROM processing_queue
+                WHERE {where_sql} AND id < ?
+                ORDER BY id DESC
+                LIMIT ?
+            ''', params + [after_id, limit + 1])
+        else:
+            cursor.execute(f'''
+                SELECT * FROM processing_queue
+                WHERE {where_sql}
+                ORDER BY id DESC
+                LIMIT ? OFFSET ?
+            ''', params + [limit + 1, (page - 1) * limit])
 
         rows = cursor.fetchall()
         conn.close()
 
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
         return {
             'items': [dict(row) for row in rows],
             'total': total,
             'page': page,
-            'total_pages': total_pages
+            'total_pages': total_pages,
+            'next_cursor': rows[-1]['id'] if has_more else None,
+            'has_more': has_more
         }
 
     def get_processing_queue_item(self, queue_id: int) -> Optional[Dict[str, Any]]:
@@ -1000,30 +1349,171 @@ class SupplierDatabase:
 
         return deleted
 
+    def get_processing_queue_items(self, queue_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+        """
+        Get many processing queue items in one query
+
+        Args:
+            queue_ids: Queue item IDs
+
+        Returns:
+            Dict of queue_id -> item (missing IDs are absent), extracted_data parsed as in get_processing_queue_item
+        """
+        items = {}
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            cursor = conn.cursor()
+            for start in range(0, len(queue_ids), 500):
+                chunk = queue_ids[start:start + 500]
+                cursor.execute(f'''
+                    SELECT * FROM processing_queue WHERE id IN ({','.join('?' * len(chunk))})
+                ''', chunk)
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    if item.get('extracted_data'):
+                        try:
+                            item['extracted_data'] = json.loads(item['extracted_data'])
+                        except (json.JSONDecodeError, TypeError):
+                            pass
+                    items[item['id']] = item
+        finally:
+            conn.close()
+
+        return items
+
+    def begin_processing_queue_approvals(self, approvals: List[Dict[str, Any]]) -> Tuple[Dict[int, int], Dict[int, str]]:
+        """
+        Record approvals before their sheet rows are written
+
+        For each approval the supplier product is added/updated, a WIP entry is
+        created without a sheet row, and the queue item is marked 'approving'.
+        Each item runs in its own savepoint, so one bad item doesn't fail the
+        batch. Items already 'approving' (an earlier run stopped before
+        complete_processing_queue_approvals) are refused, so a retry can't append
+        their sheet rows twice.
+
+        Args:
+            approvals: Dicts with queue_id, sku, product_url, product_name, supplier_name,
+                collection_name and extracted_data
+
+        Returns:
+            (Dict of queue_id -> WIP ID, Dict of queue_id -> error for items not started)
+        """
+        wip_ids = {}
+        failures = {}
+        if not approvals:
+            return wip_ids, failures
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            for approval in approvals:
+                queue_id = approval['queue_id']
+                cursor.execute('SAVEPOINT approval')
+                try:
+                    cursor.execute('''
+                        UPDATE processing_queue
+                        SET status = 'approving', updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ? AND IFNULL(status, '') != 'approving'
+                    ''', (queue_id,))
+                    if cursor.rowcount != 1:
+                        raise ValueError('already being approved or no longer in the queue')
+
+                    cursor.execute('''
+                        INSERT INTO supplier_products (sku, product_url, product_name, supplier_name, image_url)
+                        VALUES (?, ?, ?, ?, NULL)
+                        ON CONFLICT(sku) DO UPDATE SET
+                            product_url = excluded.product_url,
+                            product_name = excluded.product_name,
+                            supplier_name = excluded.supplier_name,
+                            updated_at = CURRENT_TIMESTAMP
+                    ''', (approval['sku'], approval['product_url'], approval.get('product_name'),
+                          approval['supplier_name']))
+                    cursor.execute('SELECT id FROM supplier_products WHERE sku = ?', (approval['sku'],))
+                    product_id = cursor.fetchone()[0]
+
+                    extracted_data = approval.get('extracted_data')
+                    cursor.execute('''
+                        INSERT INTO wip_products (supplier_product_id, collection_name, status, extracted_data)
+                        VALUES (?, ?, 'pending', ?)
+                    ''', (product_id, approval['collection_name'],
+                          json.dumps(extracted_data) if extracted_data else None))
+                    wip_ids[queue_id] = cursor.lastrowid
+                    cursor.execute('RELEASE SAVEPOINT approval')
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO SAVEPOINT approval')
+                    cursor.execute('RELEASE SAVEPOINT approval')
+                    failures[queue_id] = str(e)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        return wip_ids, failures
+
+    def complete_processing_queue_approvals(self, approvals: List[Dict[str, Any]]):
+        """
+        Finish approvals started by begin_processing_queue_approvals, in one transaction
+
+        Each WIP entry gets its sheet row, and the queue item is marked approved
+        and removed - the same writes as update_wip_sheet_row,
+        update_processing_queue_status and remove_from_processing_queue.
+
+        Args:
+            approvals: Dicts with queue_id, wip_id and sheet_row (None if the sheet write failed)
+        """
+        if not approvals:
+            return
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.cursor()
+            cursor.executemany('''
+                UPDATE wip_products
+                SET sheet_row_number = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', [(approval['sheet_row'], approval['wip_id']) for approval in approvals])
+
+            queue_ids = [(approval['queue_id'],) for approval in approvals]
+            cursor.executemany('''
+                UPDATE processing_queue
+                SET status = 'approved', approved_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', queue_ids)
+            cursor.executemany('DELETE FROM processing_queue WHERE id = ?', queue_ids)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"✅ Approved {len(approvals)} processing queue items")
+
     def get_processing_queue_stats(self) -> Dict[str, Any]:
         """Get statistics for the processing queue"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
-        # Count by status
-        cursor.execute('''
-            SELECT status, COUNT(*) as count
-            FROM processing_queue
-            GROUP BY status
-        ''')
-        by_status = {row[0]: row[1] for row in cursor.fetchall()}
-
-        # Count by collection
+        # Counts are maintained by triggers on processing_queue
         cursor.execute('''
-            SELECT target_collection, COUNT(*) as count
-            FROM processing_queue
-            GROUP BY target_collection
+            SELECT target_collection, status, count
+            FROM processing_queue_counts
+            WHERE count > 0
         ''')
-        by_collection = {row[0]: row[1] for row in cursor.fetchall()}
 
-        # Total
-        cursor.execute('SELECT COUNT(*) FROM processing_queue')
-        total = cursor.fetchone()[0]
+        by_status = {}
+        by_collection = {}
+        total = 0
+        for collection, status, count in cursor.fetchall():
+            status = status or None
+            by_status[status] = by_status.get(status, 0) + count
+            by_collection[collection] = by_collection.get(collection, 0) + count
+            total += count
 
         conn.close()
 
@@ -1033,61 +1523,226 @@ class SupplierDatabase:
             'by_collection': by_collection
         }
 
+    # Columns the baseline CSV owns; enrichment columns added by migrations are left alone on re-import
+    SHOPIFY_BASELINE_COLUMNS = (
+        'sku', 'product_id', 'variant_id', 'vendor', 'title', 'product_type', 'status', 'handle',
+        'tags', 'price', 'compare_at_price', 'weight', 'image_src', 'body_html_length',
+        'created_at', 'updated_at', 'meta_json', 'raw_json',
+    )
+
+    # Baseline fields not copied into raw_json (body_html can be huge; body_html_length is stored)
+    SHOPIFY_RAW_EXCLUDE = frozenset({'body_html'})
+
+    def _shopify_baseline_values(self, row: Dict[str, Any]) -> Optional[Tuple]:
+        """Column values for one baseline CSV row, in SHOPIFY_BASELINE_COLUMNS order (None = skip row)"""
+        sku = row.get('sku', '') or None
+        variant_id = row.get('variant_id', '') or None
+        if not variant_id and not sku:
+            return None
+
+        meta = {}
+        for key, value in row.items():
+            if key.startswith('meta_') and value not in (None, ''):
+                meta[key[5:]] = value
+        raw = {k: v for k, v in row.items() if k not in self.SHOPIFY_RAW_EXCLUDE}
+
+        return (
+            sku,
+            row.get('product_id', '') or None,
+            variant_id,
+            row.get('vendor', '') or None,
+            row.get('title', '') or None,
+            row.get('product_type', '') or None,
+            row.get('status', '') or None,
+            row.get('handle', '') or None,
+            row.get('tags', '') or None,
+            row.get('price', '') or None,
+            row.get('compare_at_price', '') or None,
+            row.get('weight', '') or None,
+            row.get('image_src', '') or None,
+            row.get('body_html_length') or None,
+            row.get('created_at', '') or None,
+            row.get('updated_at', '') or None,
+            json.dumps(meta),
+            json.dumps(raw),
+        )
+
+    def _upsert_shopify_baseline_chunk(self, cursor: sqlite3.Cursor, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Upsert one chunk of baseline rows (keyed by variant_id) and re-index their tags"""
+        values = []
+        skipped = 0
+        for row in rows:
+            row_values = self._shopify_baseline_values(row)
+            if row_values is None:
+                skipped += 1
+            else:
+                values.append(row_values)
+
+        columns = ', '.join(self.SHOPIFY_BASELINE_COLUMNS)
+        placeholders = ', '.join('?' * len(self.SHOPIFY_BASELINE_COLUMNS))
+        variant_index = self.SHOPIFY_BASELINE_COLUMNS.index('variant_id')
+        tags_index = self.SHOPIFY_BASELINE_COLUMNS.index('tags')
+        with_variant = [v for v in values if v[variant_index]]
+        without_variant = [v for v in values if not v[variant_index]]
+
+        variant_ids = list({v[variant_index] for v in with_variant})
+        existing = set()
+        for i in range(0, len(variant_ids), 500):
+            chunk = variant_ids[i:i + 500]
+            cursor.execute(
+                f"SELECT variant_id FROM shopify_products WHERE variant_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            existing.update(r[0] for r in cursor.fetchall())
+
+        # Update in place so ids and enrichment columns (super_category, enriched_at, ...) survive re-import
+        updates = ', '.join(f"{c} = excluded.{c}" for c in self.SHOPIFY_BASELINE_COLUMNS if c != 'variant_id')
+        cursor.executemany(f'''
+            INSERT INTO shopify_products ({columns}, imported_at)
+            VALUES ({placeholders}, CURRENT_TIMESTAMP)
+            ON CONFLICT(variant_id) DO UPDATE SET {updates}, imported_at = CURRENT_TIMESTAMP
+        ''', with_variant)
+
+        product_tags = []
+        for i in range(0, len(variant_ids), 500):
+            chunk = variant_ids[i:i + 500]
+            cursor.execute(
+                f"SELECT id, tags FROM shopify_products WHERE variant_id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            product_tags.extend(cursor.fetchall())
+
+        # Rows without a variant_id never conflict; insert them one by one for their ids
+        for row_values in without_variant:
+            cursor.execute(f'''
+                INSERT INTO shopify_products ({columns}, imported_at)
+                VALUES ({placeholders}, CURRENT_TIMESTAMP)
+            ''', row_values)
+            product_tags.append((cursor.lastrowid, row_values[tags_index]))
+
+        self._sync_shopify_product_tags(cursor, product_tags)
+
+        updated = len(existing)
+        return {
+            'imported': len(values),
+            'inserted': len(values) - updated,
+            'updated': updated,
+            'skipped': skipped,
+        }
+
     def import_shopify_baseline_rows(self, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Import Shopify baseline rows into shopify_products table."""
         if not rows:
-            return {'imported': 0, 'skipped': 0}
+            return {'imported': 0, 'inserted': 0, 'updated': 0, 'skipped': 0}
 
+        conn = sqlite3.connect(self.db_path)
+        try:
+            result = self._upsert_shopify_baseline_chunk(conn.cursor(), rows)
+            conn.commit()
+            return result
+        finally:
+            conn.close()
+
+    def import_shopify_baseline_csv(self, csv_file, chunk_size: int = 1000,
+                                    progress_callback: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, Any]:
+        """
+        Stream a Shopify baseline CSV into shopify_products in fixed-size chunks
+
+        Only one chunk is held in memory, and each chunk is committed on its own.
+
+        Args:
+            csv_file: Text file object (or iterable of lines) of the baseline CSV
+            chunk_size: Rows per executemany upsert/commit
+            progress_callback: Called with running totals (rows, imported, inserted, updated, skipped) after each chunk
+
+        Returns:
+            Dict with rows, imported, inserted, updated, skipped and chunks counts
+        """
+        stats = {'rows': 0, 'imported': 0, 'inserted': 0, 'updated': 0, 'skipped': 0, 'chunks': 0}
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
+        try:
+            def flush(chunk):
+                result = self._upsert_shopify_baseline_chunk(cursor, chunk)
+                conn.commit()
+                stats['rows'] += len(chunk)
+                stats['chunks'] += 1
+                for key in ('imported', 'inserted', 'updated', 'skipped'):
+                    stats[key] += result[key]
+                if progress_callback:
+                    progress_callback(dict(stats))
 
-        imported = 0
-        skipped = 0
+            chunk = []
+            for row in csv.DictReader(csv_file):
+                chunk.append(row)
+                if len(chunk) >= chunk_size:
+                    flush(chunk)
+                    chunk = []
+            if chunk:
+                flush(chunk)
+        finally:
+            conn.close()
 
-        for row in rows:
-            sku = row.get('sku', '') or None
-            product_id = row.get('product_id', '') or None
-            variant_id = row.get('variant_id', '') or None
-            vendor = row.get('vendor', '') or None
-            title = row.get('title', '') or None
-            product_type = row.get('product_type', '') or None
-            status = row.get('status', '') or None
-            handle = row.get('handle', '') or None
-            tags = row.get('tags', '') or None
-            price = row.get('price', '') or None
-            compare_at_price = row.get('compare_at_price', '') or None
-            weight = row.get('weight', '') or None
-            image_src = row.get('image_src', '') or None
-            body_html_length = row.get('body_html_length') or None
-            created_at = row.get('created_at', '') or None
-            updated_at = row.get('updated_at', '') or None
+        logger.info(f"✅ Shopify baseline import: {stats['inserted']} new, {stats['updated']} updated, "
+                    f"{stats['skipped']} skipped in {stats['chunks']} chunks")
+        return stats
 
-            meta = {}
-            for key, value in row.items():
-                if key.startswith('meta_') and value not in (None, ''):
-                    meta[key[5:]] = value
+    @staticmethod
+    def _sync_shopify_product_tags(cursor: sqlite3.Cursor, product_tags: Iterable[Tuple[int, Optional[str]]]) -> int:
+        """Replace the shopify_product_tags rows of each (shopify_products.id, tags) pair"""
+        product_tags = list(product_tags)
+        cursor.executemany('DELETE FROM shopify_product_tags WHERE product_id = ?',
+                           [(product_id,) for product_id, _ in product_tags])
 
-            if not variant_id and not sku:
-                skipped += 1
-                continue
+        rows = [
+            (product_id, position, key, value, raw)
+            for product_id, tags in product_tags
+            for position, (key, value, raw) in enumerate(parse_tag_pairs(tags))
+        ]
+        cursor.executemany('''
+            INSERT INTO shopify_product_tags (product_id, position, key, value, raw)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+        return len(rows)
 
-            cursor.execute('''
-                INSERT OR REPLACE INTO shopify_products (
-                    sku, product_id, variant_id, vendor, title, product_type, status, handle,
-                    tags, price, compare_at_price, weight, image_src, body_html_length,
-                    created_at, updated_at, meta_json, raw_json, imported_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (
-                sku, product_id, variant_id, vendor, title, product_type, status, handle,
-                tags, price, compare_at_price, weight, image_src, body_html_length,
-                created_at, updated_at, json.dumps(meta), json.dumps(row)
-            ))
-            imported += 1
+    def rebuild_shopify_product_tags(self) -> int:
+        """Re-parse every shopify_products.tags into shopify_product_tags. Returns tag rows written."""
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        try:
+            cursor.execute('DELETE FROM shopify_product_tags')
+            cursor.execute('SELECT id, tags FROM shopify_products')
+            count = self._sync_shopify_product_tags(cursor, cursor.fetchall())
+            conn.commit()
+            return count
+        finally:
+            conn.close()
 
-        conn.commit()
-        conn.close()
+    def get_shopify_product_types(self, skus: List[str]) -> Dict[str, str]:
+        """
+        Shopify product_type per SKU from the baseline, for sources that don't carry it
+
+        Args:
+            skus: Variant SKUs
 
-        return {'imported': imported, 'skipped': skipped}
+        Returns:
+            Dict of sku -> product_type (SKUs without a baseline row or product_type are absent)
+        """
+        skus = list(dict.fromkeys(sku for sku in skus if sku))
+        product_types = {}
+        if not skus:
+            return product_types
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for start in range(0, len(skus), 500):
+                chunk = skus[start:start + 500]
+                rows = conn.execute(f'''
+                    SELECT sku, product_type FROM shopify_products
+                    WHERE sku IN ({','.join('?' * len(chunk))}) AND product_type IS NOT NULL AND product_type != ''
+                ''', chunk).fetchall()
+                product_types.update(rows)
+        finally:
+            conn.close()
+        return product_types
 
     def get_shopify_baseline_stats(self) -> Dict[str, Any]:
         """Get summary stats for the Shopify baseline table."""
@@ -1177,16 +1832,37 @@ class SupplierDatabase:
 
         return updated
 
+    @staticmethod
+    def _review_priority(confidence_summary: Dict[str, Any]) -> Tuple[float, int, Optional[float]]:
+        """(overall_confidence, review_field_count, min_field_confidence) for the indexed review columns"""
+        overall = confidence_summary.get('overall_confidence')
+        review_fields = confidence_summary.get('review_fields', {})
+        field_scores = confidence_summary.get('field_scores') or {}
+        scores = [
+            score['confidence'] for score in field_scores.values()
+            if isinstance(score, dict) and isinstance(score.get('confidence'), (int, float))
+        ] if isinstance(field_scores, dict) else []
+        return (
+            overall if overall is not None else 1.0,
+            len(review_fields) if isinstance(review_fields, dict) else 0,
+            min(scores) if scores else None,
+        )
+
     def update_processing_queue_confidence(self, queue_id: int, confidence_summary: Dict[str, Any]) -> bool:
-        """Update confidence summary for a processing queue item"""
+        """Update confidence summary (and the review priority columns derived from it) for a queue item"""
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
 
+        overall, review_count, min_confidence = self._review_priority(confidence_summary)
         cursor.execute('''
             UPDATE processing_queue
-            SET confidence_summary = ?, updated_at = CURRENT_TIMESTAMP
+            SET confidence_summary = ?,
+                overall_confidence = ?,
+                review_field_count = ?,
+                min_field_confidence = ?,
+                updated_at = CURRENT_TIMESTAMP
             WHERE id = ?
-        ''', (json.dumps(confidence_summary), queue_id))
+        ''', (json.dumps(confidence_summary), overall, review_count, min_confidence, queue_id))
 
         updated = cursor.rowcount > 0
         conn.commit()
@@ -1211,12 +1887,17 @@ class SupplierDatabase:
 
         return updated
 
-    def get_items_needing_review(self, confidence_threshold: float = 0.6) -> List[Dict[str, Any]]:
+    def get_items_needing_review(self, confidence_threshold: float = 0.6,
+                                 limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get processing queue items with low-confidence fields needing manual review
 
+        Items qualify when overall confidence is below the threshold or any field
+        was routed to review. Least confident items come first.
+
         Args:
             confidence_threshold: Only return items with overall confidence below this
+            limit: Maximum items returned (None = all)
 
         Returns:
             List of queue items with their confidence summaries
@@ -1225,37 +1906,37 @@ class SupplierDatabase:
         conn.row_factory = sqlite3.Row
         cursor = conn.cursor()
 
-        cursor.execute('''
+        query = '''
             SELECT pq.*, sp.supplier_name, sp.product_url, sp.spec_sheet_url
             FROM processing_queue pq
             LEFT JOIN supplier_products sp ON pq.sku = sp.sku
-            WHERE pq.confidence_summary IS NOT NULL
-              AND pq.confidence_summary != ''
-            ORDER BY pq.created_at DESC
-        ''')
+            WHERE pq.overall_confidence IS NOT NULL
+              AND (pq.overall_confidence < ? OR pq.review_field_count > 0)
+            ORDER BY pq.overall_confidence ASC, pq.min_field_confidence ASC
+        '''
+        params: List[Any] = [confidence_threshold]
+        if limit is not None:
+            query += ' LIMIT ?'
+            params.append(limit)
 
-        rows = cursor.fetchall()
+        cursor.execute(query, params)
+        items = [dict(row) for row in cursor.fetchall()]
         conn.close()
 
-        # Filter items with low confidence
-        items = []
-        for row in rows:
-            item = dict(row)
-            # Parse confidence summary
-            if item.get('confidence_summary'):
-                try:
-                    conf_summary = json.loads(item['confidence_summary'])
-                    overall = conf_summary.get('overall_confidence', 1.0)
-                    review_fields = conf_summary.get('review_fields', {})
-                    review_count = len(review_fields) if isinstance(review_fields, dict) else 0
-                    # Include if overall is low OR there are review fields
-                    if overall < confidence_threshold or review_count > 0:
-                        items.append(item)
-                except (json.JSONDecodeError, TypeError):
-                    pass
-
         return items
 
+    def count_items_needing_review(self, confidence_threshold: float = 0.6) -> int:
+        """Number of items get_items_needing_review() would return without a limit"""
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute('''
+                SELECT COUNT(*) FROM processing_queue
+                WHERE overall_confidence IS NOT NULL
+                  AND (overall_confidence < ? OR review_field_count > 0)
+            ''', (confidence_threshold,)).fetchone()[0]
+        finally:
+            conn.close()
+
     def update_processing_queue_applied_fields(self, queue_id: int, applied_fields: Dict[str, Any]) -> bool:
         """
         Update applied_fields to track what was pushed to Shopify
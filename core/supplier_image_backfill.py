@@ -0,0 +1,161 @@
+"""
+Supplier Image Backfill
+Background job that fills supplier_products.image_url after a bulk import.
+og:image pages are fetched concurrently and the results are written back in
+batches, so imports no longer wait on one 15s request per row.
+"""
+import logging
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+
+from config.settings import get_settings
+from core.image_extractor import extract_og_image
+from core.supplier_db import get_supplier_db
+
+logger = logging.getLogger(__name__)
+
+# Per-page timeout, as the inline import used
+IMAGE_TIMEOUT = 15
+
+# Image URLs written to the database per transaction
+WRITE_BATCH_SIZE = 100
+
+
+class SupplierImageBackfill:
+    """Runs og:image extraction jobs for supplier products missing an image"""
+
+    def __init__(self, supplier_db=None):
+        self.settings = get_settings()
+        self.supplier_db = supplier_db or get_supplier_db()
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+
+    def start(self, skus: Optional[List[str]] = None) -> str:
+        """
+        Start a background image extraction job
+
+        Args:
+            skus: SKUs to fill (None = every product without an image)
+
+        Returns:
+            Job ID for get_job()
+        """
+        job_id = str(uuid.uuid4())
+        with self.lock:
+            self.jobs[job_id] = {
+                'job_id': job_id,
+                'status': 'queued',
+                'total': len(skus) if skus is not None else None,
+                'processed': 0,
+                'found': 0,
+                'not_found': 0,
+                'created_at': datetime.now().isoformat(),
+                'completed_at': None,
+                'error': None,
+            }
+
+        thread = threading.Thread(target=self._run_job, args=(job_id, skus), daemon=True,
+                                  name=f"supplier-images-{job_id[:8]}")
+        thread.start()
+        logger.info(f"🖼️ Started supplier image job {job_id} for {len(skus) if skus is not None else 'all'} products")
+        return job_id
+
+    def _run_job(self, job_id: str, skus: Optional[List[str]]):
+        self._update_job(job_id, status='running')
+
+        def progress(job_stats: Dict[str, int]):
+            self._update_job(job_id, **job_stats)
+
+        try:
+            stats = self.run(skus, progress_callback=progress)
+            self._update_job(job_id, status='completed', completed_at=datetime.now().isoformat(), **stats)
+        except Exception as e:
+            logger.error(f"❌ Supplier image job {job_id} failed: {e}")
+            self._update_job(job_id, status='failed', error=str(e), completed_at=datetime.now().isoformat())
+
+    def run(self, skus: Optional[List[str]] = None,
+            progress_callback: Optional[Callable[[Dict[str, int]], None]] = None) -> Dict[str, int]:
+        """
+        Extract and store images now, in the calling thread
+
+        Args:
+            skus: SKUs to fill (None = every product without an image)
+            progress_callback: Called with the running totals after each product
+
+        Returns:
+            Dict with total, processed, found and not_found counts
+        """
+        products = self.supplier_db.get_products_missing_images(skus)
+        stats = {'total': len(products), 'processed': 0, 'found': 0, 'not_found': 0}
+        if progress_callback:
+            progress_callback(dict(stats))
+        if not products:
+            return stats
+
+        pending = []
+        workers = max(1, self.settings.SUPPLIER_IMAGE_WORKERS)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(extract_og_image, product['product_url'], IMAGE_TIMEOUT): product['sku']
+                for product in products
+            }
+            for future in as_completed(futures):
+                sku = futures[future]
+                try:
+                    image_url = future.result()
+                except Exception as e:
+                    logger.warning(f"Failed to extract image for {sku}: {e}")
+                    image_url = None
+
+                stats['processed'] += 1
+                if image_url:
+                    stats['found'] += 1
+                    pending.append((sku, image_url))
+                else:
+                    stats['not_found'] += 1
+
+                if len(pending) >= WRITE_BATCH_SIZE:
+                    self.supplier_db.update_image_urls(pending)
+                    pending = []
+
+                if progress_callback:
+                    progress_callback(dict(stats))
+
+        self.supplier_db.update_image_urls(pending)
+        logger.info(f"✅ Supplier images: {stats['found']}/{stats['total']} found")
+        return stats
+
+    def _update_job(self, job_id: str, **fields):
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(fields)
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get a copy of a job's status and counts"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        """All jobs since startup, newest first"""
+        with self.lock:
+            jobs = [dict(job) for job in self.jobs.values()]
+        return sorted(jobs, key=lambda job: job['created_at'], reverse=True)
+
+
+# Singleton instance
+_supplier_image_backfill = None
+_supplier_image_backfill_lock = threading.Lock()
+
+
+def get_supplier_image_backfill() -> SupplierImageBackfill:
+    """Get singleton supplier image backfill instance"""
+    global _supplier_image_backfill
+    if _supplier_image_backfill is None:
+        with _supplier_image_backfill_lock:
+            if _supplier_image_backfill is None:
+                _supplier_image_backfill = SupplierImageBackfill()
+    return _supplier_image_backfill
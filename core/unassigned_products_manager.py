@@ -3,13 +3,19 @@ Unassigned Products Manager
 Handles Shopify backlog sheet used to triage uncategorized products.
 """
 import logging
-from typing import List, Dict, Optional
+import threading
+from typing import List, Dict, Optional, Any
 
 from config.settings import get_settings
+from core.cache_manager import cache_manager
 from core.sheets_manager import get_sheets_manager
 
 logger = logging.getLogger(__name__)
 
+# Row-index map of the sheet, kept in the local cache between reads
+INDEX_CACHE_NAMESPACE = 'unassigned_index'
+INDEX_CACHE_TTL = 300
+
 
 REQUIRED_HEADERS = [
     'url',
@@ -38,6 +44,8 @@ class UnassignedProductsManager:
         self.sheets_manager = get_sheets_manager()
         self._worksheet = None
         self._spreadsheet = None
+        # Serializes row deletes so sheet positions in the index stay valid
+        self._index_lock = threading.Lock()
 
     def _ensure_configured(self) -> bool:
         if not self.settings.UNASSIGNED_SPREADSHEET_ID:
@@ -86,13 +94,57 @@ class UnassignedProductsManager:
                 logger.error(f"Unable to open or create worksheet '{self.settings.UNASSIGNED_WORKSHEET_NAME}': {exc}")
                 return None
 
+    @property
+    def _index_key(self) -> str:
+        return f"{self.settings.UNASSIGNED_SPREADSHEET_ID}:{self.settings.UNASSIGNED_WORKSHEET_NAME}"
+
+    @staticmethod
+    def _build_index(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Index sheet records by normalized SKU
+
+        Returns:
+            {'records': [...in sheet order...], 'rows': {sku: [sheet row numbers]}}
+        """
+        rows: Dict[str, List[int]] = {}
+        for position, record in enumerate(records):
+            sku = str(record.get('variant_sku') or '').strip().lower()
+            if sku:
+                rows.setdefault(sku, []).append(position + 2)  # Row 1 is the header
+        return {'records': records, 'rows': rows}
+
+    def _store_index(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        index = self._build_index(records)
+        cache_manager.set(INDEX_CACHE_NAMESPACE, self._index_key, index, ttl=INDEX_CACHE_TTL)
+        return index
+
+    def _get_index(self) -> Optional[Dict[str, Any]]:
+        """Cached row-index map, rebuilt from one sheet read when missing or expired"""
+        index = cache_manager.get(INDEX_CACHE_NAMESPACE, self._index_key)
+        if index is not None:
+            return index
+        worksheet = self._get_worksheet()
+        if not worksheet:
+            return None
+        try:
+            return self._store_index(worksheet.get_all_records())
+        except Exception as exc:
+            logger.error(f"Failed to fetch unassigned products: {exc}")
+            return None
+
+    def invalidate_index(self):
+        """Drop the cached row-index map (e.g. after editing the sheet by hand)"""
+        cache_manager.invalidate(INDEX_CACHE_NAMESPACE, self._index_key)
+
     def get_all_products(self) -> List[Dict[str, str]]:
         """Return all rows as dictionaries keyed by header."""
         worksheet = self._get_worksheet()
         if not worksheet:
             return []
         try:
-            return worksheet.get_all_records()
+            records = worksheet.get_all_records()
+            self._store_index(records)
+            return records
         except Exception as exc:
             logger.error(f"Failed to fetch unassigned products: {exc}")
             return []
@@ -106,54 +158,107 @@ class UnassignedProductsManager:
             payload = [REQUIRED_HEADERS] + rows if rows else [REQUIRED_HEADERS]
             worksheet.clear()
             worksheet.update('A1', payload)
+            self._store_index([dict(zip(REQUIRED_HEADERS, row)) for row in rows])
             logger.info(f"Wrote {len(rows)} unassigned rows")
             return True
         except Exception as exc:
+            self.invalidate_index()
             logger.error(f"Failed to write unassigned products: {exc}")
             return False
 
     def remove_skus(self, skus: List[str]) -> int:
-        """Remove rows whose Variant SKU is in the provided list."""
+        """
+        Remove rows whose Variant SKU is in the provided list.
+
+        Row positions come from a fresh read of the Variant SKU column (the
+        cached index may be stale if the sheet changed since it was built), and
+        every matching row is deleted in a single batchUpdate of deleteDimension
+        requests (one per contiguous run, bottom-up so earlier indexes stay valid).
+        """
         normalized = {str(sku).strip().lower() for sku in skus if sku}
         if not normalized:
             return 0
         worksheet = self._get_worksheet()
         if not worksheet:
             return 0
-        try:
-            all_values = worksheet.get_all_values()
-            if not all_values:
+
+        with self._index_lock:
+            index = self._get_index()
+            if not index:
+                return 0
+
+            headers = list(index['records'][0].keys()) if index['records'] else REQUIRED_HEADERS
+            if 'variant_sku' not in headers:
+                logger.error("Unassigned sheet has no variant_sku column")
+                return 0
+            try:
+                sku_column = worksheet.col_values(headers.index('variant_sku') + 1)
+            except Exception as exc:
+                logger.error(f"Failed to read SKUs from unassigned sheet: {exc}")
+                return 0
+            if not sku_column or sku_column[0] != 'variant_sku':
+                self.invalidate_index()
+                logger.error("Unassigned sheet columns changed; not removing rows")
+                return 0
+
+            current_skus = [str(value).strip().lower() for value in sku_column[1:]]
+            row_numbers = [position + 2 for position, sku in enumerate(current_skus) if sku in normalized]
+            if not row_numbers:
                 return 0
-            header, *data_rows = all_values
-            kept_rows = [header]
-            removed = 0
-            sku_index = header.index('variant_sku') if 'variant_sku' in header else 0
-            for row in data_rows:
-                row_sku = str(row[sku_index]).strip().lower() if len(row) > sku_index else ''
-                if row_sku and row_sku in normalized:
-                    removed += 1
-                    continue
-                kept_rows.append(row)
-            worksheet.clear()
-            worksheet.update('A1', kept_rows)
-            return removed
-        except Exception as exc:
-            logger.error(f"Failed to remove SKUs from unassigned sheet: {exc}")
-            return 0
+
+            # Group into contiguous runs: [(first_row, last_row), ...]
+            runs = []
+            for row_num in row_numbers:
+                if runs and row_num == runs[-1][1] + 1:
+                    runs[-1][1] = row_num
+                else:
+                    runs.append([row_num, row_num])
+
+            delete_requests = [
+                {
+                    'deleteDimension': {
+                        'range': {
+                            'sheetId': worksheet.id,
+                            'dimension': 'ROWS',
+                            'startIndex': first - 1,
+                            'endIndex': last,
+                        }
+                    }
+                }
+                for first, last in reversed(runs)
+            ]
+
+            try:
+                self._get_spreadsheet().batch_update({'requests': delete_requests})
+            except Exception as exc:
+                self.invalidate_index()
+                logger.error(f"Failed to remove SKUs from unassigned sheet: {exc}")
+                return 0
+
+            # col_values drops trailing blank cells, so pad before comparing
+            cached_skus = [str(record.get('variant_sku') or '').strip().lower() for record in index['records']]
+            if cached_skus == current_skus + [''] * (len(cached_skus) - len(current_skus)):
+                deleted = set(row_numbers)
+                remaining = [record for position, record in enumerate(index['records'])
+                             if position + 2 not in deleted]
+                self._store_index(remaining)
+            else:
+                # The sheet moved under the cached index; rebuild it on next read
+                self.invalidate_index()
+
+        logger.info(f"Removed {len(row_numbers)} unassigned rows in {len(runs)} range(s)")
+        return len(row_numbers)
 
     def get_products_by_skus(self, skus: List[str]) -> List[Dict[str, str]]:
         """Return dictionaries for the requested SKUs."""
         lookup = {str(sku).strip().lower() for sku in skus if sku}
         if not lookup:
             return []
-        products = self.get_all_products()
-        matched: List[Dict[str, str]] = []
-        for product in products:
-            sku = str(product.get('variant_sku') or '').strip().lower()
-            if sku in lookup:
-                matched.append(product)
-        return matched
-
+        index = self._get_index()
+        if not index:
+            return []
+        row_numbers = sorted(row for sku in lookup for row in index['rows'].get(sku, []))
+        return [dict(index['records'][row_num - 2]) for row_num in row_numbers]
 
 # Global helper
 unassigned_products_manager = UnassignedProductsManager()
@@ -30,20 +30,24 @@ from config.validation import validate_product_data, calculate_quality_score
 from config.suppliers import get_supplier_contact, get_all_suppliers
 
 # Import core modules
-from core.sheets_manager import get_sheets_manager
-from core.ai_extractor import get_ai_extractor
-from core.data_processor import get_data_processor
 from core.google_apps_script_manager import google_apps_script_manager
-from core.pricing_manager import get_pricing_manager
 from core.cache_manager import cache_manager
 from core.supplier_db import get_supplier_db
 from core.collection_detector import detect_collection, detect_collection_batch, COLLECTION_PATTERNS
 from core.image_extractor import extract_og_image
 from core.wip_job_manager import get_wip_job_manager
 from core.wip_background_processor import process_wip_products_background
-from core.unassigned_products_manager import get_unassigned_products_manager
 from core.queue_processor import get_queue_processor
 
+# Modules that pull in gspread/googleapiclient/openai (and build their
+# singletons on import) load on first use, keeping worker cold start fast
+from utils.lazy_imports import LazyObject, lazy_callable
+get_sheets_manager = lazy_callable('core.sheets_manager', 'get_sheets_manager')
+get_ai_extractor = lazy_callable('core.ai_extractor', 'get_ai_extractor')
+get_data_processor = lazy_callable('core.data_processor', 'get_data_processor')
+get_pricing_manager = lazy_callable('core.pricing_manager', 'get_pricing_manager')
+get_unassigned_products_manager = lazy_callable('core.unassigned_products_manager', 'get_unassigned_products_manager')
+
 # Initialize settings and configure logging
 settings = get_settings()
 logging.config.dictConfig(settings.LOGGING_CONFIG)
@@ -482,10 +486,10 @@ else:
     socketio = None
     logger.info("Socket.IO disabled")
 
-# Get global instances
-sheets_manager = get_sheets_manager()
-ai_extractor = get_ai_extractor()
-data_processor = get_data_processor()
+# Get global instances (constructed on first attribute access)
+sheets_manager = LazyObject(get_sheets_manager)
+ai_extractor = LazyObject(get_ai_extractor)
+data_processor = LazyObject(get_data_processor)
 
 # Initialize WIP job manager and connect to Socket.IO
 wip_job_manager = get_wip_job_manager()
@@ -529,6 +533,16 @@ except ImportError as e:
     logger.warning(f"⚠️ Bulk PDF extraction routes not available: {e}")
 except Exception as e:
     logger.error(f"❌ Error registering bulk PDF extraction routes: {e}")
+
+# Register OpenAI Batch API content generation routes
+try:
+    from routes.content_batch_routes import setup_content_batch_routes
+    setup_content_batch_routes(app, data_processor)
+    logger.info("✅ Content batch routes registered")
+except ImportError as e:
+    logger.warning(f"⚠️ Content batch routes not available: {e}")
+except Exception as e:
+    logger.error(f"❌ Error registering content batch routes: {e}")
 
 # Register Review Queue UI routes
 try:
@@ -944,6 +958,40 @@ def processing_queue_page():
         return jsonify({'error': 'Failed to load processing queue page', 'details': str(e), 'traceback': traceback.format_exc()}), 500
 
 
+def apply_ml_collection_fallback(items):
+    """Fill predicted_collection from the ML category model for items no pattern or override matched"""
+    unmatched = [item for item in items if not item['predicted_collection'] and not item['is_override']]
+    if not unmatched:
+        return
+
+    # The unassigned sheet has no product_type column; the model reads it from the Shopify baseline
+    try:
+        product_types = get_supplier_db().get_shopify_product_types([item['variant_sku'] for item in unmatched])
+    except Exception as e:
+        logger.warning(f"⚠️ Shopify product types unavailable for ML fallback: {e}")
+        product_types = {}
+
+    try:
+        from core.collection_detector import predict_collections_ml
+        predictions = predict_collections_ml([
+            {**item, 'product_type': product_types.get(item['variant_sku'], '')}
+            for item in unmatched
+        ])
+    except Exception as e:
+        logger.warning(f"⚠️ ML collection fallback skipped: {e}")
+        return
+
+    for item, prediction in zip(unmatched, predictions):
+        if not prediction:
+            continue
+        item['ml_category'] = prediction['primary_category']
+        if prediction['collection']:
+            item['predicted_collection'] = prediction['collection']
+            item['confidence'] = prediction['confidence']
+            item['confidence_percent'] = int(prediction['confidence'] * 100)
+            item['prediction_source'] = 'ml'
+
+
 @app.route('/api/unassigned-products', methods=['GET'])
 def api_get_unassigned_products():
     """Return Shopify products sitting on the unassigned sheet with smart predictions."""
@@ -1039,11 +1087,6 @@ def api_get_unassigned_products():
                     confidence = float(confidence or 0.0)
                     is_override = False
 
-                if target_collection and (detected_collection or '').lower() != target_collection:
-                    continue
-                if confidence < min_conf:
-                    continue
-
                 item = {
                     'variant_sku': sku,
                     'shopify_id': str(row.get('id') or ''),
@@ -1067,6 +1110,14 @@ def api_get_unassigned_products():
                 }
                 processed.append(item)
 
+            # Filter after the ML fallback so ML-assigned collections are filterable too
+            apply_ml_collection_fallback(processed)
+            processed = [
+                item for item in processed
+                if (not target_collection or (item['predicted_collection'] or '').lower() == target_collection)
+                and item['confidence'] >= min_conf
+            ]
+
             total = len(processed)
             start = (page - 1) * limit
             end = start + limit
@@ -1125,6 +1176,8 @@ def api_get_unassigned_products():
                 }
                 paginated.append(item)
 
+            apply_ml_collection_fallback(paginated)
+
         total_pages = (total + limit - 1) // limit if limit else 1
 
         return jsonify({
@@ -1392,13 +1445,16 @@ def api_get_processing_queue():
         status = request.args.get('status', '')
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 50))
+        # Keyset cursor (next_cursor of the previous page); without it, page uses OFFSET
+        cursor = request.args.get('cursor', '')
 
         supplier_db = get_supplier_db()
         result = supplier_db.get_processing_queue(
             collection=collection if collection else None,
             status=status if status else None,
             page=page,
-            limit=limit
+            limit=limit,
+            after_id=int(cursor) if cursor else None
         )
 
         # Get statistics for the UI
@@ -1410,6 +1466,8 @@ def api_get_processing_queue():
             'total': result['total'],
             'page': result['page'],
             'total_pages': result['total_pages'],
+            'next_cursor': result['next_cursor'],
+            'has_more': result['has_more'],
             'stats': stats
         })
     except Exception as e:
@@ -1495,11 +1553,15 @@ def api_delete_processing_queue_item(queue_id):
 def api_approve_processing_queue_items():
     """Approve selected items and move them to the collection WIP, then upload to Google Sheet.
 
-    Uses the same data processing pipeline as the main collection workflow:
-    1. DataCleaner for rule-based standardization
+    Uses the same data processing pipeline as the main collection workflow, batched:
+    1. DataCleaner for rule-based standardization (all items in memory)
     2. Column mapping validation
-    3. WIP creation with proper linking
-    4. Google Sheet write via sheets_manager.add_product()
+    3. WIP creation and 'approving' queue status first, recorded per item
+    4. One Google Sheet append per collection, then its sheet rows are stored
+       on the WIP entries and the queue items removed
+
+    Batches larger than BACKGROUND_THRESHOLD run as a background job; poll
+    /api/processing-queue/approve/jobs/<job_id> for progress and the result.
     """
     try:
         data = request.get_json() or {}
@@ -1508,150 +1570,44 @@ def api_approve_processing_queue_items():
         if not queue_ids:
             return jsonify({'success': False, 'error': 'No items selected'}), 400
 
-        supplier_db = get_supplier_db()
-        sheets_mgr = get_sheets_manager()
-
-        # Get DataCleaner for final standardization
-        from core.data_cleaner import DataCleaner
-        data_cleaner = DataCleaner(sheets_mgr)
-
-        approved = []
-        errors = []
-
-        for queue_id in queue_ids:
-            try:
-                # Get queue item
-                item = supplier_db.get_processing_queue_item(queue_id)
-                if not item:
-                    errors.append(f'Item {queue_id} not found')
-                    continue
+        from core.queue_approver import get_queue_approver, BACKGROUND_THRESHOLD
+        approver = get_queue_approver()
 
-                collection_name = item['target_collection']
-                sku = item['sku']
-                title = item.get('title', '')
-                vendor = item.get('vendor', '')
-
-                logger.info(f"📋 Processing approval for {sku} -> {collection_name}")
-
-                # Create supplier product entry
-                product_url = build_shopify_product_url(item.get('shopify_handle', ''))
-                product_id = supplier_db.add_manual_product(
-                    sku=sku,
-                    product_url=product_url,
-                    product_name=title,
-                    supplier_name=vendor or 'Shopify'
-                )
-
-                # Get extracted data from the queue item (if any)
-                extracted_data = item.get('extracted_data')
-                if isinstance(extracted_data, str):
-                    import json
-                    extracted_data = json.loads(extracted_data) if extracted_data else {}
-                elif extracted_data is None:
-                    extracted_data = {}
-
-                # Apply final DataCleaner rules before writing to sheet
-                # This ensures consistency with the main collection workflow
-                try:
-                    # Load rules if not already loaded
-                    from config.settings import get_settings
-                    settings = get_settings()
-                    rules_spreadsheet_id = getattr(settings, 'RULES_SPREADSHEET_ID', None)
-                    if rules_spreadsheet_id:
-                        data_cleaner.load_rules(rules_spreadsheet_id)
-
-                    cleaned_data = data_cleaner.clean_extracted_data(
-                        collection_name=collection_name,
-                        extracted_data=extracted_data,
-                        title=title,
-                        vendor=vendor
-                    )
-                    logger.info(f"  🧹 Applied cleaning rules: {len(extracted_data)} -> {len(cleaned_data)} fields")
-                except Exception as clean_error:
-                    logger.warning(f"  ⚠️ DataCleaner failed, using raw data: {clean_error}")
-                    cleaned_data = extracted_data
-
-                # Get collection config to validate against column mapping
-                try:
-                    collection_config = get_collection_config(collection_name)
-                    column_mapping = getattr(collection_config, 'column_mapping', {})
-
-                    # Filter to only include fields that exist in the schema
-                    valid_fields = set(column_mapping.keys())
-                    validated_data = {k: v for k, v in cleaned_data.items() if k in valid_fields}
-                    logger.info(f"  ✅ Validated {len(validated_data)} fields against schema")
-                except Exception as config_error:
-                    logger.warning(f"  ⚠️ Schema validation skipped: {config_error}")
-                    validated_data = cleaned_data
-
-                # Add to WIP for the target collection with validated data
-                wip_id = supplier_db.add_to_wip(
-                    product_id,
-                    collection_name,
-                    extracted_data=validated_data
-                )
-
-                # Upload to Google Sheet
-                sheet_row = None
-                try:
-                    # Build sheet data from validated data + required fields
-                    sheet_data = {
-                        'variant_sku': sku,
-                        'url': product_url,
-                        'title': title,
-                        'vendor': vendor,
-                        **validated_data  # Merge validated extracted data
-                    }
-
-                    # Add Shopify images if available
-                    if item.get('shopify_images'):
-                        sheet_data['shopify_images'] = item.get('shopify_images')
-
-                    # Add spec sheet URL if available
-                    if item.get('shopify_spec_sheet'):
-                        sheet_data['shopify_spec_sheet'] = item.get('shopify_spec_sheet')
-
-                    # Add product to Google Sheet using existing infrastructure
-                    sheet_row = sheets_mgr.add_product(collection_name, sheet_data)
-                    logger.info(f"  ✅ Added {sku} to {collection_name} sheet at row {sheet_row}")
-
-                    # Update WIP with sheet row number
-                    supplier_db.update_wip_sheet_row(wip_id, sheet_row)
-
-                except Exception as sheet_error:
-                    logger.error(f"  ⚠️ Sheet write failed for {sku}: {sheet_error}")
-                    errors.append(f'{sku}: Added to WIP but sheet write failed - {str(sheet_error)}')
-
-                # Mark as approved and remove from queue
-                supplier_db.update_processing_queue_status(queue_id, 'approved')
-                supplier_db.remove_from_processing_queue(queue_id)
-
-                approved.append({
-                    'queue_id': queue_id,
-                    'sku': sku,
-                    'wip_id': wip_id,
-                    'collection': collection_name,
-                    'sheet_row': sheet_row,
-                    'fields_written': len(validated_data)
-                })
-
-            except Exception as item_error:
-                logger.error(f"Error approving item {queue_id}: {item_error}")
-                import traceback
-                logger.error(traceback.format_exc())
-                errors.append(f'{queue_id}: {str(item_error)}')
+        if len(queue_ids) > BACKGROUND_THRESHOLD:
+            job_id = approver.start(queue_ids)
+            return jsonify({
+                'success': True,
+                'job_id': job_id,
+                'status_url': f'/api/processing-queue/approve/jobs/{job_id}'
+            })
 
+        result = approver.run(queue_ids)
         return jsonify({
-            'success': len(approved) > 0,
-            'approved_count': len(approved),
-            'approved': approved,
-            'errors': errors
+            'success': result['approved_count'] > 0,
+            **result
         })
     except Exception as e:
         logger.error(f"Error approving processing queue items: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+@app.route('/api/processing-queue/approve/jobs/<job_id>', methods=['GET'])
+def api_get_processing_queue_approve_job(job_id):
+    """Get progress (and, once completed, the result) of a background approval job"""
+    from core.queue_approver import get_queue_approver
+    job = get_queue_approver().get_job(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+
 @app.route('/api/processing-queue/stats', methods=['GET'])
 def api_get_processing_queue_stats():
     """Get statistics for the processing queue."""
@@ -1782,7 +1738,8 @@ def api_extract_spec_sheet_data():
             'normalized_data': result.normalized_data,
             'raw_extraction': result.raw_extraction,
             'source_url': spec_sheet_url,
-            'field_count': len(result.extracted_data) if result.extracted_data else 0
+            'field_count': len(result.extracted_data) if result.extracted_data else 0,
+            'timings': result.timings
         })
 
     except Exception as e:
@@ -2611,21 +2568,18 @@ def get_checkbox_status(collection_name, row_num):
 def staging_stats(collection):
     """Get staging statistics for collection"""
     try:
-        from api.staging_routes import staging_data
+        from core.staging_store import get_staging_store
 
-        collection_products = [
-            product for product in staging_data.values()
-            if product.get('collection') == collection
-        ]
+        counts = get_staging_store().count_by_status(collection)
 
         stats = {
-            'total_staged': len(collection_products),
-            'uploaded': len([p for p in collection_products if p['status'] == 'uploaded']),
-            'extracting': len([p for p in collection_products if p['status'] == 'extracting']),
-            'extracted': len([p for p in collection_products if p['status'] == 'extracted']),
-            'processing': len([p for p in collection_products if p['status'] == 'processing']),
-            'ready': len([p for p in collection_products if p['status'] == 'ready']),
-            'error': len([p for p in collection_products if p['status'] == 'error']),
+            'total_staged': sum(counts.values()),
+            'uploaded': counts.get('uploaded', 0),
+            'extracting': counts.get('extracting', 0),
+            'extracted': counts.get('extracted', 0),
+            'processing': counts.get('processing', 0),
+            'ready': counts.get('ready', 0),
+            'error': counts.get('error', 0),
         }
 
         return jsonify({'success': True, 'stats': stats})
@@ -4316,6 +4270,44 @@ def api_generate_product_faqs(collection_name, row_num):
             'error': str(e)
         }), 500
 
+@app.route('/api/<collection_name>/products/generate-faqs-batch', methods=['POST'])
+def api_generate_faqs_batch(collection_name):
+    """Generate FAQs for many products, several products per ChatGPT request"""
+    try:
+        data = request.get_json() or {}
+
+        if not settings.OPENAI_API_KEY:
+            return jsonify({
+                'success': False,
+                'error': 'OpenAI API key not configured'
+            }), 500
+
+        row_numbers = data.get('row_numbers')
+        if row_numbers is not None:
+            try:
+                row_numbers = [int(row_num) for row_num in row_numbers]
+            except (TypeError, ValueError):
+                return jsonify({
+                    'success': False,
+                    'error': 'row_numbers must be a list of row numbers'
+                }), 400
+
+        from core.faq_generator import faq_generator
+        result = faq_generator.update_collection_faqs(
+            collection_name,
+            row_numbers=row_numbers,
+            overwrite=bool(data.get('overwrite', False))
+        )
+
+        return jsonify(result), 200 if result['success'] else 500
+
+    except Exception as e:
+        logger.error(f"Error generating batch FAQs for {collection_name}: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/api/<collection_name>/generate-faqs', methods=['POST'])
 def api_generate_faqs(collection_name):
     """Generate FAQs for a collection or specific product using ChatGPT"""
@@ -4437,7 +4429,9 @@ def api_generate_product_title_with_competitors(collection_name, row_num):
         # Generate title with competitor analysis
         try:
             ai_extractor = get_ai_extractor()
-            result = ai_extractor.generate_seo_product_title_with_competitor_analysis(product_data, collection_name)
+            offline = bool((request.get_json(silent=True) or {}).get('offline'))
+            result = ai_extractor.generate_seo_product_title_with_competitor_analysis(product_data, collection_name,
+                                                                                      offline=offline)
             logger.info(f"Competitor-enhanced title generation result: {result.get('success', False)}")
         except Exception as e:
             logger.error(f"Error in competitor-enhanced title generation: {e}")
@@ -6227,7 +6221,7 @@ application = app
 # Log startup information
 logger.info("Collection-Agnostic PIM System with Staging and Pricing Loaded")
 logger.info(f"Available collections: {list(get_all_collections().keys())}")
-logger.info(f"Google Sheets connected: {bool(sheets_manager.gc)}")
+logger.info("Google Sheets: connects on first use")
 logger.info(f"OpenAI configured: {bool(settings.OPENAI_API_KEY)}")
 logger.info(f"Features enabled: {[k for k, v in settings.FEATURES.items() if v]}")
 logger.info("New Products Staging System: ENABLED")
@@ -7259,6 +7253,33 @@ def api_cache_stats():
             'misses': 0
         })
 
+@app.route('/api/system/model-router-stats', methods=['GET'])
+def api_model_router_stats():
+    """Get fast/strong model cascade metrics (latency, cost, escalation rate per route)"""
+    try:
+        from core.model_router import get_model_router
+        return jsonify(get_model_router().get_metrics())
+    except Exception as e:
+        logger.error(f"Error getting model router stats: {e}")
+        return jsonify({'routes': {}, 'models': {}, 'total_cost_usd': 0.0})
+
+@app.route('/api/system/competitor-title-cache', methods=['GET'])
+def api_competitor_title_cache():
+    """Get competitor title cache statistics; ?brand= and/or ?q= also return matching cached titles"""
+    try:
+        from core.competitor_title_cache import get_competitor_title_cache
+        cache = get_competitor_title_cache()
+        response = cache.get_stats(max_age_days=settings.COMPETITOR_TITLE_CACHE_TTL_DAYS)
+        brand = request.args.get('brand')
+        text = request.args.get('q')
+        if brand or text:
+            response['titles_found'] = cache.search(brand_name=brand, text=text,
+                                                    limit=request.args.get('limit', 100, type=int))
+        return jsonify(response)
+    except Exception as e:
+        logger.error(f"Error getting competitor title cache stats: {e}")
+        return jsonify({'queries': 0, 'titles': 0, 'error': str(e)})
+
 @app.route('/api/system/queue-stats', methods=['GET'])
 def api_queue_stats():
     """Get async processing queue statistics"""
@@ -7367,8 +7388,8 @@ def api_import_supplier_products():
 
         supplier_db = get_supplier_db()
 
-        # Import products with auto image extraction
-        # Set auto_extract_images=True by default, unless explicitly disabled
+        # Rows are upserted in one transaction; images are extracted by a background job
+        # (auto_extract_images=True by default, unless explicitly disabled)
         auto_extract = data.get('auto_extract_images', True)
         result = supplier_db.import_from_csv(data['products'], auto_extract_images=auto_extract)
 
@@ -7385,6 +7406,45 @@ def api_import_supplier_products():
         }), 500
 
 
+@app.route('/api/supplier-products/image-jobs', methods=['POST'])
+def api_start_supplier_image_job():
+    """Start a background job extracting images for supplier products without one"""
+    try:
+        data = request.get_json(silent=True) or {}
+
+        from core.supplier_image_backfill import get_supplier_image_backfill
+        job_id = get_supplier_image_backfill().start(data.get('skus'))
+
+        return jsonify({
+            'success': True,
+            'job_id': job_id
+        })
+
+    except Exception as e:
+        logger.error(f"Error starting supplier image job: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@app.route('/api/supplier-products/image-jobs/<job_id>', methods=['GET'])
+def api_get_supplier_image_job(job_id):
+    """Get progress of a supplier image extraction job"""
+    from core.supplier_image_backfill import get_supplier_image_backfill
+    job = get_supplier_image_backfill().get_job(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'job': job
+    })
+
+
 @app.route('/api/supplier-products/search', methods=['POST'])
 def api_search_supplier_products():
     """Search supplier products by SKU list"""
@@ -160,14 +160,19 @@ function syncRowToFirestore(rowNum, fieldName, newValue) {
     const docId = String(rowNum);
     const firestoreUrl = `https://firestore.googleapis.com/v1/projects/${projectId}/databases/(default)/documents/${collection}/${docId}`;
 
-    // Prepare update data - only update the changed field
-    const updateMask = `updateMask.fieldPaths=${fieldName}`;
+    // Prepare update data - only update the changed field (plus row_number, which
+    // cursor pagination orders by and must equal the document ID)
+    let updateMask = `updateMask.fieldPaths=${fieldName}`;
+    if (fieldName !== 'row_number') {
+      updateMask += '&updateMask.fieldPaths=row_number';
+    }
 
     // Build Firestore document format
     const documentData = {
       fields: {}
     };
     documentData.fields[fieldName] = convertToFirestoreValue(newValue);
+    documentData.fields.row_number = rowNumberValue(rowNum);
 
     const options = {
       method: 'patch',
@@ -233,6 +238,7 @@ function syncEntireRowToFirestore(rowNum) {
       const value = rowData[columnIndex] || '';
       documentData.fields[fieldName] = convertToFirestoreValue(value);
     }
+    documentData.fields.row_number = rowNumberValue(rowNum);
 
     const accessToken = getFirestoreAccessToken();
     const projectId = CONFIG.FIREBASE_PROJECT_ID;
@@ -334,6 +340,14 @@ function convertToFirestoreValue(value) {
   return { stringValue: String(value) };
 }
 
+/**
+ * Firestore value for row_number: always the integer sheet row (the document ID),
+ * never the column A cell, which convertToFirestoreValue could turn into a string
+ */
+function rowNumberValue(rowNum) {
+  return { integerValue: String(parseInt(rowNum, 10)) };
+}
+
 /**
  * Convert column number to letter (1 → A, 27 → AA)
  */
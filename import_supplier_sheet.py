@@ -19,8 +19,6 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from core.supplier_db import get_supplier_db
-from core.image_extractor import extract_og_image
-from core.collection_detector import detect_collection
 
 load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
@@ -167,6 +165,7 @@ def import_supplier_sheet(
     total_updated = 0
     total_skipped = 0
     total_errors = 0
+    skus_missing_images = []
 
     for i, tab in enumerate(product_tabs, 1):
         supplier_name = tab['title']
@@ -189,71 +188,24 @@ def import_supplier_sheet(
             logger.warning(f"⚠️  Tab '{supplier_name}' missing SKU or URL columns - skipping")
             continue
 
-        # Process products
-        processed = 0
-        imported = 0
-        updated = 0
-        skipped = 0
-        errors = 0
-
-        for row in sheet_data:
-            sku = row.get('sku', '').strip()
-            url = row.get('url', '').strip()
-
-            if not sku or not url:
-                skipped += 1
-                continue
-
-            try:
-                # Check if already exists
-                if skip_existing:
-                    existing = supplier_db.search_by_sku([sku])
-                    if existing:
-                        skipped += 1
-                        continue
-
-                # Extract image if requested
-                image_url = None
-                if extract_images:
-                    try:
-                        logger.info(f"  🖼️  Extracting image for {sku}...")
-                        image_url = extract_og_image(url, timeout=10)
-                    except Exception as e:
-                        logger.warning(f"  ⚠️  Failed to extract image: {e}")
-
-                # Detect collection
-                collection, confidence = detect_collection('', url)
-
-                # Import to database
-                csv_row = [{
-                    'sku': sku,
-                    'supplier_name': supplier_name,
-                    'product_url': url,
-                    'product_name': '',
-                    'image_url': image_url or ''
-                }]
-
-                result = supplier_db.import_from_csv(csv_row, auto_extract_images=False)
-
-                if result['imported'] > 0:
-                    imported += 1
-                elif result['updated'] > 0:
-                    updated += 1
-                else:
-                    skipped += 1
-
-                # Update collection detection
-                if collection:
-                    supplier_db.update_collection_detection(sku, collection, confidence)
-
-                processed += 1
-
-                if processed % 50 == 0:
-                    logger.info(f"  📈 Processed {processed}/{len(sheet_data)} from {supplier_name}")
-
-            except Exception as e:
-                logger.error(f"  ❌ Error importing {sku}: {e}")
-                errors += 1
+        # Upsert the whole tab in one transaction; images are fetched afterwards
+        csv_rows = [
+            {
+                'sku': row.get('sku', '').strip(),
+                'supplier_name': supplier_name,
+                'product_url': row.get('url', '').strip(),
+                'product_name': '',
+                'image_url': ''
+            }
+            for row in sheet_data
+        ]
+
+        result = supplier_db.bulk_import(csv_rows, skip_existing=skip_existing)
+        imported = result['imported']
+        updated = result['updated']
+        skipped = result['skipped'] + result['duplicates']
+        errors = len(result['errors'])
+        skus_missing_images.extend(result['skus_missing_images'])
 
         logger.info(f"✅ {supplier_name} complete:")
         logger.info(f"   - Imported: {imported}")
@@ -276,6 +228,13 @@ def import_supplier_sheet(
     logger.info(f"Total Errors:   {total_errors}")
     logger.info(f"{'='*60}")
 
+    # Phase two: fetch og:images concurrently for the imported products still missing one
+    if extract_images and skus_missing_images:
+        from core.supplier_image_backfill import get_supplier_image_backfill
+        logger.info(f"🖼️  Extracting images for {len(skus_missing_images)} products...")
+        stats = get_supplier_image_backfill().run(skus_missing_images)
+        logger.info(f"✅ Images found: {stats['found']}/{stats['total']}")
+
 
 if __name__ == '__main__':
     import argparse
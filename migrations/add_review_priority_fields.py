@@ -0,0 +1,96 @@
+"""
+Migration: Add indexed review-priority columns to processing_queue
+Date: 2026-10-18
+
+overall_confidence, review_field_count and min_field_confidence are copied
+out of confidence_summary so the review queue can filter and sort in SQL.
+"""
+
+import sqlite3
+import os
+import logging
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = [
+    ('overall_confidence', 'REAL'),
+    ('review_field_count', 'INTEGER'),
+    ('min_field_confidence', 'REAL'),
+]
+
+
+def run_migration(db_path: str = None):
+    """
+    Add review-priority columns and indexes to processing_queue and backfill
+    them from the existing confidence_summary JSON
+
+    Args:
+        db_path: Path to supplier_products.db (defaults to project root)
+    """
+    if db_path is None:
+        project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        db_path = os.path.join(project_dir, 'supplier_products.db')
+
+    if not os.path.exists(db_path):
+        logger.warning(f"Database not found at {db_path}, skipping migration")
+        return
+
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+
+    try:
+        for column, column_type in COLUMNS:
+            try:
+                cursor.execute(f"ALTER TABLE processing_queue ADD COLUMN {column} {column_type}")
+                logger.info(f"✅ Added {column} column")
+            except sqlite3.OperationalError as e:
+                if "duplicate column name" in str(e).lower():
+                    logger.info(f"⏭️  {column} already exists")
+                else:
+                    raise
+
+        # Same values SupplierDatabase.update_processing_queue_confidence stores
+        cursor.execute("""
+            UPDATE processing_queue
+            SET overall_confidence = COALESCE(json_extract(confidence_summary, '$.overall_confidence'), 1.0),
+                review_field_count = CASE
+                    WHEN json_type(confidence_summary, '$.review_fields') = 'object'
+                    THEN (SELECT COUNT(*) FROM json_each(confidence_summary, '$.review_fields'))
+                    ELSE 0
+                END,
+                min_field_confidence = (
+                    SELECT MIN(json_extract(value, '$.confidence'))
+                    FROM json_each(confidence_summary, '$.field_scores')
+                )
+            WHERE confidence_summary IS NOT NULL
+              AND confidence_summary != ''
+              AND json_valid(confidence_summary)
+        """)
+        logger.info(f"✅ Backfilled review priority for {cursor.rowcount} queue items")
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pq_review_priority
+            ON processing_queue(overall_confidence, min_field_confidence)
+        """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_pq_review_field_count
+            ON processing_queue(review_field_count)
+        """)
+        logger.info("✅ Added review priority indexes")
+
+        conn.commit()
+    except Exception as e:
+        logger.error(f"❌ Migration failed: {e}")
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    run_migration()
+    print("\n✅ Migration complete! New fields added:")
+    print("   - processing_queue.overall_confidence")
+    print("   - processing_queue.review_field_count")
+    print("   - processing_queue.min_field_confidence")
@@ -0,0 +1,54 @@
+"""
+Migration: Move staging products from staging_data.json into the SQLite staging store
+Date: 2026-10-18
+"""
+
+import os
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JSON_PATH = '/home/cassbrothers/mysite/staging_data.json'
+
+
+def run_migration(json_path: str = None, db_path: str = None) -> int:
+    """
+    Import staging_data.json into the staging_products table, then rename the
+    JSON file to *.migrated so the import only ever runs once.
+
+    Args:
+        json_path: Path to the legacy JSON file
+        db_path: Path to the staging SQLite database (defaults to project root)
+
+    Returns:
+        Number of products migrated
+    """
+    project_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_dir not in sys.path:
+        sys.path.insert(0, project_dir)
+    from core.staging_store import StagingStore, get_staging_store
+
+    json_path = json_path or DEFAULT_JSON_PATH
+    if not os.path.exists(json_path):
+        logger.info(f"⏭️  No staging JSON at {json_path}, nothing to migrate")
+        return 0
+
+    store = StagingStore(db_path) if db_path else get_staging_store()
+
+    try:
+        migrated = store.import_from_json(json_path)
+    except Exception as e:
+        logger.error(f"❌ Staging migration failed: {e}")
+        raise
+
+    os.replace(json_path, json_path + '.migrated')
+    logger.info(f"🎉 Migrated {migrated} staging products; renamed {json_path} to *.migrated")
+    return migrated
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    path = sys.argv[1] if len(sys.argv) > 1 else None
+    count = run_migration(path)
+    print(f"\n✅ Migration complete! {count} staging products moved to SQLite")
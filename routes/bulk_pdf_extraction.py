@@ -6,13 +6,16 @@ import logging
 import time
 import threading
 from flask import request, jsonify
-from extract_dimensions_from_pdf import PDFDimensionExtractor
-from core.ai_extractor import AIExtractor
 from config.collections import get_collection_config
+from utils.lazy_imports import lazy_callable
 import tempfile
 import requests
 import os
 
+# openai and googleapiclient load when the first extraction runs, not at route registration
+PDFDimensionExtractor = lazy_callable('extract_dimensions_from_pdf', 'PDFDimensionExtractor')
+AIExtractor = lazy_callable('core.ai_extractor', 'AIExtractor')
+
 logger = logging.getLogger(__name__)
 
 def setup_bulk_pdf_routes(app, sheets_manager, socketio):
@@ -110,8 +113,8 @@ def setup_bulk_pdf_routes(app, sheets_manager, socketio):
 
             # Create thread-safe sheets manager for writing (only needed for bulk updates)
             logger.info(f"🔧 Step 3: Creating thread-safe Google Sheets writer...")
-            from core.sheets_manager import GoogleSheetsManager
-            thread_sheets_manager = GoogleSheetsManager()
+            from core.sheets_manager import SheetsManager
+            thread_sheets_manager = SheetsManager()
             logger.info(f"✅ Thread-safe writer created")
 
             # Track results
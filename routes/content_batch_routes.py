@@ -0,0 +1,89 @@
+"""
+API routes for OpenAI Batch API content generation
+
+Submitting queues description/features/care-instruction requests as batch
+jobs; results are written back to the sheet once a job completes (half the
+per-token cost of the synchronous path, at the price of latency).
+"""
+
+import logging
+from flask import jsonify, request
+
+logger = logging.getLogger(__name__)
+
+
+def setup_content_batch_routes(app, data_processor):
+    """Setup batch content generation routes"""
+
+    @app.route('/api/<collection_name>/process/content-batch', methods=['POST'])
+    def api_submit_content_batch(collection_name):
+        """
+        Submit content generation for many products as batch jobs
+
+        Request body:
+        {
+            "selected_rows": [2, 3, 4],
+            "fields_to_generate": ["description", "features", "care_instructions"],
+            "use_url_content": false,
+            "max_feature_words": 5
+        }
+        """
+        try:
+            payload = request.get_json() or {}
+            selected_rows = payload.get('selected_rows') or None
+
+            result = data_processor.generate_product_content(
+                collection_name=collection_name,
+                selected_rows=selected_rows,
+                use_url_content=payload.get('use_url_content', False),
+                fields_to_generate=payload.get('fields_to_generate'),
+                max_feature_words=payload.get('max_feature_words', 5),
+                batch_mode=True
+            )
+            return jsonify(result), 200 if result.get('success') else 400
+
+        except ValueError:
+            return jsonify({"success": False, "message": f"Collection not found: {collection_name}"}), 404
+        except Exception as e:
+            logger.error(f"❌ Batch content submission failed for {collection_name}: {e}")
+            return jsonify({"success": False, "message": str(e)}), 500
+
+    @app.route('/api/content-batches', methods=['GET'])
+    def api_list_content_batches():
+        """List content batch jobs, refreshing the ones still running"""
+        try:
+            from core.openai_batch import get_batch_runner
+
+            runner = get_batch_runner()
+            runner.resume()
+            jobs = [job for job in runner.store.list_jobs() if job['name'].startswith('content:')]
+            return jsonify({"success": True, "jobs": jobs})
+
+        except Exception as e:
+            logger.error(f"❌ Failed to list content batches: {e}")
+            return jsonify({"success": False, "message": str(e)}), 500
+
+    @app.route('/api/content-batches/<job_id>/apply', methods=['POST'])
+    def api_apply_content_batch(job_id):
+        """Write a completed batch job's results back to the sheet"""
+        try:
+            result = data_processor.apply_content_generation_batch(job_id)
+            return jsonify(result), 200 if result.get('success') else 409
+
+        except ValueError as e:
+            return jsonify({"success": False, "message": str(e)}), 404
+        except Exception as e:
+            logger.error(f"❌ Failed to apply content batch {job_id}: {e}")
+            return jsonify({"success": False, "message": str(e)}), 500
+
+    @app.route('/api/content-batches/apply-completed', methods=['POST'])
+    def api_apply_completed_content_batches():
+        """Resume polling after a restart and apply every completed, unapplied job"""
+        try:
+            collection_name = (request.get_json() or {}).get('collection_name')
+            applied = data_processor.apply_completed_content_batches(collection_name)
+            return jsonify({"success": True, "applied": applied})
+
+        except Exception as e:
+            logger.error(f"❌ Failed to apply completed content batches: {e}")
+            return jsonify({"success": False, "message": str(e)}), 500
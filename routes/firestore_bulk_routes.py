@@ -73,48 +73,54 @@ def setup_firestore_bulk_routes(app):
             failed = []
             errors = []
 
+            # Batched reads of current values: needed for append mode, and lets
+            # unchanged documents be skipped before any write is issued
+            current_products = firestore_manager.get_products_batch(collection_name, product_ids)
+
+            updates_by_row = {}
             for row_num in product_ids:
-                try:
-                    # Get current product if append mode
-                    if update_mode == 'append':
-                        current_product = firestore_manager.get_single_product(collection_name, row_num)
-                        if current_product:
-                            # Merge updates (append tags, etc.)
-                            merged_updates = {}
-                            for field, new_value in updates.items():
-                                current_value = current_product.get(field, '')
-                                if field in ['tags', 'features']:
-                                    # Append to comma-separated lists
-                                    if current_value:
-                                        merged_updates[field] = f"{current_value}, {new_value}"
-                                    else:
-                                        merged_updates[field] = new_value
-                                else:
-                                    merged_updates[field] = new_value
-                            updates_to_apply = merged_updates
+                current_product = current_products.get(int(row_num))
+                if not current_product:
+                    # A missing document would fail its whole WriteBatch, so reject it up front
+                    failed.append(row_num)
+                    errors.append(f"Row {row_num}: Product not found")
+                    continue
+                if update_mode == 'append':
+                    # Merge updates (append tags, etc.)
+                    merged_updates = {}
+                    for field, new_value in updates.items():
+                        current_value = current_product.get(field, '')
+                        if field in ['tags', 'features']:
+                            # Append to comma-separated lists
+                            if current_value:
+                                merged_updates[field] = f"{current_value}, {new_value}"
+                            else:
+                                merged_updates[field] = new_value
                         else:
-                            updates_to_apply = updates
-                    else:
-                        updates_to_apply = updates
-
-                    # Apply updates
-                    success = firestore_manager.update_product_row(
-                        collection_name,
-                        row_num,
-                        updates_to_apply,
-                        overwrite_mode=True
-                    )
-
-                    if success:
-                        successful.append(row_num)
-                    else:
-                        failed.append(row_num)
-                        errors.append(f"Row {row_num}: Update failed")
-
-                except Exception as e:
+                            merged_updates[field] = new_value
+                    updates_by_row[int(row_num)] = merged_updates
+                else:
+                    updates_by_row[int(row_num)] = dict(updates)
+
+            # Apply updates in 500-op batches
+            write_stats = firestore_manager.batch_update_products(
+                collection_name,
+                updates_by_row,
+                overwrite_mode=True,
+                existing=current_products,
+                create_missing=False
+            )
+
+            failed_ids = set(write_stats['failed_ids'])
+            for row_num in product_ids:
+                if int(row_num) not in updates_by_row:
+                    continue
+                if str(int(row_num)) in failed_ids:
                     failed.append(row_num)
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    logger.error(f"Error updating row {row_num}: {e}")
+                    errors.append(f"Row {row_num}: Update failed")
+                else:
+                    successful.append(row_num)
+            errors.extend(write_stats['errors'])
 
             logger.info(f"✅ [Bulk Edit] Complete: {len(successful)} success, {len(failed)} failed")
 
@@ -174,20 +180,19 @@ def setup_firestore_bulk_routes(app):
             failed = []
             errors = []
 
-            collection_ref = firestore_manager.get_collection_ref(collection_name)
-
+            writer = firestore_manager.get_batch_writer(collection_name)
             for row_num in product_ids:
-                try:
-                    # Delete the document
-                    doc_ref = collection_ref.document(str(row_num))
-                    doc_ref.delete()
-                    successful.append(row_num)
-                    logger.debug(f"✅ Deleted row {row_num}")
+                writer.delete(row_num)
+            write_stats = writer.flush()
 
-                except Exception as e:
+            failed_ids = set(write_stats['failed_ids'])
+            for row_num in product_ids:
+                if str(row_num) in failed_ids:
                     failed.append(row_num)
-                    errors.append(f"Row {row_num}: {str(e)}")
-                    logger.error(f"Error deleting row {row_num}: {e}")
+                    errors.append(f"Row {row_num}: Delete failed")
+                else:
+                    successful.append(row_num)
+            errors.extend(write_stats['errors'])
 
             # Invalidate cache
             firestore_manager._invalidate_cache(collection_name)
@@ -306,7 +311,35 @@ def setup_firestore_bulk_routes(app):
             failed = []
             errors = []
 
-            collection_ref = firestore_manager.get_collection_ref(collection_name)
+            # SKU -> row number index, built once on first lookup instead of per row
+            sku_index = None
+
+            def find_row_num(clean_row):
+                nonlocal sku_index
+                if 'row_number' in clean_row and clean_row['row_number']:
+                    return int(clean_row['row_number'])
+                if 'variant_sku' in clean_row and clean_row['variant_sku']:
+                    if sku_index is None:
+                        sku_index = {}
+                        for r, product in firestore_manager.get_all_products(collection_name).items():
+                            product_sku = str(product.get('variant_sku') or '').strip()
+                            if product_sku:
+                                sku_index.setdefault(product_sku, r)
+                    return sku_index.get(str(clean_row['variant_sku']).strip())
+                return None
+
+            def merge_cleaning(payload, product):
+                # Cleaning results only fill in non-empty values (overwrite_mode=False)
+                cleaning_updates = data_cleaner.clean_product(collection_name, product)
+                for field, value in (cleaning_updates or {}).items():
+                    if value is not None and str(value).strip() != '':
+                        payload[field] = value
+                return payload
+
+            # First pass: classify rows so all writes can be committed in batches
+            deletes = []   # (csv line, row_num)
+            updates = []   # (csv line, row_num, clean_row)
+            adds = []      # (csv line, clean_row)
 
             for i, row in enumerate(rows, start=1):
                 try:
@@ -324,109 +357,86 @@ def setup_firestore_bulk_routes(app):
                     if not any(clean_row.values()):
                         continue
 
-                    # Handle DELETE action
-                    if action == 'DELETE':
+                    if action in ('DELETE', 'UPDATE'):
                         # Find product by row_number or variant_sku
-                        row_num = None
-
-                        if 'row_number' in clean_row and clean_row['row_number']:
-                            row_num = int(clean_row['row_number'])
-                        elif 'variant_sku' in clean_row and clean_row['variant_sku']:
-                            # Find by SKU
-                            sku = str(clean_row['variant_sku']).strip()
-                            all_products = firestore_manager.get_all_products(collection_name)
-                            for r, product in all_products.items():
-                                if product.get('variant_sku', '').strip() == sku:
-                                    row_num = r
-                                    break
-
-                        if row_num:
-                            doc_ref = collection_ref.document(str(row_num))
-                            doc_ref.delete()
-                            deleted.append(row_num)
-                            logger.info(f"🗑️ Deleted row {row_num} (CSV line {i})")
-                        else:
-                            errors.append(f"Row {i}: DELETE failed - product not found")
+                        row_num = find_row_num(clean_row)
+                        if not row_num:
+                            errors.append(f"Row {i}: {action} failed - product not found")
                             failed.append(i)
-
-                        continue
-
-                    # Handle UPDATE action
-                    if action == 'UPDATE':
-                        # Find product by row_number or variant_sku
-                        row_num = None
-
-                        if 'row_number' in clean_row and clean_row['row_number']:
-                            row_num = int(clean_row['row_number'])
-                        elif 'variant_sku' in clean_row and clean_row['variant_sku']:
-                            # Find by SKU
-                            sku = str(clean_row['variant_sku']).strip()
-                            all_products = firestore_manager.get_all_products(collection_name)
-                            for r, product in all_products.items():
-                                if product.get('variant_sku', '').strip() == sku:
-                                    row_num = r
-                                    break
-
-                        if row_num:
-                            # Update the product (overwrite existing data)
-                            success = firestore_manager.update_product_row(
-                                collection_name,
-                                row_num,
-                                clean_row,
-                                overwrite_mode=True  # Overwrite existing data with new values
-                            )
-
-                            if success:
-                                # Apply data cleaning
-                                current_product = firestore_manager.get_single_product(collection_name, row_num)
-                                cleaning_updates = data_cleaner.clean_product(collection_name, current_product)
-                                if cleaning_updates:
-                                    firestore_manager.update_product_row(
-                                        collection_name,
-                                        row_num,
-                                        cleaning_updates,
-                                        overwrite_mode=False
-                                    )
-
-                                updated.append(row_num)
-                                logger.info(f"✏️ Updated row {row_num} (CSV line {i})")
-                            else:
-                                errors.append(f"Row {i}: UPDATE failed - could not update product")
-                                failed.append(i)
+                        elif action == 'DELETE':
+                            deletes.append((i, row_num))
                         else:
-                            errors.append(f"Row {i}: UPDATE failed - product not found")
-                            failed.append(i)
-
+                            updates.append((i, row_num, clean_row))
                         continue
 
                     # Default: ADD new product
-                    # Add metadata
-                    clean_row['created_at'] = datetime.utcnow().isoformat()
-                    clean_row['imported_from'] = file.filename
+                    adds.append((i, clean_row))
 
-                    # Add product to Firestore
-                    row_num = firestore_manager.add_product(collection_name, clean_row)
+                except Exception as e:
+                    failed.append(i)
+                    errors.append(f"Row {i}: {str(e)}")
+                    logger.error(f"Error processing row {i}: {e}")
 
-                    # Apply data cleaning rules
-                    product_with_row = {**clean_row, 'row_number': row_num}
-                    cleaning_updates = data_cleaner.clean_product(collection_name, product_with_row)
+            writer = firestore_manager.get_batch_writer(collection_name)
+            queued = {}  # doc_id -> (csv line, result list, row_num)
 
-                    if cleaning_updates:
-                        firestore_manager.update_product_row(
-                            collection_name,
-                            row_num,
-                            cleaning_updates,
-                            overwrite_mode=False
-                        )
+            for i, row_num in deletes:
+                writer.delete(row_num)
+                queued[str(row_num)] = (i, deleted, row_num)
 
-                    imported.append(row_num)
-                    logger.debug(f"✅ Imported row {i} as document {row_num}")
+            # UPDATE: read current documents in batches, clean in memory, one write each
+            current_products = firestore_manager.get_products_batch(
+                collection_name, [row_num for _, row_num, _ in updates]
+            )
+            for i, row_num, clean_row in updates:
+                try:
+                    current_product = current_products.get(row_num)
+                    if not current_product:
+                        errors.append(f"Row {i}: UPDATE failed - could not update product")
+                        failed.append(i)
+                        continue
 
+                    payload = merge_cleaning(dict(clean_row), {**current_product, **clean_row})
+                    payload['row_number'] = row_num  # CSV values are strings; the page query sorts on an int
+                    if writer.set(row_num, payload, merge=True, existing=current_product):
+                        queued[str(row_num)] = (i, updated, row_num)
+                    else:
+                        updated.append(row_num)  # Already identical, nothing to write
                 except Exception as e:
                     failed.append(i)
                     errors.append(f"Row {i}: {str(e)}")
                     logger.error(f"Error processing row {i}: {e}")
 
+            # ADD: reserve all new row numbers with one metadata write
+            new_row_nums = firestore_manager.reserve_row_numbers(collection_name, len(adds))
+            for (i, clean_row), row_num in zip(adds, new_row_nums):
+                try:
+                    clean_row['created_at'] = datetime.utcnow().isoformat()
+                    clean_row['imported_from'] = file.filename
+                    clean_row['row_number'] = row_num
+                    clean_row['updated_at'] = clean_row['created_at']
+
+                    payload = merge_cleaning(clean_row, dict(clean_row))
+                    writer.set(row_num, payload, merge=False, skip_unchanged=False)
+                    queued[str(row_num)] = (i, imported, row_num)
+                except Exception as e:
+                    failed.append(i)
+                    errors.append(f"Row {i}: {str(e)}")
+                    logger.error(f"Error processing row {i}: {e}")
+
+            write_stats = writer.flush()
+            failed_ids = set(write_stats['failed_ids'])
+            for doc_id, (i, results, row_num) in queued.items():
+                if doc_id in failed_ids:
+                    failed.append(i)
+                    errors.append(f"Row {i}: write failed")
+                else:
+                    results.append(row_num)
+            errors.extend(write_stats['errors'])
+
+            if imported or deleted:
+                firestore_manager._update_collection_stats(collection_name)
+
             # Invalidate cache after all operations
             firestore_manager._invalidate_cache(collection_name)
 
@@ -7,6 +7,8 @@ Google Sheets is the source of truth, and Apps Script automatically pushes chang
 See: google-apps-script/SheetToFirestoreSync.gs and APPS_SCRIPT_SYNC_GUIDE.md
 """
 from flask import Blueprint, request, jsonify
+import base64
+import json
 import logging
 import time
 
@@ -29,6 +31,20 @@ def _invalidate_route_cache(collection_name: str):
         logger.info(f"🗑️ [Route Cache INVALIDATE] Cleared missing-info cache for {collection_name}")
 
 
+def _encode_cursor(row_num) -> str:
+    """Opaque page token for the row to continue after"""
+    return base64.urlsafe_b64encode(json.dumps({'after': row_num}).encode()).decode().rstrip('=')
+
+
+def _decode_cursor(token: str):
+    """Row number from a page token (ValueError if the token is malformed)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode()))['after']
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
 def setup_firestore_product_routes(app):
     """
     Setup Firestore-based product routes
@@ -218,6 +234,37 @@ def setup_firestore_product_routes(app):
                     'error': 'Firestore not initialized'
                 }), 500
 
+            # Optional field mask for list views (?fields=title,variant_sku,...)
+            fields = [f.strip() for f in request.args.get('fields', '').split(',') if f.strip()] or None
+
+            # CURSOR PAGINATION: one ordered query per page; ?cursor= (empty) starts at the first page
+            if 'cursor' in request.args:
+                cursor = request.args.get('cursor')
+                try:
+                    after_row = _decode_cursor(cursor) if cursor else None
+                except ValueError as e:
+                    return jsonify({
+                        'success': False,
+                        'error': str(e)
+                    }), 400
+
+                products, next_row = firestore_manager.get_products_page(
+                    collection_name, per_page, after_row=after_row, fields=fields
+                )
+                logger.info(f"✅ [Firestore] Cursor page: {len(products)} products in one query")
+
+                return jsonify({
+                    'success': True,
+                    'products': {str(row_num): product for row_num, product in products.items()},
+                    'pagination': {
+                        'per_page': per_page,
+                        'has_next': next_row is not None,
+                        'next_cursor': _encode_cursor(next_row) if next_row is not None else None
+                    },
+                    'collection': collection_name,
+                    'source': 'firestore'
+                })
+
             # CRITICAL OPTIMIZATION: For large requests (loading all products), use the cached get_all_products()
             # This prevents reading 1,200+ documents from Firestore on every page load!
             if per_page > 100:
@@ -262,9 +309,6 @@ def setup_firestore_product_routes(app):
                     'source': 'firestore_cached'
                 })
 
-            # Use Firestore's native pagination (much faster!)
-            collection_ref = firestore_manager.get_collection_ref(collection_name)
-
             # Get total count (cached in metadata)
             try:
                 metadata_ref = firestore_manager.db.collection('collections').document(collection_name).collection('metadata').document('stats')
@@ -285,34 +329,11 @@ def setup_firestore_product_routes(app):
             start_row = offset + 1  # Row numbers start at 1
             end_row = start_row + per_page
 
-            # Fetch only the documents we need by ID
-            docs = []
-            for row_num in range(start_row, end_row):
-                try:
-                    doc_ref = collection_ref.document(str(row_num))
-                    doc = doc_ref.get()
-                    if doc.exists:
-                        product_data = doc.to_dict()
-                        product_data['row_number'] = row_num
-                        docs.append(product_data)
-                except Exception as doc_error:
-                    # Skip documents that don't exist (gaps in row numbers)
-                    continue
-
-            logger.info(f"✅ [Firestore] Efficient pagination: Read only {len(docs)} documents (not all {total}!)")
-
-            # Convert to list
-            paginated_products = []
-            if isinstance(docs, list) and docs and isinstance(docs[0], dict):
-                # Already processed (fallback path)
-                paginated_products = docs
-            else:
-                # Process document snapshots (normal path)
-                for doc in docs:
-                    product_data = doc.to_dict()
-                    product_data['row_number'] = int(doc.id)  # Ensure row_number is set
-                    paginated_products.append(product_data)
+            # Fetch only the documents we need by ID, in one batched get_all round trip
+            products = firestore_manager.get_products_batch(collection_name, list(range(start_row, end_row)), fields=fields)
+            paginated_products = [products[row_num] for row_num in sorted(products)]
 
+            logger.info(f"✅ [Firestore] Efficient pagination: Read only {len(paginated_products)} documents (not all {total}!)")
             logger.info(f"✅ [Firestore] Retrieved page {page} ({len(paginated_products)} products) using native pagination")
 
             # Convert list to dictionary keyed by row_number for frontend compatibility
@@ -332,7 +353,8 @@ def setup_firestore_product_routes(app):
                     'total': total,
                     'total_pages': (total + per_page - 1) // per_page if total > 0 else 1,
                     'has_next': offset + per_page < total,
-                    'has_prev': page > 1
+                    'has_prev': page > 1,
+                    'next_cursor': _encode_cursor(end_row - 1) if offset + per_page < total else None
                 },
                 'collection': collection_name,
                 'source': 'firestore'
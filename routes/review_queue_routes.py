@@ -13,10 +13,10 @@ def setup_review_queue_routes(app):
         threshold = float(request.args.get('threshold', '0.6'))
         limit = int(request.args.get('limit', '200'))
 
-        items = db.get_items_needing_review(confidence_threshold=threshold)
+        items = db.get_items_needing_review(confidence_threshold=threshold, limit=limit)
         rows = []
 
-        for item in items[:limit]:
+        for item in items:
             extracted_data = {}
             reviewed_data = {}
             confidence_summary = {}
@@ -61,7 +61,7 @@ def setup_review_queue_routes(app):
             rows=rows,
             threshold=threshold,
             limit=limit,
-            total_items=len(items),
+            total_items=db.count_items_needing_review(confidence_threshold=threshold),
         )
 
     @app.route('/review-queue/approve', methods=['POST'])
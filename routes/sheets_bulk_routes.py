@@ -19,10 +19,13 @@ def setup_sheets_bulk_routes(app):
     """
     Setup Google Sheets bulk operation routes
     """
-    from core.sheets_manager import get_sheets_manager
     from core.db_cache import get_db_cache
     from core.cache_manager import cache_manager
     from config.collections import get_collection_config
+    from utils.lazy_imports import lazy_callable
+
+    # gspread loads on the first bulk request rather than at registration
+    get_sheets_manager = lazy_callable('core.sheets_manager', 'get_sheets_manager')
 
     # =============================================================================
     # BULK EDIT
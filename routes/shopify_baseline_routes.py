@@ -1,13 +1,23 @@
-import csv
-import io
+import codecs
+import threading
+from datetime import datetime
 
-from flask import render_template, request, redirect, url_for, flash
+from flask import render_template, request, redirect, url_for, flash, jsonify
 
 from core.supplier_db import get_supplier_db
 
+# Rows per upsert/commit when streaming an uploaded baseline
+IMPORT_CHUNK_SIZE = 1000
+
 
 def setup_shopify_baseline_routes(app):
     db = get_supplier_db()
+    import_progress = {'status': 'idle'}
+    progress_lock = threading.Lock()
+
+    def update_progress(**fields):
+        with progress_lock:
+            import_progress.update(fields)
 
     @app.route('/shopify-baseline', methods=['GET'])
     def shopify_baseline():
@@ -25,14 +35,30 @@ def setup_shopify_baseline_routes(app):
             flash('No file selected', 'error')
             return redirect(url_for('shopify_baseline'))
 
+        with progress_lock:
+            import_progress.clear()
+            import_progress.update({'status': 'running', 'filename': file.filename, 'rows': 0,
+                                    'started_at': datetime.now().isoformat()})
+
         try:
-            content = file.read().decode('utf-8', errors='replace')
-            reader = csv.DictReader(io.StringIO(content))
-            rows = list(reader)
+            # Stream the upload instead of reading it into memory. iterdecode only needs the
+            # stream to be iterable (TextIOWrapper needs readable(), which SpooledTemporaryFile lacks before 3.11)
+            stream = codecs.iterdecode(file.stream, 'utf-8', errors='replace')
+            result = db.import_shopify_baseline_csv(
+                stream, chunk_size=IMPORT_CHUNK_SIZE,
+                progress_callback=lambda stats: update_progress(**stats)
+            )
         except Exception as e:
-            flash(f'Failed to read CSV: {e}', 'error')
+            update_progress(status='failed', error=str(e), completed_at=datetime.now().isoformat())
+            flash(f'Failed to import CSV: {e}', 'error')
             return redirect(url_for('shopify_baseline'))
 
-        result = db.import_shopify_baseline_rows(rows)
-        flash(f'Imported {result["imported"]} rows (skipped {result["skipped"]})', 'success')
+        update_progress(status='completed', completed_at=datetime.now().isoformat(), **result)
+        flash(f'Imported {result["imported"]} rows ({result["inserted"]} new, {result["updated"]} updated, '
+              f'skipped {result["skipped"]})', 'success')
         return redirect(url_for('shopify_baseline'))
+
+    @app.route('/shopify-baseline/import/progress', methods=['GET'])
+    def shopify_baseline_import_progress():
+        with progress_lock:
+            return jsonify(dict(import_progress))
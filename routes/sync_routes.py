@@ -57,7 +57,7 @@ def setup_sync_routes(app):
             logger.info(f"✅ Retrieved {len(all_products)} products from Google Sheets")
 
             # Get existing Firestore data for comparison
-            firestore_products = fm.get_all_products(collection_name, force_refresh=True)
+            firestore_products = fm.get_all_products(collection_name)
 
             # Filter to specific rows if requested
             if specific_rows:
@@ -67,6 +67,10 @@ def setup_sync_routes(app):
             else:
                 stats['total_rows'] = len(all_products)
 
+            # Changed rows are queued here and committed in 500-op WriteBatches
+            pending_writes = {}
+            new_rows = set()
+
             # Process each row
             for row_num, sheet_product in all_products.items():
                 try:
@@ -81,7 +85,7 @@ def setup_sync_routes(app):
                         continue
 
                     # Get existing Firestore product
-                    firestore_product = firestore_products.get(str(row_num), {})
+                    firestore_product = firestore_products.get(int(row_num), {})
                     is_new = not firestore_product or len(firestore_product) == 0
 
                     # Check for changes
@@ -110,29 +114,31 @@ def setup_sync_routes(app):
                         else:
                             stats['updated'] += 1
                     else:
-                        # Actually update
-                        success = fm.update_product_row(
-                            collection_name,
-                            row_num,
-                            product_data,
-                            overwrite_mode=True
-                        )
-
-                        if success:
-                            if is_new:
-                                stats['created'] += 1
-                            else:
-                                stats['updated'] += 1
-
-                            if stats['updated'] % 50 == 0:
-                                logger.info(f"📊 Progress: {stats['updated']} products synced...")
-                        else:
-                            stats['errors'] += 1
+                        pending_writes[int(row_num)] = product_data
+                        if is_new:
+                            new_rows.add(str(int(row_num)))
 
                 except Exception as e:
                     stats['errors'] += 1
                     logger.error(f"❌ Error processing row {row_num}: {e}")
 
+            if pending_writes:
+                logger.info(f"📦 Committing {len(pending_writes)} changed products in batches...")
+                write_stats = fm.batch_update_products(
+                    collection_name,
+                    pending_writes,
+                    overwrite_mode=True,
+                    existing=firestore_products
+                )
+                for doc_id in write_stats['written_ids']:
+                    if doc_id in new_rows:
+                        stats['created'] += 1
+                    else:
+                        stats['updated'] += 1
+                stats['unchanged'] += write_stats['skipped_unchanged']
+                stats['errors'] += write_stats['failed']
+                stats['batches'] = write_stats['batches']
+
             logger.info(f"✅ Sync complete: {stats['updated']} updated, {stats['created']} created")
 
             return jsonify({
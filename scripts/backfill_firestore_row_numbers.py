@@ -0,0 +1,61 @@
+"""
+Backfill Firestore row_number fields
+
+Cursor pagination orders products by their row_number field, which must equal
+the int form of the document ID. Writes now guarantee that; this fixes
+documents written earlier with a missing, empty or string row_number.
+
+Usage:
+    python scripts/backfill_firestore_row_numbers.py --collection sinks
+    python scripts/backfill_firestore_row_numbers.py --all --dry-run
+"""
+import os
+import sys
+import argparse
+import logging
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.firestore_manager import get_firestore_manager
+from config.collections import get_all_collections
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Set row_number to the document ID on Firestore products')
+    parser.add_argument('--collection', help='Collection to backfill (e.g., sinks, lighting)')
+    parser.add_argument('--all', action='store_true', help='Backfill all collections')
+    parser.add_argument('--dry-run', action='store_true', help='Only count documents that need fixing')
+    args = parser.parse_args()
+
+    if args.all:
+        collections = list(get_all_collections().keys())
+    elif args.collection:
+        collections = [args.collection]
+    else:
+        parser.error('Specify --collection or --all')
+
+    firestore_manager = get_firestore_manager()
+    if not firestore_manager.db:
+        logger.error("❌ Firestore not initialized")
+        sys.exit(1)
+
+    failed = 0
+    for collection_name in collections:
+        stats = firestore_manager.backfill_row_numbers(collection_name, dry_run=args.dry_run)
+        failed += len(stats['failed_ids'])
+        verb = 'Would fix' if args.dry_run else 'Fixed'
+        logger.info(f"{collection_name}: {verb} {stats['fixed']} of {stats['checked']} documents")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
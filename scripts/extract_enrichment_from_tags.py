@@ -15,11 +15,18 @@ Usage:
     python scripts/extract_enrichment_from_tags.py [--dry-run] [--collection COLLECTION]
 """
 
+import os
+import sys
 import sqlite3
 import argparse
-import re
 from datetime import datetime
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.supplier_db import SupplierDatabase, read_shopify_product_tags
+
 
 # ============================================================
 # Tag extraction patterns
@@ -135,17 +142,14 @@ MATERIAL_SKIP = [
 ]
 
 
-def extract_tag_value(tags: str, prefix: str) -> str | None:
-    """Extract value from a tag with given prefix (e.g., 'colour:Chrome')."""
-    if not tags:
-        return None
+# Tag keys this script reads from the shopify_product_tags index
+TAG_KEYS = ('colour', 'mounting', 'material')
 
-    # Handle both "prefix:value" and "prefix: value" (with space)
-    pattern = rf'{prefix}:\s*([^,]+)'
-    match = re.search(pattern, tags, re.IGNORECASE)
-    if match:
-        return match.group(1).strip()
-    return None
+
+def first_tag_value(tag_values: dict, key: str) -> str | None:
+    """First value of a tag key in read_shopify_product_tags output (e.g., 'colour' -> 'Chrome')."""
+    values = tag_values.get(key.lower())
+    return values[0] if values else None
 
 
 # Values that look like colours but are actually materials
@@ -204,26 +208,29 @@ def main():
     parser.add_argument('--overwrite', action='store_true', help='Overwrite existing values')
     args = parser.parse_args()
 
+    # Opening the database creates and backfills the shopify_product_tags index
+    SupplierDatabase('supplier_products.db')
     conn = sqlite3.connect('supplier_products.db')
     cursor = conn.cursor()
 
-    # Build query
-    query = """
-        SELECT id, sku, title, tags,
-               colour_finish, installation_type, material
-        FROM shopify_products
-        WHERE status = 'active' AND tags IS NOT NULL AND tags != ''
-    """
+    where = "status = 'active'"
     params = []
 
     if args.collection:
-        query += " AND super_category = ?"
+        where += " AND super_category = ?"
         params.append(args.collection)
 
-    query += " ORDER BY vendor, sku"
+    # Only products with one of the tags, via the (key, value) index
+    tags_by_id = read_shopify_product_tags(conn, where, params, keys=TAG_KEYS)
 
-    cursor.execute(query, params)
-    products = cursor.fetchall()
+    cursor.execute(f"""
+        SELECT id, sku, title,
+               colour_finish, installation_type, material
+        FROM shopify_products
+        WHERE {where}
+        ORDER BY vendor, sku
+    """, params)
+    products = [row for row in cursor.fetchall() if row[0] in tags_by_id]
 
     print("=" * 80)
     print("EXTRACT ENRICHMENT FROM SHOPIFY TAGS")
@@ -234,7 +241,7 @@ def main():
     if args.overwrite:
         print("  MODE: Overwriting existing values")
     print("=" * 80)
-    print(f"\nProducts with tags: {len(products)}")
+    print(f"\nProducts with colour/mounting/material tags: {len(products)}")
 
     # Track extractions
     colour_updates = []
@@ -246,10 +253,11 @@ def main():
     material_values = {}
 
     for row in products:
-        pid, sku, title, tags, existing_colour, existing_mounting, existing_material = row
+        pid, sku, title, existing_colour, existing_mounting, existing_material = row
+        tag_values = tags_by_id[pid]
 
         # Extract colour (may also return material if colour tag is actually a material)
-        raw_colour = extract_tag_value(tags, 'colour')
+        raw_colour = first_tag_value(tag_values, 'colour')
         if raw_colour:
             colour, material_from_colour = normalize_colour(raw_colour)
             if colour:
@@ -273,7 +281,7 @@ def main():
                     })
 
         # Extract mounting/installation type
-        raw_mounting = extract_tag_value(tags, 'Mounting')
+        raw_mounting = first_tag_value(tag_values, 'Mounting')
         if raw_mounting:
             mounting = normalize_mounting(raw_mounting)
             if mounting:
@@ -287,7 +295,7 @@ def main():
                     })
 
         # Extract material
-        raw_material = extract_tag_value(tags, 'Material')
+        raw_material = first_tag_value(tag_values, 'Material')
         if raw_material:
             material = normalize_material(raw_material)
             if material:
@@ -23,6 +23,7 @@ import csv
 import sqlite3
 import argparse
 import time
+import hashlib
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
@@ -31,8 +32,9 @@ sys.path.insert(0, REPO_ROOT)
 
 from core.data_validator import (
     validate_product_metafields, filter_by_confidence,
-    ValidationResult,
+    ValidationResult, parse_tag_pairs,
 )
+from core.supplier_db import read_shopify_product_tags
 
 # Shopify metafield keys we want to populate
 # Namespace: product_specifications
@@ -48,26 +50,19 @@ METAFIELD_SCHEMA = {
     'drain_position': {'type': 'single_line_text_field', 'extract_from': ['Drain Position', 'Waste Outlet']},
 }
 
+# Bump when extraction/validation logic changes so stored gap_results are recomputed
+GAP_ANALYSIS_VERSION = 2
+ANALYZER_FINGERPRINT = hashlib.sha1(
+    f"{GAP_ANALYSIS_VERSION}:{json.dumps(METAFIELD_SCHEMA, sort_keys=True)}".encode('utf-8')
+).hexdigest()
+
 
 def parse_shopify_tags(tags_str: str) -> Dict[str, str]:
     """
     Parse Shopify tags string into key:value pairs.
     Tags like "Width (mm): 1500, Material: Acrylic" become dict entries.
     """
-    specs = {}
-    if not tags_str:
-        return specs
-
-    for tag in tags_str.split(','):
-        tag = tag.strip()
-        if ':' in tag:
-            key, _, value = tag.partition(':')
-            key = key.strip()
-            value = value.strip()
-            if value and value not in ('', ' '):
-                specs[key] = value
-
-    return specs
+    return {key: value for key, value, _ in parse_tag_pairs(tags_str)}
 
 
 def parse_supplier_specs(specs_json: str) -> Dict[str, str]:
@@ -195,10 +190,10 @@ def get_matched_products(db_path: str, vendor: str = None,
             sp.specs_json as supplier_specs_json,
             sp.extraction_source,
             sh.product_id,
+            sh.id as shopify_row_id,
             sh.variant_id,
             sh.vendor as shopify_vendor,
             sh.title as shopify_title,
-            sh.tags as shopify_tags,
             sh.image_src as shopify_image,
             sh.body_html_length,
             sh.meta_json,
@@ -207,23 +202,21 @@ def get_matched_products(db_path: str, vendor: str = None,
         INNER JOIN shopify_products sh ON sp.sku = sh.sku
         WHERE sp.sku NOT LIKE '\\_\\_%' ESCAPE '\\'
     """
-    params = []
-
-    if vendor:
-        query += " AND sp.supplier_name = ?"
-        params.append(vendor)
-
-    if sku:
-        query += " AND sp.sku = ?"
-        params.append(sku)
-
+    filters, params = _matched_product_filters(vendor, sku)
+    query += filters
     query += " ORDER BY sp.supplier_name, sp.sku"
 
     cursor.execute(query, params)
     rows = cursor.fetchall()
+    tags_by_id = _matched_shopify_tags(conn, filters, params)
     conn.close()
 
-    return [dict(row) for row in rows]
+    products = []
+    for row in rows:
+        product = dict(row)
+        product['shopify_tags'] = tags_by_id.get(product['shopify_row_id'], {})
+        products.append(product)
+    return products
 
 
 def analyze_gaps(products: List[Dict[str, Any]],
@@ -245,56 +238,298 @@ def analyze_gaps(products: List[Dict[str, Any]],
             except json.JSONDecodeError:
                 pass
 
-        # Parse supplier specs
-        supplier_specs = parse_supplier_specs(product.get('supplier_specs_json', ''))
-
-        # Parse Shopify tags
-        shopify_tags = parse_shopify_tags(product.get('shopify_tags', ''))
-
-        # Extract metafields from all sources
-        extracted = extract_metafields(
-            supplier_specs,
-            shopify_tags,
-            brand=product.get('shopify_vendor', '')
-        )
-
-        # Determine which fields are new (not already in existing metafields)
-        new_fields = {}
-        for key, value in extracted.items():
-            if key not in existing_meta or not existing_meta[key]:
-                new_fields[key] = value
-
-        # Validate all new fields with confidence scoring
-        brand_source = ('brand_name' in new_fields and
-                        new_fields.get('brand_name') == product.get('shopify_vendor', ''))
-        validation = validate_product_metafields(
-            new_fields,
-            product.get('shopify_tags', ''),
-            supplier_specs,
-            METAFIELD_SCHEMA,
-            brand_source=brand_source,
+        analysis = analyze_product(
+            product.get('supplier_specs_json', ''),
+            product.get('shopify_tags', {}),
+            product.get('shopify_vendor', ''),
+            existing_meta,
         )
 
         # Split into auto-push / review / reject
         auto_push, needs_review, rejected = filter_by_confidence(
-            validation, auto_push_threshold, reject_threshold
+            analysis['validation'], auto_push_threshold, reject_threshold
         )
 
-        product['extracted_metafields'] = extracted
-        product['new_metafields'] = new_fields
+        product['extracted_metafields'] = analysis['extracted']
+        product['new_metafields'] = analysis['new_metafields']
         product['auto_push_fields'] = auto_push
         product['review_fields'] = needs_review
         product['rejected_fields'] = rejected
-        product['validation'] = validation
+        product['validation'] = analysis['validation']
         product['existing_metafields'] = existing_meta
-        product['supplier_specs'] = supplier_specs
-        product['gap_count'] = len(new_fields)
+        product['supplier_specs'] = analysis['supplier_specs']
+        product['gap_count'] = len(analysis['new_metafields'])
 
         results.append(product)
 
     return results
 
 
+def analyze_product(supplier_specs_json: str, shopify_tag_groups: Dict[str, List[str]], shopify_vendor: str,
+                    existing_meta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Gap analysis for one product: extract metafields, keep the ones missing
+    from existing_meta, and validate them.
+    shopify_tag_groups is the product's read_shopify_product_tags() entry.
+    Returns dict with extracted, new_metafields, validation and supplier_specs.
+    """
+    supplier_specs = parse_supplier_specs(supplier_specs_json)
+    # Last value wins for repeated keys, as in parse_shopify_tags
+    shopify_tags = {key: values[-1] for key, values in shopify_tag_groups.items()}
+
+    # Extract metafields from all sources
+    extracted = extract_metafields(supplier_specs, shopify_tags, brand=shopify_vendor or '')
+
+    # Determine which fields are new (not already in existing metafields)
+    new_fields = {}
+    for key, value in extracted.items():
+        if key not in existing_meta or not existing_meta[key]:
+            new_fields[key] = value
+
+    # Validate all new fields with confidence scoring
+    brand_source = ('brand_name' in new_fields and
+                    new_fields.get('brand_name') == (shopify_vendor or ''))
+    validation = validate_product_metafields(
+        new_fields,
+        shopify_tag_groups,
+        supplier_specs,
+        METAFIELD_SCHEMA,
+        brand_source=brand_source,
+    )
+
+    return {
+        'extracted': extracted,
+        'new_metafields': new_fields,
+        'validation': validation,
+        'supplier_specs': supplier_specs,
+    }
+
+
+# ============================================================
+# Incremental gap analysis (persisted in gap_results)
+# ============================================================
+
+def init_gap_results(conn: sqlite3.Connection):
+    """Create the gap_results table (one row per matched supplier/Shopify variant)"""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS gap_results (
+            sku TEXT NOT NULL,
+            variant_id TEXT NOT NULL DEFAULT '',
+            input_hash TEXT NOT NULL,
+            supplier_name TEXT,
+            product_id TEXT,
+            shopify_title TEXT,
+            shopify_vendor TEXT,
+            shopify_status TEXT,
+            gap_count INTEGER NOT NULL DEFAULT 0,
+            new_metafields TEXT,
+            validation TEXT,
+            extracted_metafields TEXT,
+            analyzed_at TEXT NOT NULL,
+            PRIMARY KEY (sku, variant_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_gap_results_supplier ON gap_results(supplier_name, sku)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_gap_results_gap_count ON gap_results(gap_count)")
+
+
+def _matched_product_filters(vendor: str = None, sku: str = None) -> Tuple[str, List[Any]]:
+    clauses, params = [], []
+    if vendor:
+        clauses.append("sp.supplier_name = ?")
+        params.append(vendor)
+    if sku:
+        clauses.append("sp.sku = ?")
+        params.append(sku)
+    return ''.join(f" AND {c}" for c in clauses), params
+
+
+def _matched_shopify_tags(conn: sqlite3.Connection, filters: str,
+                          params: List[Any]) -> Dict[int, Dict[str, List[str]]]:
+    """Parsed tags of the matched Shopify products, from the shopify_product_tags index"""
+    return read_shopify_product_tags(conn, f"""id IN (
+            SELECT sh.id FROM supplier_products sp
+            INNER JOIN shopify_products sh ON sp.sku = sh.sku
+            WHERE sp.sku NOT LIKE '\\_\\_%' ESCAPE '\\'{filters}
+        )""", params)
+
+
+def _input_hash(*parts: Any) -> str:
+    digest = hashlib.sha1(ANALYZER_FINGERPRINT.encode('utf-8'))
+    for part in parts:
+        digest.update(b'\x1f')
+        digest.update(str(part if part is not None else '').encode('utf-8'))
+    return digest.hexdigest()
+
+
+def refresh_gap_results(db_path: str, vendor: str = None, sku: str = None,
+                        force: bool = False) -> Dict[str, int]:
+    """
+    Re-analyze matched products whose inputs changed since the stored result.
+
+    Existing metafields are read with SQLite JSON1 (only the METAFIELD_SCHEMA
+    keys, not the whole meta_json), and each product's inputs are hashed so
+    unchanged products are skipped without parsing their specs.
+
+    Args:
+        db_path: SQLite database path
+        vendor: Only products from this supplier
+        sku: Only this SKU
+        force: Re-analyze every product
+
+    Returns:
+        Dict with matched, analyzed, unchanged and removed counts
+    """
+    meta_keys = list(METAFIELD_SCHEMA)
+    meta_columns = ',\n'.join(
+        f"""            CASE WHEN json_valid(sh.meta_json) THEN json_extract(sh.meta_json, '$."{key}"') END"""
+        for key in meta_keys
+    )
+    filters, params = _matched_product_filters(vendor, sku)
+
+    conn = sqlite3.connect(db_path)
+    try:
+        init_gap_results(conn)
+        rows = conn.execute(f"""
+            SELECT
+                sp.sku,
+                COALESCE(sh.variant_id, ''),
+                sp.supplier_name,
+                sp.specs_json,
+                sh.product_id,
+                sh.vendor,
+                sh.title,
+                sh.tags,
+                sh.status,
+                sh.id,
+{meta_columns}
+            FROM supplier_products sp
+            INNER JOIN shopify_products sh ON sp.sku = sh.sku
+            WHERE sp.sku NOT LIKE '\\_\\_%' ESCAPE '\\'{filters}
+        """, params).fetchall()
+
+        stored = dict(((r[0], r[1]), r[2]) for r in conn.execute(
+            f"SELECT sku, variant_id, input_hash FROM gap_results sp WHERE 1 = 1{filters}", params
+        ))
+
+        now = datetime.now().isoformat()
+        pending = []
+        seen = set()
+        for row in rows:
+            (row_sku, variant_id, supplier_name, specs_json, product_id,
+             shopify_vendor, title, tags, status, shopify_row_id) = row[:10]
+            existing_meta = {key: value for key, value in zip(meta_keys, row[10:]) if value is not None}
+            key = (row_sku, variant_id)
+            seen.add(key)
+
+            # The tags string is only hashed; analysis reads the parsed tags from the index
+            input_hash = _input_hash(specs_json, tags, shopify_vendor, json.dumps(existing_meta, sort_keys=True),
+                                     supplier_name, product_id, title, status)
+            if not force and stored.get(key) == input_hash:
+                continue
+            pending.append((row[:10], existing_meta, input_hash))
+
+        tags_by_id = _matched_shopify_tags(conn, filters, params) if pending else {}
+
+        upserts = []
+        for (row_sku, variant_id, supplier_name, specs_json, product_id,
+             shopify_vendor, title, tags, status, shopify_row_id), existing_meta, input_hash in pending:
+            analysis = analyze_product(specs_json, tags_by_id.get(shopify_row_id, {}), shopify_vendor, existing_meta)
+            validation = {
+                field: {'value': vr.value, 'confidence': vr.confidence, 'source': vr.source, 'issues': vr.issues}
+                for field, vr in analysis['validation'].items()
+            }
+            upserts.append((
+                row_sku, variant_id, input_hash, supplier_name, product_id, title, shopify_vendor, status,
+                len(analysis['new_metafields']), json.dumps(analysis['new_metafields']),
+                json.dumps(validation), json.dumps(analysis['extracted']), now,
+            ))
+
+        conn.executemany("""
+            INSERT INTO gap_results (
+                sku, variant_id, input_hash, supplier_name, product_id, shopify_title, shopify_vendor,
+                shopify_status, gap_count, new_metafields, validation, extracted_metafields, analyzed_at
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(sku, variant_id) DO UPDATE SET
+                input_hash = excluded.input_hash,
+                supplier_name = excluded.supplier_name,
+                product_id = excluded.product_id,
+                shopify_title = excluded.shopify_title,
+                shopify_vendor = excluded.shopify_vendor,
+                shopify_status = excluded.shopify_status,
+                gap_count = excluded.gap_count,
+                new_metafields = excluded.new_metafields,
+                validation = excluded.validation,
+                extracted_metafields = excluded.extracted_metafields,
+                analyzed_at = excluded.analyzed_at
+        """, upserts)
+
+        # Products no longer matched (supplier or Shopify row removed)
+        removed = [key for key in stored if key not in seen]
+        conn.executemany("DELETE FROM gap_results WHERE sku = ? AND variant_id = ?", removed)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        'matched': len(rows),
+        'analyzed': len(upserts),
+        'unchanged': len(rows) - len(upserts),
+        'removed': len(removed),
+    }
+
+
+def load_gap_results(db_path: str, vendor: str = None, sku: str = None, min_gaps: int = 1,
+                     auto_push_threshold: float = 0.7,
+                     reject_threshold: float = 0.3) -> List[Dict[str, Any]]:
+    """
+    Read precomputed gaps from gap_results, split by confidence.
+    Returns product dicts in the analyze_gaps() format (without supplier specs/existing metafields).
+    """
+    filters, params = _matched_product_filters(vendor, sku)
+
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    try:
+        init_gap_results(conn)
+        rows = conn.execute(f"""
+            SELECT * FROM gap_results sp
+            WHERE gap_count >= ?{filters}
+            ORDER BY supplier_name, sku
+        """, [min_gaps] + params).fetchall()
+    finally:
+        conn.close()
+
+    results = []
+    for row in rows:
+        validation = {
+            field: ValidationResult(field, vr['value'], vr['confidence'], vr['source'], vr['issues'])
+            for field, vr in json.loads(row['validation'] or '{}').items()
+        }
+        auto_push, needs_review, rejected = filter_by_confidence(
+            validation, auto_push_threshold, reject_threshold
+        )
+        results.append({
+            'sku': row['sku'],
+            'variant_id': row['variant_id'],
+            'supplier_name': row['supplier_name'],
+            'product_id': row['product_id'],
+            'shopify_title': row['shopify_title'],
+            'shopify_vendor': row['shopify_vendor'],
+            'shopify_status': row['shopify_status'],
+            'extracted_metafields': json.loads(row['extracted_metafields'] or '{}'),
+            'new_metafields': json.loads(row['new_metafields'] or '{}'),
+            'auto_push_fields': auto_push,
+            'review_fields': needs_review,
+            'rejected_fields': rejected,
+            'validation': validation,
+            'gap_count': row['gap_count'],
+            'analyzed_at': row['analyzed_at'],
+        })
+
+    return results
+
+
 def push_metafields_to_shopify(product_id: str, metafields: Dict[str, str],
                                 dry_run: bool = True) -> Dict[str, Any]:
     """
@@ -435,6 +670,8 @@ def main():
                        help='Only show products with at least N gap fields (default: 1)')
     parser.add_argument('--confidence', type=float, default=0.7,
                        help='Auto-push confidence threshold (default: 0.7)')
+    parser.add_argument('--reanalyze', action='store_true',
+                       help='Re-analyze every product, not just those whose inputs changed')
 
     args = parser.parse_args()
 
@@ -444,17 +681,19 @@ def main():
         print(f"Error: {db_path} not found.")
         sys.exit(1)
 
-    # Get matched products
-    products = get_matched_products(db_path, vendor=args.vendor, sku=args.sku)
+    # Re-analyze products whose inputs changed since the last run
+    refresh = refresh_gap_results(db_path, vendor=args.vendor, sku=args.sku, force=args.reanalyze)
 
-    if not products:
+    if not refresh['matched']:
         print("No matched products found. Run scrape_product_pages.py first.")
         sys.exit(0)
 
     print("=" * 70)
     print("  Gap Analysis & Enrichment (with Validation)")
     print("=" * 70)
-    print(f"\nMatched products: {len(products)}")
+    print(f"\nMatched products: {refresh['matched']}")
+    print(f"  Analyzed: {refresh['analyzed']}  Unchanged (cached): {refresh['unchanged']}  "
+          f"Removed: {refresh['removed']}")
     if args.push_all:
         print(f"Mode: PUSH ALL TO SHOPIFY (NO VALIDATION FILTER)")
     elif args.push:
@@ -462,11 +701,9 @@ def main():
     else:
         print(f"Mode: DRY RUN (analysis only)")
 
-    # Analyze gaps with validation
-    results = analyze_gaps(products, auto_push_threshold=args.confidence)
-
-    # Filter by min gaps
-    results = [r for r in results if r['gap_count'] >= args.min_gaps]
+    # Precomputed gaps with validation, filtered by min gaps
+    results = load_gap_results(db_path, vendor=args.vendor, sku=args.sku, min_gaps=args.min_gaps,
+                               auto_push_threshold=args.confidence)
 
     if args.limit > 0:
         results = results[:args.limit]
@@ -13,7 +13,6 @@ Usage:
 
 import os
 import sys
-import csv
 import argparse
 import time
 
@@ -63,51 +62,29 @@ def main():
         import sqlite3
         conn = sqlite3.connect(db_path)
         conn.execute('DELETE FROM shopify_products')
+        conn.execute('DELETE FROM shopify_product_tags')
         conn.commit()
         conn.close()
         print("\nCleared existing shopify_products data.")
 
-    # Read CSV and import in batches
+    # Stream the CSV and upsert it in batches (existing rows are updated in place)
     print(f"\nImporting in batches of {args.batch_size}...")
 
-    total_imported = 0
-    total_skipped = 0
-    batch = []
-    batch_num = 0
     start_time = time.time()
 
-    # Fields to exclude from raw_json to save space (body_html can be huge)
-    EXCLUDE_FROM_RAW = {'body_html'}
+    def show_progress(stats):
+        processed = stats['rows']
+        elapsed = time.time() - start_time
+        rate = processed / elapsed if elapsed > 0 else 0
+        print(f"  Batch {stats['chunks']}: {processed:>6,} / {row_count:,}  "
+              f"({processed * 100 / max(row_count, 1):.1f}%)  "
+              f"[{rate:.0f} rows/sec]", end='\r')
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-
-        for row in reader:
-            # Strip body_html from the row dict to save DB space
-            # (body_html_length is already stored separately)
-            clean_row = {k: v for k, v in row.items() if k not in EXCLUDE_FROM_RAW}
-            batch.append(clean_row)
-
-            if len(batch) >= args.batch_size:
-                batch_num += 1
-                result = db.import_shopify_baseline_rows(batch)
-                total_imported += result['imported']
-                total_skipped += result['skipped']
-                processed = total_imported + total_skipped
-                elapsed = time.time() - start_time
-                rate = processed / elapsed if elapsed > 0 else 0
-                print(f"  Batch {batch_num}: {processed:>6,} / {row_count:,}  "
-                      f"({processed * 100 / row_count:.1f}%)  "
-                      f"[{rate:.0f} rows/sec]", end='\r')
-                batch = []
-
-        # Import remaining rows
-        if batch:
-            batch_num += 1
-            result = db.import_shopify_baseline_rows(batch)
-            total_imported += result['imported']
-            total_skipped += result['skipped']
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        result = db.import_shopify_baseline_csv(f, chunk_size=args.batch_size, progress_callback=show_progress)
 
+    total_imported = result['imported']
+    total_skipped = result['skipped']
     elapsed = time.time() - start_time
     print(f"\n\nDone in {elapsed:.1f}s")
 
@@ -117,6 +94,8 @@ def main():
     print("IMPORT SUMMARY")
     print(f"{'=' * 70}")
     print(f"Rows imported:     {total_imported:,}")
+    print(f"  New:             {result['inserted']:,}")
+    print(f"  Updated:         {result['updated']:,}")
     print(f"Rows skipped:      {total_skipped:,}")
     print(f"\nDatabase stats:")
     print(f"  Total rows:      {stats['total_rows']:,}")
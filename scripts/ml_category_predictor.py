@@ -6,11 +6,12 @@ Trains on LLM-enriched products to predict categories for remaining products.
 Uses product title + vendor as features to predict super_category and primary_category.
 """
 
+import os
+import sys
 import sqlite3
 import json
 import pickle
 import argparse
-import re
 from pathlib import Path
 from datetime import datetime
 
@@ -23,59 +24,15 @@ from sklearn.pipeline import Pipeline
 from sklearn.model_selection import cross_val_score, StratifiedKFold
 from sklearn.metrics import classification_report
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Feature construction and the category map are shared with the in-app predictor service
+from core.category_predictor import SUPER_CATEGORY_MAP, build_features, get_category_predictor
+
 
 DB_PATH = 'supplier_products.db'
 MODEL_PATH = 'models/category_predictor.pkl'
 
-# Must match SUPER_CATEGORY_MAP in enrich_shopify_products.py
-SUPER_CATEGORY_MAP = {
-    "Basin Tapware": "Tapware",
-    "Kitchen Tapware": "Tapware",
-    "Bath Tapware": "Tapware",
-    "Shower Tapware": "Tapware",
-    "Basins": "Basins",
-    "Toilets": "Toilets",
-    "Bidets": "Toilets",
-    "Urinals": "Toilets",
-    "Smart Toilets": "Smart Toilets",
-    "Baths": "Baths",
-    "Kitchen Sinks": "Sinks",
-    "Laundry Sinks": "Sinks",
-    "Vanities": "Furniture",
-    "Mirrors & Cabinets": "Furniture",
-    "Showers": "Showers",
-    "Shower Screens": "Showers",
-    "Bathroom Accessories": "Accessories",
-    "Kitchen Accessories": "Accessories",
-    "Boiling Water Taps": "Boiling, Chilled & Sparkling",
-    "Chilled Water Taps": "Boiling, Chilled & Sparkling",
-    "Sparkling Water Taps": "Boiling, Chilled & Sparkling",
-    "Filtered Water Systems": "Boiling, Chilled & Sparkling",
-    "Kitchen Appliances": "Appliances",
-    "Laundry Appliances": "Appliances",
-    "Hot Water Systems": "Hot Water Systems",
-    "Air Conditioning": "Heating & Cooling",
-    "Heaters": "Heating & Cooling",
-    "Ventilation": "Heating & Cooling",
-    "Outdoor Products": "Hardware & Outdoor",
-    "Drainage": "Hardware & Outdoor",
-    "Assisted Living": "Assisted Living",
-    "Aged Care": "Assisted Living",
-}
-
-
-def clean_title(title: str) -> str:
-    """Clean product title for feature extraction"""
-    if not title:
-        return ''
-    # Remove SKU patterns (usually at end after " - ")
-    title = re.sub(r'\s*-\s*[A-Z0-9][A-Z0-9\-\./ ]*$', '', title)
-    # Remove dimensions like 900x500
-    title = re.sub(r'\d+x\d+', '', title)
-    # Lowercase
-    title = title.lower().strip()
-    return title
-
 
 def load_training_data():
     """Load enriched products as training data"""
@@ -123,19 +80,6 @@ def load_prediction_data():
     return df
 
 
-def build_features(df):
-    """Combine title + vendor + product_type into a single text feature"""
-    features = []
-    for _, row in df.iterrows():
-        title = clean_title(str(row.get('title', '')))
-        vendor = str(row.get('vendor', '')).lower()
-        product_type = str(row.get('product_type', '')).lower()
-        # Combine features with vendor repeated for emphasis
-        text = f"{title} {vendor} {vendor} {product_type}"
-        features.append(text)
-    return features
-
-
 def train_model(df):
     """Train category prediction models"""
     print("=" * 80)
@@ -200,17 +144,32 @@ def train_model(df):
 
 
 def predict_categories(model, df):
-    """Predict categories for unenriched products"""
+    """Predict categories for unenriched products
+
+    With model=None the saved model is used through the predictor service,
+    which reuses cached predictions for products it has already seen.
+    """
     print("\n" + "=" * 80)
     print("ML CATEGORY PREDICTOR - PREDICTIONS")
     print("=" * 80)
 
+    if model is None:
+        predictions = get_category_predictor().predict_batch(df)
+        if predictions and predictions[0] is None:
+            raise SystemExit("  No usable saved model - train with --save-model first")
+        df['ml_primary_category'] = [p['primary_category'] for p in predictions]
+        df['ml_primary_confidence'] = [p['confidence'] for p in predictions]
+        df['ml_super_category'] = [p['super_category'] for p in predictions]
+        cached = sum(1 for p in predictions if p['cached'])
+        print(f"  {cached}/{len(predictions)} predictions served from cache")
+        return df
+
     X_text = build_features(df)
     pipeline = model['pipeline']
 
-    # Predict primary_category
-    preds = pipeline.predict(X_text)
+    # Predict primary_category (argmax of one predict_proba call, as predict() does)
     probs = pipeline.predict_proba(X_text)
+    preds = pipeline.classes_[probs.argmax(axis=1)]
     max_probs = probs.max(axis=1)
 
     # Derive super_category from primary using the map
@@ -228,37 +187,27 @@ def save_predictions(df, dry_run=False):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
 
-    high_conf = 0
-    medium_conf = 0
-    low_conf = 0
-
-    for _, row in df.iterrows():
-        primary_conf = row['ml_primary_confidence']
-
-        if primary_conf >= 0.7:
-            high_conf += 1
-        elif primary_conf >= 0.4:
-            medium_conf += 1
-        else:
-            low_conf += 1
-
-        if not dry_run and primary_conf >= 0.4:
-            cursor.execute("""
-                UPDATE shopify_products
-                SET super_category = ?,
-                    primary_category = ?,
-                    enriched_confidence = ?,
-                    enriched_at = ?
-                WHERE id = ?
-            """, (
-                row['ml_super_category'],
-                row['ml_primary_category'],
-                round(float(primary_conf), 3),
-                datetime.now().isoformat(),
-                row['id']
-            ))
+    confidences = df['ml_primary_confidence'].astype(float)
+    high_conf = int((confidences >= 0.7).sum())
+    medium_conf = int(((confidences >= 0.4) & (confidences < 0.7)).sum())
+    low_conf = int((confidences < 0.4).sum())
 
     if not dry_run:
+        saved = df[confidences >= 0.4]
+        now = datetime.now().isoformat()
+        cursor.executemany("""
+            UPDATE shopify_products
+            SET super_category = ?,
+                primary_category = ?,
+                enriched_confidence = ?,
+                enriched_at = ?
+            WHERE id = ?
+        """, [
+            (super_cat, primary, round(float(conf), 3), now, int(product_id))
+            for super_cat, primary, conf, product_id in zip(
+                saved['ml_super_category'], saved['ml_primary_category'],
+                saved['ml_primary_confidence'], saved['id'])
+        ])
         conn.commit()
     conn.close()
 
@@ -288,34 +237,43 @@ def show_sample_predictions(df, n=30):
         print()
 
 
-def main():
-    parser = argparse.ArgumentParser(description='ML Category Predictor')
-    parser.add_argument('--dry-run', action='store_true', help='Preview predictions without saving')
-    parser.add_argument('--train-only', action='store_true', help='Only train, skip predictions')
-    parser.add_argument('--save-model', action='store_true', help='Save trained model to disk')
-    args = parser.parse_args()
-
-    # Step 1: Load training data
+def train_and_save(save_model: bool):
+    """Steps 1-2: train on enriched products (and save the model); None if there's too little data"""
     print("Loading training data...")
     train_df = load_training_data()
     print(f"  Found {len(train_df)} enriched products for training")
 
     if len(train_df) < 50:
         print("  Not enough training data (need >= 50 products)")
-        return
+        return None
 
-    # Step 2: Train model
     model = train_model(train_df)
 
-    # Save model if requested
-    if args.save_model:
+    # Save model if requested (running apps reload it on their next prediction)
+    if save_model:
         Path('models').mkdir(exist_ok=True)
         with open(MODEL_PATH, 'wb') as f:
             pickle.dump(model, f)
         print(f"\n  Model saved to {MODEL_PATH}")
 
-    if args.train_only:
-        return
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ML Category Predictor')
+    parser.add_argument('--dry-run', action='store_true', help='Preview predictions without saving')
+    parser.add_argument('--train-only', action='store_true', help='Only train, skip predictions')
+    parser.add_argument('--save-model', action='store_true', help='Save trained model to disk')
+    parser.add_argument('--use-saved-model', action='store_true',
+                        help='Skip training and predict with the saved model (cached predictor service)')
+    args = parser.parse_args()
+
+    if args.use_saved_model:
+        model = None
+    else:
+        model = train_and_save(args.save_model)
+        if model is None or args.train_only:
+            return
 
     # Step 3: Load prediction data
     print("\nLoading products for prediction...")
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Run all shopify_products derivations in one pass.
+
+Replaces running these scripts one after another (each a full-table scan
+with one UPDATE per row):
+    fix_tapware_miscategorization.py     → recategorize
+    standardize_tapware_subcategories.py → standardize-subtypes
+    derive_tapware_subtypes.py           → derive-subtypes
+    extract_enrichment_from_tags.py      → tags
+    normalize_materials.py               → materials
+    populate_warranty_data.py            → warranty
+
+The keyword tables and normalizers are imported from those scripts, so they
+stay the single source of truth. Rule sets run in the order above against
+each row as the previous sets left it (e.g. subtypes are derived after
+recategorization, and tag-extracted materials are normalized).
+
+Usage:
+    python scripts/run_derivations.py --dry-run
+    python scripts/run_derivations.py --only tags materials
+    python scripts/run_derivations.py --overwrite
+"""
+
+import os
+import sys
+import argparse
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, SCRIPTS_DIR)
+
+from core.derivation_engine import DerivationEngine, Rule, SKIP, format_report
+from core.supplier_db import SupplierDatabase
+
+import fix_tapware_miscategorization as miscat
+import standardize_tapware_subcategories as standardize
+import derive_tapware_subtypes as subtypes
+import extract_enrichment_from_tags as tag_enrichment
+import normalize_materials as materials
+import populate_warranty_data as warranty
+
+# Title words that mark a product as tapware, as used by fix_tapware_miscategorization
+TAPWARE_WORDS = ('mixer', 'tap', 'spout', 'outlet', 'diverter')
+
+
+def recategorize_rules(overwrite: bool):
+    """fix_tapware_miscategorization: move non-tapware out of Tapware (first match wins)"""
+    confidence = {'enriched_confidence': lambda row: max(row.get('enriched_confidence') or 0, 0.95)}
+
+    def move(name, super_cat, primary_cat, subtype, **matchers):
+        return Rule(
+            name=f"recategorize: {name}",
+            column='super_category',
+            value=super_cat,
+            when={'super_category': 'Tapware'},
+            sets={'primary_category': primary_cat, 'product_category_type': subtype, **confidence},
+            group='recategorize',
+            stamp_enriched=True,
+            **matchers,
+        )
+
+    return [
+        move('skylight (vendor)', 'Other', 'Skylights', None, vendor_any=('velux',)),
+        move('skylight', 'Other', 'Skylights', None, title_any=tuple(miscat.SKYLIGHT_KEYWORDS)),
+        move('tool', 'Other', 'Tools', None, title_any=tuple(miscat.TOOL_KEYWORDS)),
+        move('basin', 'Basins', 'Basins', None,
+             title_any=tuple(miscat.BASIN_KEYWORDS), title_none=TAPWARE_WORDS),
+        move('waste/trap', 'Bathroom', 'Bathroom Accessories', 'Wastes & Traps',
+             title_any=tuple(miscat.ACCESSORY_KEYWORDS), title_none=TAPWARE_WORDS),
+    ]
+
+
+def standardize_subtype_rules(overwrite: bool):
+    """standardize_tapware_subcategories: rename existing sub-categories (skips accessories/shower fixtures)"""
+    return [
+        Rule(
+            name='standardize-subtypes',
+            column='product_category_type',
+            source='product_category_type',
+            value=lambda row, old: standardize.get_standard_subcat(old, row['primary_category']),
+            when={'super_category': 'Tapware'},
+            condition=lambda row: not standardize.is_accessory(row['title'] or '')
+                and not standardize.should_move_to_showers(row['title'] or '', row['primary_category']),
+            reads=('primary_category',),
+        )
+    ]
+
+
+def derive_subtype_rules(overwrite: bool):
+    """derive_tapware_subtypes: title keywords → product_category_type per primary_category"""
+    return [
+        Rule(
+            name=f"subtype: {primary} → {subtype}",
+            column='product_category_type',
+            value=subtype,
+            when={'super_category': 'Tapware', 'primary_category': primary},
+            title_any=tuple(keywords),
+            fill_only=not overwrite,
+            group='derive-subtypes',
+        )
+        for primary, rules in subtypes.CATEGORY_RULES.items()
+        for subtype, keywords in rules
+    ]
+
+
+def tag_rules(overwrite: bool):
+    """extract_enrichment_from_tags: colour/Mounting/Material tags → colour_finish, installation_type, material"""
+    def colour(row, raw):
+        return tag_enrichment.normalize_colour(raw)[0] or SKIP
+
+    def colour_material(row, raw):
+        return tag_enrichment.normalize_colour(raw)[1] or SKIP
+
+    def material(row, raw):
+        return tag_enrichment.normalize_material(raw) or SKIP
+
+    common = {'fill_only': not overwrite, 'stamp_enriched': True}
+    return [
+        Rule(name='tag: colour', column='colour_finish', tag='colour', value=colour, **common),
+        Rule(name='tag: mounting', column='installation_type', tag='mounting',
+             value_map=tag_enrichment.MOUNTING_MAPPINGS, **common),
+        # Material tags take precedence over colour tags that name a material (first match in the group wins)
+        Rule(name='tag: material', column='material', tag='material', value=material,
+             group='tag-material', **common),
+        Rule(name='tag: colour is material', column='material', tag='colour', value=colour_material,
+             group='tag-material', **common),
+    ]
+
+
+def material_rules(overwrite: bool):
+    """normalize_materials: map material values to the standard names"""
+    return [
+        Rule(
+            name='normalize-material',
+            column='material',
+            source='material',
+            value=lambda row, old: materials.normalize_material(old, row['super_category'], row['sku']),
+            condition=lambda row: row['material'] != 'None',
+            reads=('super_category',),
+        )
+    ]
+
+
+def warranty_rules(overwrite: bool):
+    """populate_warranty_data: vendor → warranty_url / warranty_years where missing"""
+    rules = []
+    for vendor, (warranty_url, warranty_years) in warranty.VENDOR_WARRANTY_MAP.items():
+        if warranty_url:
+            rules.append(Rule(
+                name=f"warranty url: {vendor}", column='warranty_url', value=warranty_url,
+                when={'vendor': vendor}, fill_only=True, group='warranty-url',
+            ))
+        if warranty_years is not None:
+            rules.append(Rule(
+                name=f"warranty years: {vendor}", column='warranty_years', value=warranty_years,
+                when={'vendor': vendor}, fill_only=True, empty_values=(None, '', 0), group='warranty-years',
+            ))
+    return rules
+
+
+RULE_SETS = {
+    'recategorize': recategorize_rules,
+    'standardize-subtypes': standardize_subtype_rules,
+    'derive-subtypes': derive_subtype_rules,
+    'tags': tag_rules,
+    'materials': material_rules,
+    'warranty': warranty_rules,
+}
+
+
+def build_rules(names=None, overwrite: bool = False):
+    """Rules for the selected rule sets, in pipeline order"""
+    rules = []
+    for name, builder in RULE_SETS.items():
+        if names is None or name in names:
+            rules.extend(builder(overwrite))
+    return rules
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run all shopify_products derivations in one pass')
+    parser.add_argument('--dry-run', action='store_true', help='Preview without making changes')
+    parser.add_argument('--only', nargs='+', choices=list(RULE_SETS), help='Rule sets to run (default: all)')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='Overwrite existing sub-categories and tag-derived values')
+    parser.add_argument('--collection', type=str, help='Limit to specific super_category')
+    parser.add_argument('--db', default='supplier_products.db', help='SQLite database path')
+    parser.add_argument('--quiet', action='store_true', help="Don't print sample changes")
+    args = parser.parse_args()
+
+    rules = build_rules(args.only, args.overwrite)
+
+    where = "status = 'active'"
+    params = ()
+    if args.collection:
+        where += " AND super_category = ?"
+        params = (args.collection,)
+
+    print("=" * 80)
+    print("SHOPIFY PRODUCT DERIVATIONS")
+    if args.dry_run:
+        print("  MODE: Dry run (no database changes)")
+    if args.overwrite:
+        print("  MODE: Overwriting existing values")
+    print(f"  RULE SETS: {', '.join(args.only or RULE_SETS)} ({len(rules)} rules)")
+    print("=" * 80)
+
+    # Opening the database creates and backfills the shopify_product_tags index the tag rules read
+    SupplierDatabase(args.db)
+    report = DerivationEngine(args.db, rules).run(dry_run=args.dry_run, where=where, params=params)
+    print()
+    print(format_report(report, show_samples=not args.quiet))
+
+    if args.dry_run:
+        print(f"\n[DRY RUN] No changes made.")
+    else:
+        print(f"\n{report['rows_changed']} products updated.")
+
+
+if __name__ == '__main__':
+    main()
@@ -12,11 +12,19 @@ Usage:
 import sqlite3
 import argparse
 import os
+import sys
 import json
 import random
 from dotenv import load_dotenv
 from anthropic import Anthropic
 
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from core.supplier_db import SupplierDatabase, read_shopify_product_tags
+from extract_enrichment_from_tags import TAG_KEYS, first_tag_value
+
 # Load environment variables
 load_dotenv()
 
@@ -95,15 +103,17 @@ def main():
     parser.add_argument('--collection', type=str, help='Limit to specific super_category')
     args = parser.parse_args()
 
+    # Opening the database creates and backfills the shopify_product_tags index
+    SupplierDatabase('supplier_products.db')
     conn = sqlite3.connect('supplier_products.db')
     cursor = conn.cursor()
 
     # Get products with recent tag extractions (have colour but may have been from tags)
     query = """
-        SELECT id, sku, title, tags, colour_finish, installation_type, material
+        SELECT id, sku, title, colour_finish, installation_type, material
         FROM shopify_products
         WHERE status = 'active'
-        AND tags IS NOT NULL AND tags != ''
+        AND EXISTS (SELECT 1 FROM shopify_product_tags t WHERE t.product_id = shopify_products.id)
         AND colour_finish IS NOT NULL
     """
     params = []
@@ -114,7 +124,6 @@ def main():
 
     cursor.execute(query, params)
     products = cursor.fetchall()
-    conn.close()
 
     print("=" * 80)
     print("TAG EXTRACTION VERIFICATION")
@@ -124,34 +133,30 @@ def main():
 
     if len(products) == 0:
         print("No products to verify.")
+        conn.close()
         return
 
     # Random sample
     sample_size = min(args.sample_size, len(products))
     sample = random.sample(products, sample_size)
 
+    # Raw tag values of the sampled products, from the tag index
+    sample_ids = [row[0] for row in sample]
+    tags_by_id = read_shopify_product_tags(
+        conn, f"id IN ({','.join('?' * len(sample_ids))})", sample_ids, keys=TAG_KEYS
+    )
+    conn.close()
+
     # Prepare for verification
     to_verify = []
     for row in sample:
-        pid, sku, title, tags, colour, mounting, material = row
-
-        # Extract what was in the tags for comparison
-        import re
-        raw_colour = None
-        raw_mounting = None
-        raw_material = None
-
-        colour_match = re.search(r'colour:\s*([^,]+)', tags, re.IGNORECASE)
-        if colour_match:
-            raw_colour = colour_match.group(1).strip()
-
-        mounting_match = re.search(r'Mounting:\s*([^,]+)', tags, re.IGNORECASE)
-        if mounting_match:
-            raw_mounting = mounting_match.group(1).strip()
+        pid, sku, title, colour, mounting, material = row
 
-        material_match = re.search(r'Material:\s*([^,]+)', tags, re.IGNORECASE)
-        if material_match:
-            raw_material = material_match.group(1).strip()
+        # What was in the tags, for comparison
+        tag_values = tags_by_id.get(pid, {})
+        raw_colour = first_tag_value(tag_values, 'colour')
+        raw_mounting = first_tag_value(tag_values, 'Mounting')
+        raw_material = first_tag_value(tag_values, 'Material')
 
         to_verify.append({
             'id': pid,
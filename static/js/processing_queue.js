@@ -11,6 +11,7 @@ const state = {
     status: '',
     search: '',
     totalPages: 1,
+    cursors: {},  // page -> keyset cursor returned with the previous page
     loading: false,
     currentItem: null,
     extractedData: null,
@@ -90,6 +91,7 @@ function buildQuery() {
     const params = new URLSearchParams();
     params.set('page', state.page);
     params.set('limit', state.limit);
+    if (state.cursors[state.page]) params.set('cursor', state.cursors[state.page]);
     if (state.collection) params.set('collection', state.collection);
     if (state.status) params.set('status', state.status);
     return params.toString();
@@ -98,6 +100,7 @@ function buildQuery() {
 async function loadQueue() {
     if (state.loading) return;
     state.loading = true;
+    if (state.page === 1) state.cursors = {};
     document.getElementById('queueTableBody').innerHTML = `
         <tr>
             <td colspan="10" class="text-center py-5 text-muted">
@@ -122,6 +125,7 @@ async function loadQueue() {
         }
 
         renderQueue(items);
+        if (data.next_cursor) state.cursors[state.page + 1] = data.next_cursor;
         state.totalPages = data.total_pages || 1;
         updateSummary(data.total || 0, data.page || 1, state.totalPages);
         updateStats(data.stats || {});
@@ -286,6 +290,26 @@ function showToast(message, type = 'success', action = null) {
     requestAnimationFrame(() => toast.classList.add('show'));
 }
 
+async function waitForApproveJob(statusUrl) {
+    // Large batches are approved in the background; poll until the job finishes
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, 1500));
+        const response = await fetch(statusUrl);
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || 'Approval job not found');
+        }
+        const job = data.job;
+        if (job.status === 'completed') {
+            return { success: job.result.approved_count > 0, ...job.result };
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Approval job failed');
+        }
+        showToast(`Approving... ${job.processed}/${job.total} item(s) written`, 'info');
+    }
+}
+
 async function approveItems(ids) {
     try {
         const response = await fetch('/api/processing-queue/approve', {
@@ -293,9 +317,12 @@ async function approveItems(ids) {
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ queue_ids: ids })
         });
-        const data = await response.json();
+        let data = await response.json();
+        if (data.success && data.job_id) {
+            data = await waitForApproveJob(data.status_url);
+        }
         if (!data.success) {
-            throw new Error(data.error || 'Failed to approve items');
+            throw new Error(data.error || data.errors?.[0] || 'Failed to approve items');
         }
 
         // Build summary of collections
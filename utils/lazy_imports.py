@@ -0,0 +1,100 @@
+"""
+Lazy Import Helpers
+Defer importing heavy SDKs (gspread, googleapiclient, openai, pandas, ...) and
+building their singletons until the first request that actually needs them
+"""
+import importlib
+import threading
+from typing import Any, Callable
+
+
+class LazyModule:
+    """
+    Module stand-in that imports the real module on first attribute access
+
+    Usage:
+        pd = LazyModule('pandas')
+        pd.isna(value)  # pandas is imported here, not at module load
+    """
+
+    def __init__(self, module_name: str):
+        object.__setattr__(self, '_module_name', module_name)
+        object.__setattr__(self, '_module', None)
+
+    def _load(self):
+        module = object.__getattribute__(self, '_module')
+        if module is None:
+            module = importlib.import_module(object.__getattribute__(self, '_module_name'))
+            object.__setattr__(self, '_module', module)
+        return module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._load(), name)
+
+    def __repr__(self) -> str:
+        name = object.__getattribute__(self, '_module_name')
+        loaded = object.__getattribute__(self, '_module') is not None
+        return f"<LazyModule {name} ({'loaded' if loaded else 'not loaded'})>"
+
+
+class LazyObject:
+    """
+    Proxy for an object built by a factory on first use
+
+    Attribute reads and writes are forwarded to the real object, so a module
+    global like ``sheets_manager = LazyObject(get_sheets_manager)`` behaves like
+    the singleton without constructing it at import time.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', None)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _resolve(self):
+        instance = object.__getattribute__(self, '_instance')
+        if instance is None:
+            with object.__getattribute__(self, '_lock'):
+                instance = object.__getattribute__(self, '_instance')
+                if instance is None:
+                    instance = object.__getattribute__(self, '_factory')()
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+
+    @property
+    def is_loaded(self) -> bool:
+        return object.__getattribute__(self, '_instance') is not None
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name: str, value: Any):
+        setattr(self._resolve(), name, value)
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if self.is_loaded:
+            return repr(self._resolve())
+        return '<LazyObject (not loaded)>'
+
+
+def lazy_callable(module_name: str, attr: str) -> Callable:
+    """
+    Return a function that imports ``module_name`` and calls ``attr`` on first use
+
+    Usage:
+        get_sheets_manager = lazy_callable('core.sheets_manager', 'get_sheets_manager')
+    """
+    target = []
+
+    def wrapper(*args, **kwargs):
+        if not target:
+            target.append(getattr(importlib.import_module(module_name), attr))
+        return target[0](*args, **kwargs)
+
+    wrapper.__name__ = attr
+    wrapper.__qualname__ = attr
+    wrapper.__doc__ = f"Lazily imported {module_name}.{attr}"
+    return wrapper